@@ -3,14 +3,22 @@
 API module for gNMIBuddy - Contains the core network tool functions
 that can be used by both MCP and CLI interfaces.
 """
-from typing import Optional, Union
+from functools import partial
+from typing import Iterator, Optional, Union
 
-from src.services.commands import run
+from src.services.commands import run, run_stream
 from src.schemas.models import DeviceListResult
 from src.schemas.responses import NetworkOperationResult
 from src.inventory import list_available_devices_safe
 from src.collectors.logs import get_logs as collect_logs
+from src.collectors.logs import follow_logs as collect_follow_logs
+from src.collectors.logs import search_logs as collect_search_logs
 from src.collectors.topology.neighbors import neighbors
+from src.collectors.topology.path import topology_path
+from src.collectors.topology.ip_lookup import lookup_ip as collect_lookup_ip
+from src.collectors.topology.changes import (
+    get_topology_changes as collect_topology_changes,
+)
 from src.collectors.vpn import get_vpn_info as collect_vpn_info
 from src.collectors.mpls import get_mpls_info as collect_mpls_info
 from src.collectors.system import get_system_info as collect_system_info
@@ -68,7 +76,7 @@ def get_system_info(
     Returns:
         Dictionary with system information fields
     """
-    return run(device_name, collect_system_info)
+    return run(device_name, partial(collect_system_info, split_static=True))
 
 
 def get_routing_info(
@@ -108,16 +116,87 @@ def get_logs(
 
     Returns:
         Structured log information
+
+    Repeated calls for the same device only fetch lines newer than the last
+    ones seen and answer the time window from a local buffer.
     """
     return run(
         device_name,
-        collect_logs,
+        partial(collect_logs, incremental=True),
         keywords,
         minutes,
         show_all_logs,
     )
 
 
+def follow_logs(
+    device_name: str,
+    keywords: Optional[str] = None,
+    minutes: Optional[Union[str, int]] = 5,
+    interval: float = 5.0,
+    max_polls: Optional[int] = None,
+) -> Iterator[NetworkOperationResult]:
+    """
+    Follow the logs of a network device as new lines arrive.
+
+    Args:
+        device_name: Name of the device in the inventory
+        keywords: Optional keywords to filter logs
+        minutes: Minutes of history returned by the first poll (default: 5)
+        interval: Seconds between polls (default: 5)
+        max_polls: Stop after this many polls (default: follow until closed)
+
+    Yields:
+        One result per poll holding only the new log lines
+    """
+    return run_stream(
+        device_name,
+        collect_follow_logs,
+        keywords,
+        minutes,
+        interval,
+        max_polls,
+    )
+
+
+def search_logs(
+    keywords: Optional[str] = None,
+    minutes: Optional[Union[str, int]] = 60,
+    devices: Optional[str] = None,
+    max_severity: Optional[int] = None,
+    limit: Optional[int] = 200,
+) -> NetworkOperationResult:
+    """
+    Search logs already collected from all devices, without querying them.
+
+    Answers fleet-wide questions such as "which routers logged ISIS
+    ADJCHANGE in the last hour" from the local log index. The index only
+    holds lines previously fetched with get_logs or follow_logs while
+    GNMIBUDDY_LOG_INDEX is enabled; call get_logs to refresh a device.
+
+    Args:
+        keywords: Words that must all appear, e.g. "ISIS ADJCHANGE"; use
+            "ISIS|BGP" to match either word
+        minutes: Only lines from the last N minutes (default: 60)
+        devices: Optional comma-separated device names to search
+        max_severity: Only lines with a syslog severity at or below this,
+            e.g. 3 for errors and worse
+        limit: Maximum number of lines returned, newest kept (default: 200)
+
+    Returns:
+        Matching log lines with their device, and counts per device
+    """
+    return run(
+        None,
+        collect_search_logs,
+        keywords,
+        minutes,
+        devices,
+        max_severity,
+        limit,
+    )
+
+
 def get_interface_info(
     device_name: str,
     interface: Optional[str] = None,
@@ -170,7 +249,13 @@ def get_vpn_info(
     Returns:
         Structured VPN information
     """
-    return run(device_name, collect_vpn_info, vrf_name, include_details)
+    # One wildcard Get instead of VRF discovery followed by a detail Get
+    return run(
+        device_name,
+        partial(collect_vpn_info, single_request=True),
+        vrf_name,
+        include_details,
+    )
 
 
 def get_devices() -> DeviceListResult:
@@ -186,12 +271,21 @@ def get_devices() -> DeviceListResult:
 
 def get_topology_neighbors(
     device_name: str,
+    discovery: str = "ip",
+    refresh: bool = False,
 ) -> NetworkOperationResult:
     """
     Get direct neighbors of a specified device.
 
     Args:
         device_name: Name of the device in the inventory
+        discovery: "ip" (default) pairs interface subnets; "adjacency" uses
+            ISIS adjacencies and LLDP neighbors (smaller payloads, also
+            finds links without a point-to-point subnet); "merged" adds
+            adjacency links to the IP ones
+        refresh: Poll the devices the answer depends on now instead of
+            reusing interface data younger than GNMIBUDDY_TOPOLOGY_TTL
+            (default 300 s); the metadata reports the age of the data
 
     Returns:
         Dictionary with the device name and a list of its direct neighbors.
@@ -201,14 +295,59 @@ def get_topology_neighbors(
             "neighbors": [
                 {"neighbor": "P1", "attributes": {...}},
                 ...
+            ],
+            "segments": [
+                {"segment": "10.0.0.0/24", "interfaces": [...], "members": [...]},
+                ...
             ]
         }
+        Devices on a shared (multi-access) segment are listed under
+        segments with that segment, not as neighbors.
+    """
+
+    return run(device_name, partial(neighbors, refresh=refresh), discovery)
+
+
+def get_topology_path(
+    device_name: str,
+    target_device_name: str,
+    weight: str = "hops",
+    k: int = 1,
+    refresh: bool = False,
+) -> NetworkOperationResult:
     """
+    Get the shortest paths between two devices in the IP topology.
+
+    Every equal-cost shortest path is returned (ECMP), not one arbitrary
+    path. Repeated questions from the same device are answered from cached
+    shortest-path trees until the topology changes.
+
+    Args:
+        device_name: Name of the source device in the inventory
+        target_device_name: Name of the target device
+        weight: "hops" (default) or "igp" to use ISIS interface metrics
+        k: 1 (default) for all equal-cost shortest paths, up to 16 for the
+            k shortest loop-free paths
+        refresh: Poll the devices the answer depends on now instead of
+            reusing interface data younger than GNMIBUDDY_TOPOLOGY_TTL
+            (default 300 s); the metadata reports the age of the data
 
-    return run(device_name, neighbors)
+    Returns:
+        The cost of the best path, the number of equal-cost paths and the
+        paths, each with its devices, links and cost
+    """
+    return run(
+        device_name,
+        partial(topology_path, refresh=refresh),
+        target_device_name,
+        weight,
+        k,
+    )
 
 
-def get_network_topology_api() -> NetworkOperationResult:
+def get_network_topology_api(
+    discovery: str = "ip", refresh: bool = False
+) -> NetworkOperationResult:
     """
     Retrieve the full L3 IP-only direct connection list for all devices in the network inventory (excluding management interfaces).
 
@@ -230,18 +369,90 @@ def get_network_topology_api() -> NetworkOperationResult:
                     }
                 },
                 ...
+            ],
+            "segments": [
+                {
+                    "segment": <L3 network in CIDR>,
+                    "devices": [<device name>, ...],
+                    "endpoints": [{"device", "interface", "ip"}, ...]
+                },
+                ...
             ]
         }
     Notes:
     - Management interfaces (e.g., MgmtEth0/RP0/CPU0/0) are excluded from direct connections.
+    - Networks shared by three or more interfaces (LANs, exchange fabrics) are listed once under segments instead of as connections between every two members.
     - Self-loops (connections where source == target) may be present for loopbacks or virtual interfaces.
 
 
     Args:
-        device_name: Name of the device in the inventory (used for context)
+        discovery: "ip" (default) pairs interface subnets; "adjacency" uses
+            ISIS adjacencies and LLDP neighbors (smaller payloads, also
+            finds links without a point-to-point subnet; attributes the
+            adjacencies cannot provide are null); "merged" adds adjacency
+            links to the IP ones
+        refresh: Poll the devices the answer depends on now instead of
+            reusing interface data younger than GNMIBUDDY_TOPOLOGY_TTL
+            (default 300 s); the metadata reports the age of the data
 
     Returns:
         Dictionary with the device name and a list of all IP direct connections in the topology graph.
     """
 
-    return run(None, get_network_topology)
+    return run(
+        None, partial(get_network_topology, refresh=refresh), discovery
+    )
+
+
+def lookup_ip(
+    ip_address: str, refresh: bool = False
+) -> NetworkOperationResult:
+    """
+    Find which device and interface in the inventory own an IP address.
+
+    Answers from the topology index built from interface data, polling only
+    devices whose data is stale. Besides the owner, returns the longest
+    known network containing the address and the interfaces on it, which
+    also identifies the neighbors of an address that no device owns.
+
+    Args:
+        ip_address: IPv4 or IPv6 address, e.g. "10.1.2.1" or "10.1.2.1/24"
+        refresh: Poll the devices the answer depends on now instead of
+            reusing interface data younger than GNMIBUDDY_TOPOLOGY_TTL
+            (default 300 s); the metadata reports the age of the data
+
+    Returns:
+        Dictionary with the owner (device, interface, ip), network and
+        the endpoints of that network
+    """
+    return run(None, partial(collect_lookup_ip, refresh=refresh), ip_address)
+
+
+def get_topology_changes(
+    from_version: Optional[int] = None,
+    to_version: Optional[int] = None,
+    since: Optional[str] = None,
+) -> NetworkOperationResult:
+    """
+    Get what changed in the network topology between two snapshots.
+
+    Returns only the delta, which is much smaller than the full topology:
+    added and removed devices and links, links whose interfaces or IP
+    addresses changed, and devices whose interface data changed. Requires
+    GNMIBUDDY_TOPOLOGY_CACHE=true, which keeps numbered topology snapshots.
+
+    Args:
+        from_version: Baseline snapshot number (default: the snapshot
+            before to_version)
+        to_version: Snapshot number to compare (default: the topology now,
+            refreshed first)
+        since: Compare with the topology at a time instead, e.g. "2h",
+            "1d" or "2025-06-01T08:00"
+
+    Returns:
+        The snapshot numbers compared and the added, removed and changed
+        devices and links
+    """
+    return run(
+        None, collect_topology_changes, from_version, to_version, since
+    )
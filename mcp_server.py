@@ -4,8 +4,11 @@ MCP entry point for gNMIBuddy - Registers network tool functions as MCP tools.
 Uses a decorator factory to register API functions without duplicating signatures and docstrings.
 """
 
+import asyncio
 import inspect
+import math
 import os
+from contextlib import nullcontext
 from functools import wraps
 from typing import Optional
 
@@ -30,6 +33,10 @@ from src.logging import (
     read_mcp_environment_config,
 )
 from src.config.environment import get_settings
+from src.gnmi.priority import Priority, priority_scope
+from src.gnmi.session import DeviceSession, device_session
+from src.schemas.responses import OperationStatus
+from src.utils.cancellation import CancellationToken, cancellation_scope
 
 mcp_env_config = read_mcp_environment_config()
 setup_mcp_logging(tool_debug_mode=mcp_env_config.get("tool_debug_mode", False))
@@ -101,11 +108,32 @@ def create_missing_device_name_error(func_name: str) -> str:
     )
 
 
+_tool_session: Optional[DeviceSession] = None
+
+
+def _tool_session_scope():
+    """Session shared by tool calls, when GNMIBUDDY_MCP_SESSION_TTL is set.
+
+    Agents often call several tools on the same device in a row (profile,
+    vpn, routing); within the TTL later calls reuse the subtrees fetched by
+    earlier ones.
+    """
+    global _tool_session
+    ttl = get_settings().get_mcp_session_ttl()
+    if ttl <= 0:
+        return nullcontext()
+    if _tool_session is None or _tool_session.max_age != ttl:
+        _tool_session = DeviceSession(max_age=ttl)
+    return device_session(_tool_session)
+
+
 def register_as_mcp_tool(func):
     """
     Decorator factory that creates an MCP tool wrapper for an API function.
     This preserves the original function's name, signature, docstring, and type hints.
     The wrapper automatically serializes the response and uses MCP context logging.
+    Tool calls run in the interactive priority lane on a worker thread, so
+    they are not serialized behind each other or behind background work.
 
     Args:
         func: The API function to register as an MCP tool
@@ -139,7 +167,10 @@ def register_as_mcp_tool(func):
                     )
                     raise ValueError(error_msg)
 
-            result = func(*args, **kwargs)
+            # to_thread copies the current context, carrying the lane and
+            # the shared device session along
+            with priority_scope(Priority.INTERACTIVE), _tool_session_scope():
+                result = await asyncio.to_thread(func, *args, **kwargs)
 
             serialized_result = make_serializable(result)
 
@@ -171,6 +202,7 @@ async def health_check(request: Request) -> PlainTextResponse:
 # Register all API functions as MCP tools
 register_as_mcp_tool(api.get_routing_info)
 register_as_mcp_tool(api.get_logs)
+register_as_mcp_tool(api.search_logs)
 register_as_mcp_tool(api.get_interface_info)
 register_as_mcp_tool(api.get_mpls_info)
 register_as_mcp_tool(api.get_vpn_info)
@@ -179,6 +211,91 @@ register_as_mcp_tool(api.get_device_profile_api)
 register_as_mcp_tool(api.get_system_info)
 register_as_mcp_tool(api.get_network_topology_api)
 register_as_mcp_tool(api.get_topology_neighbors)
+register_as_mcp_tool(api.get_topology_path)
+register_as_mcp_tool(api.lookup_ip)
+register_as_mcp_tool(api.get_topology_changes)
+
+# Upper bound on how long a single follow_logs tool call may run
+MAX_FOLLOW_SECONDS = 600
+
+
+@mcp.tool()
+async def follow_logs(
+    device_name: str,
+    keywords: Optional[str] = None,
+    minutes: int = 5,
+    duration_seconds: int = 60,
+    interval_seconds: float = 5.0,
+    ctx: Optional[Context] = None,
+) -> dict:
+    """
+    Follow the logs of a network device for a while, like ``tail -f``.
+
+    New log lines are sent as MCP progress and log messages as soon as each
+    poll returns them. The final result lists every line seen.
+
+    Args:
+        device_name: Name of the device in the inventory
+        keywords: Optional keywords to filter logs
+        minutes: Minutes of history included in the first poll (default: 5)
+        duration_seconds: How long to follow, at most 600 (default: 60)
+        interval_seconds: Seconds between polls (default: 5)
+
+    Returns:
+        The log lines seen while following, and the status of each poll
+    """
+    tool_logger = get_mcp_logger("gnmibuddy.mcp.tools.follow_logs", ctx)
+    interval = max(interval_seconds, 1.0)
+    duration = min(max(duration_seconds, 0), MAX_FOLLOW_SECONDS)
+    max_polls = math.floor(duration / interval) + 1
+    await tool_logger.info(
+        "Following logs on %s for %ss", device_name, duration
+    )
+
+    token = CancellationToken()
+    stream = api.follow_logs(
+        device_name, keywords, minutes, interval, max_polls
+    )
+    logs, errors, polls = [], [], 0
+    try:
+        while True:
+            with priority_scope(Priority.INTERACTIVE), cancellation_scope(
+                token
+            ):
+                result = await asyncio.to_thread(next, stream, None)
+            if result is None:
+                break
+            polls += 1
+            if result.status != OperationStatus.SUCCESS:
+                errors.append(make_serializable(result.error_response))
+                continue
+            new_logs = result.data.get("logs", [])
+            logs.extend(new_logs)
+            if ctx is not None:
+                await ctx.report_progress(
+                    polls, max_polls, f"{len(new_logs)} new log lines"
+                )
+                if new_logs:
+                    await ctx.info(
+                        "\n".join(log["message"] for log in new_logs)
+                    )
+    finally:
+        # Ends a poll still waiting in its worker thread if the call was
+        # cancelled by the client
+        token.cancel("follow_logs finished")
+        try:
+            stream.close()
+        except ValueError:
+            # Still inside a poll in its worker thread; the cancelled
+            # token ends that poll and the stream is closed once collected
+            pass
+
+    return {
+        "device_name": device_name,
+        "logs": logs,
+        "summary": {"count": len(logs), "polls": polls},
+        "errors": errors,
+    }
 
 
 def main():
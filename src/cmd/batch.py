@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Batch operations support for CLI commands with parallel execution"""
 import time
-from typing import List, Any, Callable
+from typing import List, Any, Callable, Dict, Optional, Sequence, Set
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
@@ -15,41 +15,128 @@ from src.schemas.responses import (
 from src.logging import get_logger
 from src.schemas.models import NetworkOS
 from src.inventory.manager import InventoryManager
+from src.storage.latency_stats import LatencyStatsStore, nearest_rank_p95
+from src.storage.result_store import SpillingResultStore
+from src.utils.cancellation import CancellationToken, cancellation_scope
+from src.gnmi.priority import (
+    Priority,
+    priority_scope,
+    warn_if_oversubscribed,
+)
 
 logger = get_logger(__name__)
 
 
+def _mean(values) -> Optional[float]:
+    values = list(values)
+    return sum(values) / len(values) if values else None
+
+
 class ProgressIndicator:
-    """Simple progress indicator for batch operations"""
+    """Simple progress indicator for batch operations
+
+    When expected per-device durations are known (from historical latency
+    statistics) the remaining time is estimated from the devices still
+    pending instead of extrapolating linearly from the elapsed time. With
+    their p95 durations an upper bound is shown as well. Pending devices
+    without history are assumed to take the mean (p95 for the bound) of the
+    durations observed so far in this batch, or of the known devices before
+    any device has finished.
+    """
 
-    def __init__(self, total: int, show_progress: bool = True):
+    def __init__(
+        self,
+        total: int,
+        show_progress: bool = True,
+        expected_durations: Optional[Dict[str, float]] = None,
+        workers: int = 1,
+        p95_durations: Optional[Dict[str, float]] = None,
+    ):
         self.total = total
         self.completed = 0
         self.show_progress = show_progress
         self.start_time = time.time()
-
-    def update(self, increment: int = 1):
-        """Update progress"""
+        self.pending_expected = dict(expected_durations or {})
+        self.pending_p95 = dict(p95_durations or {})
+        self.history_expected = _mean(self.pending_expected.values())
+        self.history_p95 = _mean(self.pending_p95.values())
+        self.observed: List[float] = []
+        self.workers = max(workers, 1)
+
+    def update(
+        self,
+        increment: int = 1,
+        device: Optional[str] = None,
+        duration: Optional[float] = None,
+    ):
+        """Update progress, optionally with the finished device's duration"""
         self.completed += increment
+        if device is not None:
+            self.pending_expected.pop(device, None)
+            self.pending_p95.pop(device, None)
+        if isinstance(duration, (int, float)) and duration > 0:
+            self.observed.append(duration)
         if self.show_progress and self.total > 1:
             percentage = (self.completed / self.total) * 100
             elapsed = time.time() - self.start_time
-            estimated_total = (
-                elapsed / (self.completed / self.total)
-                if self.completed > 0
-                else 0
+            remaining = self.estimate_remaining(elapsed)
+            upper_bound = self.estimate_upper_bound()
+            bound = (
+                f" (up to {upper_bound:.1f}s)"
+                if upper_bound is not None
+                else ""
             )
-            remaining = estimated_total - elapsed
 
             click.echo(
                 f"\rProgress: {self.completed}/{self.total} "
                 f"({percentage:.1f}%) - "
                 f"Elapsed: {elapsed:.1f}s, "
-                f"Remaining: {remaining:.1f}s",
+                f"Remaining: {remaining:.1f}s{bound}",
                 nl=False,
                 err=True,
             )
 
+    def estimate_remaining(self, elapsed: float) -> float:
+        """Estimate remaining seconds for the batch"""
+        if self.completed >= self.total:
+            return 0.0
+        fallback = (
+            _mean(self.observed) if self.observed else self.history_expected
+        )
+        if fallback is not None:
+            return self._pending_time(self.pending_expected, fallback)
+        estimated_total = (
+            elapsed / (self.completed / self.total)
+            if self.completed > 0
+            else 0
+        )
+        return estimated_total - elapsed
+
+    def estimate_upper_bound(self) -> Optional[float]:
+        """Remaining seconds if pending devices take their p95, if known"""
+        if self.completed >= self.total:
+            return 0.0
+        fallback = (
+            nearest_rank_p95(self.observed)
+            if self.observed
+            else self.history_p95
+        )
+        if fallback is None:
+            return None
+        return self._pending_time(self.pending_p95, fallback)
+
+    def _pending_time(
+        self, known: Dict[str, float], fallback: float
+    ) -> float:
+        # Devices without history take the fallback duration. Pending work
+        # is spread over the workers, but never less than the single
+        # longest pending device.
+        unknown = max(self.total - self.completed - len(known), 0)
+        pending = list(known.values()) + [fallback] * unknown
+        if not pending:
+            return 0.0
+        return max(sum(pending) / self.workers, max(pending))
+
     def finish(self):
         """Finish progress indication"""
         if self.show_progress and self.total > 1:
@@ -57,10 +144,20 @@ class ProgressIndicator:
 
 
 class BatchOperationExecutor:
-    """Executor for batch operations with parallel processing"""
+    """Executor for batch operations with parallel processing
+
+    If a latency store is given, devices are submitted longest-expected-first
+    based on their historical durations for the operation, and the duration
+    of every device is recorded back into the store when the batch finishes.
+    """
 
-    def __init__(self, max_workers: int = 5):
+    def __init__(
+        self,
+        max_workers: int = 5,
+        latency_store: Optional[LatencyStatsStore] = None,
+    ):
         self.max_workers = max_workers
+        self.latency_store = latency_store
 
     def execute_batch_operation(
         self,
@@ -69,6 +166,9 @@ class BatchOperationExecutor:
         operation_type: str,
         show_progress: bool = True,
         fail_fast: bool = False,
+        result_sink: Optional[SpillingResultStore] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        on_result: Optional[Callable[[NetworkOperationResult], None]] = None,
     ) -> BatchOperationResult:
         """
         Execute an operation on multiple devices in parallel
@@ -79,88 +179,170 @@ class BatchOperationExecutor:
             operation_type: Type of operation being performed (for metadata)
             show_progress: Whether to show progress indicator
             fail_fast: Whether to stop on first failure
+            result_sink: Optional on-disk store to spill per-device results
+                to; the returned BatchOperationResult then reads from it lazily
+            cancellation_token: Optional token to cancel the batch from
+                outside (e.g. a coordinator); a new one is used otherwise
+            on_result: Optional callback invoked with each device result as
+                soon as it is collected
 
         Returns:
             BatchOperationResult with consistent NetworkOperationResult structure
         """
         start_time = time.time()
-        results = []
-        progress = ProgressIndicator(len(devices), show_progress)
+        results = result_sink if result_sink is not None else []
+        finished_devices = set()
+        successful = 0
+
+        def collect(result: NetworkOperationResult) -> None:
+            nonlocal successful
+            results.append(result)
+            finished_devices.add(result.device_name)
+            if result.status == OperationStatus.SUCCESS:
+                successful += 1
+            self._record_latency(result, operation_type)
+            if on_result is not None:
+                on_result(result)
+
+        expected_durations: Dict[str, float] = {}
+        p95_durations: Dict[str, float] = {}
+        if self.latency_store is not None:
+            devices = self.latency_store.order_longest_first(
+                devices, operation_type
+            )
+            expected_durations = self.latency_store.expected_durations(
+                devices, operation_type
+            )
+            p95_durations = self.latency_store.p95_durations(
+                devices, operation_type
+            )
+        progress = ProgressIndicator(
+            len(devices),
+            show_progress,
+            expected_durations=expected_durations,
+            workers=self.max_workers,
+            p95_durations=p95_durations,
+        )
+
+        token = cancellation_token or CancellationToken()
+        warn_if_oversubscribed(self.max_workers, Priority.BULK)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        future_to_device = {}
 
         try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_device = {
-                    executor.submit(
-                        self._execute_single_device, device, operation_func
-                    ): device
-                    for device in devices
-                }
-
-                # Process completed tasks
-                for future in as_completed(future_to_device):
-                    device = future_to_device[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        progress.update()
-
-                        # Log individual results
-                        if result.status == OperationStatus.SUCCESS:
-                            execution_time = result.metadata.get(
-                                "execution_time", 0.0
-                            )
-                            logger.debug(
-                                "Successfully processed device %s in %.2fs",
-                                device,
-                                execution_time,
-                            )
-                        else:
-                            error_msg = (
-                                result.error_response.message
-                                if result.error_response
-                                else "Unknown error"
-                            )
-                            logger.warning(
-                                "Failed to process device %s: %s",
-                                device,
-                                error_msg,
-                            )
-
-                        # Fail fast if requested and we hit an error
-                        if (
-                            fail_fast
-                            and result.status != OperationStatus.SUCCESS
-                        ):
-                            # Cancel remaining futures
-                            for remaining_future in future_to_device:
-                                if not remaining_future.done():
-                                    remaining_future.cancel()
-                            break
-
-                    except Exception as e:
-                        logger.error(
-                            "Unexpected error processing device %s: %s",
+            # Submit all tasks
+            future_to_device = {
+                executor.submit(
+                    self._execute_in_scope,
+                    token,
+                    device,
+                    operation_func,
+                    operation_type,
+                ): device
+                for device in devices
+            }
+
+            # Process completed tasks
+            for future in as_completed(future_to_device):
+                device = future_to_device[future]
+                try:
+                    result = future.result()
+                    collect(result)
+                    progress.update(
+                        device=device,
+                        duration=result.metadata.get("execution_time"),
+                    )
+
+                    # Log individual results
+                    if result.status == OperationStatus.SUCCESS:
+                        execution_time = result.metadata.get(
+                            "execution_time", 0.0
+                        )
+                        logger.debug(
+                            "Successfully processed device %s in %.2fs",
                             device,
-                            e,
+                            execution_time,
+                        )
+                    else:
+                        error_msg = (
+                            result.error_response.message
+                            if result.error_response
+                            else "Unknown error"
                         )
-                        # Create a failed NetworkOperationResult for unexpected errors
-                        error_result = self._create_error_result(
+                        logger.warning(
+                            "Failed to process device %s: %s",
                             device,
-                            operation_type,
-                            f"Unexpected error: {str(e)}",
+                            error_msg,
                         )
-                        results.append(error_result)
-                        progress.update()
+
+                    # Fail fast if requested and we hit an error
+                    if fail_fast and result.status != OperationStatus.SUCCESS:
+                        # Abort in-flight work and drop pending devices
+                        token.cancel(f"fail-fast triggered by device {device}")
+                        break
+
+                except Exception as e:
+                    logger.error(
+                        "Unexpected error processing device %s: %s",
+                        device,
+                        e,
+                    )
+                    # Create a failed NetworkOperationResult for unexpected errors
+                    error_result = self._create_error_result(
+                        device,
+                        operation_type,
+                        f"Unexpected error: {str(e)}",
+                    )
+                    collect(error_result)
+                    progress.update(device=device)
+
+        except KeyboardInterrupt:
+            token.cancel("interrupted by user")
+            raise
 
         finally:
+            # On cancellation do not wait for running workers; the token
+            # makes them return promptly on their own.
+            executor.shutdown(
+                wait=not token.is_cancelled,
+                cancel_futures=token.is_cancelled,
+            )
             progress.finish()
+            if self.latency_store is not None:
+                self.latency_store.save()
+
+        if token.is_cancelled:
+            for cancelled_result in self._create_cancelled_results(
+                devices, finished_devices, operation_type, token.reason
+            ):
+                collect(cancelled_result)
+
+        return self._build_batch_result(
+            devices,
+            results,
+            successful,
+            start_time,
+            operation_type,
+            metadata={
+                "max_workers": self.max_workers,
+                "fail_fast": fail_fast,
+                "show_progress": show_progress,
+                "cancelled": token.is_cancelled,
+                "spilled_results": result_sink is not None,
+            },
+        )
 
-        # Calculate summary
+    def _build_batch_result(
+        self,
+        devices: List[str],
+        results: Sequence[NetworkOperationResult],
+        successful: int,
+        start_time: float,
+        operation_type: str,
+        metadata: Dict[str, Any],
+    ) -> BatchOperationResult:
+        """Summarize collected results into a BatchOperationResult"""
         execution_time = time.time() - start_time
-        successful = sum(
-            1 for r in results if r.status == OperationStatus.SUCCESS
-        )
         failed = len(results) - successful
 
         summary = BatchOperationSummary(
@@ -175,11 +357,7 @@ class BatchOperationExecutor:
         batch_result = BatchOperationResult(
             results=results,
             summary=summary,
-            metadata={
-                "max_workers": self.max_workers,
-                "fail_fast": fail_fast,
-                "show_progress": show_progress,
-            },
+            metadata=metadata,
         )
 
         # Log summary
@@ -193,10 +371,68 @@ class BatchOperationExecutor:
 
         return batch_result
 
+    def _record_latency(
+        self, result: NetworkOperationResult, operation_type: str
+    ) -> None:
+        """Record a device duration into the latency store"""
+        if self.latency_store is None:
+            return
+        if (
+            result.error_response is not None
+            and result.error_response.type == "CANCELLED"
+        ):
+            return
+        execution_time = result.metadata.get("execution_time")
+        # 0.0 marks results that were never timed (unexpected errors)
+        if isinstance(execution_time, (int, float)) and execution_time > 0:
+            self.latency_store.record(
+                result.device_name, operation_type, execution_time
+            )
+
+    def _execute_in_scope(
+        self,
+        token: CancellationToken,
+        device_name: str,
+        operation_func: Callable[[str], NetworkOperationResult],
+        operation_type: str,
+    ) -> NetworkOperationResult:
+        """Run a device operation in the batch cancellation scope and bulk lane"""
+        if token.is_cancelled:
+            return self._create_error_result(
+                device_name,
+                operation_type,
+                f"Operation cancelled: {token.reason}",
+                error_type="CANCELLED",
+            )
+        with cancellation_scope(token), priority_scope(Priority.BULK):
+            return self._execute_single_device(
+                device_name, operation_func, operation_type
+            )
+
+    def _create_cancelled_results(
+        self,
+        devices: List[str],
+        finished: Set[str],
+        operation_type: str,
+        reason: Optional[str],
+    ) -> List[NetworkOperationResult]:
+        """Create results for devices that did not finish before cancellation"""
+        return [
+            self._create_error_result(
+                device,
+                operation_type,
+                f"Operation cancelled: {reason}",
+                error_type="CANCELLED",
+            )
+            for device in devices
+            if device not in finished
+        ]
+
     def _execute_single_device(
         self,
         device_name: str,
         operation_func: Callable[[str], NetworkOperationResult],
+        operation_type: str,
     ) -> NetworkOperationResult:
         """Execute operation on a single device"""
         start_time = time.time()
@@ -216,7 +452,7 @@ class BatchOperationExecutor:
 
             # Create a failed NetworkOperationResult
             return self._create_error_result(
-                device_name, "unknown", error_msg, execution_time
+                device_name, operation_type, error_msg, execution_time
             )
 
     def _create_error_result(
@@ -225,6 +461,7 @@ class BatchOperationExecutor:
         operation_type: str,
         error_msg: str,
         execution_time: float = 0.0,
+        error_type: str = "execution_error",
     ) -> NetworkOperationResult:
         """Create a NetworkOperationResult for errors"""
         return NetworkOperationResult(
@@ -235,9 +472,7 @@ class BatchOperationExecutor:
             status=OperationStatus.FAILED,
             data={},
             metadata={"execution_time": execution_time},
-            error_response=ErrorResponse(
-                type="execution_error", message=error_msg
-            ),
+            error_response=ErrorResponse(type=error_type, message=error_msg),
         )
 
 
@@ -385,7 +620,10 @@ def create_batch_operation_wrapper(
 
         # Prepare batch executor
         max_workers = getattr(ctx.obj, "max_workers", 5)
-        executor = BatchOperationExecutor(max_workers=max_workers)
+        executor = BatchOperationExecutor(
+            max_workers=max_workers,
+            latency_store=LatencyStatsStore.default(),
+        )
 
         # Extract operation type from the original function or command context
         operation_type = getattr(ctx.command, "name", "unknown_operation")
@@ -12,10 +12,13 @@ from typing import Callable, List
 import click
 
 from src.logging import get_logger
-from src.cmd.formatters import format_output
+from src.cmd.formatters import format_output, stream_batch_output
 from src.inventory.manager import InventoryManager
 from src.cmd.batch import BatchOperationExecutor
+from src.cmd.sharded_batch import ShardedBatchExecutor
 from src.schemas.models import DeviceErrorResult
+from src.storage.latency_stats import LatencyStatsStore
+from src.storage.result_store import SpillingResultStore
 from src.schemas.responses import (
     NetworkOperationResult,
     OperationStatus,
@@ -48,7 +51,18 @@ def execute_batch_operation(
         BatchOperationResult: Results from all device operations
     """
     max_workers = getattr(ctx.obj, "max_workers", 5)
-    executor = BatchOperationExecutor(max_workers=max_workers)
+    processes = getattr(ctx.obj, "processes", 1)
+    if processes > 1:
+        executor = ShardedBatchExecutor(
+            processes=processes,
+            max_workers=max_workers,
+            latency_store=LatencyStatsStore.default(),
+        )
+    else:
+        executor = BatchOperationExecutor(
+            max_workers=max_workers,
+            latency_store=LatencyStatsStore.default(),
+        )
 
     # Extract operation type from context or function
     operation_type = getattr(ctx.command, "name", "unknown_operation")
@@ -96,17 +110,31 @@ def execute_batch_operation(
     # Show progress for long-running operations
     show_progress = len(batch_devices) > 2
 
+    # Optionally keep per-device results on disk instead of in memory; the
+    # store is removed when the click context closes.
+    result_sink = None
+    if getattr(ctx.obj, "spill_results", False):
+        result_sink = SpillingResultStore()
+        ctx.call_on_close(result_sink.close)
+
     try:
         batch_result = executor.execute_batch_operation(
             devices=batch_devices,
             operation_func=single_device_operation,
             operation_type=operation_type,
             show_progress=show_progress,
+            result_sink=result_sink,
         )
 
-        # Format and display the results
-        formatted_output = format_output(batch_result, output.lower())
-        click.echo(formatted_output)
+        # Format and display the results; spilled results are printed one
+        # at a time so they are never all decoded together
+        if result_sink is not None:
+            for chunk in stream_batch_output(batch_result, output.lower()):
+                click.echo(chunk, nl=False)
+            click.echo()
+        else:
+            formatted_output = format_output(batch_result, output.lower())
+            click.echo(formatted_output)
 
         return batch_result
 
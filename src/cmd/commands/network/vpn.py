@@ -36,6 +36,9 @@ def network_vpn_examples() -> ExampleSet:
     ).add_advanced(
         command=f"uv run gnmibuddy.py n {Command.NETWORK_VPN.command_name} --device R1 --vrf-name MGMT",
         description="Using alias with VRF filter",
+    ).add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.NETWORK.group_name} {Command.NETWORK_VPN.command_name} --device R1 --single-request --projected",
+        description="Fetch all VRFs in one projected gNMI request",
     )
 
     return examples
@@ -66,15 +69,38 @@ def _get_command_help() -> str:
 @add_common_device_options
 @click.option("--vrf-name", help="Filter by VRF name (e.g., CUSTOMER_A)")
 @add_detail_option(help_text="Show detailed VPN information")
+@click.option(
+    "--single-request",
+    is_flag=True,
+    help="Fetch all VRFs in one wildcard gNMI request",
+)
+@click.option(
+    "--projected",
+    is_flag=True,
+    help="With --single-request, only request the fields used in the output",
+)
 @click.pass_context
 def network_vpn(
-    ctx, device, vrf_name, detail, output, devices, device_file, all_devices
+    ctx,
+    device,
+    vrf_name,
+    detail,
+    single_request,
+    projected,
+    output,
+    devices,
+    device_file,
+    all_devices,
 ):
     """Get VPN/VRF information from a network device"""
 
     def operation_func(device_obj, **kwargs):
         return get_vpn_info(
-            device_obj, vrf_name=vrf_name, include_details=detail
+            device_obj,
+            vrf_name=vrf_name,
+            include_details=detail,
+            single_request=single_request,
+            projected=projected,
         )
 
     return execute_device_command(
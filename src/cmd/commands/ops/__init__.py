@@ -2,9 +2,11 @@
 """Operations command implementations"""
 
 from .logs import ops_logs
+from .log_search import ops_log_search
 from .validate import ops_validate
 
 __all__ = [
     "ops_logs",
+    "ops_log_search",
     "ops_validate",
 ]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Ops log-search command implementation"""
+import click
+
+from src.cmd.commands.decorators import add_output_option
+from src.cmd.schemas.commands import Command, CommandGroup
+from src.cmd.error_providers import CommandErrorProvider
+from src.cmd.registries.command_registry import (
+    register_command,
+    register_error_provider,
+)
+from src.cmd.examples.example_builder import (
+    ExampleBuilder,
+    ExampleSet,
+)
+from src.cmd.formatters import format_output
+from src.logging import get_logger
+from src.collectors.logs import search_logs
+from src.services.commands import run_network_wide
+
+logger = get_logger(__name__)
+
+
+def ops_log_search_examples() -> ExampleSet:
+    """Build ops log-search command examples with common patterns."""
+    examples = ExampleBuilder.simple_command_examples(
+        command=f"{CommandGroup.OPS.group_name} {Command.OPS_LOG_SEARCH.command_name} --keywords 'ISIS ADJCHANGE'",
+        description="Which devices logged ISIS ADJCHANGE in the last hour",
+    )
+
+    examples.add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.OPS.group_name} {Command.OPS_LOG_SEARCH.command_name} --keywords 'ISIS|BGP' --minutes 30",
+        description="Lines mentioning ISIS or BGP in the last 30 minutes",
+    ).add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.OPS.group_name} {Command.OPS_LOG_SEARCH.command_name} --max-severity 3 --devices R1,R2",
+        description="Errors and worse on selected devices",
+    ).add_advanced(
+        command=f"GNMIBUDDY_LOG_INDEX=true uv run gnmibuddy.py --all-devices {CommandGroup.OPS.group_name} {Command.OPS_LOGS.command_name} --minutes 60",
+        description="Fill the index from every device",
+    )
+
+    return examples
+
+
+def basic_usage() -> str:
+    """Basic usage examples"""
+    return ops_log_search_examples().basic_only().to_string()
+
+
+def detailed_examples() -> str:
+    """Detailed examples"""
+    return ops_log_search_examples().for_help()
+
+
+error_provider = CommandErrorProvider(Command.OPS_LOG_SEARCH)
+register_error_provider(Command.OPS_LOG_SEARCH, error_provider)
+
+
+def _get_command_help() -> str:
+    return detailed_examples()
+
+
+@register_command(Command.OPS_LOG_SEARCH)
+@click.command(help=_get_command_help())
+@add_output_option
+@click.option(
+    "--keywords",
+    type=str,
+    help="Words that must all appear; use 'A|B' to match either",
+)
+@click.option(
+    "--minutes",
+    type=click.IntRange(min=0),
+    default=60,
+    show_default=True,
+    help="Only lines from the last N minutes",
+)
+@click.option(
+    "--devices",
+    type=str,
+    help="Comma-separated device names to search (default: all)",
+)
+@click.option(
+    "--max-severity",
+    type=click.IntRange(0, 7),
+    help="Only lines with a severity at or below this (3 = errors)",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=0),
+    default=200,
+    show_default=True,
+    help="Maximum number of lines returned, newest kept",
+)
+@click.pass_context
+def ops_log_search(
+    ctx, output, keywords, minutes, devices, max_severity, limit
+):
+    """Search logs already collected from all devices"""
+
+    logger.info("Searching the local log index for %s", keywords)
+
+    # Answered from the local index; no device is contacted
+    result = run_network_wide(
+        search_logs, keywords, minutes, devices, max_severity, limit
+    )
+
+    formatted_output = format_output(result, output.lower())
+    click.echo(formatted_output)
+    return result
+
+
+if __name__ == "__main__":
+    print(_get_command_help())
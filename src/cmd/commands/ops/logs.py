@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 """Ops logs command implementation"""
+import json
+
 import click
-from src.collectors.logs import get_logs
+from src.collectors.logs import (
+    DEFAULT_FOLLOW_INTERVAL,
+    follow_logs,
+    get_logs,
+)
 from src.cmd.commands.base import execute_device_command
+from src.cmd.formatters import format_output
+from src.inventory.manager import InventoryManager
+from src.schemas.models import DeviceErrorResult
+from src.schemas.responses import OperationStatus
 from src.cmd.commands.decorators import add_common_device_options
 from src.cmd.schemas.commands import Command, CommandGroup
 from src.cmd.error_providers import CommandErrorProvider
@@ -39,6 +49,9 @@ def ops_logs_examples() -> ExampleSet:
     ).add_advanced(
         command=f"uv run gnmibuddy.py {CommandGroup.OPS.group_name} {Command.OPS_LOGS.command_name} --device R1 --show-all-logs",
         description="Show all available logs",
+    ).add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.OPS.group_name} {Command.OPS_LOGS.command_name} --device R1 --follow",
+        description="Follow new log lines as they arrive (Ctrl+C to stop)",
     ).add_advanced(
         command=f"uv run gnmibuddy.py o {Command.OPS_LOGS.command_name} --device R1 --minutes 5",
         description="Using alias with time filter",
@@ -82,6 +95,18 @@ def _get_command_help() -> str:
 @click.option(
     "--show-all-logs", is_flag=True, help="Show all available log entries"
 )
+@click.option(
+    "--follow",
+    is_flag=True,
+    help="Keep polling and print new log lines as they arrive",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=1.0),
+    default=DEFAULT_FOLLOW_INTERVAL,
+    show_default=True,
+    help="Seconds between polls with --follow",
+)
 @click.pass_context
 def ops_logs(
     ctx,
@@ -89,12 +114,30 @@ def ops_logs(
     keywords,
     minutes,
     show_all_logs,
+    follow,
+    interval,
     output,
     devices,
     device_file,
     all_devices,
 ):
     """Get log information from a network device"""
+    if follow:
+        if (
+            devices
+            or device_file
+            or all_devices
+            or getattr(ctx.obj, "all_devices", False)
+        ):
+            raise click.UsageError("--follow works with a single --device")
+        if show_all_logs:
+            raise click.UsageError(
+                "--follow cannot be combined with --show-all-logs"
+            )
+        if not device:
+            click.echo(ctx.get_help())
+            ctx.exit()
+        return _follow_logs(device, keywords, minutes, interval, output)
 
     def operation_func(device_obj, **kwargs):
         return get_logs(
@@ -119,5 +162,33 @@ def ops_logs(
     )
 
 
+def _follow_logs(device, keywords, minutes, interval, output):
+    """Print log records as they arrive until interrupted.
+
+    JSON output is one record per line; YAML output is a sequence that
+    grows by one item per record.
+    """
+    device_obj = InventoryManager.get_device(device)
+    if isinstance(device_obj, DeviceErrorResult):
+        click.echo(f"Error: {device_obj.msg}", err=True)
+        raise click.Abort()
+
+    try:
+        for result in follow_logs(
+            device_obj, keywords=keywords, minutes=minutes, interval=interval
+        ):
+            if result.status != OperationStatus.SUCCESS:
+                message = getattr(result.error_response, "message", "")
+                click.echo(f"Error polling logs: {message}", err=True)
+                continue
+            for record in result.data.get("logs", []):
+                if output == "yaml":
+                    click.echo(format_output([record], "yaml"), nl=False)
+                else:
+                    click.echo(json.dumps(record))
+    except KeyboardInterrupt:
+        click.echo("Stopped following logs", err=True)
+
+
 if __name__ == "__main__":
     print(_get_command_help())
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Ops validate command implementation"""
 import time
+import contextvars
 import concurrent.futures
 from typing import Dict, Any, List
 
@@ -16,6 +17,7 @@ from src.cmd.registries.command_registry import (
 )
 from src.logging import get_logger
 from src.schemas.responses import OperationStatus, NetworkOperationResult
+from src.gnmi.session import device_session
 
 # Import all collector functions
 from src.collectors.system import get_system_info
@@ -170,11 +172,15 @@ def _run_collector_tests(
 
     # Use the smaller of max_workers or number of test functions to avoid unnecessary threads
     effective_max_workers = min(max_workers, len(test_functions))
-    with concurrent.futures.ThreadPoolExecutor(
+    # Collectors share fetched subtrees (VRF names, network instances,
+    # interfaces) through one device session
+    with device_session(), concurrent.futures.ThreadPoolExecutor(
         max_workers=effective_max_workers
     ) as executor:
         future_to_test = {
-            executor.submit(test_func): test_name
+            executor.submit(contextvars.copy_context().run, test_func): (
+                test_name
+            )
             for test_name, test_func in test_functions.items()
         }
 
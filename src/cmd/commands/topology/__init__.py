@@ -3,8 +3,10 @@
 
 from .network import topology_network
 from .neighbors import topology_neighbors
+from .changes import topology_changes
 
 __all__ = [
     "topology_network",
     "topology_neighbors",
+    "topology_changes",
 ]
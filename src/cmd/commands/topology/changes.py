@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Topology changes command implementation"""
+import click
+
+from src.cmd.commands.decorators import add_output_option
+from src.cmd.schemas.commands import Command, CommandGroup
+from src.cmd.error_providers import CommandErrorProvider
+from src.cmd.registries.command_registry import (
+    register_command,
+    register_error_provider,
+)
+from src.cmd.examples.example_builder import (
+    ExampleBuilder,
+    ExampleSet,
+)
+from src.cmd.formatters import format_output
+from src.logging import get_logger
+from src.collectors.topology.changes import get_topology_changes
+from src.services.commands import run_network_wide
+
+
+logger = get_logger(__name__)
+
+
+def topology_changes_examples() -> ExampleSet:
+    """Build topology changes command examples with common patterns."""
+    examples = ExampleBuilder.simple_command_examples(
+        command=f"{CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_CHANGES.command_name}",
+        description="Show what changed since the previous topology snapshot.",
+    )
+
+    examples.add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_CHANGES.command_name} --since 8h",
+        description="Show what changed in the last 8 hours",
+    ).add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_CHANGES.command_name} --from-version 3 --to-version 7",
+        description="Compare two stored snapshots",
+    )
+
+    return examples
+
+
+def basic_usage() -> str:
+    """Basic usage examples"""
+    return topology_changes_examples().basic_only().to_string()
+
+
+def detailed_examples() -> str:
+    """Detailed examples"""
+    return topology_changes_examples().for_help()
+
+
+error_provider = CommandErrorProvider(Command.TOPOLOGY_CHANGES)
+register_error_provider(Command.TOPOLOGY_CHANGES, error_provider)
+
+
+def _get_command_help() -> str:
+    return detailed_examples()
+
+
+@register_command(Command.TOPOLOGY_CHANGES)
+@click.command(help=_get_command_help())
+@add_output_option
+@click.option(
+    "--from-version",
+    type=int,
+    help="Baseline snapshot number (default: the previous snapshot)",
+)
+@click.option(
+    "--to-version",
+    type=int,
+    help="Snapshot number to compare (default: the topology now)",
+)
+@click.option(
+    "--since",
+    help="Compare with the topology at a time: 2h, 1d or an ISO 8601 time",
+)
+@click.pass_context
+def topology_changes(ctx, output, from_version, to_version, since):
+    """Show what changed in the topology between snapshots"""
+
+    logger.info("Getting topology changes")
+
+    result = run_network_wide(
+        get_topology_changes, from_version, to_version, since
+    )
+
+    formatted_output = format_output(result, output.lower())
+    click.echo(formatted_output)
+    return result
+
+
+if __name__ == "__main__":
+    print(_get_command_help())
@@ -11,6 +11,7 @@ from src.cmd.registries.command_registry import (
     register_error_provider,
 )
 from src.logging import get_logger
+from src.collectors.topology.adjacency import DISCOVERY_IP, DISCOVERY_METHODS
 from src.collectors.topology.neighbors import neighbors
 
 from src.cmd.examples.example_builder import (
@@ -23,7 +24,7 @@ logger = get_logger(__name__)
 
 def topology_neighbors_examples() -> ExampleSet:
     """Build topology neighbors command examples with common patterns."""
-    return ExampleBuilder.standard_command_examples(
+    examples = ExampleBuilder.standard_command_examples(
         command=f"{CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_NEIGHBORS.command_name}",
         alias=f"t {Command.TOPOLOGY_NEIGHBORS.command_name}",
         device="R1",
@@ -32,6 +33,11 @@ def topology_neighbors_examples() -> ExampleSet:
         output_formats=True,
         alias_examples=True,
     )
+    examples.add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_NEIGHBORS.command_name} --device R1 --discovery adjacency",
+        description="Find neighbors from ISIS adjacencies and LLDP",
+    )
+    return examples
 
 
 def basic_usage() -> str:
@@ -55,12 +61,35 @@ def _get_command_help() -> str:
 @register_command(Command.TOPOLOGY_NEIGHBORS)
 @click.command(help=_get_command_help())
 @add_common_device_options
+@click.option(
+    "--discovery",
+    type=click.Choice(DISCOVERY_METHODS),
+    default=DISCOVERY_IP,
+    show_default=True,
+    help="Links from interface subnets (ip), ISIS/LLDP adjacencies "
+    "(adjacency) or both (merged)",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Poll devices now instead of reusing topology data younger "
+    "than GNMIBUDDY_TOPOLOGY_TTL",
+)
 @click.pass_context
-def topology_neighbors(ctx, device, output, devices, device_file, all_devices):
+def topology_neighbors(
+    ctx,
+    device,
+    discovery,
+    refresh,
+    output,
+    devices,
+    device_file,
+    all_devices,
+):
     """Get topology neighbors information"""
 
     def operation_func(device_obj, **kwargs):
-        return neighbors(device_obj)
+        return neighbors(device_obj, discovery, refresh=refresh)
 
     return execute_device_command(
         ctx=ctx,
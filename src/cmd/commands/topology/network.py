@@ -15,6 +15,7 @@ from src.cmd.examples.example_builder import (
 )
 from src.cmd.formatters import format_output
 from src.logging import get_logger
+from src.collectors.topology.adjacency import DISCOVERY_IP, DISCOVERY_METHODS
 from src.collectors.topology.network_topology import get_network_topology
 from src.services.commands import run_network_wide
 
@@ -36,6 +37,9 @@ def topology_network_examples() -> ExampleSet:
     ).add_advanced(
         command=f"uv run gnmibuddy.py t {Command.TOPOLOGY_NETWORK.command_name}",
         description="Get network topology with alias",
+    ).add_advanced(
+        command=f"uv run gnmibuddy.py {CommandGroup.TOPOLOGY.group_name} {Command.TOPOLOGY_NETWORK.command_name} --discovery merged",
+        description="Add ISIS/LLDP adjacency links to the IP topology",
     )
 
     return examples
@@ -62,14 +66,28 @@ def _get_command_help() -> str:
 @register_command(Command.TOPOLOGY_NETWORK)
 @click.command(help=_get_command_help())
 @add_output_option
+@click.option(
+    "--discovery",
+    type=click.Choice(DISCOVERY_METHODS),
+    default=DISCOVERY_IP,
+    show_default=True,
+    help="Links from interface subnets (ip), ISIS/LLDP adjacencies "
+    "(adjacency) or both (merged)",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Poll devices now instead of reusing topology data younger "
+    "than GNMIBUDDY_TOPOLOGY_TTL",
+)
 @click.pass_context
-def topology_network(ctx, output):
+def topology_network(ctx, output, discovery, refresh):
     """Get complete network topology information for all devices"""
 
-    logger.info("Getting complete network topology")
+    logger.info("Getting complete network topology (%s)", discovery)
 
     # Call the network topology collector function (network-wide operation)
-    result = run_network_wide(get_network_topology)
+    result = run_network_wide(get_network_topology, discovery, refresh)
 
     formatted_output = format_output(result, output.lower())
     click.echo(formatted_output)
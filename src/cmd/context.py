@@ -19,6 +19,8 @@ class CLIContext:
     device: Optional[str] = None
     all_devices: bool = False
     max_workers: int = 5
+    processes: int = 1
+    spill_results: bool = False
     inventory: Optional[str] = None
     env_file: Optional[str] = None
     settings: Optional[Any] = None  # Will hold GNMIBuddySettings instance
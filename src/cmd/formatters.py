@@ -2,9 +2,10 @@
 """Output formatting system for CLI with support for multiple formats (JSON, YAML) while handling dataclasses, enums, and nested structures."""
 from enum import Enum
 from io import StringIO
-from typing import Any, List
+from typing import Any, Iterator, List
 from abc import ABC, abstractmethod
-from dataclasses import is_dataclass, asdict
+from collections.abc import Sequence
+from dataclasses import is_dataclass, fields
 
 import json
 import yaml
@@ -20,7 +21,9 @@ def make_serializable(obj: Any) -> Any:
     Convert complex objects to JSON/YAML-serializable format.
 
     This is a pure function that recursively converts dataclasses, enums,
-    and nested structures to basic Python types.
+    and nested structures to basic Python types. Dataclasses are walked
+    field by field rather than through ``asdict``, which would deep-copy
+    every payload before conversion.
 
     Args:
         obj: Object to convert to serializable format
@@ -28,15 +31,19 @@ def make_serializable(obj: Any) -> Any:
     Returns:
         Serializable representation of the object
     """
-    if is_dataclass(obj):
-        # Convert dataclass to dict, then recursively process the result
-        data_dict = asdict(obj)
-        return make_serializable(data_dict)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {
+            f.name: make_serializable(getattr(obj, f.name))
+            for f in fields(obj)
+        }
     elif isinstance(obj, Enum):
         return obj.value
     elif isinstance(obj, dict):
         return {key: make_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
+    elif isinstance(obj, (str, bytes)):
+        return obj
+    elif isinstance(obj, Sequence):
+        # Lists, tuples and lazy result views
         return [make_serializable(item) for item in obj]
     else:
         return obj
@@ -179,6 +186,75 @@ def print_formatted_output(data: Any, output_format: str = "json", **kwargs):
     print(formatted_output)
 
 
+def stream_batch_output(
+    batch_result: Any, output_format: str = "json"
+) -> Iterator[str]:
+    """
+    Yield a batch result as formatted chunks, one device result at a time.
+
+    Produces the same document as format_output, but only one result is
+    serialized at any point, so batches backed by an on-disk store keep
+    their memory bound while being printed.
+
+    Args:
+        batch_result: BatchOperationResult whose results may be a lazy view
+        output_format: The format to use ('json', 'yaml')
+
+    Yields:
+        Consecutive pieces of the formatted document
+    """
+    tail = {
+        "summary": make_serializable(batch_result.summary),
+        "metadata": make_serializable(batch_result.metadata),
+    }
+
+    if output_format == "yaml":
+        yield "results:"
+        count = 0
+        for result in batch_result.results:
+            item = yaml.dump(
+                [make_serializable(result)],
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+                indent=2,
+            )
+            yield "\n" + item.rstrip("\n")
+            count += 1
+        if not count:
+            yield " []"
+        yield "\n" + yaml.dump(
+            tail,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+            indent=2,
+        ).rstrip("\n")
+        return
+
+    if output_format != "json":
+        logger.warning(
+            "Unknown format '%s', falling back to default 'json'",
+            output_format,
+        )
+
+    def _dump(value: Any, depth: int) -> str:
+        text = json.dumps(value, indent=2, ensure_ascii=False, default=str)
+        return text.replace("\n", "\n" + "  " * depth)
+
+    yield '{\n  "results": ['
+    separator = "\n    "
+    for result in batch_result.results:
+        yield separator + _dump(make_serializable(result), 2)
+        separator = ",\n    "
+    if separator == "\n    ":
+        yield "],\n"
+    else:
+        yield "\n  ],\n"
+    yield '  "summary": ' + _dump(tail["summary"], 1) + ",\n"
+    yield '  "metadata": ' + _dump(tail["metadata"], 1) + "\n}"
+
+
 def get_available_output_formats() -> List[str]:
     """Get list of available output formats"""
     return formatter_manager.get_available_formats()
@@ -189,6 +265,7 @@ __all__ = [
     # Core formatting functions
     "format_output",
     "print_formatted_output",
+    "stream_batch_output",
     "get_available_output_formats",
     "make_serializable",
     # Classes for advanced usage
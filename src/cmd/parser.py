@@ -70,7 +70,13 @@ Run 'gnmibuddy.py COMMAND --help' for more information on a command.
         "  -e, --env-file PATH             Path to .env file for configuration"
     )
     options_lines.append(
-        "  --max-workers NUMBER            Maximum number of concurrent workers for batch operations (--all-devices, --devices, --device-file)"
+        "  --max-workers NUMBER            Maximum number of concurrent workers for batch operations (--all-devices, --devices, --device-file); capped by GNMIBUDDY_MAX_CONCURRENT_REQUESTS"
+    )
+    options_lines.append(
+        "  --processes NUMBER              Shard batch operations across this many worker processes"
+    )
+    options_lines.append(
+        "  --spill-results                 Keep batch results in a compressed on-disk store instead of memory"
     )
     options_section = "\n".join(options_lines)
 
@@ -204,7 +210,18 @@ def show_detailed_version_callback(ctx, param, value):
     "--max-workers",
     type=int,
     default=5,
-    help="Maximum number of concurrent workers for batch operations (--all-devices, --devices, --device-file)",
+    help="Maximum number of concurrent workers for batch operations (--all-devices, --devices, --device-file). gNMI requests in flight are capped by GNMIBUDDY_MAX_CONCURRENT_REQUESTS (default 32, minus GNMIBUDDY_INTERACTIVE_RESERVED for batches)",
+)
+@click.option(
+    "--processes",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Shard batch operations across this many local worker processes, each with --max-workers threads",
+)
+@click.option(
+    "--spill-results",
+    is_flag=True,
+    help="Spill per-device batch results to a compressed on-disk store to bound memory use on large batches",
 )
 @click.option(
     "--inventory",
@@ -227,6 +244,8 @@ def cli(
     quiet_external,
     all_devices,
     max_workers,
+    processes,
+    spill_results,
     inventory,
     env_file,
 ):
@@ -240,6 +259,8 @@ def cli(
         quiet_external=quiet_external,
         all_devices=all_devices,
         max_workers=max_workers,
+        processes=processes,
+        spill_results=spill_results,
         inventory=inventory,
         env_file=env_file,
     )
@@ -54,8 +54,10 @@ COMMAND_MODULES: List[str] = [
     # Topology commands - Commands for topology discovery and analysis
     "src.cmd.commands.topology.neighbors",
     "src.cmd.commands.topology.network",
+    "src.cmd.commands.topology.changes",
     # Operations commands - Commands for operational tasks and testing
     "src.cmd.commands.ops.logs",
+    "src.cmd.commands.ops.log_search",
     "src.cmd.commands.ops.validate",
     # Inventory commands - Commands for inventory file validation and management
     "src.cmd.commands.inventory.validate",
@@ -35,9 +35,17 @@ class Command(Enum):
         "network",
         "Get complete network topology information. Queries all devices in inventory.",
     )
+    TOPOLOGY_CHANGES = (
+        "changes",
+        "Show what changed in the topology between snapshots",
+    )
 
     # Operations commands
     OPS_LOGS = ("logs", "Retrieve and filter device logs")
+    OPS_LOG_SEARCH = (
+        "log-search",
+        "Search logs already collected from all devices (local log index)",
+    )
     OPS_VALIDATE = (
         "validate",
         "Validate all collector functions (development tool)",
@@ -89,11 +89,23 @@ class CommandRegistry:
                 group=CommandGroup.TOPOLOGY,
                 requires_device=False,
             ),
+            CommandInfo(
+                command=Command.TOPOLOGY_CHANGES,
+                group=CommandGroup.TOPOLOGY,
+                requires_device=False,
+            ),
             # Operations commands
             CommandInfo(
                 command=Command.OPS_LOGS,
                 group=CommandGroup.OPS,
             ),
+            CommandInfo(
+                command=Command.OPS_LOG_SEARCH,
+                group=CommandGroup.OPS,
+                supports_batch=False,
+                supports_detail=False,
+                requires_device=False,
+            ),
             CommandInfo(
                 command=Command.OPS_VALIDATE,
                 group=CommandGroup.OPS,
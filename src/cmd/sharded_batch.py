@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Multi-process sharded batch execution with a local coordinator.
+
+The coordinator splits the device list into shards, one per worker process.
+Each worker runs a regular BatchOperationExecutor (its own thread pool and
+gNMI channels) over its shard and streams every device result back as soon
+as it is collected. The coordinator merges the streams into a single
+BatchOperationResult.
+
+Coordinator and workers talk through ``multiprocessing.connection``
+connections using JSON messages, so the same protocol works over a
+``multiprocessing.connection.Listener``/``Client`` socket pair:
+
+    coordinator -> worker
+        {"type": "assign", "devices": [...], "operation_type": str,
+         "max_workers": int}
+        {"type": "cancel", "reason": str}
+
+    worker -> coordinator
+        {"type": "result", "result": <result_to_dict(...)>}
+        {"type": "done"}
+        {"type": "error", "message": str}
+
+Local workers are forked so they inherit the operation function and the
+initialized inventory; remote workers would provide their own operation
+function for the assigned operation type.
+"""
+import json
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from src.cmd.batch import BatchOperationExecutor, ProgressIndicator
+from src.logging import get_logger
+from src.schemas.responses import (
+    BatchOperationResult,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.storage.latency_stats import LatencyStatsStore
+from src.storage.result_store import (
+    SpillingResultStore,
+    result_from_dict,
+    result_to_dict,
+)
+from src.utils.cancellation import CancellationToken
+
+logger = get_logger(__name__)
+
+# Seconds to wait for workers to exit before terminating them
+WORKER_JOIN_TIMEOUT = 1.0
+
+
+def send_message(conn: Connection, message: Dict[str, Any]) -> None:
+    """Send one protocol message over a connection."""
+    conn.send_bytes(json.dumps(message, default=str).encode("utf-8"))
+
+
+def recv_message(conn: Connection) -> Dict[str, Any]:
+    """Receive one protocol message; raises EOFError when closed."""
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+def shard_devices(
+    devices: List[str],
+    shards: int,
+    expected_durations: Optional[Dict[str, float]] = None,
+) -> List[List[str]]:
+    """Split devices into at most ``shards`` non-empty shards.
+
+    With expected durations each device goes to the currently least loaded
+    shard (greedy LPT, devices assumed ordered longest first); otherwise
+    devices are dealt round-robin.
+    """
+    shards = max(1, min(shards, len(devices)))
+    buckets: List[List[str]] = [[] for _ in range(shards)]
+    if not expected_durations:
+        for index, device in enumerate(devices):
+            buckets[index % shards].append(device)
+        return buckets
+
+    fallback = sum(expected_durations.values()) / len(expected_durations)
+    loads = [0.0] * shards
+    for device in devices:
+        target = loads.index(min(loads))
+        buckets[target].append(device)
+        loads[target] += expected_durations.get(device, fallback)
+    return [bucket for bucket in buckets if bucket]
+
+
+def run_worker(
+    conn: Connection,
+    operation_func: Callable[[str], NetworkOperationResult],
+) -> None:
+    """Serve one shard assignment on ``conn`` and stream results back."""
+    token = CancellationToken()
+    try:
+        assignment = recv_message(conn)
+        if assignment.get("type") != "assign":
+            raise ValueError(
+                f"Expected an assign message, got {assignment.get('type')}"
+            )
+
+        def listen_for_cancel() -> None:
+            try:
+                while True:
+                    message = recv_message(conn)
+                    if message.get("type") == "cancel":
+                        token.cancel(message.get("reason", "cancelled"))
+                        return
+            except (EOFError, OSError):
+                token.cancel("coordinator went away")
+
+        threading.Thread(target=listen_for_cancel, daemon=True).start()
+
+        executor = BatchOperationExecutor(
+            max_workers=assignment.get("max_workers", 5)
+        )
+        executor.execute_batch_operation(
+            devices=assignment["devices"],
+            operation_func=operation_func,
+            operation_type=assignment["operation_type"],
+            show_progress=False,
+            cancellation_token=token,
+            on_result=lambda result: send_message(
+                conn, {"type": "result", "result": result_to_dict(result)}
+            ),
+        )
+        send_message(conn, {"type": "done"})
+    except Exception as e:
+        logger.error("Shard worker failed: %s", e)
+        try:
+            send_message(conn, {"type": "error", "message": str(e)})
+        except OSError:
+            pass
+    finally:
+        conn.close()
+
+
+def _worker_main(
+    conn: Connection,
+    operation_func: Callable[[str], NetworkOperationResult],
+) -> None:
+    # Ctrl-C is handled by the coordinator, which stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_worker(conn, operation_func)
+
+
+class ShardedBatchExecutor(BatchOperationExecutor):
+    """Batch executor that shards devices across local worker processes
+
+    Drop-in replacement for BatchOperationExecutor: ``max_workers`` is the
+    thread pool size inside each worker process, so up to
+    ``processes × max_workers`` devices are processed at once.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        max_workers: int = 5,
+        latency_store: Optional[LatencyStatsStore] = None,
+    ):
+        super().__init__(max_workers=max_workers, latency_store=latency_store)
+        self.processes = processes
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Local workers need the fork start method"""
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    def execute_batch_operation(
+        self,
+        devices: List[str],
+        operation_func: Callable[[str], NetworkOperationResult],
+        operation_type: str,
+        show_progress: bool = True,
+        fail_fast: bool = False,
+        result_sink: Optional[SpillingResultStore] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        on_result: Optional[Callable[[NetworkOperationResult], None]] = None,
+    ) -> BatchOperationResult:
+        """Execute an operation on devices sharded across worker processes"""
+        if self.processes <= 1 or len(devices) <= 1 or not self.is_supported():
+            return super().execute_batch_operation(
+                devices,
+                operation_func,
+                operation_type,
+                show_progress=show_progress,
+                fail_fast=fail_fast,
+                result_sink=result_sink,
+                cancellation_token=cancellation_token,
+                on_result=on_result,
+            )
+
+        start_time = time.time()
+        results = result_sink if result_sink is not None else []
+        finished_devices = set()
+        successful = 0
+        token = cancellation_token or CancellationToken()
+
+        expected_durations: Dict[str, float] = {}
+        p95_durations: Dict[str, float] = {}
+        if self.latency_store is not None:
+            devices = self.latency_store.order_longest_first(
+                devices, operation_type
+            )
+            expected_durations = self.latency_store.expected_durations(
+                devices, operation_type
+            )
+            p95_durations = self.latency_store.p95_durations(
+                devices, operation_type
+            )
+        shards = shard_devices(devices, self.processes, expected_durations)
+        progress = ProgressIndicator(
+            len(devices),
+            show_progress,
+            expected_durations=expected_durations,
+            workers=self.max_workers * len(shards),
+            p95_durations=p95_durations,
+        )
+
+        def collect(result: NetworkOperationResult) -> None:
+            nonlocal successful
+            results.append(result)
+            finished_devices.add(result.device_name)
+            if result.status == OperationStatus.SUCCESS:
+                successful += 1
+            self._record_latency(result, operation_type)
+            if on_result is not None:
+                on_result(result)
+            progress.update(
+                device=result.device_name,
+                duration=result.metadata.get("execution_time"),
+            )
+
+        mp_context = multiprocessing.get_context("fork")
+        workers: Dict[Connection, Any] = {}
+
+        def cancel_workers(reason: str) -> None:
+            token.cancel(reason)
+            for conn in workers:
+                try:
+                    send_message(conn, {"type": "cancel", "reason": reason})
+                except OSError:
+                    pass
+
+        try:
+            for shard in shards:
+                parent_conn, child_conn = mp_context.Pipe(duplex=True)
+                process = mp_context.Process(
+                    target=_worker_main,
+                    args=(child_conn, operation_func),
+                    daemon=True,
+                )
+                process.start()
+                child_conn.close()
+                workers[parent_conn] = process
+                send_message(
+                    parent_conn,
+                    {
+                        "type": "assign",
+                        "devices": shard,
+                        "operation_type": operation_type,
+                        "max_workers": self.max_workers,
+                    },
+                )
+            logger.debug(
+                "Started %d shard workers for %d devices",
+                len(shards),
+                len(devices),
+            )
+
+            open_conns = list(workers)
+            while open_conns:
+                for conn in wait(open_conns):
+                    try:
+                        message = recv_message(conn)
+                    except (EOFError, OSError):
+                        open_conns.remove(conn)
+                        continue
+
+                    message_type = message.get("type")
+                    if message_type == "result":
+                        result = result_from_dict(message["result"])
+                        collect(result)
+                        if (
+                            fail_fast
+                            and result.status != OperationStatus.SUCCESS
+                            and not token.is_cancelled
+                        ):
+                            cancel_workers(
+                                "fail-fast triggered by device "
+                                f"{result.device_name}"
+                            )
+                    elif message_type == "done":
+                        open_conns.remove(conn)
+                    elif message_type == "error":
+                        logger.error(
+                            "Shard worker reported an error: %s",
+                            message.get("message"),
+                        )
+                        open_conns.remove(conn)
+
+        except KeyboardInterrupt:
+            cancel_workers("interrupted by user")
+            raise
+
+        finally:
+            for conn, process in workers.items():
+                process.join(timeout=WORKER_JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                conn.close()
+            progress.finish()
+            if self.latency_store is not None:
+                self.latency_store.save()
+
+        # Devices without a result were cancelled or lost with a worker
+        missing = [d for d in devices if d not in finished_devices]
+        if missing:
+            reason = token.reason if token.is_cancelled else None
+            for device in missing:
+                if reason:
+                    collect(
+                        self._create_error_result(
+                            device,
+                            operation_type,
+                            f"Operation cancelled: {reason}",
+                            error_type="CANCELLED",
+                        )
+                    )
+                else:
+                    collect(
+                        self._create_error_result(
+                            device,
+                            operation_type,
+                            "Worker process exited before reporting a result",
+                            error_type="worker_error",
+                        )
+                    )
+
+        return self._build_batch_result(
+            devices,
+            results,
+            successful,
+            start_time,
+            operation_type,
+            metadata={
+                "max_workers": self.max_workers,
+                "processes": len(shards),
+                "fail_fast": fail_fast,
+                "show_progress": show_progress,
+                "cancelled": token.is_cancelled,
+                "spilled_results": result_sink is not None,
+            },
+        )
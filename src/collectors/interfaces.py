@@ -4,7 +4,8 @@ Interface functions module.
 Provides functions for retrieving interface information from network devices using gNMI.
 """
 
-from typing import Optional, Dict, Any
+from enum import Enum
+from typing import Optional, Dict, Any, List
 from src.schemas.responses import (
     ErrorResponse,
     SuccessResponse,
@@ -24,11 +25,42 @@ from src.logging import get_logger, log_operation
 
 logger = get_logger(__name__)
 
+INTERFACES_PATH = "openconfig-interfaces:interfaces"
+_ALL_INTERFACES = f"{INTERFACES_PATH}/interface[name=*]"
+_MAIN_SUBINTERFACE = f"{_ALL_INTERFACES}/subinterfaces/subinterface[index=0]"
+
+
+class InterfaceView(Enum):
+    """How much of the interfaces tree the interface brief requests"""
+
+    # Status leaves and the main subinterface (IP and VRF)
+    BRIEF = "brief"
+    # Only the IPv4 and IPv6 addresses of the main subinterface, for
+    # topology builds
+    TOPOLOGY = "topology"
+    # The whole openconfig-interfaces tree, counters included
+    FULL = "full"
+
+
+INTERFACE_VIEW_PATHS: Dict[InterfaceView, List[str]] = {
+    InterfaceView.BRIEF: [
+        f"{_ALL_INTERFACES}/state/admin-status",
+        f"{_ALL_INTERFACES}/state/oper-status",
+        _MAIN_SUBINTERFACE,
+    ],
+    InterfaceView.TOPOLOGY: [
+        f"{_MAIN_SUBINTERFACE}/openconfig-if-ip:ipv4/addresses",
+        f"{_MAIN_SUBINTERFACE}/openconfig-if-ip:ipv6/addresses",
+    ],
+    InterfaceView.FULL: [INTERFACES_PATH],
+}
+
 
 @log_operation("get_interfaces")
 def get_interfaces(
     device: Device,
     interface: Optional[str] = None,
+    view: InterfaceView = InterfaceView.BRIEF,
 ) -> NetworkOperationResult:
     """
     Retrieve interface information from the device.
@@ -36,6 +68,8 @@ def get_interfaces(
     Args:
         device: Target device dictionary with device information
         interface: Optional interface name to filter results
+        view: Paths requested for the interface brief (ignored when an
+            interface is given)
 
     Returns:
         NetworkOperationResult: Response object containing interface information
@@ -49,26 +83,30 @@ def get_interfaces(
     if interface:
         return _get_single_interface_info(device, interface)
 
-    return _get_interface_brief(device)
+    return _get_interface_brief(device, view)
 
 
 def _get_interface_brief(
     device: Device,
+    view: InterfaceView = InterfaceView.BRIEF,
 ) -> NetworkOperationResult:
     """
     Get a summary of all interfaces (similar to 'show ip int brief').
 
     Args:
         device: Target device
+        view: Which projected path set to request
 
     Returns:
         NetworkOperationResult: Response object containing structured summary information
     """
     interface_brief_request = GnmiRequest(
-        path=["openconfig-interfaces:interfaces"],
+        path=INTERFACE_VIEW_PATHS[view],
     )
     logger.debug(
-        "Making gNMI request for interface brief on device %s", device.name
+        "Making gNMI request for interface brief (%s view) on device %s",
+        view.value,
+        device.name,
     )
 
     response = get_gnmi_data(device, interface_brief_request)
@@ -139,6 +177,7 @@ def _get_interface_brief(
     metadata = {
         "is_single_interface": False,
         "operation_details": "Retrieved summary of all interfaces",
+        "view": view.value,
     }
 
     interface_count = result_data.get("interface_count", 0)
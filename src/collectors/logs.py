@@ -4,12 +4,14 @@ Logging functions module.
 Provides functions for retrieving logging information from network devices using gNMI.
 """
 
-from typing import Optional, Union
-from src.schemas.models import Device
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Union
+from src.schemas.models import Device, NetworkOS
 from src.gnmi.client import get_gnmi_data
 from src.gnmi.parameters import GnmiRequest
 from src.gnmi.capabilities.encoding import GnmiEncoding
-from src.processors.logs.filter import filter_logs
+from src.processors.logs.filter import filter_logs, parse_log_timestamp
 from src.schemas.responses import (
     ErrorResponse,
     SuccessResponse,
@@ -17,9 +19,24 @@ from src.schemas.responses import (
     NetworkOperationResult,
 )
 from src.logging import get_logger, log_operation
+from src.utils.cancellation import get_current_token
+from src.config.environment import get_settings
+from src.storage.log_buffer import (
+    DeviceLogBuffer,
+    LogEntry,
+    get_log_buffer_store,
+)
+from src.storage.log_index import get_log_index
 
 logger = get_logger(__name__)
 
+# Seconds between polls when following logs
+DEFAULT_FOLLOW_INTERVAL = 5.0
+
+# Lines remembered by a follower; only the watermark lines are needed to
+# drop duplicates, so this stays small no matter how long it runs
+FOLLOW_BUFFER_SIZE = 256
+
 
 @log_operation("get_logs")
 def get_logs(
@@ -27,6 +44,7 @@ def get_logs(
     keywords: Optional[str] = None,
     minutes: Optional[Union[str, int]] = 5,
     show_all_logs: bool = False,
+    incremental: bool = False,
 ) -> NetworkOperationResult:
     """
     Get logging information from a network device.
@@ -36,6 +54,9 @@ def get_logs(
         keywords: Optional keywords to filter logs
         minutes: Number of minutes to filter logs (default: 5 minutes). Can be provided as string or integer.
         show_all_logs: If True, return all logs without time filtering (default: False)
+        incremental: If True, only fetch lines newer than the last ones seen
+            for this device and answer the time window from a local buffer.
+            Ignored when show_all_logs is set.
 
     Returns:
         NetworkOperationResult: Response object containing logs or error information
@@ -75,14 +96,17 @@ def get_logs(
         "show_all_logs": show_all_logs,
     }
 
-    log_filter = (
-        "(-[1-5]-|ISIS|BGP|ADJCHANGE|LINK-3|LINEPROTO|MPLS|VRF|VPN|CONFIG-3)"
-    )
+    log_filter = _build_log_filter(keywords)
 
-    if keywords:
-        log_filter = f"(-[1-5]-|{keywords}) | utility egrep -v logged"
+    buffer = None
+    since = None
+    if incremental and not show_all_logs:
+        now = _utc_now()
+        window_start = now - timedelta(minutes=validated_minutes or 5)
+        buffer = get_log_buffer_store().get(device.name, log_filter)
+        since = _fetch_start(buffer, window_start)
 
-    log_query = f"show logging | utility egrep '{log_filter}' | utility egrep -v logged "
+    log_query = _build_log_query(log_filter, since)
     logger.debug("Generated log query: %s", log_query)
 
     # Create a GnmiRequest with the appropriate parameters for logs
@@ -127,6 +151,17 @@ def get_logs(
             len(gnmi_data) if gnmi_data else 0,
         )
 
+        if buffer is not None:
+            return _incremental_result(
+                device,
+                buffer,
+                gnmi_data,
+                since,
+                window_start,
+                now,
+                filter_info,
+            )
+
         # Process the logs through the filter
         filtered_logs = filter_logs(
             gnmi_data or [], show_all_logs, validated_minutes or 5
@@ -152,6 +187,19 @@ def get_logs(
             )
 
         log_count = len(filtered_logs.get("logs", []))
+        if get_settings().get_log_index_enabled():
+            _index_entries(
+                device,
+                _entries_from_messages(
+                    [
+                        log["message"]
+                        for log in filtered_logs.get("logs", [])
+                        if "message" in log
+                    ],
+                    None,
+                    _utc_now(),
+                ),
+            )
 
         if log_count == 0:
             logger.info("No logs found on %s matching filters", device.name)
@@ -195,6 +243,339 @@ def get_logs(
         )
 
 
+def follow_logs(
+    device: Device,
+    keywords: Optional[str] = None,
+    minutes: Optional[Union[str, int]] = 5,
+    interval: float = DEFAULT_FOLLOW_INTERVAL,
+    max_polls: Optional[int] = None,
+) -> Iterator[NetworkOperationResult]:
+    """
+    Follow the logs of a network device, like ``tail -f``.
+
+    The first poll returns the lines of the last ``minutes``; every later
+    poll asks the device only for lines from the watermark onwards. Each
+    poll yields one result holding just the new lines, so memory stays flat
+    however long the follow runs. A failed poll yields a failed result and
+    following continues with the next poll.
+
+    Args:
+        device: Device object containing device information
+        keywords: Optional keywords to filter logs
+        minutes: Minutes of history returned by the first poll
+        interval: Seconds to wait between polls
+        max_polls: Stop after this many polls (default: follow until the
+            generator is closed or the operation is cancelled)
+
+    Yields:
+        NetworkOperationResult: One result per poll with the new log lines
+    """
+    try:
+        validated_minutes = _validate_and_convert_minutes(minutes)
+    except ValueError as e:
+        yield NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="logs",
+            status=OperationStatus.FAILED,
+            error_response=ErrorResponse(
+                type="INVALID_PARAMETER", message=str(e)
+            ),
+        )
+        return
+
+    log_filter = _build_log_filter(keywords)
+    filter_info = {
+        "keywords": keywords,
+        "filter_minutes": validated_minutes,
+        "show_all_logs": False,
+        "follow": True,
+    }
+    buffer = DeviceLogBuffer(max_entries=FOLLOW_BUFFER_SIZE)
+    since = _utc_now() - timedelta(minutes=validated_minutes or 5)
+    polls = 0
+
+    while True:
+        now = _utc_now()
+        yield _poll_logs(device, log_filter, buffer, since, now, filter_info)
+        polls += 1
+        if max_polls is not None and polls >= max_polls:
+            return
+        if buffer.watermark is not None:
+            since = max(since, buffer.watermark)
+        if _wait_or_cancelled(interval):
+            logger.info("Stopped following logs on %s", device.name)
+            return
+
+
+def search_logs(
+    keywords: Optional[str] = None,
+    minutes: Optional[Union[str, int]] = 60,
+    devices: Optional[str] = None,
+    max_severity: Optional[int] = None,
+    limit: Optional[int] = 200,
+) -> NetworkOperationResult:
+    """
+    Search the local log index across devices, without contacting them.
+
+    The index holds the lines fetched by get_logs and log followers while
+    GNMIBUDDY_LOG_INDEX is enabled.
+
+    Args:
+        keywords: Words that must all appear; "ISIS|BGP" matches either
+        minutes: Only lines from the last N minutes (None: no time bound)
+        devices: Comma-separated device names (default: all devices)
+        max_severity: Only lines with a severity at or below this (0-7)
+        limit: Maximum number of lines returned, newest kept
+
+    Returns:
+        NetworkOperationResult: Matching lines and per-device counts
+    """
+    started = time.perf_counter()
+    try:
+        validated_minutes = _validate_and_convert_minutes(minutes)
+    except ValueError as e:
+        return NetworkOperationResult(
+            device_name="ALL_DEVICES",
+            ip_address="0.0.0.0",
+            nos=NetworkOS.UNKNOWN,
+            operation_type="log_search",
+            status=OperationStatus.FAILED,
+            error_response=ErrorResponse(
+                type="INVALID_PARAMETER", message=str(e)
+            ),
+        )
+
+    since = None
+    if validated_minutes is not None:
+        since = _utc_now() - timedelta(minutes=validated_minutes)
+    device_names = [
+        name.strip() for name in (devices or "").split(",") if name.strip()
+    ]
+    index = get_log_index()
+    matches = index.query(
+        keywords=keywords,
+        since=since,
+        devices=device_names or None,
+        max_severity=max_severity,
+        limit=limit,
+    )
+
+    per_device: Dict[str, int] = {}
+    for match in matches:
+        per_device[match.device] = per_device.get(match.device, 0) + 1
+    query = {
+        "keywords": keywords,
+        "minutes": validated_minutes,
+        "devices": device_names or None,
+        "max_severity": max_severity,
+        "limit": limit,
+    }
+    return NetworkOperationResult(
+        device_name="ALL_DEVICES",
+        ip_address="0.0.0.0",
+        nos=NetworkOS.UNKNOWN,
+        operation_type="log_search",
+        status=OperationStatus.SUCCESS,
+        data={
+            "logs": [match.to_dict() for match in matches],
+            "summary": {
+                "count": len(matches),
+                "devices": per_device,
+                "query": query,
+            },
+        },
+        metadata={
+            "index_enabled": get_settings().get_log_index_enabled(),
+            "indexed_devices": len(index.devices()),
+            "query_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    )
+
+
+def _poll_logs(
+    device: Device,
+    log_filter: str,
+    buffer: DeviceLogBuffer,
+    since: datetime,
+    now: datetime,
+    filter_info: Dict[str, Any],
+) -> NetworkOperationResult:
+    """Fetch the lines from ``since`` and return the ones not seen yet."""
+    log_request = GnmiRequest(
+        path=[_build_log_query(log_filter, since)],
+        encoding=GnmiEncoding.ASCII,
+    )
+    response = get_gnmi_data(device=device, request=log_request)
+    if isinstance(response, ErrorResponse):
+        logger.warning(
+            "Failed to poll logs from %s: %s", device.name, response.message
+        )
+        return NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="logs",
+            status=OperationStatus.FAILED,
+            error_response=response,
+        )
+
+    gnmi_data = response.data if isinstance(response, SuccessResponse) else []
+    entries = _parse_entries(gnmi_data or [], since, now)
+    _index_entries(device, entries)
+    new_entries = buffer.merge(entries, since)
+    logs = [
+        {"timestamp": entry.timestamp.isoformat(), "message": entry.message}
+        for entry in new_entries
+    ]
+    return NetworkOperationResult(
+        device_name=device.name,
+        ip_address=device.ip_address,
+        nos=device.nos,
+        operation_type="logs",
+        status=OperationStatus.SUCCESS,
+        data={
+            "logs": logs,
+            "summary": {"count": len(logs), "filter_info": filter_info},
+            "filters_applied": filter_info,
+        },
+        metadata={"fetched_since": since.isoformat()},
+    )
+
+
+def _wait_or_cancelled(interval: float) -> bool:
+    """Wait between polls; True if the operation was cancelled meanwhile."""
+    token = get_current_token()
+    if token is None:
+        time.sleep(interval)
+        return False
+    return token.wait(interval)
+
+
+def _build_log_filter(keywords: Optional[str]) -> str:
+    """Device-side egrep pattern for the log query."""
+    if keywords:
+        return f"(-[1-5]-|{keywords}) | utility egrep -v logged"
+    return "(-[1-5]-|ISIS|BGP|ADJCHANGE|LINK-3|LINEPROTO|MPLS|VRF|VPN|CONFIG-3)"
+
+
+def _build_log_query(log_filter: str, since: Optional[datetime]) -> str:
+    """Build the log CLI query, bounded to lines from ``since`` if given."""
+    command = "show logging"
+    if since is not None:
+        # IOS-XR: show logging start <month> <day> <hh:mm:ss>
+        command += f" start {since:%b} {since.day} {since:%H:%M:%S}"
+    return f"{command} | utility egrep '{log_filter}' | utility egrep -v logged "
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _fetch_start(buffer: DeviceLogBuffer, window_start: datetime) -> datetime:
+    """
+    Time to fetch logs from: the watermark when the buffer already covers
+    the window, otherwise the start of the window.
+    """
+    with buffer.lock:
+        if buffer.covers(window_start) and buffer.watermark is not None:
+            return max(buffer.watermark, window_start)
+        return window_start
+
+
+def _parse_entries(
+    gnmi_data: List[Dict[str, Any]], since: datetime, now: datetime
+) -> List[LogEntry]:
+    """Turn fetched log lines into timestamped entries.
+
+    Lines without a timestamp (continuations) take the one of the line
+    before them.
+    """
+    messages = filter_logs(gnmi_data, True, 0).get("logs", [])
+    return _entries_from_messages(
+        [log["message"] for log in messages], since, now
+    )
+
+
+def _entries_from_messages(
+    messages: List[str], fallback: Optional[datetime], now: datetime
+) -> List[LogEntry]:
+    """Timestamp log lines; leading lines without one get ``fallback``.
+
+    Leading lines are dropped when there is no fallback.
+    """
+    entries = []
+    last_timestamp = fallback
+    for message in messages:
+        try:
+            timestamp = parse_log_timestamp(message, now)
+        except ValueError:
+            timestamp = None
+        if timestamp is not None:
+            last_timestamp = timestamp
+        if last_timestamp is not None:
+            entries.append(LogEntry(last_timestamp, message))
+    return entries
+
+
+def _index_entries(device: Device, entries: List[LogEntry]) -> None:
+    """Keep fetched lines in the local log index, when it is enabled."""
+    if not entries or not get_settings().get_log_index_enabled():
+        return
+    added = get_log_index().add(device.name, entries)
+    logger.debug("Indexed %d new log lines from %s", added, device.name)
+
+
+def _incremental_result(
+    device: Device,
+    buffer: DeviceLogBuffer,
+    gnmi_data: List[Dict[str, Any]],
+    since: datetime,
+    window_start: datetime,
+    now: datetime,
+    filter_info: Dict[str, Any],
+) -> NetworkOperationResult:
+    """Merge newly fetched lines into the buffer and answer the window."""
+    entries = _parse_entries(gnmi_data or [], since, now)
+    _index_entries(device, entries)
+    with buffer.lock:
+        new_entries = len(buffer.merge(entries, since))
+        window = buffer.window(window_start)
+        buffered = len(buffer.entries)
+
+    logger.info(
+        "Fetched %d new log lines from %s since %s (%d buffered)",
+        new_entries,
+        device.name,
+        since.isoformat(),
+        buffered,
+    )
+    logs = [{"message": entry.message} for entry in window]
+    return NetworkOperationResult(
+        device_name=device.name,
+        ip_address=device.ip_address,
+        nos=device.nos,
+        operation_type="logs",
+        status=OperationStatus.SUCCESS,
+        data={
+            "logs": logs,
+            "summary": {
+                "count": len(logs),
+                "filter_info": filter_info,
+            },
+            "filters_applied": filter_info,
+        },
+        metadata={
+            "incremental": {
+                "fetched_since": since.isoformat(),
+                "new_entries": new_entries,
+                "buffered_entries": buffered,
+            }
+        },
+    )
+
+
 def _validate_and_convert_minutes(
     minutes: Optional[Union[str, int]],
 ) -> Optional[int]:
@@ -13,13 +13,16 @@ from src.schemas.responses import (
 from src.schemas.models import Device
 from src.gnmi.client import get_gnmi_data
 from src.gnmi.parameters import GnmiRequest
-from src.utils.vrf_utils import get_non_default_vrf_names
+from src.utils.vrf_utils import is_internal_vrf, network_instance_name
 from src.processors.deviceprofile_processor import DeviceProfileProcessor
 from src.logging import get_logger, log_operation
 
 logger = get_logger(__name__)
 
 
+VPN_BGP_AFI_SAFI_STATE_PATH = "openconfig-network-instance:network-instances/network-instance[name=*]/protocols/protocol/bgp/global/afi-safis/afi-safi[afi-safi-name=*]/state"
+
+
 def deviceprofile_request():
     return GnmiRequest(
         path=[
@@ -135,49 +138,42 @@ def get_device_profile(device: Device) -> NetworkOperationResult:
 def _get_vpn_bgp_info(device: Device):
     """
     Return (vpn_info, vpn_bgp_afi_safi_states) for non-default VPNs on the device.
+
+    All BGP AFI-SAFI states are fetched with a single wildcard Get across
+    every network instance; default/internal VRFs are filtered out locally.
+    The RPC count therefore does not depend on the number of VRFs.
+    vpn_info["vpn_names"] lists the non-default VRFs that have BGP AFI-SAFI
+    state.
     """
     logger.debug("Getting VPN BGP info for device %s", device.name)
 
-    vpn_names = get_non_default_vrf_names(device)
-    logger.debug("Found VPN names: %s", str(vpn_names))
-
-    vpn_info = {"vpn_names": vpn_names or []}
+    vpn_resp = get_gnmi_data(
+        device, GnmiRequest(path=[VPN_BGP_AFI_SAFI_STATE_PATH])
+    )
 
+    vpn_names = []
     vpn_bgp_afi_safi_states = []
-    if vpn_names:
-        logger.debug(
-            "Querying BGP AFI-SAFI states for %d VPNs", len(vpn_names)
-        )
-        for vpn in vpn_names:
-            logger.debug("Querying VPN %s BGP AFI-SAFI state", vpn)
-            path_query = f"openconfig-network-instance:network-instances/network-instance[name={vpn}]/protocols/protocol/bgp/global/afi-safis/afi-safi[afi-safi-name=*]/state"
-            vpn_req = GnmiRequest(path=[path_query])
-            vpn_resp = get_gnmi_data(device, vpn_req)
-
-            if not isinstance(vpn_resp, ErrorResponse) and not isinstance(
-                vpn_resp, FeatureNotFoundResponse
-            ):
-                if vpn_resp.data:
-                    logger.debug(
-                        "VPN %s: found %d BGP AFI-SAFI states",
-                        vpn,
-                        len(vpn_resp.data),
-                    )
-                    vpn_bgp_afi_safi_states.extend(vpn_resp.data)
-                else:
-                    logger.debug("VPN %s: no BGP AFI-SAFI data", vpn)
-            else:
-                if isinstance(vpn_resp, ErrorResponse):
-                    logger.warning(
-                        "Failed to get BGP data for VPN %s on %s: %s",
-                        vpn,
-                        device.name,
-                        vpn_resp.message,
-                    )
-                logger.debug("VPN %s: error or feature not found", vpn)
 
+    if isinstance(vpn_resp, ErrorResponse):
+        logger.warning(
+            "Failed to get VPN BGP data on %s: %s",
+            device.name,
+            vpn_resp.message,
+        )
+    elif isinstance(vpn_resp, FeatureNotFoundResponse):
+        logger.debug("No BGP AFI-SAFI data on %s", device.name)
+    else:
+        for update in vpn_resp.data or []:
+            vpn = network_instance_name(update.get("path", ""))
+            if vpn is None or is_internal_vrf(vpn):
+                continue
+            if vpn not in vpn_names:
+                vpn_names.append(vpn)
+            vpn_bgp_afi_safi_states.append(update)
+
+    logger.debug("Found VPN names with BGP state: %s", str(vpn_names))
     logger.debug(
         "Total VPN BGP AFI-SAFI states collected: %d",
         len(vpn_bgp_afi_safi_states),
     )
-    return vpn_info, vpn_bgp_afi_safi_states
+    return {"vpn_names": vpn_names}, vpn_bgp_afi_safi_states
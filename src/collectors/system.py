@@ -4,6 +4,9 @@ System information module.
 Provides functions for retrieving system information from network devices using gNMI.
 """
 
+from typing import Any, Dict, List, Optional, Union
+
+from src.config.environment import get_settings
 from src.schemas.responses import (
     ErrorResponse,
     OperationStatus,
@@ -13,11 +16,30 @@ from src.schemas.responses import (
 from src.schemas.models import Device
 from src.gnmi.client import get_gnmi_data
 from src.gnmi.parameters import GnmiRequest
+from src.processors.gnmi_tree import merge_trees, updates_to_tree
 from src.processors.system_info_processor import SystemInfoProcessor
+from src.storage.system_info_cache import get_system_info_cache
 from src.logging import get_logger, log_operation
 
 logger = get_logger(__name__)
 
+# Subtrees that change rarely; cached per device until boot time changes
+SYSTEM_STATIC_PATHS = [
+    "openconfig-system:/system/state",
+    "openconfig-system:/system/clock",
+    "openconfig-system:/system/openconfig-system-grpc:grpc-servers",
+    "openconfig-system:/system/aaa",
+    "openconfig-system:/system/logging",
+]
+
+# Subtrees fetched on every call; boot-time validates the cached part
+SYSTEM_DYNAMIC_PATHS = [
+    "openconfig-system:/system/state/current-datetime",
+    "openconfig-system:/system/state/boot-time",
+    "openconfig-system:/system/memory",
+    "openconfig-system:/system/messages",
+]
+
 
 # Define common requests as constants
 def system_request():
@@ -28,18 +50,33 @@ def system_request():
     )
 
 
-def get_system_info(device: Device) -> NetworkOperationResult:
+def system_static_request():
+    return GnmiRequest(path=list(SYSTEM_STATIC_PATHS))
+
+
+def system_dynamic_request():
+    return GnmiRequest(path=list(SYSTEM_DYNAMIC_PATHS))
+
+
+def get_system_info(
+    device: Device, split_static: bool = False
+) -> NetworkOperationResult:
     """
     Get system information from a device.
 
     Args:
         device: Target device
+        split_static: Fetch only the dynamic subtrees each call and reuse
+            the static ones cached for the device (GNMIBUDDY_SYSTEM_STATIC_TTL)
 
     Returns:
         NetworkOperationResult: Response object containing system information or failure details
     """
     logger.debug("Getting system info for device %s", device.name)
 
+    if split_static:
+        return _get_split_system_info(device)
+
     response = get_gnmi_data(device, system_request())
     logger.debug(
         "System gNMI response type: %s, status: %s",
@@ -47,7 +84,48 @@ def get_system_info(device: Device) -> NetworkOperationResult:
         getattr(response, "status", "N/A"),
     )
 
-    # Error/feature-not-found handling
+    if isinstance(response, (ErrorResponse, FeatureNotFoundResponse)):
+        return _failed_result(device, response)
+
+    return _parse_system_info(device, response.data)
+
+
+def _get_split_system_info(device: Device) -> NetworkOperationResult:
+    """Merge freshly fetched dynamic subtrees with the cached static ones."""
+    response = get_gnmi_data(device, system_dynamic_request())
+    if isinstance(response, (ErrorResponse, FeatureNotFoundResponse)):
+        return _failed_result(device, response)
+
+    dynamic = updates_to_tree(response.data or [], root="system")
+    boot_time = dynamic.get("state", {}).get("boot-time")
+
+    cache = get_system_info_cache()
+    ttl = get_settings().get_system_static_ttl()
+    static = cache.get(device.name, boot_time, ttl) if ttl else None
+    cache_status = "hit" if static is not None else "miss"
+    if static is None:
+        response = get_gnmi_data(device, system_static_request())
+        if isinstance(response, (ErrorResponse, FeatureNotFoundResponse)):
+            return _failed_result(device, response)
+        static = updates_to_tree(response.data or [], root="system")
+        if ttl:
+            cache.put(device.name, static, boot_time)
+
+    logger.debug(
+        "Static system info for %s: cache %s", device.name, cache_status
+    )
+    merge_trees(static, dynamic)
+    return _parse_system_info(
+        device,
+        [{"path": "system", "val": static}],
+        metadata={"static_cache": cache_status},
+    )
+
+
+def _failed_result(
+    device: Device, response: Union[ErrorResponse, FeatureNotFoundResponse]
+) -> NetworkOperationResult:
+    """Build the result for an error or missing-feature response."""
     if isinstance(response, ErrorResponse):
         logger.debug(
             "ErrorResponse details - type: %s, message: %s",
@@ -87,15 +165,21 @@ def get_system_info(device: Device) -> NetworkOperationResult:
             },
         )
 
-    # Work directly with response data
+
+def _parse_system_info(
+    device: Device,
+    gnmi_data: List[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> NetworkOperationResult:
+    """Process system gNMI data into a successful (or parsing error) result."""
     parser = SystemInfoProcessor()
     try:
         logger.debug(
             "Processing system data with length: %d",
-            len(response.data) if response.data else 0,
+            len(gnmi_data) if gnmi_data else 0,
         )
 
-        parsed_data = parser.process_data(response.data)
+        parsed_data = parser.process_data(gnmi_data)
         logger.debug(
             "Parsed system data keys: %s",
             str(list(parsed_data.keys()) if parsed_data else []),
@@ -122,6 +206,7 @@ def get_system_info(device: Device) -> NetworkOperationResult:
                 "system_data": parsed_data,
                 "summary": summary,
             },
+            metadata=metadata or {},
         )
 
     except (KeyError, ValueError, TypeError) as e:
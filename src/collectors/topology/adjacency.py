@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Adjacency-based topology discovery.
+
+The IP topology pairs interface addresses: two interfaces on one network
+make a link. That needs the address tree of every device, misses links
+without a point-to-point subnet (unnumbered interfaces, shared segments)
+and relies on a list of management interface names to skip.
+
+ISIS and LLDP already know the links. ISIS adjacency state names the
+neighbor (system ID and address) on each interface, and LLDP neighbor
+state names the neighbor system and its port. Both are small payloads next
+to the interface tree. This module requests them, keeps them per device
+and turns them into links with the attributes of the IP topology (network,
+local/remote interface, local/remote IP), so either source, or both merged,
+feed the same graph schema and the same commands.
+
+Neighbors are resolved to inventory devices by ISIS system ID (learned from
+the NET of each polled device), by LLDP system name (the device name or
+its host part), or by the owner of the neighbor address in the topology
+index. Attributes a source cannot provide, such as the network of a link
+seen only by LLDP, are None.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.gnmi.parameters import GnmiRequest
+
+from .index import Endpoint, TopologyIndex
+
+DISCOVERY_IP = "ip"
+DISCOVERY_ADJACENCY = "adjacency"
+DISCOVERY_MERGED = "merged"
+DISCOVERY_METHODS = (DISCOVERY_IP, DISCOVERY_ADJACENCY, DISCOVERY_MERGED)
+
+_ISIS_PATH = (
+    "openconfig-network-instance:network-instances/network-instance[name=*]"
+    "/protocols/protocol/isis"
+)
+
+
+def isis_adjacency_request() -> GnmiRequest:
+    """The NET and adjacency state of ISIS, without the rest of ISIS."""
+    return GnmiRequest(
+        path=[
+            f"{_ISIS_PATH}/global/state/net",
+            f"{_ISIS_PATH}/interfaces/interface/levels/level/adjacencies"
+            "/adjacency/state",
+        ],
+    )
+
+
+def lldp_neighbor_request() -> GnmiRequest:
+    """The state of the LLDP neighbors of every interface."""
+    return GnmiRequest(
+        path=[
+            "openconfig-lldp:lldp/interfaces/interface/neighbors/neighbor"
+            "/state",
+        ],
+    )
+
+
+def validate_discovery(discovery: str) -> str:
+    """
+    Check a discovery method name.
+
+    Raises:
+        ValueError: If discovery is not one of DISCOVERY_METHODS
+    """
+    if discovery not in DISCOVERY_METHODS:
+        raise ValueError(
+            f"Invalid discovery {discovery!r}, expected one of "
+            f"{DISCOVERY_METHODS}"
+        )
+    return discovery
+
+
+def uses_ip(discovery: str) -> bool:
+    """Whether a discovery method needs interface addresses."""
+    return discovery != DISCOVERY_ADJACENCY
+
+
+def uses_adjacencies(discovery: str) -> bool:
+    """Whether a discovery method needs ISIS/LLDP adjacencies."""
+    return discovery != DISCOVERY_IP
+
+
+def _sort_key(entry: Tuple) -> Tuple:
+    return tuple(value or "" for value in entry)
+
+
+@dataclass(frozen=True)
+class DeviceAdjacencies:
+    """ISIS and LLDP adjacency data of one device as used for topology."""
+
+    fetched_at: float
+    system_id: Optional[str] = None
+    # (interface, neighbor system ID, neighbor IPv4 address)
+    isis: Tuple[Tuple[str, str, Optional[str]], ...] = ()
+    # (interface, neighbor system name, neighbor port)
+    lldp: Tuple[Tuple[str, str, Optional[str]], ...] = ()
+    available: bool = True
+
+    @classmethod
+    def from_result(
+        cls, result: Dict, fetched_at: float
+    ) -> "DeviceAdjacencies":
+        if "feature_not_found" in result:
+            return cls(fetched_at, available=False)
+        isis = (
+            (a["interface"], a["system_id"], a.get("neighbor_ipv4"))
+            for a in result.get("isis", [])
+        )
+        lldp = (
+            (n["interface"], n["system_name"], n.get("port_id"))
+            for n in result.get("lldp", [])
+        )
+        return cls(
+            fetched_at,
+            result.get("system_id"),
+            tuple(sorted(isis, key=_sort_key)),
+            tuple(sorted(lldp, key=_sort_key)),
+        )
+
+    @property
+    def signature(self) -> Tuple:
+        """What the graph depends on."""
+        return (self.available, self.system_id, self.isis, self.lldp)
+
+
+class NeighborResolver:
+    """Maps the neighbors named by ISIS and LLDP to inventory devices."""
+
+    def __init__(
+        self,
+        adjacencies: Dict[str, DeviceAdjacencies],
+        devices: List[str],
+        index: Optional[TopologyIndex] = None,
+    ):
+        self._adjacencies = adjacencies
+        self._index = index
+        self._system_ids = {
+            entry.system_id: name
+            for name, entry in adjacencies.items()
+            if entry.system_id
+        }
+        self._names: Dict[str, str] = {}
+        for name in devices:
+            self._names.setdefault(name.split(".", 1)[0], name)
+        self._names.update({name: name for name in devices})
+
+    def isis(self, system_id: str, address: Optional[str]) -> Optional[str]:
+        """Device of an ISIS neighbor, by system ID or address."""
+        name = self._system_ids.get(system_id)
+        if name is None:
+            owner = self.owner(address)
+            name = owner.device if owner else None
+        return name
+
+    def lldp(self, system_name: str) -> Optional[str]:
+        """Device of an LLDP neighbor, by name or host part of the name."""
+        return self._names.get(system_name) or self._names.get(
+            system_name.split(".", 1)[0]
+        )
+
+    def owner(self, address: Optional[str]) -> Optional[Endpoint]:
+        """Interface of an address in the topology index, if known."""
+        if not address or self._index is None:
+            return None
+        try:
+            return self._index.owner(address)
+        except ValueError:
+            return None
+
+    def neighbors_of(self, device: str) -> Set[str]:
+        """Devices named as neighbors in a device's adjacency data."""
+        entry = self._adjacencies.get(device)
+        if entry is None:
+            return set()
+        names = {
+            self.isis(system_id, address)
+            for _, system_id, address in entry.isis
+        }
+        names.update(self.lldp(name) for _, name, _ in entry.lldp)
+        names.discard(None)
+        names.discard(device)
+        return names
+
+
+@dataclass
+class _HalfLink:
+    """A link as seen from one end."""
+
+    device: str
+    interface: str
+    neighbor: str
+    neighbor_interface: Optional[str] = None
+    neighbor_ip: Optional[str] = None
+
+
+def adjacency_links(
+    adjacencies: Dict[str, DeviceAdjacencies],
+    devices: List[str],
+    index: Optional[TopologyIndex] = None,
+) -> Iterator[Tuple[str, str, Dict[str, Optional[str]]]]:
+    """
+    (source, target, attributes) of every link seen by ISIS or LLDP.
+
+    The view from each end is paired with the view from the other end
+    (when that device reported it) to fill in both interfaces and both
+    addresses; the topology index, if given, adds the network. The earlier
+    device in devices is the source of a link.
+    """
+    order = {device: i for i, device in enumerate(devices)}
+    resolver = NeighborResolver(adjacencies, devices, index)
+    halves = {
+        device: _half_links(device, adjacencies[device], resolver, order)
+        for device in devices
+        if device in adjacencies and adjacencies[device].available
+    }
+    paired: Set[Tuple[str, str, str]] = set()
+    for device in devices:
+        for half in halves.get(device, {}).values():
+            if (half.device, half.interface, half.neighbor) in paired:
+                continue
+            reverse = _reverse(half, halves.get(half.neighbor, {}), paired)
+            paired.add((half.device, half.interface, half.neighbor))
+            if reverse is not None:
+                paired.add(
+                    (reverse.device, reverse.interface, reverse.neighbor)
+                )
+            yield _link(half, reverse, resolver, order, index)
+
+
+def _half_links(
+    device: str,
+    entry: DeviceAdjacencies,
+    resolver: NeighborResolver,
+    order: Dict[str, int],
+) -> Dict[Tuple[str, str], _HalfLink]:
+    """One device's links, keyed by (interface, neighbor device)."""
+    halves: Dict[Tuple[str, str], _HalfLink] = {}
+    for interface, system_id, address in entry.isis:
+        neighbor = resolver.isis(system_id, address)
+        if neighbor in order and neighbor != device:
+            half = halves.setdefault(
+                (interface, neighbor), _HalfLink(device, interface, neighbor)
+            )
+            half.neighbor_ip = address
+    for interface, system_name, port in entry.lldp:
+        neighbor = resolver.lldp(system_name)
+        if neighbor in order and neighbor != device:
+            half = halves.setdefault(
+                (interface, neighbor), _HalfLink(device, interface, neighbor)
+            )
+            half.neighbor_interface = port
+    return halves
+
+
+def _reverse(
+    half: _HalfLink,
+    neighbor_halves: Dict[Tuple[str, str], _HalfLink],
+    paired: Set[Tuple[str, str, str]],
+) -> Optional[_HalfLink]:
+    """The neighbor's view of the same link, if it reported one."""
+    candidates = [
+        other
+        for other in neighbor_halves.values()
+        if other.neighbor == half.device
+        and (other.device, other.interface, other.neighbor) not in paired
+    ]
+    for other in candidates:
+        if (
+            other.interface == half.neighbor_interface
+            or other.neighbor_interface == half.interface
+        ):
+            return other
+    return candidates[0] if candidates else None
+
+
+def _link(
+    half: _HalfLink,
+    reverse: Optional[_HalfLink],
+    resolver: NeighborResolver,
+    order: Dict[str, int],
+    index: Optional[TopologyIndex],
+) -> Tuple[str, str, Dict[str, Optional[str]]]:
+    local_ip = reverse.neighbor_ip if reverse else None
+    remote_ip = half.neighbor_ip
+    remote_interface = (
+        reverse.interface if reverse else half.neighbor_interface
+    )
+    owner = resolver.owner(remote_ip)
+    if remote_interface is None and owner and owner.device == half.neighbor:
+        remote_interface = owner.interface
+    network = None
+    if index is not None:
+        for address in (remote_ip, local_ip):
+            try:
+                network = address and index.containing_network(address)
+            except ValueError:
+                network = None
+            if network:
+                break
+        if network and local_ip is None:
+            local_ip = next(
+                (
+                    endpoint.ip
+                    for endpoint in index.endpoints(network)
+                    if endpoint.device == half.device
+                    and endpoint.interface == half.interface
+                ),
+                None,
+            )
+
+    local = (half.device, half.interface, local_ip)
+    remote = (half.neighbor, remote_interface, remote_ip)
+    if order[half.device] > order[half.neighbor]:
+        local, remote = remote, local
+    return (
+        local[0],
+        remote[0],
+        {
+            "network": network or None,
+            "local_interface": local[1],
+            "remote_interface": remote[1],
+            "local_ip": local[2],
+            "remote_ip": remote[2],
+        },
+    )
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Topology changes between snapshots.
+
+"What changed in the topology since this morning" is answered from the
+numbered topology snapshots (snapshot.py) instead of rebuilding the
+topology twice and comparing the full link lists: only the delta (added
+and removed devices and links, links whose interfaces or addresses
+changed, devices whose data changed) is returned.
+
+Snapshots are written when GNMIBUDDY_TOPOLOGY_CACHE is enabled.
+"""
+import re
+import time
+from datetime import datetime
+from typing import Optional, Union
+
+from src.logging import get_logger
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    FeatureNotFoundResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+
+from .service import get_topology_service
+
+logger = get_logger(__name__)
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd])\s*$", re.IGNORECASE)
+_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_since(
+    since: Union[str, float], now: Optional[float] = None
+) -> float:
+    """
+    Parse a point in time as epoch seconds.
+
+    Accepts a duration before now ("30m", "2h", "1d"), an ISO 8601 date
+    and time (local time if no offset is given) or epoch seconds.
+
+    Raises:
+        ValueError: If since is none of these
+    """
+    if isinstance(since, (int, float)):
+        return float(since)
+    now = time.time() if now is None else now
+    match = _DURATION.match(since)
+    if match:
+        amount, unit = match.groups()
+        return now - float(amount) * _SECONDS[unit.lower()]
+    try:
+        return float(since)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(since.strip()).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"Invalid time {since!r}: use a duration such as '2h' or '1d', "
+            "an ISO 8601 date and time, or epoch seconds"
+        ) from None
+
+
+def get_topology_changes(
+    from_version: Optional[int] = None,
+    to_version: Optional[int] = None,
+    since: Optional[str] = None,
+) -> NetworkOperationResult:
+    """
+    Return what changed in the topology between two snapshots.
+
+    Without to_version the topology is refreshed first (polling only stale
+    devices) and compared as it is now. The baseline is from_version, the
+    snapshot that was current at since, or else the snapshot before.
+
+    Args:
+        from_version: Baseline snapshot number
+        to_version: Snapshot number to compare (default: the current one)
+        since: Compare with the topology at this time instead of a
+            snapshot number: "2h", "1d", an ISO 8601 date and time, or
+            epoch seconds
+
+    Returns:
+        NetworkOperationResult: The added, removed and changed devices and
+        links
+    """
+
+    def result(status, data=None, error=None, metadata=None, feature=None):
+        return NetworkOperationResult(
+            device_name="ALL_DEVICES",
+            ip_address="0.0.0.0",
+            nos=NetworkOS.UNKNOWN,
+            operation_type="topology_changes",
+            status=status,
+            data=data or {},
+            error_response=error,
+            feature_not_found_response=feature,
+            metadata=dict(metadata or {}, scope="network-wide"),
+        )
+
+    def invalid(message):
+        return result(
+            OperationStatus.FAILED,
+            error=ErrorResponse(type="INVALID_PARAMETER", message=message),
+        )
+
+    if since is not None and from_version is not None:
+        return invalid("Use either from_version or since, not both")
+    try:
+        since_time = parse_since(since) if since is not None else None
+    except ValueError as e:
+        return invalid(str(e))
+
+    service = get_topology_service()
+    store = service.snapshots
+    if store is None:
+        return result(
+            OperationStatus.FEATURE_NOT_AVAILABLE,
+            feature=FeatureNotFoundResponse(
+                feature_name="topology snapshots",
+                message=(
+                    "Topology snapshots are disabled; set "
+                    "GNMIBUDDY_TOPOLOGY_CACHE=true to keep them"
+                ),
+            ),
+        )
+
+    failed_devices = []
+    if to_version is None:
+        refresh = service.get_graph()
+        failed_devices = refresh.error_devices
+    versions = store.versions()
+    if not versions:
+        return invalid("No topology snapshots are stored yet")
+    to_version = versions[-1] if to_version is None else to_version
+
+    note = None
+    if since_time is not None:
+        from_version = store.version_at(since_time)
+        if from_version is None:
+            from_version = versions[0]
+            note = "No snapshot that old is kept; compared with the oldest"
+    elif from_version is None:
+        earlier = [version for version in versions if version < to_version]
+        from_version = earlier[-1] if earlier else to_version
+
+    snapshots = {}
+    for version in (from_version, to_version):
+        snapshots[version] = store.load(version)
+        if snapshots[version] is None:
+            return invalid(
+                f"Topology snapshot {version} not found; "
+                f"available: {versions}"
+            )
+
+    after = snapshots[to_version]
+    before = snapshots[from_version]
+    changes = after.diff(before)
+    logger.info(
+        "Topology changes %d -> %d: %d links added, %d removed, %d changed",
+        from_version,
+        to_version,
+        len(changes["added_links"]),
+        len(changes["removed_links"]),
+        len(changes["changed_links"]),
+    )
+    metadata = {
+        "from_built_at": before.built_at,
+        "to_built_at": after.built_at,
+        "available_versions": versions,
+        "total_changes": sum(
+            len(value) for value in changes.values() if isinstance(value, list)
+        ),
+        "failed_devices": failed_devices,
+    }
+    if note:
+        metadata["note"] = note
+    return result(OperationStatus.SUCCESS, data=changes, metadata=metadata)
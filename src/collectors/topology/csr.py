@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Array-backed topology graph (compressed sparse row adjacency).
+
+A NetworkX graph keeps a dict per node, a dict per adjacency and an
+attribute dict per edge. For large topologies CSRGraph keeps instead:
+
+- the node names, once;
+- one row per link: source and target node ids and the ids of its
+  network, interfaces and IPs in an interned string table;
+- the adjacency as ``offsets`` (per node, where its neighbors start) and
+  ``targets``/``rows`` (neighbor node id and link row per slot).
+
+Neighbors, BFS, Dijkstra and connected components run over these arrays.
+It offers the part of the NetworkX graph API the topology collectors use
+(``in``, ``neighbors``, ``get_edge_data``, ``edges``, ``subgraph``, ...)
+and converts to NetworkX with to_networkx() for anything else.
+
+Select it for the topology service with GNMIBUDDY_TOPOLOGY_BACKEND=csr.
+"""
+import heapq
+from array import array
+from collections import deque
+from itertools import accumulate
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import networkx as nx
+
+BACKEND_NETWORKX = "networkx"
+BACKEND_CSR = "csr"
+
+EDGE_ATTRIBUTES = (
+    "network",
+    "local_interface",
+    "remote_interface",
+    "local_ip",
+    "remote_ip",
+)
+
+
+class StringTable:
+    """Interned strings: each distinct string is stored once, by id."""
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self._ids: Dict[str, int] = {}
+        for string in strings or ():
+            self.intern(string)
+
+    @property
+    def strings(self) -> List[str]:
+        return list(self._ids)
+
+    def intern(self, string: str) -> int:
+        return self._ids.setdefault(string, len(self._ids))
+
+
+class CSRGraph:
+    """Undirected topology graph over CSR adjacency arrays."""
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        strings: List[str],
+        edge_source: array,
+        edge_target: array,
+        attributes: Dict[str, array],
+    ):
+        """
+        Args:
+            nodes: Node names; node id i is nodes[i]
+            strings: String table the attribute columns index into
+            edge_source: Source node id per link row
+            edge_target: Target node id per link row
+            attributes: Column of string ids per name in EDGE_ATTRIBUTES
+        """
+        self.nodes: List[str] = list(nodes)
+        self.strings = strings
+        self.edge_source = edge_source
+        self.edge_target = edge_target
+        self.attributes = attributes
+        self._ids = {node: i for i, node in enumerate(self.nodes)}
+        self._build_adjacency()
+
+    def _build_adjacency(self) -> None:
+        degree = [0] * (len(self.nodes) + 1)
+        for source, target in zip(self.edge_source, self.edge_target):
+            degree[source + 1] += 1
+            if source != target:
+                degree[target + 1] += 1
+        self.offsets = array("I", accumulate(degree))
+        slots = self.offsets[-1]
+        self.targets = array("I", [0]) * slots
+        self.rows = array("I", [0]) * slots
+        cursor = list(self.offsets[:-1])
+        for row, (source, target) in enumerate(
+            zip(self.edge_source, self.edge_target)
+        ):
+            self.targets[cursor[source]] = target
+            self.rows[cursor[source]] = row
+            cursor[source] += 1
+            if source != target:
+                self.targets[cursor[target]] = source
+                self.rows[cursor[target]] = row
+                cursor[target] += 1
+
+    @classmethod
+    def from_edges(
+        cls,
+        nodes: Iterable[str],
+        edges: Iterable[Tuple[str, str, Dict[str, str]]],
+    ) -> "CSRGraph":
+        """
+        Build a graph from nodes and (source, target, attributes) links.
+
+        As with nx.Graph.add_edge, unknown endpoints become nodes and a
+        second link between the same two nodes replaces the first one's
+        attributes.
+        """
+        node_ids: Dict[str, int] = {}
+        for node in nodes:
+            node_ids.setdefault(node, len(node_ids))
+        edge_source, edge_target = array("I"), array("I")
+        link_data: List[Dict[str, str]] = []
+        pair_rows: Dict[Tuple[int, int], int] = {}
+        for source, target, data in edges:
+            source_id = node_ids.setdefault(source, len(node_ids))
+            target_id = node_ids.setdefault(target, len(node_ids))
+            pair = (
+                (source_id, target_id)
+                if source_id <= target_id
+                else (target_id, source_id)
+            )
+            row = pair_rows.setdefault(pair, len(link_data))
+            if row == len(link_data):
+                edge_source.append(source_id)
+                edge_target.append(target_id)
+                link_data.append(data)
+            else:
+                link_data[row] = {**link_data[row], **data}
+
+        string_ids: Dict[str, int] = {}
+        intern = string_ids.setdefault
+        columns = {
+            name: array(
+                "I",
+                [
+                    intern(data.get(name, ""), len(string_ids))
+                    for data in link_data
+                ],
+            )
+            for name in EDGE_ATTRIBUTES
+        }
+        return cls(
+            list(node_ids), list(string_ids), edge_source, edge_target, columns
+        )
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "CSRGraph":
+        """Convert a NetworkX topology graph."""
+        return cls.from_edges(graph.nodes, graph.edges(data=True))
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "CSRGraph":
+        """Use the node, string and edge tables of a TopologySnapshot."""
+        return cls(
+            snapshot.nodes,
+            snapshot.strings,
+            snapshot.edges["source"],
+            snapshot.edges["target"],
+            {name: snapshot.edges[name] for name in EDGE_ATTRIBUTES},
+        )
+
+    def to_networkx(self) -> nx.Graph:
+        """The same graph as NetworkX, for its full API."""
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    def __contains__(self, node) -> bool:
+        return node in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        return len(self.edge_source)
+
+    def node_id(self, node: str) -> int:
+        """
+        Raises:
+            nx.NetworkXError: If the node is not in the graph
+        """
+        try:
+            return self._ids[node]
+        except KeyError:
+            raise nx.NetworkXError(
+                f"The node {node} is not in the graph."
+            ) from None
+
+    def neighbors(self, node: str) -> Iterator[str]:
+        node_id = self.node_id(node)
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return (self.nodes[target] for target in self.targets[start:end])
+
+    def degree(self, node: str) -> int:
+        node_id = self.node_id(node)
+        return self.offsets[node_id + 1] - self.offsets[node_id]
+
+    def edge_row(self, source: str, target: str) -> Optional[int]:
+        """Link row between two nodes, or None if they are not adjacent."""
+        source_id, target_id = self._ids.get(source), self._ids.get(target)
+        if source_id is None or target_id is None:
+            return None
+        start, end = self.offsets[source_id], self.offsets[source_id + 1]
+        for slot in range(start, end):
+            if self.targets[slot] == target_id:
+                return self.rows[slot]
+        return None
+
+    def edge_attributes(self, row: int) -> Dict[str, str]:
+        """Attribute dict of a link row (built on demand)."""
+        return {
+            name: self.strings[self.attributes[name][row]]
+            for name in EDGE_ATTRIBUTES
+        }
+
+    def get_edge_data(self, source: str, target: str, default=None):
+        row = self.edge_row(source, target)
+        if row is None:
+            return default
+        return self.edge_attributes(row)
+
+    def edges(self, data: bool = False) -> Iterator[Tuple]:
+        """Links in NetworkX order: by node, each link once."""
+        for node_id, node in enumerate(self.nodes):
+            start, end = self.offsets[node_id], self.offsets[node_id + 1]
+            for slot in range(start, end):
+                target = self.targets[slot]
+                if target < node_id:
+                    continue
+                if data:
+                    yield (
+                        node,
+                        self.nodes[target],
+                        self.edge_attributes(self.rows[slot]),
+                    )
+                else:
+                    yield node, self.nodes[target]
+
+    def subgraph(self, nodes: Iterable[str]) -> "CSRGraph":
+        """Graph induced by the given nodes (a copy, in graph node order)."""
+        wanted = {self._ids[node] for node in nodes if node in self._ids}
+        keep = [i for i in range(len(self.nodes)) if i in wanted]
+        new_ids = {old: new for new, old in enumerate(keep)}
+        edge_source, edge_target = array("I"), array("I")
+        columns = {name: array("I") for name in EDGE_ATTRIBUTES}
+        for row, (source, target) in enumerate(
+            zip(self.edge_source, self.edge_target)
+        ):
+            if source in new_ids and target in new_ids:
+                edge_source.append(new_ids[source])
+                edge_target.append(new_ids[target])
+                for name in EDGE_ATTRIBUTES:
+                    columns[name].append(self.attributes[name][row])
+        return CSRGraph(
+            [self.nodes[i] for i in keep],
+            self.strings,
+            edge_source,
+            edge_target,
+            columns,
+        )
+
+    def bfs(self, source: str) -> Dict[str, int]:
+        """Hop count from a node to every node reachable from it."""
+        distances = self._bfs(self.node_id(source))[0]
+        return {
+            self.nodes[node_id]: distance
+            for node_id, distance in enumerate(distances)
+            if distance >= 0
+        }
+
+    def _bfs(self, source: int) -> Tuple[array, array]:
+        """Distances (-1: unreached) and BFS parents."""
+        distances = array("i", [-1]) * len(self.nodes)
+        parents = array("i", [-1]) * len(self.nodes)
+        distances[source] = 0
+        queue = deque([source])
+        offsets, targets = self.offsets, self.targets
+        while queue:
+            node_id = queue.popleft()
+            next_distance = distances[node_id] + 1
+            for slot in range(offsets[node_id], offsets[node_id + 1]):
+                neighbor = targets[slot]
+                if distances[neighbor] < 0:
+                    distances[neighbor] = next_distance
+                    parents[neighbor] = node_id
+                    queue.append(neighbor)
+        return distances, parents
+
+    def dijkstra(
+        self, source: str, weights: Sequence[float]
+    ) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        """
+        Weighted distances and shortest-path parents from a node.
+
+        Args:
+            source: Start node
+            weights: Non-negative weight per link row
+        """
+        distances, parents = self._dijkstra(self.node_id(source), weights)
+        reached = [i for i, d in enumerate(distances) if d != float("inf")]
+        return (
+            {self.nodes[i]: distances[i] for i in reached},
+            {
+                self.nodes[i]: (
+                    self.nodes[parents[i]] if parents[i] >= 0 else None
+                )
+                for i in reached
+            },
+        )
+
+    def _dijkstra(
+        self,
+        source: int,
+        weights: Sequence[float],
+        target: Optional[int] = None,
+    ) -> Tuple[List[float], array]:
+        distances = [float("inf")] * len(self.nodes)
+        parents = array("i", [-1]) * len(self.nodes)
+        done = bytearray(len(self.nodes))
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        offsets, targets, rows = self.offsets, self.targets, self.rows
+        while heap:
+            distance, node_id = heapq.heappop(heap)
+            if done[node_id]:
+                continue
+            done[node_id] = 1
+            if node_id == target:
+                break
+            for slot in range(offsets[node_id], offsets[node_id + 1]):
+                neighbor = targets[slot]
+                candidate = distance + weights[rows[slot]]
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    parents[neighbor] = node_id
+                    heapq.heappush(heap, (candidate, neighbor))
+        return distances, parents
+
+    def shortest_path_tree(
+        self, source: str, weights: Optional[Sequence[float]] = None
+    ) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+        """
+        Distances from a node and every equal-cost predecessor per node.
+
+        Args:
+            source: Start node
+            weights: Non-negative weight per link row (inf hides a link);
+                hop count when None
+
+        Returns:
+            (distances, predecessors) for the nodes reachable from source
+        """
+        source_id = self.node_id(source)
+        offsets, targets, rows = self.offsets, self.targets, self.rows
+        predecessors: Dict[int, List[int]] = {source_id: []}
+        if weights is None:
+            hops = array("i", [-1]) * len(self.nodes)
+            hops[source_id] = 0
+            queue = deque([source_id])
+            while queue:
+                node_id = queue.popleft()
+                next_hops = hops[node_id] + 1
+                for slot in range(offsets[node_id], offsets[node_id + 1]):
+                    neighbor = targets[slot]
+                    if hops[neighbor] < 0:
+                        hops[neighbor] = next_hops
+                        predecessors[neighbor] = [node_id]
+                        queue.append(neighbor)
+                    elif hops[neighbor] == next_hops:
+                        predecessors[neighbor].append(node_id)
+            distances = {i: float(hops[i]) for i in predecessors}
+        else:
+            costs = [float("inf")] * len(self.nodes)
+            done = bytearray(len(self.nodes))
+            costs[source_id] = 0.0
+            heap = [(0.0, source_id)]
+            while heap:
+                cost, node_id = heapq.heappop(heap)
+                if done[node_id]:
+                    continue
+                done[node_id] = 1
+                for slot in range(offsets[node_id], offsets[node_id + 1]):
+                    neighbor = targets[slot]
+                    candidate = cost + weights[rows[slot]]
+                    if candidate < costs[neighbor]:
+                        costs[neighbor] = candidate
+                        predecessors[neighbor] = [node_id]
+                        heapq.heappush(heap, (candidate, neighbor))
+                    elif (
+                        candidate == costs[neighbor]
+                        and candidate != float("inf")
+                        and not done[neighbor]
+                    ):
+                        predecessors[neighbor].append(node_id)
+            distances = {i: costs[i] for i in predecessors}
+        nodes = self.nodes
+        return (
+            {nodes[i]: distance for i, distance in distances.items()},
+            {
+                nodes[i]: [nodes[p] for p in parents]
+                for i, parents in predecessors.items()
+            },
+        )
+
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        weights: Optional[Sequence[float]] = None,
+    ) -> List[str]:
+        """
+        Nodes of a shortest path, by hop count or by per-row weights.
+
+        Raises:
+            nx.NodeNotFound: If source or target is not in the graph
+            nx.NetworkXNoPath: If target cannot be reached from source
+        """
+        if source not in self._ids or target not in self._ids:
+            raise nx.NodeNotFound(
+                f"Either source {source} or target {target} is not in G"
+            )
+        source_id, target_id = self._ids[source], self._ids[target]
+        if weights is None:
+            path = self._bidirectional_bfs(source_id, target_id)
+        else:
+            distances, parents = self._dijkstra(source_id, weights, target_id)
+            path = None
+            if distances[target_id] != float("inf"):
+                path = [target_id]
+                while path[-1] != source_id:
+                    path.append(parents[path[-1]])
+                path.reverse()
+        if path is None:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return [self.nodes[node_id] for node_id in path]
+
+    def _bidirectional_bfs(
+        self, source: int, target: int
+    ) -> Optional[List[int]]:
+        """Hop-count shortest path, expanding the smaller side each round."""
+        if source == target:
+            return [source]
+        offsets, targets = self.offsets, self.targets
+        # Parent towards the source / towards the target per reached node
+        parents = [{source: -1}, {target: -1}]
+        frontiers = [[source], [target]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = parents[side], parents[1 - side]
+            reached = []
+            for node_id in frontiers[side]:
+                for slot in range(offsets[node_id], offsets[node_id + 1]):
+                    neighbor = targets[slot]
+                    if neighbor in mine:
+                        continue
+                    mine[neighbor] = node_id
+                    if neighbor in other:
+                        return self._join(parents, neighbor)
+                    reached.append(neighbor)
+            frontiers[side] = reached
+        return None
+
+    @staticmethod
+    def _join(parents: List[Dict[int, int]], meeting: int) -> List[int]:
+        path = []
+        node_id = meeting
+        while node_id >= 0:
+            path.append(node_id)
+            node_id = parents[0][node_id]
+        path.reverse()
+        node_id = parents[1][meeting]
+        while node_id >= 0:
+            path.append(node_id)
+            node_id = parents[1][node_id]
+        return path
+
+    def connected_components(self) -> List[Set[str]]:
+        """Node sets of the connected components, largest first."""
+        component = array("i", [-1]) * len(self.nodes)
+        components: List[List[int]] = []
+        offsets, targets = self.offsets, self.targets
+        for start in range(len(self.nodes)):
+            if component[start] >= 0:
+                continue
+            label = len(components)
+            members = [start]
+            component[start] = label
+            stack = [start]
+            while stack:
+                node_id = stack.pop()
+                for slot in range(offsets[node_id], offsets[node_id + 1]):
+                    neighbor = targets[slot]
+                    if component[neighbor] < 0:
+                        component[neighbor] = label
+                        members.append(neighbor)
+                        stack.append(neighbor)
+            components.append(members)
+        components.sort(key=len, reverse=True)
+        return [{self.nodes[i] for i in members} for members in components]
+
+
+def shortest_path(graph, source: str, target: str) -> List[str]:
+    """Shortest path by hop count on a NetworkX or CSR topology graph."""
+    if isinstance(graph, CSRGraph):
+        return graph.shortest_path(source, target)
+    return nx.shortest_path(graph, source=source, target=target)
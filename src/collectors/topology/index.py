@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Topology index: subnet and address lookups over collected interface data.
+
+Networks and addresses are keyed by integers, (version, network address,
+prefix length) and (version, address), so the same prefix written in
+different ways ("10.0.0.1/24", "10.0.0.0/255.255.255.0") finds the same
+entry and IPv4 and IPv6 share one structure. The index is updated one
+device at a time as the topology service refreshes devices; segment
+membership, the networks of a device and the owner of an address are
+dictionary lookups.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.processors.topology_processor import (
+    NetworkKey,
+    format_network,
+    parse_address,
+    parse_network,
+)
+
+AddressKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """An interface address on a network."""
+
+    device: str
+    interface: str
+    ip: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "device": self.device,
+            "interface": self.interface,
+            "ip": self.ip,
+        }
+
+
+def network_key(network: str) -> NetworkKey:
+    """Integer key of a prefix; host bits are ignored."""
+    return parse_network(network)
+
+
+def address_key(address: str) -> AddressKey:
+    """Integer key of an address; a prefix length, if given, is ignored."""
+    return parse_address(address.partition("/")[0])
+
+
+def network_name(key: NetworkKey) -> str:
+    """CIDR string of a network key."""
+    return format_network(key)
+
+
+class TopologyIndex:
+    """
+    Network, device and address lookups for the topology of a network.
+
+    Entries come from extract_interface_subnets: dicts with device,
+    interface, ip and network.
+    """
+
+    def __init__(self):
+        self._endpoints: Dict[NetworkKey, List[Endpoint]] = {}
+        self._device_interfaces: Dict[str, Dict[str, Set[NetworkKey]]] = {}
+        self._addresses: Dict[AddressKey, Endpoint] = {}
+        self._device_addresses: Dict[str, Set[AddressKey]] = {}
+        # Prefix lengths present per IP version, for longest-prefix match
+        self._prefix_lengths: Dict[int, Dict[int, int]] = {4: {}, 6: {}}
+
+    def set_device(
+        self, device: str, entries: Iterable[Dict[str, str]]
+    ) -> Set[NetworkKey]:
+        """
+        Replace the entries of a device.
+
+        Returns:
+            Keys of the networks whose endpoints changed
+        """
+        touched = self.remove_device(device)
+        interfaces = self._device_interfaces.setdefault(device, {})
+        addresses = self._device_addresses.setdefault(device, set())
+        for entry in entries:
+            try:
+                key = network_key(entry["network"])
+                ip_key = address_key(entry["ip"])
+            except (KeyError, ValueError):
+                continue
+            endpoint = Endpoint(device, entry["interface"], entry["ip"])
+            endpoints = self._endpoints.setdefault(key, [])
+            if not endpoints:
+                lengths = self._prefix_lengths[key[0]]
+                lengths[key[2]] = lengths.get(key[2], 0) + 1
+            endpoints.append(endpoint)
+            interfaces.setdefault(endpoint.interface, set()).add(key)
+            self._addresses[ip_key] = endpoint
+            addresses.add(ip_key)
+            touched.add(key)
+        return touched
+
+    def remove_device(self, device: str) -> Set[NetworkKey]:
+        """
+        Drop the entries of a device.
+
+        Returns:
+            Keys of the networks whose endpoints changed
+        """
+        interfaces = self._device_interfaces.pop(device, {})
+        touched = set()
+        for keys in interfaces.values():
+            touched.update(keys)
+        for key in touched:
+            remaining = [
+                endpoint
+                for endpoint in self._endpoints.get(key, ())
+                if endpoint.device != device
+            ]
+            if remaining:
+                self._endpoints[key] = remaining
+                continue
+            self._endpoints.pop(key, None)
+            lengths = self._prefix_lengths[key[0]]
+            lengths[key[2]] -= 1
+            if not lengths[key[2]]:
+                del lengths[key[2]]
+        for ip_key in self._device_addresses.pop(device, ()):
+            endpoint = self._addresses.get(ip_key)
+            if endpoint is not None and endpoint.device == device:
+                del self._addresses[ip_key]
+        return touched
+
+    def endpoints(self, network: str) -> List[Endpoint]:
+        """Interface addresses on a network, in the order they were added."""
+        return list(self._endpoints_of(network_key(network)))
+
+    def _endpoints_of(self, key: NetworkKey) -> List[Endpoint]:
+        return self._endpoints.get(key, [])
+
+    def networks(self) -> Dict[NetworkKey, List[Endpoint]]:
+        """All networks with their endpoints (do not modify)."""
+        return self._endpoints
+
+    def devices_on(self, network: str) -> List[str]:
+        """Devices with an address on a network."""
+        return list(
+            dict.fromkeys(e.device for e in self.endpoints(network))
+        )
+
+    def interfaces_of(self, device: str) -> Dict[str, List[str]]:
+        """Interfaces of a device with the networks they are on."""
+        return {
+            interface: sorted(network_name(key) for key in keys)
+            for interface, keys in self._device_interfaces.get(
+                device, {}
+            ).items()
+        }
+
+    def network_keys_of(
+        self, device: str, exclude: Iterable[str] = ()
+    ) -> Set[NetworkKey]:
+        """Networks a device has an address on, minus some interfaces."""
+        excluded = set(exclude)
+        return {
+            key
+            for interface, keys in self._device_interfaces.get(
+                device, {}
+            ).items()
+            if interface not in excluded
+            for key in keys
+        }
+
+    def peers_of(
+        self, device: str, exclude: Iterable[str] = ()
+    ) -> Set[str]:
+        """Other devices sharing a network with a device."""
+        excluded = set(exclude)
+        return {
+            endpoint.device
+            for key in self.network_keys_of(device, excluded)
+            for endpoint in self._endpoints_of(key)
+            if endpoint.device != device
+            and endpoint.interface not in excluded
+        }
+
+    def owner(self, address: str) -> Optional[Endpoint]:
+        """The interface configured with an address, if known."""
+        return self._addresses.get(address_key(address))
+
+    def containing_network(self, address: str) -> Optional[str]:
+        """Longest known prefix containing an address."""
+        version, value = address_key(address)
+        bits = 32 if version == 4 else 128
+        for prefix_length in sorted(
+            self._prefix_lengths[version], reverse=True
+        ):
+            host_bits = bits - prefix_length
+            key = (version, value >> host_bits << host_bits, prefix_length)
+            if key in self._endpoints:
+                return network_name(key)
+        return None
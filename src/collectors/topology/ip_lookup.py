@@ -0,0 +1,81 @@
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.logging import get_logger
+
+from .service import get_topology_service
+from .utils import data_age_metadata
+
+logger = get_logger(__name__)
+
+
+def lookup_ip(
+    ip_address: str, refresh: bool = False
+) -> NetworkOperationResult:
+    """
+    Find the device and interface configured with an IP address.
+
+    The answer comes from the topology index; only the device that owned
+    the address in earlier data (and devices without data) are polled when
+    their data is stale.
+
+    Args:
+        ip_address: IPv4 or IPv6 address, optionally with a prefix length
+        refresh: Poll the owner of the address even if its data is younger
+            than GNMIBUDDY_TOPOLOGY_TTL
+
+    Returns:
+        NetworkOperationResult: The owning device and interface, if any,
+        and the longest known network containing the address
+    """
+    service = get_topology_service()
+    if refresh:
+        service.invalidate()
+    try:
+        topology_result, owner, network = service.locate_address(ip_address)
+    except ValueError as e:
+        return NetworkOperationResult(
+            device_name="ALL_DEVICES",
+            ip_address="0.0.0.0",
+            nos=NetworkOS.UNKNOWN,
+            operation_type="topology_ip_lookup",
+            status=OperationStatus.FAILED,
+            error_response=ErrorResponse(
+                type="INVALID_PARAMETER", message=str(e)
+            ),
+        )
+
+    logger.debug(
+        "IP %s: owner %s, network %s",
+        ip_address,
+        owner.device if owner else None,
+        network,
+    )
+    segment = []
+    if network is not None:
+        segment = [
+            endpoint.to_dict()
+            for endpoint in topology_result.index.endpoints(network)
+        ]
+    return NetworkOperationResult(
+        device_name="ALL_DEVICES",
+        ip_address="0.0.0.0",
+        nos=NetworkOS.UNKNOWN,
+        operation_type="topology_ip_lookup",
+        status=OperationStatus.SUCCESS,
+        data={
+            "ip_address": ip_address,
+            "owner": owner.to_dict() if owner else None,
+            "network": network,
+            "segment": segment,
+        },
+        metadata={
+            "found": owner is not None,
+            "refreshed_devices": len(topology_result.refreshed_devices),
+            "failed_devices": topology_result.error_devices,
+            **data_age_metadata(topology_result),
+        },
+    )
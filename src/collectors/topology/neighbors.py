@@ -5,18 +5,30 @@ from src.schemas.responses import (
     NetworkOperationResult,
 )
 
-from .utils import _build_graph_ip_only
+from .adjacency import DISCOVERY_IP, uses_ip, validate_discovery
+from .segment_graph import segment_view
+from .utils import _build_graph_ip_only, data_age_metadata
 from src.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-def neighbors(device: Device) -> NetworkOperationResult:
+def neighbors(
+    device: Device, discovery: str = DISCOVERY_IP, refresh: bool = False
+) -> NetworkOperationResult:
     """
     List direct neighbors of a device.
 
+    Devices reached over a multi-access segment (a network shared by three
+    or more interfaces) are listed under segments with the segment, not as
+    neighbors.
+
     Args:
         device: Device object from inventory
+        discovery: "ip" (default) to pair interface subnets, "adjacency" to
+            use ISIS adjacencies and LLDP neighbors, "merged" for both
+        refresh: Poll the device and its peers even if their data is
+            younger than GNMIBUDDY_TOPOLOGY_TTL
 
     Returns:
         NetworkOperationResult: Response object containing neighbor information
@@ -24,7 +36,25 @@ def neighbors(device: Device) -> NetworkOperationResult:
     logger.debug("Getting neighbors for device %s", device.name)
 
     try:
-        topology_result = _build_graph_ip_only()
+        validate_discovery(discovery)
+    except ValueError as e:
+        return NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="topology_neighbors",
+            status=OperationStatus.FAILED,
+            data={},
+            error_response=ErrorResponse(
+                type="INVALID_PARAMETER", message=str(e)
+            ),
+            metadata={"device_in_topology": False},
+        )
+
+    try:
+        topology_result = _build_graph_ip_only(
+            source=device.name, discovery=discovery, refresh=refresh
+        )
         logger.debug(
             "Topology graph built with %d nodes",
             (
@@ -101,17 +131,24 @@ def neighbors(device: Device) -> NetworkOperationResult:
             "Found %d neighbors for device %s", len(neighbor_list), device_name
         )
 
+        segments = []
+        if uses_ip(discovery):
+            segments = segment_view(topology_result.segments, device_name)
+
         return NetworkOperationResult(
             device_name=device.name,
             ip_address=device.ip_address,
             nos=device.nos,
             operation_type="topology_neighbors",
             status=OperationStatus.SUCCESS,
-            data={"neighbors": neighbor_list},
+            data={"neighbors": neighbor_list, "segments": segments},
             metadata={
                 "message": f"Found {len(neighbor_list)} neighbors for device {device_name}",
                 "device_in_topology": True,
                 "neighbor_count": len(neighbor_list),
+                "segment_count": len(segments),
+                "discovery": discovery,
+                **data_age_metadata(topology_result),
             },
         )
 
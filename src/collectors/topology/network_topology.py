@@ -4,28 +4,61 @@ from src.schemas.responses import (
     NetworkOperationResult,
 )
 from src.schemas.models import NetworkOS
-from .utils import _build_graph_ip_only
+from .adjacency import DISCOVERY_IP, uses_ip, validate_discovery
+from .utils import _build_graph_ip_only, data_age_metadata
 from src.logging import get_logger, log_operation
 
 logger = get_logger(__name__)
 
 
-def get_network_topology() -> NetworkOperationResult:
+def get_network_topology(
+    discovery: str = DISCOVERY_IP,
+    refresh: bool = False,
+) -> NetworkOperationResult:
     """
-    Return the full IP-only direct connection list of the topology graph (no ISIS).
+    Return the full direct connection list of the topology graph.
     Each connection represents a direct L3 IP connectivity between two devices.
 
     This function builds a complete network topology using all devices in the inventory.
     This is a network-wide operation that analyzes all devices to build the topology graph.
 
+    Networks shared by three or more interfaces (multi-access segments) are
+    listed once under segments with their members, not as connections
+    between every two members.
+
+    Args:
+        discovery: "ip" (default) to pair interface subnets, "adjacency" to
+            use ISIS adjacencies and LLDP neighbors, "merged" for both
+        refresh: Poll every device even if its data is younger than
+            GNMIBUDDY_TOPOLOGY_TTL
+
     Returns:
-        NetworkOperationResult: Response object containing all direct IP connections in the network
+        NetworkOperationResult: Response object containing all direct IP connections and multi-access segments in the network
     """
+    try:
+        validate_discovery(discovery)
+    except ValueError as e:
+        return NetworkOperationResult(
+            device_name="ALL_DEVICES",
+            ip_address="0.0.0.0",
+            nos=NetworkOS.UNKNOWN,
+            operation_type="network_topology",
+            status=OperationStatus.FAILED,
+            data={},
+            error_response=ErrorResponse(
+                type="INVALID_PARAMETER", message=str(e)
+            ),
+            metadata={"scope": "network-wide"},
+        )
+
     try:
         logger.debug(
-            "Building complete IP topology graph for all devices in inventory"
+            "Building complete %s topology graph for all devices in inventory",
+            discovery,
+        )
+        topology_result = _build_graph_ip_only(
+            discovery=discovery, refresh=refresh
         )
-        topology_result = _build_graph_ip_only()
         logger.debug(
             "Topology graph build result: %s", type(topology_result).__name__
         )
@@ -108,20 +141,30 @@ def get_network_topology() -> NetworkOperationResult:
             str(direct_connections[:3]) if direct_connections else "none",
         )
 
+        segments = []
+        if uses_ip(discovery) and topology_result.segments is not None:
+            segments = topology_result.segments.to_list()
+
         return NetworkOperationResult(
             device_name="ALL_DEVICES",
             ip_address="0.0.0.0",
             nos=NetworkOS.UNKNOWN,
             operation_type="network_topology",
             status=OperationStatus.SUCCESS,
-            data={"direct_connections": direct_connections},
+            data={
+                "direct_connections": direct_connections,
+                "segments": segments,
+            },
             metadata={
                 "total_connections": len(direct_connections),
+                "total_segments": len(segments),
                 "total_nodes": topology_graph.number_of_nodes(),
                 "total_edges": topology_graph.number_of_edges(),
                 "scope": "network-wide",
                 "operation_note": "This operation analyzes all devices in inventory",
                 "context_device": "network-wide",
+                "discovery": discovery,
+                **data_age_metadata(topology_result),
             },
         )
 
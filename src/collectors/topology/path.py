@@ -1,32 +1,116 @@
 import networkx as nx
-from .utils import _build_graph_ip_only
+
+from src.schemas.models import Device
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.logging import get_logger
+
+from .path_queries import WEIGHT_HOPS, get_path_query_service
+from .utils import data_age_metadata
+
+logger = get_logger(__name__)
 
 
 def path(device, target_device_name: str) -> dict:
     """
     Compute shortest path between two devices.
+
+    The answer comes from the cached shortest-path tree of the source;
+    "equal_cost_paths" lists the nodes of every path with the same hop
+    count (up to a limit).
     """
-    topology_result = _build_graph_ip_only()
-    topology_graph = topology_result.graph
     source_device_name = device.name if hasattr(device, "name") else device
     try:
-        path_nodes = nx.shortest_path(
-            topology_graph,
-            source=source_device_name,
-            target=target_device_name,
+        answer = get_path_query_service().query(
+            source_device_name, target_device_name
         )
-        path_edges = []
-        for idx in range(len(path_nodes) - 1):
-            from_device, to_device = path_nodes[idx], path_nodes[idx + 1]
-            path_edges.append(
-                {
-                    "source": from_device,
-                    "target": to_device,
-                    "attributes": topology_graph.get_edge_data(
-                        from_device, to_device
-                    ),
-                }
-            )
-        return {"nodes": path_nodes, "edges": path_edges}
+        best = answer["paths"][0]
+        return {
+            "nodes": best["nodes"],
+            "edges": best["edges"],
+            "equal_cost_paths": [p["nodes"] for p in answer["paths"]],
+        }
     except Exception as error:
         return {"error": str(error)}
+
+
+def topology_path(
+    device: Device,
+    target_device_name: str,
+    weight: str = WEIGHT_HOPS,
+    k: int = 1,
+    refresh: bool = False,
+) -> NetworkOperationResult:
+    """
+    Shortest paths from a device to another device in the IP topology.
+
+    Repeated questions from the same device are answered from its cached
+    shortest-path tree until the topology changes.
+
+    Args:
+        device: Source device
+        target_device_name: Name of the target device
+        weight: "hops", or "igp" for ISIS metric costs
+        k: 1 for all equal-cost shortest paths, more for the k shortest
+            loop-free paths
+        refresh: Poll the devices the answer depends on even if their
+            data is younger than GNMIBUDDY_TOPOLOGY_TTL
+
+    Returns:
+        NetworkOperationResult: The cost of the best path and the paths
+    """
+
+    def result(status, data=None, error=None, metadata=None):
+        return NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="topology_path",
+            status=status,
+            data=data or {},
+            error_response=error,
+            metadata=metadata or {},
+        )
+
+    service = get_path_query_service()
+    try:
+        answer = service.query(
+            device.name, target_device_name, weight, k, refresh
+        )
+    except ValueError as e:
+        return result(
+            OperationStatus.FAILED,
+            error=ErrorResponse(type="INVALID_PARAMETER", message=str(e)),
+        )
+    except nx.NodeNotFound as e:
+        return result(
+            OperationStatus.FAILED,
+            error=ErrorResponse(type="TOPOLOGY_ERROR", message=str(e)),
+            metadata={"failed_devices": service.error_devices},
+        )
+    except nx.NetworkXNoPath as e:
+        logger.debug("No path: %s", e)
+        return result(
+            OperationStatus.SUCCESS,
+            data={"source": device.name, "target": target_device_name},
+            metadata={
+                "reachable": False,
+                "message": str(e),
+                "failed_devices": service.error_devices,
+                **data_age_metadata(service.last_refresh),
+            },
+        )
+
+    return result(
+        OperationStatus.SUCCESS,
+        data=answer,
+        metadata={
+            "reachable": True,
+            "paths_returned": len(answer["paths"]),
+            "failed_devices": service.error_devices,
+            **data_age_metadata(service.last_refresh),
+        },
+    )
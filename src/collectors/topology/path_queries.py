@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Path queries answered from memoized shortest-path trees.
+
+Troubleshooting reachability means asking for many paths, mostly from the
+same few sources. Instead of running a shortest-path search per question,
+the service computes the shortest-path tree of a source once: the distance
+to every device and, per device, every predecessor on an equal-cost path.
+Any later question from that source is a walk up the tree, and all
+equal-cost (ECMP) paths come out of it instead of one arbitrary path.
+
+Trees belong to one topology graph. The topology service replaces its
+graph whenever the topology changes (each new snapshot), and the trees of
+the old graph are dropped with it.
+
+Before answering, the data the answer depends on is refreshed when older
+than the topology TTL. For a shortest path by hops only the devices
+explored between the two ends are (TopologyService.get_path_scope, which
+expands from both ends until they meet); IGP costs and the k shortest
+paths may use any link, so they refresh the whole topology.
+
+Paths may cross multi-access segments (shared LANs, segment_graph.py).
+They are searched in the bipartite graph of the devices, their links and
+the segments (SegmentGraph.to_graph), where a member joins a segment with
+half the cost of a link, so crossing a segment costs as much as a link.
+In the answer a crossing is one hop between the two members, with the
+segment as its network.
+
+Costs are hop counts, or IGP costs: the ISIS metric of the interfaces at
+each end of a link (the larger one if they differ), or across a segment
+the mean of the metrics of the two member interfaces. Links and members
+without ISIS are not used for IGP paths. With k > 1 the k shortest
+loop-free paths are returned (Yen's algorithm, through NetworkX).
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from src.logging import get_logger
+from src.utils.parallel_execution import run_command_on_devices
+
+from .csr import CSRGraph
+from .segment_graph import SegmentGraph
+from .service import TopologyService, get_topology_service
+from .utils import TopologyBuildResult, _get_isis_metrics
+
+logger = get_logger(__name__)
+
+WEIGHT_HOPS = "hops"
+WEIGHT_IGP = "igp"
+WEIGHTS = (WEIGHT_HOPS, WEIGHT_IGP)
+
+# Equal-cost paths listed per answer (all are counted)
+MAX_EQUAL_COST_PATHS = 16
+MAX_K = 16
+DEFAULT_MAX_TREES = 64
+# Hop cost of the edge between a device and a segment it is on
+MEMBER_HOPS = 0.5
+
+
+@dataclass
+class PathTree:
+    """Shortest-path tree from a source, keeping all equal-cost parents."""
+
+    source: str
+    distances: Dict[str, float]
+    predecessors: Dict[str, List[str]]
+
+    def paths_to(
+        self, target: str, limit: int = MAX_EQUAL_COST_PATHS
+    ) -> List[List[str]]:
+        """Up to limit equal-cost paths from the source to target."""
+        if target not in self.distances:
+            return []
+        paths: List[List[str]] = []
+        stack = [(target, [target])]
+        while stack and len(paths) < limit:
+            node, reversed_path = stack.pop()
+            if node == self.source:
+                paths.append(reversed_path[::-1])
+                continue
+            for parent in reversed(self.predecessors[node]):
+                stack.append((parent, reversed_path + [parent]))
+        return paths
+
+    def path_count(self, target: str) -> int:
+        """Number of equal-cost paths from the source to target."""
+        if target not in self.distances:
+            return 0
+        counts: Dict[str, int] = {}
+        stack = [(target, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in counts:
+                continue
+            if node == self.source:
+                counts[node] = 1
+            elif expanded:
+                counts[node] = sum(
+                    counts[parent] for parent in self.predecessors[node]
+                )
+            else:
+                stack.append((node, True))
+                stack.extend(
+                    (parent, False)
+                    for parent in self.predecessors[node]
+                    if parent not in counts
+                )
+        return counts[target]
+
+
+class PathQueryService:
+    """Shortest-path answers cached per topology graph."""
+
+    def __init__(
+        self,
+        topology: Optional[TopologyService] = None,
+        max_trees: int = DEFAULT_MAX_TREES,
+    ):
+        """
+        Args:
+            topology: Topology service (default: the process-wide one)
+            max_trees: Shortest-path trees kept (least recently used go)
+        """
+        self._topology = topology
+        self.max_trees = max_trees
+        self._lock = threading.Lock()
+        self._graph = None
+        # The graph searched: the topology graph with its segments
+        self._path_graph = None
+        self._segments: Optional[SegmentGraph] = None
+        self._segment_nodes: Set[str] = set()
+        # When and how the data of a (source, target) scope, or of the
+        # whole topology (key None), was last refreshed
+        self._checked: Dict[
+            Optional[Tuple[str, str]], Tuple[float, TopologyBuildResult]
+        ] = {}
+        # The refresh behind the last answer, for its data age
+        self.last_refresh: Optional[TopologyBuildResult] = None
+        self._igp_checked_at: Optional[float] = None
+        self.error_devices: List[str] = []
+        self._trees: "OrderedDict[Tuple[str, str], PathTree]" = OrderedDict()
+        self._k_paths: "OrderedDict[Tuple, List[List[str]]]" = OrderedDict()
+        self._networkx: Optional[nx.Graph] = None
+        # Per graph: IGP cost per (device, device) link, both directions
+        self._igp_costs: Optional[Dict[Tuple[str, str], float]] = None
+        self._igp_row_costs: Optional[List[float]] = None
+        self._hop_row_costs: Optional[List[float]] = None
+
+    def query(
+        self,
+        source: str,
+        target: str,
+        weight: str = WEIGHT_HOPS,
+        k: int = 1,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Shortest paths between two devices.
+
+        Args:
+            source: Source device
+            target: Target device
+            weight: "hops" or "igp" (ISIS metrics)
+            k: 1 for all equal-cost shortest paths, more for the k shortest
+                loop-free paths
+            refresh: Poll the devices the answer depends on even if their
+                data is younger than the topology TTL
+
+        Returns:
+            Dict with the cost of the best path, the paths (nodes, edges and
+            cost each) and the number of equal-cost shortest paths
+
+        Raises:
+            ValueError: If weight or k is invalid
+            nx.NodeNotFound: If a device is not in the topology
+            nx.NetworkXNoPath: If the devices are not connected
+        """
+        if weight not in WEIGHTS:
+            raise ValueError(
+                f"Invalid weight {weight!r}, expected one of {WEIGHTS}"
+            )
+        if not 1 <= k <= MAX_K:
+            raise ValueError(f"k must be between 1 and {MAX_K}")
+        with self._lock:
+            scope = (source, target)
+            if weight != WEIGHT_HOPS or k > 1:
+                scope = None
+            if refresh:
+                (self._topology or get_topology_service()).invalidate()
+                self._checked.clear()
+                self._drop(WEIGHT_IGP)
+            graph = self._current_graph(scope)
+            for node in (source, target):
+                if node not in graph:
+                    raise nx.NodeNotFound(
+                        f"Device {node} is not in the topology"
+                    )
+            path_graph = self._path_graph
+            tree = self._tree(path_graph, source, weight)
+            if target not in tree.distances:
+                raise nx.NetworkXNoPath(
+                    f"No path between {source} and {target}."
+                )
+            equal_cost = tree.path_count(target)
+            if k == 1:
+                paths = tree.paths_to(target)
+            else:
+                paths = self._k_shortest(
+                    path_graph, source, target, weight, k
+                )
+            return {
+                "source": source,
+                "target": target,
+                "weight": weight,
+                "cost": tree.distances[target],
+                "equal_cost_paths": equal_cost,
+                "paths": [
+                    self._describe(graph, path, weight) for path in paths
+                ],
+            }
+
+    def _current_graph(self, scope: Optional[Tuple[str, str]]):
+        """
+        The topology graph, with the data of a scope refreshed when older
+        than the topology TTL.
+
+        Args:
+            scope: (source, target) to refresh only the devices between
+                them, or None for the whole topology
+        """
+        topology = self._topology or get_topology_service()
+        now = time.time()
+        ttl = topology.effective_ttl()
+        checked = max(
+            (
+                self._checked[key]
+                for key in (scope, None)
+                if key in self._checked
+            ),
+            default=None,
+            key=lambda entry: entry[0],
+        )
+        if (
+            topology.graph is None
+            or checked is None
+            or now - checked[0] >= ttl
+        ):
+            if scope is None:
+                result = topology.get_graph()
+            else:
+                result = topology.get_path_scope(*scope)
+            self.error_devices = list(result.error_devices)
+            self._checked = {
+                key: entry
+                for key, entry in self._checked.items()
+                if now - entry[0] < ttl
+            }
+            checked = self._checked[scope] = (now, result)
+        self.last_refresh = checked[1]
+        # ISIS metrics can change without the topology changing
+        if (
+            self._igp_checked_at is not None
+            and now - self._igp_checked_at >= ttl
+        ):
+            self._drop(WEIGHT_IGP)
+        graph = topology.graph
+        if graph is not self._graph:
+            logger.debug("Topology graph changed, dropping path trees")
+            self._graph = graph
+            self._segments = topology.segments
+            self._path_graph = self._with_segments(graph, self._segments)
+            self._networkx = None
+            self._hop_row_costs = None
+            self._drop(WEIGHT_HOPS)
+            self._drop(WEIGHT_IGP)
+        return graph
+
+    def _with_segments(self, graph, segments: Optional[SegmentGraph]):
+        """The graph to search: the topology graph and its segments."""
+        if not segments:
+            self._segment_nodes = set()
+            return graph
+        self._segment_nodes = set(segments.segments())
+        combined = segments.to_graph(graph)
+        if isinstance(graph, CSRGraph):
+            return CSRGraph.from_networkx(combined)
+        return combined
+
+    def _drop(self, weight: str) -> None:
+        """Forget the trees and paths computed with a weighting."""
+        for cache in (self._trees, self._k_paths):
+            for key in [key for key in cache if weight in key]:
+                del cache[key]
+        if weight == WEIGHT_IGP:
+            self._igp_costs = None
+            self._igp_row_costs = None
+            self._igp_checked_at = None
+
+    def _tree(self, graph, source: str, weight: str) -> PathTree:
+        key = (source, weight)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+        weighted = weight == WEIGHT_IGP or bool(self._segment_nodes)
+        if isinstance(graph, CSRGraph):
+            row_costs = None
+            if weighted:
+                row_costs = self._row_costs(graph, weight)
+            distances, predecessors = graph.shortest_path_tree(
+                source, row_costs
+            )
+        elif weighted:
+            predecessors, distances = nx.dijkstra_predecessor_and_distance(
+                graph, source, weight=self._networkx_weight(weight)
+            )
+        else:
+            predecessors = nx.predecessor(graph, source)
+            distances = {
+                node: float(hops)
+                for node, hops in nx.single_source_shortest_path_length(
+                    graph, source
+                ).items()
+            }
+        tree = PathTree(source, distances, predecessors)
+        self._trees[key] = tree
+        while len(self._trees) > self.max_trees:
+            self._trees.popitem(last=False)
+        return tree
+
+    def _k_shortest(
+        self, graph, source: str, target: str, weight: str, k: int
+    ) -> List[List[str]]:
+        key = (source, target, weight, k)
+        paths = self._k_paths.get(key)
+        if paths is None:
+            if self._networkx is None:
+                self._networkx = (
+                    graph.to_networkx()
+                    if isinstance(graph, CSRGraph)
+                    else graph
+                )
+            paths = list(
+                islice(
+                    nx.shortest_simple_paths(
+                        self._networkx,
+                        source,
+                        target,
+                        weight=(
+                            self._networkx_weight(weight)
+                            if weight == WEIGHT_IGP or self._segment_nodes
+                            else None
+                        ),
+                    ),
+                    k,
+                )
+            )
+            self._k_paths[key] = paths
+            while len(self._k_paths) > self.max_trees:
+                self._k_paths.popitem(last=False)
+        return paths
+
+    def _describe(self, graph, path: List[str], weight: str) -> Dict:
+        edge_cost = self._edge_cost(weight)
+        cost = sum(edge_cost(u, v) for u, v in zip(path, path[1:]))
+        nodes = [node for node in path if node not in self._segment_nodes]
+        edges = []
+        for i, (from_node, to_node) in enumerate(zip(path, path[1:])):
+            if from_node in self._segment_nodes:
+                continue
+            if to_node in self._segment_nodes:
+                # A segment is never an end of the path
+                to_device = path[i + 2]
+                attributes = self._segment_link(
+                    to_node, from_node, to_device
+                )
+            else:
+                to_device = to_node
+                attributes = graph.get_edge_data(from_node, to_node)
+            edges.append(
+                {
+                    "source": from_node,
+                    "target": to_device,
+                    "attributes": attributes,
+                }
+            )
+        return {"nodes": nodes, "edges": edges, "cost": cost}
+
+    def _segment_link(
+        self, segment: str, local: str, remote: str
+    ) -> Dict[str, Any]:
+        """Link attributes of a crossing of a segment between two members."""
+        members = self._segments.members(segment)
+        local_end = next(e for e in members if e.device == local)
+        remote_end = next(e for e in members if e.device == remote)
+        return {
+            "network": segment,
+            "local_interface": local_end.interface,
+            "remote_interface": remote_end.interface,
+            "local_ip": local_end.ip,
+            "remote_ip": remote_end.ip,
+            "multi_access": True,
+        }
+
+    def _edge_cost(self, weight: str) -> Callable[[str, str], Optional[float]]:
+        """Cost of an edge of the searched graph (None hides it)."""
+        if weight == WEIGHT_IGP:
+            costs = self._link_costs()
+            return lambda u, v: costs.get((u, v))
+        segment_nodes = self._segment_nodes
+        return lambda u, v: (
+            MEMBER_HOPS if u in segment_nodes or v in segment_nodes else 1.0
+        )
+
+    def _networkx_weight(self, weight: str) -> Callable:
+        edge_cost = self._edge_cost(weight)
+        # None hides links and members without ISIS
+        return lambda u, v, _: edge_cost(u, v)
+
+    def _row_costs(self, graph: CSRGraph, weight: str) -> List[float]:
+        row_costs = (
+            self._igp_row_costs
+            if weight == WEIGHT_IGP
+            else self._hop_row_costs
+        )
+        if row_costs is None:
+            edge_cost = self._edge_cost(weight)
+            row_costs = []
+            for row in range(graph.number_of_edges()):
+                cost = edge_cost(
+                    graph.nodes[graph.edge_source[row]],
+                    graph.nodes[graph.edge_target[row]],
+                )
+                row_costs.append(float("inf") if cost is None else cost)
+            if weight == WEIGHT_IGP:
+                self._igp_row_costs = row_costs
+            else:
+                self._hop_row_costs = row_costs
+        return row_costs
+
+    def _link_costs(self) -> Dict[Tuple[str, str], float]:
+        """IGP cost per link and segment member, from ISIS metrics."""
+        if self._igp_costs is not None:
+            return self._igp_costs
+        topology = self._topology or get_topology_service()
+        graph = self._graph
+        metrics = self._isis_metrics(list(graph))
+        costs: Dict[Tuple[str, str], float] = {}
+        for u, v, attributes in graph.edges(data=True):
+            owner = topology.index.owner(attributes["local_ip"])
+            local, remote = (v, u) if owner and owner.device == v else (u, v)
+            local_metric = metrics.get(local, {}).get(
+                attributes["local_interface"]
+            )
+            remote_metric = metrics.get(remote, {}).get(
+                attributes["remote_interface"]
+            )
+            if local_metric is None or remote_metric is None:
+                continue
+            costs[(u, v)] = costs[(v, u)] = float(
+                max(local_metric, remote_metric)
+            )
+        for segment in sorted(self._segment_nodes):
+            for endpoint in self._segments.members(segment):
+                metric = metrics.get(endpoint.device, {}).get(
+                    endpoint.interface
+                )
+                if metric is None:
+                    continue
+                # The cheapest interface of a device on the segment
+                member = (endpoint.device, segment)
+                cost = metric / 2
+                if cost < costs.get(member, float("inf")):
+                    costs[member] = costs[(segment, endpoint.device)] = cost
+        self._igp_costs = costs
+        self._igp_checked_at = time.time()
+        return costs
+
+    def _isis_metrics(self, devices: List[str]) -> Dict[str, Dict[str, int]]:
+        results = run_command_on_devices(
+            _get_isis_metrics, devices, max_workers=10
+        )
+        metrics = {}
+        for result in results:
+            if not isinstance(result, dict):
+                continue
+            if "metrics" in result:
+                metrics[result["device_name"]] = result["metrics"]
+            elif "error" in result:
+                logger.warning(
+                    "No ISIS metrics from %s: %s",
+                    result.get("device_name"),
+                    result["error"],
+                )
+        logger.debug("ISIS metrics from %d devices", len(metrics))
+        return metrics
+
+
+_service: Optional[PathQueryService] = None
+_service_lock = threading.Lock()
+
+
+def get_path_query_service() -> PathQueryService:
+    """Return the process-wide path query service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PathQueryService()
+        return _service
+
+
+def reset_path_query_service() -> None:
+    """Drop the process-wide path query service (primarily for tests)."""
+    global _service
+    with _service_lock:
+        _service = None
@@ -1,20 +1,29 @@
-from .utils import _build_graph_ip_only
+from .service import get_topology_service
+from .utils import data_age_metadata
 
 
-def segment(network: str) -> dict:
+def segment(network: str, refresh: bool = False) -> dict:
     """
     List devices on the specified L3 segment.
+
+    multi_access tells whether it is a shared segment (three or more
+    interfaces, management excluded) rather than a point-to-point link.
+    With refresh the devices on the segment are polled even if their data
+    is younger than GNMIBUDDY_TOPOLOGY_TTL.
     """
-    topology_result = _build_graph_ip_only()
-    topology_graph = topology_result.graph
-    devices_on_segment = set()
-    for source_device, target_device, edge_attributes in topology_graph.edges(
-        data=True
-    ):
-        if (
-            edge_attributes.get("type") == "ip"
-            and edge_attributes.get("network") == network
-        ):
-            devices_on_segment.add(source_device)
-            devices_on_segment.add(target_device)
-    return {"segment": network, "devices": list(devices_on_segment)}
+    service = get_topology_service()
+    if refresh:
+        service.invalidate()
+    try:
+        result, endpoints = service.get_segment(network)
+    except ValueError as error:
+        return {"error": str(error)}
+    devices = list(dict.fromkeys(endpoint.device for endpoint in endpoints))
+    return {
+        "segment": network,
+        "devices": devices,
+        "endpoints": [endpoint.to_dict() for endpoint in endpoints],
+        "multi_access": result.segments is not None
+        and network in result.segments,
+        **data_age_metadata(result),
+    }
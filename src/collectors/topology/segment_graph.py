@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Multi-access segments as a bipartite device–segment graph.
+
+The topology graph pairs interfaces: a network with exactly two endpoints
+is a link between two devices. A broadcast segment with three or more
+routers (a shared LAN, an exchange fabric) has no such pair and would need
+a link between every two members, n * (n - 1) / 2 edges for n routers.
+
+Such segments are kept here as nodes of their own instead: each member is
+joined to the segment once, so a segment costs one entry per member. The
+membership is indexed both ways (segment -> endpoints, device -> segments),
+so who is on a segment and which segments a device is on are dictionary
+lookups. Path queries search the bipartite graph of the devices, their
+links and the segments (to_graph), so paths can cross a shared LAN.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from src.processors.topology_processor import NetworkKey
+
+from .index import Endpoint, TopologyIndex, network_key, network_name
+
+# Fewer endpoints make a point-to-point link (see utils._index_links)
+MULTI_ACCESS_MIN_ENDPOINTS = 3
+
+DEVICE_NODE = "device"
+SEGMENT_NODE = "segment"
+
+
+class SegmentGraph:
+    """Members of the multi-access segments of a topology."""
+
+    def __init__(self):
+        self._members: Dict[NetworkKey, Tuple[Endpoint, ...]] = {}
+        # Segments per device, in the order the device joined them
+        self._device_segments: Dict[str, Dict[NetworkKey, None]] = {}
+
+    @classmethod
+    def from_index(
+        cls,
+        index: TopologyIndex,
+        devices: Iterable[str],
+        exclude: Iterable[str] = (),
+    ) -> "SegmentGraph":
+        """
+        Collect the multi-access segments of a topology index.
+
+        Args:
+            index: Index of the interface addresses of the devices
+            devices: Devices that can be members, in the order members
+                are listed
+            exclude: Interface names that never join a segment (management)
+        """
+        order = {device: i for i, device in enumerate(devices)}
+        excluded = set(exclude)
+        segments = cls()
+        for key, endpoints in index.networks().items():
+            endpoints = [
+                endpoint
+                for endpoint in endpoints
+                if endpoint.interface not in excluded
+            ]
+            if len(endpoints) < MULTI_ACCESS_MIN_ENDPOINTS:
+                continue
+            members = sorted(
+                (e for e in endpoints if e.device in order),
+                key=lambda e: (order[e.device], e.interface, e.ip),
+            )
+            segments._add(key, tuple(members))
+        return segments
+
+    def _add(self, key: NetworkKey, members: Tuple[Endpoint, ...]) -> None:
+        self._members[key] = members
+        for endpoint in members:
+            self._device_segments.setdefault(endpoint.device, {})[key] = None
+
+    def __contains__(self, network: str) -> bool:
+        try:
+            return network_key(network) in self._members
+        except ValueError:
+            return False
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def number_of_memberships(self) -> int:
+        """Device–segment pairs, the edges of the bipartite graph."""
+        return sum(
+            len(segments) for segments in self._device_segments.values()
+        )
+
+    def segments(self) -> List[str]:
+        """Networks of all segments, in address order."""
+        return [network_name(key) for key in sorted(self._members)]
+
+    def members(self, network: str) -> List[Endpoint]:
+        """Interface addresses on a segment (empty if not a segment)."""
+        return list(self._members.get(network_key(network), ()))
+
+    def devices_on(self, network: str) -> List[str]:
+        """Devices on a segment."""
+        return list(dict.fromkeys(e.device for e in self.members(network)))
+
+    def segments_of(self, device: str) -> List[str]:
+        """Networks of the segments a device is on."""
+        return [
+            network_name(key)
+            for key in self._device_segments.get(device, ())
+        ]
+
+    def peers_of(self, device: str) -> Set[str]:
+        """Other devices sharing a segment with a device."""
+        return {
+            endpoint.device
+            for key in self._device_segments.get(device, ())
+            for endpoint in self._members[key]
+            if endpoint.device != device
+        }
+
+    def to_list(self) -> List[Dict]:
+        """Segments with their devices and endpoints, for output."""
+        return [
+            {
+                "segment": network_name(key),
+                "devices": list(
+                    dict.fromkeys(e.device for e in self._members[key])
+                ),
+                "endpoints": [e.to_dict() for e in self._members[key]],
+            }
+            for key in sorted(self._members)
+        ]
+
+    def to_graph(self, topology_graph=None) -> nx.Graph:
+        """
+        The bipartite device–segment graph.
+
+        Device nodes have kind="device" and bipartite=0, segment nodes are
+        named by their network and have kind="segment" and bipartite=1. A
+        member edge lists the interfaces and addresses of the device on the
+        segment.
+
+        Args:
+            topology_graph: Device graph (nx.Graph or CSRGraph) whose
+                devices and point-to-point links are added as well, so
+                paths can cross both links and segments
+
+        Returns:
+            A new nx.Graph
+        """
+        graph = nx.Graph()
+        if topology_graph is not None:
+            graph.add_nodes_from(
+                topology_graph, kind=DEVICE_NODE, bipartite=0
+            )
+            graph.add_edges_from(topology_graph.edges(data=True))
+        for key in sorted(self._members):
+            segment = network_name(key)
+            graph.add_node(segment, kind=SEGMENT_NODE, bipartite=1)
+            for endpoint in self._members[key]:
+                if endpoint.device not in graph:
+                    graph.add_node(
+                        endpoint.device, kind=DEVICE_NODE, bipartite=0
+                    )
+                member = graph.get_edge_data(endpoint.device, segment)
+                if member is None:
+                    member = {"interfaces": [], "ips": []}
+                    graph.add_edge(endpoint.device, segment, **member)
+                    member = graph[endpoint.device][segment]
+                member["interfaces"].append(endpoint.interface)
+                member["ips"].append(endpoint.ip)
+        return graph
+
+
+def segment_view(
+    segments: Optional[SegmentGraph], device: str
+) -> List[Dict]:
+    """The segments of a device with the other members, for output."""
+    if segments is None:
+        return []
+    view = []
+    for network in segments.segments_of(device):
+        members = segments.members(network)
+        view.append(
+            {
+                "segment": network,
+                "interfaces": [
+                    e.interface for e in members if e.device == device
+                ],
+                "members": [
+                    e.to_dict() for e in members if e.device != device
+                ],
+            }
+        )
+    return view
@@ -0,0 +1,801 @@
+#!/usr/bin/env python3
+"""
+Topology service: the IP topology graph kept up to date device by device.
+
+Every topology query (neighbors, path, segment, network topology) used to
+poll the interfaces of every device in the inventory and rebuild the graph
+from scratch. The service keeps the interface data of each device with the
+time it was fetched and, on a query, polls only the devices whose data is
+older than GNMIBUDDY_TOPOLOGY_TTL, new to the inventory, or invalidated
+(e.g. after a configuration change). The graph is rebuilt only when the
+subnets of a polled device changed or devices left the inventory.
+
+Questions about one device do not need the whole network to be fresh. The
+TopologyIndex (index.py), updated as devices are refreshed, names the
+candidate peers of a device, so neighbor queries refresh only the device and
+those peers, and path queries expand hop by hop from both ends until they
+meet. Segment and address lookups are answered from the same index.
+
+Networks with three or more endpoints (shared LANs) are not links of the
+graph but segments of a bipartite device–segment graph (segment_graph.py),
+rebuilt with the graph.
+
+With GNMIBUDDY_TOPOLOGY_CACHE enabled each refresh is also written as a
+compact topology snapshot (snapshot.py) in the state directory. A new
+service (a short-lived CLI run, a new MCP worker) loads the latest snapshot
+instead of polling: the graph, the index and the fetch time of every device
+come back as they were, and only devices whose data has since gone stale
+are polled. A new snapshot number is used whenever the topology changed.
+
+Links can also come from ISIS adjacencies and LLDP neighbors instead of
+(discovery="adjacency") or on top of (discovery="merged") the interface
+addresses; see adjacency.py. Adjacency data is kept and refreshed per
+device the same way, in memory only: snapshots hold the IP topology.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import networkx as nx
+
+from src.config.environment import get_settings
+from src.inventory.manager import InventoryManager
+from src.logging import get_logger
+from src.processors.topology_processor import extract_interface_subnets
+from src.schemas.responses import ErrorResponse
+from src.utils.parallel_execution import run_command_on_devices
+
+from .adjacency import (
+    DISCOVERY_IP,
+    DISCOVERY_MERGED,
+    DeviceAdjacencies,
+    NeighborResolver,
+    uses_adjacencies,
+    uses_ip,
+    validate_discovery,
+)
+from .csr import BACKEND_CSR, CSRGraph
+from .index import Endpoint, TopologyIndex, network_key
+from .segment_graph import SegmentGraph
+from .snapshot import SnapshotStore, TopologySnapshot, signature_hash
+from .utils import (
+    MGMT_INTERFACES,
+    TopologyBuildResult,
+    _get_adjacencies,
+    _get_interface,
+    build_adjacency_graph,
+    build_ip_only_graph_from_index,
+    build_segment_graph,
+)
+
+logger = get_logger(__name__)
+
+TOPOLOGY_SNAPSHOT_DIR = "topology_snapshots"
+
+
+@dataclass
+class _Refresh:
+    """Bookkeeping of one topology request."""
+
+    device_names: List[str]
+    max_workers: int
+    polled: List[str] = field(default_factory=list)
+    adjacency_polled: List[str] = field(default_factory=list)
+    error_devices: List[str] = field(default_factory=list)
+    error_response: Optional[ErrorResponse] = None
+    # Devices whose data the answer depends on, polled or not
+    considered: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class DeviceInterfaces:
+    """Interface data of one device as used for topology."""
+
+    fetched_at: float
+    signature: Tuple
+
+    @classmethod
+    def from_result(
+        cls, result: Dict[str, Any], fetched_at: float
+    ) -> "DeviceInterfaces":
+        return cls(fetched_at, _topology_signature(result))
+
+    @property
+    def available(self) -> bool:
+        """Whether the device reported interface data."""
+        return self.signature != ("feature_not_found",)
+
+
+def _topology_signature(result: Dict[str, Any]) -> Tuple:
+    """What the graph depends on: availability and (interface, IP, network)."""
+    if "feature_not_found" in result:
+        return ("feature_not_found",)
+    entries = extract_interface_subnets(
+        [dict(result, device=result.get("device_name"))]
+    )
+    return tuple(
+        sorted((e["interface"], e["ip"], e["network"]) for e in entries)
+    )
+
+
+class TopologyService:
+    """
+    In-memory IP topology graph refreshed per device.
+
+    The returned graph is shared between callers and must be treated as
+    read-only; a refresh replaces it instead of modifying it.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        snapshot_dir: Optional[Path] = None,
+        backend: Optional[str] = None,
+    ):
+        """
+        Args:
+            ttl: Seconds device data is reused (default: from settings)
+            snapshot_dir: Directory for topology snapshots (default: memory
+                only)
+            backend: "networkx" or "csr" graphs (default: from settings)
+        """
+        self.ttl = ttl
+        self.backend = backend or get_settings().get_topology_backend()
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        self.snapshot_version = 0
+        self.built_at: Optional[float] = None
+        # Device hashes and inventory of the last snapshot written
+        self._snapshot_key: Optional[Tuple] = None
+        # Held while reading or updating the state below, released while
+        # devices are polled so other queries are not blocked by a poll
+        self._lock = threading.Condition()
+        self._devices: Dict[str, DeviceInterfaces] = {}
+        # Devices some request is polling now
+        self._polling: Set[str] = set()
+        self._adjacency_polling: Set[str] = set()
+        # Device data changed since the graph was built
+        self._dirty = False
+        # Subnet and address lookups over the data above
+        self._index = TopologyIndex()
+        self._invalidated: Set[str] = set()
+        self._graph: Optional[Union[nx.Graph, CSRGraph]] = None
+        self._graph_devices: List[str] = []
+        self._segments: Optional[SegmentGraph] = None
+        self._adjacencies: Dict[str, DeviceAdjacencies] = {}
+        self._adjacency_invalidated: Set[str] = set()
+        # Bumped whenever adjacency data changes
+        self._adjacency_version = 0
+        # discovery -> (inputs it was built from, graph)
+        self._adjacency_graphs: Dict[str, Tuple[Tuple, Any]] = {}
+        self._load()
+
+    @classmethod
+    def default(cls) -> "TopologyService":
+        """Create a service, persisted in the state directory if enabled."""
+        settings = get_settings()
+        snapshot_dir = None
+        if settings.get_topology_cache_enabled():
+            snapshot_dir = settings.get_state_dir() / TOPOLOGY_SNAPSHOT_DIR
+        return cls(snapshot_dir=snapshot_dir)
+
+    @property
+    def graph(self) -> Optional[Union[nx.Graph, CSRGraph]]:
+        """The last built graph, without refreshing (None before a query)."""
+        return self._graph
+
+    @property
+    def segments(self) -> Optional[SegmentGraph]:
+        """Multi-access segments of the last built graph (None before)."""
+        return self._segments
+
+    @property
+    def index(self) -> TopologyIndex:
+        """The index of the current device data, without refreshing."""
+        return self._index
+
+    def invalidate(self, device_name: Optional[str] = None) -> None:
+        """
+        Poll a device (or every device) again on the next query.
+
+        Queries with refresh=True call this, so the devices they depend on
+        are polled whatever the age of their data.
+        """
+        with self._lock:
+            if device_name is None:
+                self._invalidated.update(self._devices)
+                self._adjacency_invalidated.update(self._adjacencies)
+            else:
+                self._invalidated.add(device_name)
+                self._adjacency_invalidated.add(device_name)
+
+    def get_graph(
+        self, max_workers: int = 10, discovery: str = DISCOVERY_IP
+    ) -> TopologyBuildResult:
+        """
+        Return the topology graph, polling only devices with stale data.
+
+        Args:
+            max_workers: Maximum devices polled concurrently
+            discovery: "ip" (interface addresses), "adjacency" (ISIS and
+                LLDP) or "merged" (both)
+
+        Returns:
+            TopologyBuildResult with the graph and the errors of this refresh
+
+        Raises:
+            ValueError: If discovery is not a known method
+        """
+        validate_discovery(discovery)
+        with self._lock:
+            refresh = _Refresh(self._inventory_devices(), max_workers)
+            if uses_ip(discovery):
+                self._refresh(refresh, refresh.device_names)
+            if uses_adjacencies(discovery):
+                self._refresh_adjacencies(refresh, refresh.device_names)
+            return self._result(refresh, discovery)
+
+    def get_neighborhood(
+        self,
+        device_name: str,
+        max_workers: int = 10,
+        discovery: str = DISCOVERY_IP,
+    ) -> TopologyBuildResult:
+        """
+        Return the topology graph with a device and its peers refreshed.
+
+        Only the device and the devices that shared one of its networks in
+        earlier data, or that its adjacencies name (or that have no data
+        yet), are polled when stale, so the cost follows the size of the
+        neighborhood, not of the network.
+
+        Raises:
+            ValueError: If discovery is not a known method
+        """
+        validate_discovery(discovery)
+        with self._lock:
+            refresh = _Refresh(self._inventory_devices(), max_workers)
+            if uses_ip(discovery):
+                self._refresh(refresh, [device_name])
+                peers = self._candidate_peers(refresh, {device_name})
+                self._refresh(refresh, peers)
+            if uses_adjacencies(discovery):
+                self._refresh_adjacencies(refresh, [device_name])
+                resolver = NeighborResolver(
+                    self._adjacencies, refresh.device_names, self._index
+                )
+                peers = self._with_unknown(
+                    refresh,
+                    resolver.neighbors_of(device_name),
+                    self._adjacencies,
+                )
+                self._refresh_adjacencies(refresh, peers)
+            return self._result(refresh, discovery)
+
+    def get_path_scope(
+        self, source: str, target: str, max_workers: int = 10
+    ) -> TopologyBuildResult:
+        """
+        Return the part of the graph explored between two devices.
+
+        Discovery expands breadth-first from both ends, one hop of the
+        smaller frontier at a time, refreshing only the candidate peers of
+        that frontier, until the two searches meet or one runs out. Every
+        shortest path between the devices, including paths across
+        multi-access segments, lies in the returned subgraph.
+        """
+        with self._lock:
+            refresh = _Refresh(self._inventory_devices(), max_workers)
+            self._refresh(refresh, [source, target])
+            visited = [{source}, {target}]
+            frontiers = [{source}, {target}]
+            while (
+                frontiers[0]
+                and frontiers[1]
+                and not visited[0] & visited[1]
+            ):
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                frontier = frontiers[side]
+                self._refresh(
+                    refresh, self._candidate_peers(refresh, frontier)
+                )
+                graph = self._current_graph(refresh)
+                reached = {
+                    peer
+                    for device in frontier
+                    if device in graph
+                    for peer in graph.neighbors(device)
+                }
+                # Crossing a shared segment is one hop as well
+                if self._segments is not None:
+                    for device in frontier:
+                        reached |= self._segments.peers_of(device)
+                frontiers[side] = reached - visited[side]
+                visited[side] |= frontiers[side]
+
+            result = self._result(refresh)
+            explored = visited[0] | visited[1]
+            result.graph = result.graph.subgraph(explored)
+            logger.debug(
+                "Path discovery %s -> %s explored %d devices",
+                source,
+                target,
+                len(explored),
+            )
+            return result
+
+    def get_segment(
+        self, network: str, max_workers: int = 10
+    ) -> Tuple[TopologyBuildResult, List[Endpoint]]:
+        """
+        Return the interface addresses on a network.
+
+        Only the devices known to be on the network (and devices without
+        data) are refreshed when stale.
+
+        Raises:
+            ValueError: If network is not an IPv4 or IPv6 prefix
+        """
+        network_key(network)
+        with self._lock:
+            refresh = _Refresh(self._inventory_devices(), max_workers)
+            self._refresh(
+                refresh,
+                self._with_unknown(refresh, self._index.devices_on(network)),
+            )
+            return self._result(refresh), self._index.endpoints(network)
+
+    def locate_address(
+        self, address: str, max_workers: int = 10
+    ) -> Tuple[TopologyBuildResult, Optional[Endpoint], Optional[str]]:
+        """
+        Find the interface configured with an address.
+
+        The device currently known to own the address (and devices without
+        data) are refreshed when stale before the lookup.
+
+        Returns:
+            The build result, the owning endpoint (if any) and the longest
+            known network containing the address (if any)
+
+        Raises:
+            ValueError: If address is not an IPv4 or IPv6 address
+        """
+        with self._lock:
+            owner = self._index.owner(address)
+            refresh = _Refresh(self._inventory_devices(), max_workers)
+            self._refresh(
+                refresh,
+                self._with_unknown(refresh, [owner.device] if owner else []),
+            )
+            return (
+                self._result(refresh),
+                self._index.owner(address),
+                self._index.containing_network(address),
+            )
+
+    def _refresh(self, refresh: _Refresh, device_names) -> None:
+        """Poll the devices among device_names whose data is stale."""
+        ttl = self.effective_ttl()
+        now = time.time()
+        inventory = set(refresh.device_names)
+        device_names = [
+            name for name in dict.fromkeys(device_names) if name in inventory
+        ]
+        refresh.considered.update(device_names)
+        due = [
+            name
+            for name in device_names
+            if name not in refresh.polled
+            and self._is_due(name, now, ttl)
+        ]
+        logger.debug(
+            "Topology refresh: %d of %d devices due",
+            len(due),
+            len(refresh.device_names),
+        )
+        if not due:
+            return
+        refresh.polled.extend(due)
+        self._invalidated.difference_update(due)
+        by_device, polled = self._poll(
+            _get_interface, due, refresh.max_workers, self._polling
+        )
+        for name in polled:
+            result = by_device.get(name) or {
+                "error": "No interface result",
+                "device_name": name,
+            }
+            if "error" in result:
+                refresh.error_devices.append(name)
+                if refresh.error_response is None:
+                    refresh.error_response = ErrorResponse(
+                        type="gNMIException",
+                        message=result.get("error", "Unknown error"),
+                    )
+                self._drop(name)
+                continue
+            self._store(name, DeviceInterfaces.from_result(result, now))
+
+    def _refresh_adjacencies(self, refresh: _Refresh, device_names) -> None:
+        """Poll the adjacencies of the devices whose data is stale."""
+        ttl = self.effective_ttl()
+        now = time.time()
+        inventory = set(refresh.device_names)
+        device_names = [
+            name for name in dict.fromkeys(device_names) if name in inventory
+        ]
+        refresh.considered.update(device_names)
+        due = [
+            name
+            for name in device_names
+            if name not in refresh.adjacency_polled
+            and self._adjacency_is_due(name, now, ttl)
+        ]
+        logger.debug(
+            "Adjacency refresh: %d of %d devices due",
+            len(due),
+            len(refresh.device_names),
+        )
+        if not due:
+            return
+        refresh.adjacency_polled.extend(due)
+        self._adjacency_invalidated.difference_update(due)
+        by_device, polled = self._poll(
+            _get_adjacencies,
+            due,
+            refresh.max_workers,
+            self._adjacency_polling,
+        )
+        for name in polled:
+            result = by_device.get(name) or {
+                "error": "No adjacency result",
+                "device_name": name,
+            }
+            previous = self._adjacencies.get(name)
+            if "error" in result:
+                if name not in refresh.error_devices:
+                    refresh.error_devices.append(name)
+                if refresh.error_response is None:
+                    refresh.error_response = ErrorResponse(
+                        type="gNMIException",
+                        message=result.get("error", "Unknown error"),
+                    )
+                if self._adjacencies.pop(name, None) is not None:
+                    self._adjacency_version += 1
+                continue
+            entry = DeviceAdjacencies.from_result(result, now)
+            self._adjacencies[name] = entry
+            if previous is None or previous.signature != entry.signature:
+                self._adjacency_version += 1
+
+    def _poll(
+        self,
+        func,
+        due: List[str],
+        max_workers: int,
+        polling: Set[str],
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Run func on the due devices without holding the lock.
+
+        Devices another request is already polling are not polled twice:
+        this request waits until that request has stored their data.
+
+        Returns:
+            The results by device name, and the devices polled here
+        """
+        mine = [name for name in due if name not in polling]
+        others = [name for name in due if name in polling]
+        results = []
+        if mine:
+            polling.update(mine)
+            self._lock.release()
+            try:
+                results = run_command_on_devices(
+                    func, mine, max_workers=max_workers
+                )
+            finally:
+                self._lock.acquire()
+                polling.difference_update(mine)
+                self._lock.notify_all()
+        if others:
+            self._lock.wait_for(lambda: polling.isdisjoint(others))
+        by_device = {
+            result.get("device_name") or result.get("device"): result
+            for result in results
+            if isinstance(result, dict)
+        }
+        return by_device, mine
+
+    def _candidate_peers(
+        self, refresh: _Refresh, devices: Set[str]
+    ) -> List[str]:
+        """Devices that may share a network with the given devices."""
+        candidates = set()
+        for device in devices:
+            candidates.update(self._index.peers_of(device, MGMT_INTERFACES))
+        return self._with_unknown(refresh, candidates - set(devices))
+
+    def _with_unknown(
+        self,
+        refresh: _Refresh,
+        candidates: Iterable[str],
+        known: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        """Candidates plus devices without data, which could be anywhere."""
+        wanted = set(candidates)
+        known = self._devices if known is None else known
+        return [
+            name
+            for name in refresh.device_names
+            if name in wanted or name not in known
+        ]
+
+    def _store(self, name: str, entry: DeviceInterfaces) -> bool:
+        """Keep a device's data; returns whether its topology changed."""
+        previous = self._devices.get(name)
+        self._devices[name] = entry
+        if previous is not None and previous.signature == entry.signature:
+            return False
+        self._dirty = True
+        if not entry.available:
+            self._index.remove_device(name)
+        else:
+            self._index.set_device(
+                name,
+                (
+                    {"interface": interface, "ip": ip, "network": network}
+                    for interface, ip, network in entry.signature
+                ),
+            )
+        return True
+
+    def _drop(self, name: str) -> bool:
+        """Forget a device's data; returns whether there was any."""
+        if name not in self._devices:
+            return False
+        self._index.remove_device(name)
+        del self._devices[name]
+        self._dirty = True
+        return True
+
+    def _current_graph(
+        self, refresh: _Refresh
+    ) -> Union[nx.Graph, CSRGraph]:
+        """The graph of the current data, rebuilt if it changed."""
+        removed = set(self._devices) - set(refresh.device_names)
+        for name in removed:
+            self._drop(name)
+        if (
+            self._dirty
+            or self._graph is None
+            or self._graph_devices != refresh.device_names
+        ):
+            self._rebuild(refresh.device_names)
+            self._dirty = False
+        return self._graph
+
+    def _result(
+        self, refresh: _Refresh, discovery: str = DISCOVERY_IP
+    ) -> TopologyBuildResult:
+        if uses_ip(discovery):
+            built_at = self.built_at
+            graph = self._current_graph(refresh)
+            if refresh.polled or self.built_at != built_at:
+                self._save()
+        if uses_adjacencies(discovery):
+            graph = self._adjacency_graph(refresh, discovery)
+
+        available = sum(
+            1
+            for name in refresh.device_names
+            if (uses_ip(discovery) and self._available(name))
+            or (uses_adjacencies(discovery) and self._adjacent(name))
+        )
+        error_count = len(refresh.error_devices)
+        total_devices = available + error_count
+        self._warn_on_failures(error_count, total_devices)
+
+        fetched = [
+            entries[name].fetched_at
+            for entries, used in (
+                (self._devices, uses_ip(discovery)),
+                (self._adjacencies, uses_adjacencies(discovery)),
+            )
+            if used
+            for name in refresh.considered
+            if name in entries
+        ]
+
+        return TopologyBuildResult(
+            graph=graph,
+            has_errors=bool(refresh.error_devices),
+            error_devices=refresh.error_devices,
+            total_devices=total_devices,
+            error_response=refresh.error_response,
+            refreshed_devices=list(
+                dict.fromkeys(refresh.polled + refresh.adjacency_polled)
+            ),
+            built_at=self.built_at,
+            index=self._index,
+            segments=self._segments,
+            fetched_at=min(fetched) if fetched else None,
+        )
+
+    def _adjacency_graph(
+        self, refresh: _Refresh, discovery: str
+    ) -> Union[nx.Graph, CSRGraph]:
+        """The adjacency (or merged) graph, rebuilt if its inputs changed."""
+        for name in set(self._adjacencies) - set(refresh.device_names):
+            del self._adjacencies[name]
+            self._adjacency_version += 1
+        inputs = (
+            self._adjacency_version,
+            self.built_at,
+            tuple(refresh.device_names),
+        )
+        cached = self._adjacency_graphs.get(discovery)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        merged = discovery == DISCOVERY_MERGED
+        nodes = [
+            name
+            for name in refresh.device_names
+            if self._adjacent(name) or (merged and self._available(name))
+        ]
+        graph = build_adjacency_graph(
+            self._adjacencies,
+            nodes,
+            self._index,
+            self.backend,
+            include_ip=merged,
+        )
+        self._adjacency_graphs[discovery] = (inputs, graph)
+        return graph
+
+    def _available(self, name: str) -> bool:
+        """Whether a device reported interface data."""
+        return name in self._devices and self._devices[name].available
+
+    def _adjacent(self, name: str) -> bool:
+        """Whether a device reported ISIS or LLDP data."""
+        return (
+            name in self._adjacencies and self._adjacencies[name].available
+        )
+
+    def effective_ttl(self) -> float:
+        """Seconds device data is reused (the ttl argument or the setting)."""
+        if self.ttl is not None:
+            return self.ttl
+        return get_settings().get_topology_ttl()
+
+    def _is_due(self, name: str, now: float, ttl: float) -> bool:
+        entry = self._devices.get(name)
+        return (
+            entry is None
+            or name in self._invalidated
+            or now - entry.fetched_at >= ttl
+        )
+
+    def _adjacency_is_due(self, name: str, now: float, ttl: float) -> bool:
+        entry = self._adjacencies.get(name)
+        return (
+            entry is None
+            or name in self._adjacency_invalidated
+            or now - entry.fetched_at >= ttl
+        )
+
+    @staticmethod
+    def _inventory_devices() -> List[str]:
+        InventoryManager.initialize()
+        return [d.name for d in InventoryManager.list_devices().devices]
+
+    def _rebuild(self, device_names: List[str]) -> None:
+        nodes = [name for name in device_names if self._available(name)]
+        self._graph = build_ip_only_graph_from_index(
+            self._index, nodes, self.backend
+        )
+        self._segments = build_segment_graph(self._index, nodes)
+        self._graph_devices = list(device_names)
+        self.built_at = time.time()
+        logger.debug(
+            "Rebuilt topology graph: %d nodes, %d edges",
+            self._graph.number_of_nodes(),
+            self._graph.number_of_edges(),
+        )
+
+    @staticmethod
+    def _warn_on_failures(error_count: int, total_devices: int) -> None:
+        if total_devices > 0 and error_count > 0:
+            error_percentage = (error_count / total_devices) * 100
+            if error_percentage >= 25:  # Warn if 25% or more failed
+                logger.warning(
+                    "High interface collection failure rate: %d/%d devices failed (%.1f%%) - topology may be incomplete",
+                    error_count,
+                    total_devices,
+                    error_percentage,
+                )
+
+    def _load(self) -> None:
+        """Restore devices, index and graph from the latest snapshot."""
+        if self.snapshots is None:
+            return
+        versions = self.snapshots.versions()
+        if not versions:
+            return
+        snapshot = self.snapshots.load(versions[-1])
+        if snapshot is None:
+            return
+        fetched_at = {d.name: d.fetched_at for d in snapshot.devices}
+        for name, signature in snapshot.device_signatures().items():
+            self._store(name, DeviceInterfaces(fetched_at[name], signature))
+        if self.backend == BACKEND_CSR:
+            self._graph = snapshot.to_csr()
+        else:
+            self._graph = snapshot.to_graph()
+        self._segments = build_segment_graph(self._index, list(self._graph))
+        self._graph_devices = list(snapshot.inventory)
+        self.built_at = snapshot.built_at
+        self.snapshot_version = snapshot.version
+        self._snapshot_key = self._current_snapshot_key()
+        self._dirty = False
+        logger.debug(
+            "Loaded topology snapshot %d: %d devices, %d links",
+            snapshot.version,
+            len(snapshot.devices),
+            snapshot.edge_count,
+        )
+
+    def _save(self) -> None:
+        """Write the current state as a snapshot, numbered anew if changed."""
+        if self.snapshots is None or self._graph is None:
+            return
+        key = self._current_snapshot_key()
+        changed = key != self._snapshot_key
+        version = self.snapshots.save(
+            TopologySnapshot.build(
+                version=self.snapshot_version,
+                built_at=self.built_at,
+                graph=self._graph,
+                devices=(
+                    (name, entry.fetched_at, entry.signature)
+                    for name, entry in self._devices.items()
+                ),
+                inventory=self._graph_devices,
+            ),
+            new_version=changed,
+        )
+        if changed and version is not None:
+            self.snapshot_version = version
+            self._snapshot_key = key
+
+    def _current_snapshot_key(self) -> Tuple:
+        hashes = tuple(
+            sorted(
+                (name, signature_hash(entry.signature))
+                for name, entry in self._devices.items()
+            )
+        )
+        return hashes, tuple(self._graph_devices)
+
+
+_service: Optional[TopologyService] = None
+_service_lock = threading.Lock()
+
+
+def get_topology_service() -> TopologyService:
+    """Return the process-wide topology service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TopologyService.default()
+        return _service
+
+
+def reset_topology_service() -> None:
+    """Drop the process-wide topology service (primarily for tests)."""
+    global _service
+    with _service_lock:
+        _service = None
@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+Compact, versioned snapshots of the IP topology.
+
+A snapshot holds everything the topology service needs to answer queries
+after a restart without polling: the node table, an edge table with the
+interface and IP attributes of each link, the address table the topology
+index is built from, and per device the time its data was fetched and a
+hash of that data. Strings are interned in one table and every other
+column is an array of integers, stored as raw little-endian bytes, so
+loading is mostly ``array.frombytes``.
+
+File layout: ``GBTS`` magic, a 2-byte format version, then a zlib
+compressed body of a 4-byte header length, a JSON header (scalars, string
+table and per-device columns) and the integer columns.
+
+Snapshots are numbered; a new number is used whenever the topology
+changed, so consecutive snapshots can be diffed. Numbers are allocated
+from the files in the directory when a snapshot is saved, so several
+processes can share one snapshot directory.
+"""
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+
+from src.logging import get_logger
+
+from .csr import EDGE_ATTRIBUTES, CSRGraph, StringTable
+
+logger = get_logger(__name__)
+
+MAGIC = b"GBTS"
+FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".gbts"
+DEFAULT_KEEP = 20
+# Compressed bytes decompressed at a time when reading only the header
+HEADER_CHUNK = 16 * 1024
+
+ADDRESS_COLUMNS = ("device", "interface", "ip", "network")
+EDGE_COLUMNS = ("source", "target") + EDGE_ATTRIBUTES
+
+Signature = Tuple
+
+
+def signature_hash(signature: Signature) -> str:
+    """Short, stable hash of a device's topology data."""
+    encoded = json.dumps(list(signature), separators=(",", ":")).encode()
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+@dataclass
+class SnapshotDevice:
+    """Per-device row of a snapshot."""
+
+    name: str
+    fetched_at: float
+    hash: str
+    available: bool = True
+
+
+@dataclass
+class TopologySnapshot:
+    """Node, edge, address and device tables of one topology version."""
+
+    version: int
+    built_at: float
+    nodes: List[str]
+    devices: List[SnapshotDevice]
+    strings: List[str]
+    # Column name -> array of string ids (nodes ids for source/target)
+    addresses: Dict[str, array] = field(default_factory=dict)
+    edges: Dict[str, array] = field(default_factory=dict)
+    # Devices the graph was built for, in inventory order
+    inventory: List[str] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        built_at: float,
+        graph: nx.Graph,
+        devices: Iterable[Tuple[str, float, Signature]],
+        inventory: Optional[List[str]] = None,
+    ) -> "TopologySnapshot":
+        """
+        Create a snapshot from a topology graph and per-device data.
+
+        Args:
+            version: Snapshot number
+            built_at: When the graph was built (epoch seconds)
+            graph: IP-only topology graph
+            devices: (name, fetched_at, signature) per device, where the
+                signature is a tuple of (interface, ip, network) or
+                ("feature_not_found",)
+            inventory: Devices the graph was built for (default: nodes)
+        """
+        strings = StringTable()
+        nodes = list(graph.nodes)
+        node_ids = {node: i for i, node in enumerate(nodes)}
+        addresses = {name: array("I") for name in ADDRESS_COLUMNS}
+        device_rows = []
+        for name, fetched_at, signature in devices:
+            available = signature != ("feature_not_found",)
+            device_rows.append(
+                SnapshotDevice(
+                    name=name,
+                    fetched_at=fetched_at,
+                    hash=signature_hash(signature),
+                    available=available,
+                )
+            )
+            if not available:
+                continue
+            device_id = strings.intern(name)
+            for interface, ip, network in signature:
+                addresses["device"].append(device_id)
+                addresses["interface"].append(strings.intern(interface))
+                addresses["ip"].append(strings.intern(ip))
+                addresses["network"].append(strings.intern(network))
+
+        edges = {name: array("I") for name in EDGE_COLUMNS}
+        for source, target, attributes in graph.edges(data=True):
+            edges["source"].append(node_ids[source])
+            edges["target"].append(node_ids[target])
+            for name in EDGE_ATTRIBUTES:
+                edges[name].append(
+                    strings.intern(str(attributes.get(name, "")))
+                )
+        return cls(
+            version=version,
+            built_at=built_at,
+            nodes=nodes,
+            devices=device_rows,
+            strings=strings.strings,
+            addresses=addresses,
+            edges=edges,
+            inventory=list(inventory if inventory is not None else nodes),
+        )
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edges.get("source", ()))
+
+    def device_signatures(self) -> Dict[str, Signature]:
+        """Topology data per device, as the topology service keeps it."""
+        rows: Dict[str, List[Tuple[str, str, str]]] = {}
+        columns = [self.addresses[name] for name in ADDRESS_COLUMNS]
+        for device_id, interface, ip, network in zip(*columns):
+            rows.setdefault(self.strings[device_id], []).append(
+                (
+                    self.strings[interface],
+                    self.strings[ip],
+                    self.strings[network],
+                )
+            )
+        return {
+            device.name: (
+                tuple(sorted(rows.get(device.name, ())))
+                if device.available
+                else ("feature_not_found",)
+            )
+            for device in self.devices
+        }
+
+    def edge_rows(self) -> Iterable[Tuple[str, str, Dict[str, str]]]:
+        """(source, target, attributes) per edge."""
+        strings = self.strings
+        attribute_columns = [self.edges[name] for name in EDGE_ATTRIBUTES]
+        for source, target, *values in zip(
+            self.edges["source"], self.edges["target"], *attribute_columns
+        ):
+            yield (
+                self.nodes[source],
+                self.nodes[target],
+                {
+                    name: strings[value]
+                    for name, value in zip(EDGE_ATTRIBUTES, values)
+                },
+            )
+
+    def to_graph(self) -> nx.Graph:
+        """The topology as a NetworkX graph."""
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(self.edge_rows())
+        return graph
+
+    def to_csr(self) -> CSRGraph:
+        """The topology as an array-backed graph, sharing these tables."""
+        return CSRGraph.from_snapshot(self)
+
+    def adjacency(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Lighter view: node -> [(neighbor, edge row)], without NetworkX."""
+        adjacency: Dict[str, List[Tuple[str, int]]] = {
+            node: [] for node in self.nodes
+        }
+        for row, (source, target) in enumerate(
+            zip(self.edges["source"], self.edges["target"])
+        ):
+            source_name, target_name = self.nodes[source], self.nodes[target]
+            adjacency[source_name].append((target_name, row))
+            if source != target:
+                adjacency[target_name].append((source_name, row))
+        return adjacency
+
+    def diff(self, previous: "TopologySnapshot") -> Dict[str, Any]:
+        """
+        Changes from a previous snapshot to this one.
+
+        Links are identified by their two devices and network; a link whose
+        interfaces or addresses differ is reported as changed. The edge
+        tables are compared as integers: the previous snapshot's node and
+        string ids are mapped to this snapshot's once, and only the links
+        in the delta are decoded to strings.
+        """
+        # Unchanged tables (the common case) need no translation
+        old_links = previous._link_keys(
+            _id_map(previous.nodes, self.nodes)
+            if previous.nodes != self.nodes
+            else None,
+            _id_map(previous.strings, self.strings)
+            if previous.strings != self.strings
+            else None,
+        )
+        new_links = self._link_keys()
+        old_hashes = {d.name: d.hash for d in previous.devices}
+        new_hashes = {d.name: d.hash for d in self.devices}
+        return {
+            "from_version": previous.version,
+            "to_version": self.version,
+            "added_nodes": sorted(set(self.nodes) - set(previous.nodes)),
+            "removed_nodes": sorted(set(previous.nodes) - set(self.nodes)),
+            "added_links": [
+                self.link(row)
+                for key, (row, _) in new_links.items()
+                if key not in old_links
+            ],
+            "removed_links": [
+                previous.link(row)
+                for key, (row, _) in old_links.items()
+                if key not in new_links
+            ],
+            "changed_links": [
+                {
+                    "before": previous.link(old_links[key][0]),
+                    "after": self.link(row),
+                }
+                for key, (row, ends) in new_links.items()
+                if key in old_links and old_links[key][1] != ends
+            ],
+            "changed_devices": sorted(
+                name
+                for name, device_hash in new_hashes.items()
+                if name in old_hashes and old_hashes[name] != device_hash
+            ),
+        }
+
+    def link(self, row: int) -> Dict[str, Any]:
+        """One edge as {source, target, attributes}."""
+        return {
+            "source": self.nodes[self.edges["source"][row]],
+            "target": self.nodes[self.edges["target"][row]],
+            "attributes": {
+                name: self.strings[self.edges[name][row]]
+                for name in EDGE_ATTRIBUTES
+            },
+        }
+
+    def _link_keys(
+        self,
+        node_ids: Optional[List[int]] = None,
+        string_ids: Optional[List[int]] = None,
+    ) -> Dict[Tuple[int, int, int], Tuple[int, Tuple]]:
+        """
+        Integer (devices, network) key -> (row, ends) of every edge.
+
+        The ends, the (device, interface, IP) of both sides in a fixed
+        order, tell whether a link with the same key changed. Ids are
+        translated with node_ids / string_ids when given.
+        """
+        columns = [self.edges[name] for name in EDGE_COLUMNS]
+        if node_ids is not None:
+            columns[:2] = [[node_ids[i] for i in c] for c in columns[:2]]
+        if string_ids is not None:
+            columns[2:] = [[string_ids[i] for i in c] for c in columns[2:]]
+        names = dict(zip(EDGE_COLUMNS, columns))
+        keys = {}
+        for row, (source, target, network, *interfaces) in enumerate(
+            zip(
+                names["source"],
+                names["target"],
+                names["network"],
+                names["local_interface"],
+                names["local_ip"],
+                names["remote_interface"],
+                names["remote_ip"],
+            )
+        ):
+            local = (source, interfaces[0], interfaces[1])
+            remote = (target, interfaces[2], interfaces[3])
+            key = (min(source, target), max(source, target), network)
+            ends = (local, remote) if local <= remote else (remote, local)
+            keys[key] = (row, ends)
+        return keys
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the compact snapshot format."""
+        header = {
+            "version": self.version,
+            "built_at": self.built_at,
+            "nodes": self.nodes,
+            "inventory": self.inventory,
+            "strings": self.strings,
+            "devices": {
+                "name": [d.name for d in self.devices],
+                "fetched_at": [d.fetched_at for d in self.devices],
+                "hash": [d.hash for d in self.devices],
+                "available": [int(d.available) for d in self.devices],
+            },
+            "address_rows": len(self.addresses.get("device", ())),
+            "edge_rows": self.edge_count,
+        }
+        encoded_header = json.dumps(header, separators=(",", ":")).encode()
+        columns = [self.addresses[name] for name in ADDRESS_COLUMNS]
+        columns += [self.edges[name] for name in EDGE_COLUMNS]
+        body = [struct.pack(">I", len(encoded_header)), encoded_header]
+        for column in columns:
+            body.append(_little_endian(column).tobytes())
+        return (
+            MAGIC
+            + struct.pack(">H", FORMAT_VERSION)
+            + zlib.compress(b"".join(body))
+        )
+
+    @staticmethod
+    def read_header(data: bytes) -> Dict[str, Any]:
+        """
+        Read only the JSON header of serialized snapshot data.
+
+        Decompresses just enough of the body to reach the end of the
+        header, skipping the integer columns.
+
+        Raises:
+            ValueError: If the data is not a supported snapshot
+        """
+        _check_format(data)
+        decompressor = zlib.decompressobj()
+        body = b""
+        offset = 6
+        try:
+            while True:
+                if len(body) >= 4:
+                    (header_length,) = struct.unpack(">I", body[:4])
+                    if len(body) >= 4 + header_length:
+                        return json.loads(body[4 : 4 + header_length])
+                chunk = data[offset : offset + HEADER_CHUNK]
+                if not chunk:
+                    raise ValueError("Truncated topology snapshot")
+                offset += len(chunk)
+                body += decompressor.decompress(chunk)
+        except zlib.error as e:
+            raise ValueError(f"Corrupt topology snapshot: {e}") from e
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TopologySnapshot":
+        """
+        Load a snapshot serialized with to_bytes.
+
+        Raises:
+            ValueError: If the data is not a supported snapshot
+        """
+        _check_format(data)
+        try:
+            body = zlib.decompress(data[6:])
+        except zlib.error as e:
+            raise ValueError(f"Corrupt topology snapshot: {e}") from e
+        (header_length,) = struct.unpack(">I", body[:4])
+        header = json.loads(body[4 : 4 + header_length])
+        offset = 4 + header_length
+
+        def read_columns(names, rows):
+            nonlocal offset
+            columns = {}
+            for name in names:
+                column = array("I")
+                size = rows * column.itemsize
+                column.frombytes(body[offset : offset + size])
+                offset += size
+                columns[name] = _little_endian(column)
+            return columns
+
+        addresses = read_columns(ADDRESS_COLUMNS, header["address_rows"])
+        edges = read_columns(EDGE_COLUMNS, header["edge_rows"])
+        device_columns = header["devices"]
+        devices = [
+            SnapshotDevice(name, fetched_at, device_hash, bool(available))
+            for name, fetched_at, device_hash, available in zip(
+                device_columns["name"],
+                device_columns["fetched_at"],
+                device_columns["hash"],
+                device_columns["available"],
+            )
+        ]
+        return cls(
+            version=header["version"],
+            built_at=header["built_at"],
+            nodes=header["nodes"],
+            devices=devices,
+            strings=header["strings"],
+            addresses=addresses,
+            edges=edges,
+            inventory=header["inventory"],
+        )
+
+
+def _check_format(data: bytes) -> None:
+    if data[:4] != MAGIC:
+        raise ValueError("Not a topology snapshot")
+    (format_version,) = struct.unpack(">H", data[4:6])
+    if format_version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {format_version}"
+        )
+
+
+def _id_map(old: List[str], new: List[str]) -> List[int]:
+    """
+    Map the ids of one table to the ids of the same values in another.
+
+    Values missing from the new table get distinct negative ids, so they
+    never match anything.
+    """
+    lookup = {value: i for i, value in enumerate(new)}
+    return [lookup.get(value, -1 - i) for i, value in enumerate(old)]
+
+
+def _little_endian(column: array) -> array:
+    """The column in little-endian order (swapping is its own inverse)."""
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+class SnapshotStore:
+    """Numbered topology snapshots in a directory, oldest pruned."""
+
+    def __init__(self, root: Path, keep: int = DEFAULT_KEEP):
+        self.root = Path(root)
+        self.keep = keep
+
+    def versions(self) -> List[int]:
+        """Stored snapshot numbers, oldest first."""
+        if not self.root.is_dir():
+            return []
+        versions = []
+        for path in self.root.glob(f"*{SNAPSHOT_SUFFIX}"):
+            if path.stem.isdigit():
+                versions.append(int(path.stem))
+        return sorted(versions)
+
+    def path(self, version: int) -> Path:
+        return self.root / f"{version:08d}{SNAPSHOT_SUFFIX}"
+
+    def load(
+        self, version: Optional[int] = None
+    ) -> Optional[TopologySnapshot]:
+        """
+        Load a snapshot, the latest when no version is given.
+
+        Returns:
+            The snapshot, or None if it does not exist or cannot be read
+        """
+        if version is None:
+            versions = self.versions()
+            if not versions:
+                return None
+            version = versions[-1]
+        path = self.path(version)
+        try:
+            return TopologySnapshot.from_bytes(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.warning("Could not load topology snapshot %s: %s", path, e)
+            return None
+
+    def header(self, version: int) -> Optional[Dict[str, Any]]:
+        """
+        The header (version, built_at, nodes, ...) of a stored snapshot.
+
+        Returns:
+            The header, or None if it does not exist or cannot be read
+        """
+        path = self.path(version)
+        try:
+            return TopologySnapshot.read_header(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Could not read topology snapshot %s: %s", path, e)
+            return None
+
+    def version_at(self, timestamp: float) -> Optional[int]:
+        """
+        The snapshot that was current at a time: the newest one built at
+        or before it (None if all are newer).
+        """
+        for version in reversed(self.versions()):
+            header = self.header(version)
+            built_at = header.get("built_at") if header else None
+            if built_at is not None and built_at <= timestamp:
+                return version
+        return None
+
+    def save(
+        self, snapshot: TopologySnapshot, new_version: bool = False
+    ) -> Optional[int]:
+        """
+        Write a snapshot.
+
+        The file is written under a unique temporary name first, so
+        processes sharing the directory never write into the same file.
+
+        Args:
+            snapshot: Snapshot to write
+            new_version: Number the snapshot after the newest stored one
+                instead of replacing the one with its own number. The
+                number is claimed with an exclusive create, so concurrent
+                writers never get the same one.
+
+        Returns:
+            The number the snapshot was stored under, or None on error
+        """
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if new_version:
+                version = self._save_new(snapshot)
+            else:
+                version = snapshot.version
+                os.replace(self._write_temporary(snapshot), self.path(version))
+        except OSError as e:
+            logger.warning(
+                "Could not save topology snapshot in %s: %s", self.root, e
+            )
+            return None
+        for old_version in self.versions()[: -self.keep or None]:
+            try:
+                self.path(old_version).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("Could not prune topology snapshot: %s", e)
+        return version
+
+    def _save_new(self, snapshot: TopologySnapshot) -> int:
+        """Store a snapshot under the next free number."""
+        while True:
+            versions = self.versions()
+            version = versions[-1] + 1 if versions else 1
+            snapshot = replace(snapshot, version=version)
+            temporary = self._write_temporary(snapshot)
+            try:
+                # Fails if another writer claimed the number meanwhile
+                os.link(temporary, self.path(version))
+                return version
+            except FileExistsError:
+                continue
+            finally:
+                temporary.unlink(missing_ok=True)
+
+    def _write_temporary(self, snapshot: TopologySnapshot) -> Path:
+        with tempfile.NamedTemporaryFile(
+            dir=self.root, suffix=".tmp", delete=False
+        ) as f:
+            temporary = Path(f.name)
+            try:
+                f.write(snapshot.to_bytes())
+            except BaseException:
+                f.close()
+                temporary.unlink(missing_ok=True)
+                raise
+        return temporary
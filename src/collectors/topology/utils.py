@@ -1,20 +1,46 @@
-from dataclasses import dataclass
-from collections import defaultdict
-from typing import Dict, Any, List, Union, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union, Optional
 
 import networkx as nx
 
 from src.logging import get_logger
 from src.inventory.manager import InventoryManager
-from src.collectors.routing import get_routing_info
-from src.collectors.interfaces import get_interfaces
+from src.collectors.routing import get_routing_info, isis_request
+from src.collectors.interfaces import InterfaceView, get_interfaces
 from src.schemas.models import Device, DeviceErrorResult
-from src.schemas.responses import OperationStatus, ErrorResponse
-from src.utils.parallel_execution import run_command_on_all_devices
-from src.processors.topology_processor import extract_interface_subnets
+from src.schemas.responses import (
+    OperationStatus,
+    ErrorResponse,
+    FeatureNotFoundResponse,
+)
+from src.gnmi.client import get_gnmi_data
+from src.processors.protocols.isis.isis_processor import (
+    extract_isis_interface_metrics,
+    extract_isis_topology,
+)
+from src.processors.topology_processor import (
+    extract_lldp_neighbors,
+    format_network,
+    parse_interface_addresses,
+)
+
+from .adjacency import (
+    DISCOVERY_IP,
+    DeviceAdjacencies,
+    adjacency_links,
+    isis_adjacency_request,
+    lldp_neighbor_request,
+)
+from .csr import BACKEND_CSR, BACKEND_NETWORKX, CSRGraph
+from .index import TopologyIndex, network_name
+from .segment_graph import SegmentGraph
 
 logger = get_logger(__name__)
 
+# Management interfaces never form topology links
+MGMT_INTERFACES = frozenset({"MgmtEth0/RP0/CPU0/0"})
+
 
 @dataclass
 class TopologyBuildResult:
@@ -22,18 +48,46 @@ class TopologyBuildResult:
     Result of topology building operation containing both the graph and error information.
 
     Attributes:
-        graph: NetworkX graph representing the topology
+        graph: NetworkX (or CSRGraph) graph representing the topology
         has_errors: Whether errors occurred during interface collection
         error_devices: List of device names that encountered errors
         total_devices: Total number of devices processed
         error_response: First ErrorResponse encountered, if any
+        refreshed_devices: Devices polled to answer this request
+        built_at: When the graph was last rebuilt (epoch seconds)
+        index: Subnet and address index the graph was built from
+        segments: Multi-access segments (3+ endpoints) of the index, which
+            the graph has no links for
+        fetched_at: When the oldest device data the answer depends on was
+            fetched (epoch seconds)
     """
 
-    graph: nx.Graph
+    graph: Union[nx.Graph, CSRGraph]
     has_errors: bool
     error_devices: List[str]
     total_devices: int
     error_response: Optional[ErrorResponse] = None
+    refreshed_devices: List[str] = field(default_factory=list)
+    built_at: Optional[float] = None
+    index: Optional[TopologyIndex] = None
+    segments: Optional[SegmentGraph] = None
+    fetched_at: Optional[float] = None
+
+
+def data_age_metadata(
+    result: Optional[TopologyBuildResult],
+) -> Dict[str, Any]:
+    """When the graph was built and how old the data behind an answer is."""
+    if result is None:
+        return {}
+    age = None
+    if result.fetched_at is not None:
+        age = round(max(time.time() - result.fetched_at, 0.0), 1)
+    return {
+        "built_at": result.built_at,
+        "data_fetched_at": result.fetched_at,
+        "data_age_seconds": age,
+    }
 
 
 def build_ip_only_graph_from_interface_results(interface_results) -> nx.Graph:
@@ -78,86 +132,61 @@ def build_ip_only_graph_from_interface_results(interface_results) -> nx.Graph:
         "Added %d nodes to topology graph", topology_graph.number_of_nodes()
     )
 
-    ip_subnet_entries = extract_interface_subnets(interface_results)
-    logger.debug("Extracted %d IP subnet entries", len(ip_subnet_entries))
-
-    mgmt_names = {"MgmtEth0/RP0/CPU0/0"}
-    ip_subnet_entries = [
-        entry
-        for entry in ip_subnet_entries
-        if entry["interface"] not in mgmt_names
-    ]
-    logger.debug(
-        "After filtering management interfaces: %d subnet entries",
-        len(ip_subnet_entries),
-    )
-
-    network_to_interface_entries: Dict[str, List[Dict[str, Any]]] = (
-        defaultdict(list)
-    )
-    for interface_entry in ip_subnet_entries:
-        device = interface_entry.get("device") or interface_entry.get(
-            "device_name"
-        )
-        if not device or not interface_entry.get("network"):
-            continue
-        interface_entry["device"] = device
-        network_to_interface_entries[interface_entry["network"]].append(
-            interface_entry
-        )
-
+    address_table = parse_interface_addresses(interface_results)
+    logger.debug("Extracted %d IP subnet entries", len(address_table))
+
+    mgmt_names = MGMT_INTERFACES
+    network_to_rows = {
+        key: [
+            row
+            for row in rows
+            if address_table.interfaces[row] not in mgmt_names
+        ]
+        for key, rows in address_table.group_by_network().items()
+    }
     logger.debug(
         "Grouped interfaces into %d unique networks",
-        len(network_to_interface_entries),
+        len(network_to_rows),
     )
 
     connections_added = 0
-    for network, interface_entry_list in network_to_interface_entries.items():
-        if len(interface_entry_list) == 2:
-            endpoint_a = interface_entry_list[0]
-            endpoint_b = interface_entry_list[1]
-            if (
-                endpoint_a.get("interface") in mgmt_names
-                or endpoint_b.get("interface") in mgmt_names
-            ):
-                continue
-
-            # Determine source/target based on device order in input
-            device_a_order = device_order.get(
-                endpoint_a["device"], float("inf")
-            )
-            device_b_order = device_order.get(
-                endpoint_b["device"], float("inf")
-            )
+    for key, rows in network_to_rows.items():
+        if len(rows) != 2:
+            continue
+        row_a, row_b = rows
 
-            if device_a_order < device_b_order:
-                source_endpoint, target_endpoint = endpoint_a, endpoint_b
-            elif device_a_order > device_b_order:
-                source_endpoint, target_endpoint = endpoint_b, endpoint_a
-            else:
-                # Same device order (including self-loops), use original order
-                source_endpoint, target_endpoint = endpoint_a, endpoint_b
-
-            topology_graph.add_edge(
-                source_endpoint["device"],
-                target_endpoint["device"],
-                network=network,
-                local_interface=source_endpoint["interface"],
-                remote_interface=target_endpoint["interface"],
-                local_ip=source_endpoint["ip"],
-                remote_ip=target_endpoint["ip"],
-            )
-            connections_added += 1
-
-            logger.debug(
-                "Added connection %d: %s (%s) <-> %s (%s) on network %s",
-                connections_added,
-                source_endpoint["device"],
-                source_endpoint["interface"],
-                target_endpoint["device"],
-                target_endpoint["interface"],
-                network,
-            )
+        # Determine source/target based on device order in input
+        device_a_order = device_order.get(
+            address_table.devices[row_a], float("inf")
+        )
+        device_b_order = device_order.get(
+            address_table.devices[row_b], float("inf")
+        )
+        if device_a_order > device_b_order:
+            row_a, row_b = row_b, row_a
+        # Same device order (including self-loops) keeps the original order
+
+        network = format_network(key)
+        topology_graph.add_edge(
+            address_table.devices[row_a],
+            address_table.devices[row_b],
+            network=network,
+            local_interface=address_table.interfaces[row_a],
+            remote_interface=address_table.interfaces[row_b],
+            local_ip=address_table.ips[row_a],
+            remote_ip=address_table.ips[row_b],
+        )
+        connections_added += 1
+
+        logger.debug(
+            "Added connection %d: %s (%s) <-> %s (%s) on network %s",
+            connections_added,
+            address_table.devices[row_a],
+            address_table.interfaces[row_a],
+            address_table.devices[row_b],
+            address_table.interfaces[row_b],
+            network,
+        )
 
     logger.debug(
         "Final topology graph: %d nodes, %d edges",
@@ -168,99 +197,179 @@ def build_ip_only_graph_from_interface_results(interface_results) -> nx.Graph:
     return topology_graph
 
 
-def _build_graph_ip_only(max_workers: int = 10) -> TopologyBuildResult:
+def build_ip_only_graph_from_index(
+    index: TopologyIndex,
+    devices: List[str],
+    backend: str = BACKEND_NETWORKX,
+) -> Union[nx.Graph, CSRGraph]:
+    """
+    Build the IP-only graph from a topology index.
+
+    Same graph as build_ip_only_graph_from_interface_results, without
+    parsing and regrouping the interface data: every indexed network with
+    exactly two (non-management) endpoints becomes an edge. Networks with
+    more endpoints are multi-access segments, see build_segment_graph.
 
-    logger.debug("Getting device list from inventory")
-    device_list_result = InventoryManager.list_devices()
-    device_objs = device_list_result.devices
-    device_names = [d.name for d in device_objs]
-    logger.debug("Found %d devices: %s", len(device_names), str(device_names))
+    Args:
+        index: Index of the interface addresses of the devices
+        devices: Devices to include as nodes, in order; the earlier device
+            of a link is the edge source
+        backend: "networkx" for an nx.Graph, "csr" for a CSRGraph
 
-    logger.debug("Running interface commands on all devices")
-    raw_interface_results = run_command_on_all_devices(
-        _get_interface, max_workers=max_workers
+    Returns:
+        The topology graph
+    """
+    topology_graph = _graph_from_links(
+        devices, _index_links(index, devices), backend
     )
-    logger.debug("Got %d interface results", len(raw_interface_results))
+    logger.debug(
+        "Built %s topology graph from index: %d nodes, %d edges",
+        backend,
+        topology_graph.number_of_nodes(),
+        topology_graph.number_of_edges(),
+    )
+    return topology_graph
 
-    interface_results = [
-        dict(result, device=result.get("device_name", device_name))
-        for device_name, result in zip(device_names, raw_interface_results)
-    ]
 
-    # Track errors and devices that encountered them
-    success_count = 0
-    error_count = 0
-    error_devices = []
-    first_error_response = None
-
-    for i, result in enumerate(interface_results):
-        device_name = device_names[i]
-        if isinstance(result, dict):
-            if "error" in result:
-                error_count += 1
-                error_devices.append(device_name)
-                # Capture the first error response for fail-fast behavior
-                if first_error_response is None:
-                    error_message = result.get("error", "Unknown error")
-                    first_error_response = ErrorResponse(
-                        type="gNMIException", message=error_message
-                    )
-                    logger.debug(
-                        "Captured first ErrorResponse from device %s: %s",
-                        device_name,
-                        error_message,
-                    )
-            elif "feature_not_found" in result:
-                # Feature not found is not considered an error for topology building
-                pass
-            else:
-                success_count += 1
-        logger.debug(
-            "Device %s: %s - keys: %s",
-            device_names[i],
-            type(result).__name__,
-            (
-                str(list(result.keys()))
-                if isinstance(result, dict)
-                else "not a dict"
-            ),
-        )
+def build_segment_graph(
+    index: TopologyIndex, devices: List[str]
+) -> SegmentGraph:
+    """
+    Collect the multi-access segments of a topology index.
+
+    Every indexed network with three or more (non-management) endpoints is
+    a segment node joined to its member devices, instead of a link between
+    every two members.
 
+    Args:
+        index: Index of the interface addresses of the devices
+        devices: Devices that can be members
+
+    Returns:
+        The device–segment membership
+    """
+    segments = SegmentGraph.from_index(index, devices, MGMT_INTERFACES)
     logger.debug(
-        "Interface collection summary - success: %d, errors: %d",
-        success_count,
-        error_count,
+        "Found %d multi-access segments with %d members",
+        len(segments),
+        segments.number_of_memberships(),
     )
+    return segments
 
-    # Determine if we have significant errors that should cause fail-fast
-    total_devices = success_count + error_count
-    has_errors = error_count > 0
-
-    if total_devices > 0 and error_count > 0:
-        error_percentage = (error_count / total_devices) * 100
-        if error_percentage >= 25:  # Warn if 25% or more failed
-            logger.warning(
-                "High interface collection failure rate: %d/%d devices failed (%.1f%%) - topology may be incomplete",
-                error_count,
-                total_devices,
-                error_percentage,
-            )
 
-    logger.debug("Building graph from interface results")
-    graph = build_ip_only_graph_from_interface_results(interface_results)
+def build_adjacency_graph(
+    adjacencies: Dict[str, DeviceAdjacencies],
+    devices: List[str],
+    index: Optional[TopologyIndex] = None,
+    backend: str = BACKEND_NETWORKX,
+    include_ip: bool = False,
+) -> Union[nx.Graph, CSRGraph]:
+    """
+    Build the topology graph from ISIS adjacencies and LLDP neighbors.
+
+    Edges have the attributes of the IP-only graph. The index, if given,
+    fills in addresses and networks the adjacencies do not carry.
+
+    Args:
+        adjacencies: Adjacency data per device
+        devices: Devices to include as nodes, in order; the earlier device
+            of a link is the edge source
+        index: Index of the interface addresses of the devices
+        backend: "networkx" for an nx.Graph, "csr" for a CSRGraph
+        include_ip: Also add the point-to-point networks of the index;
+            adjacencies then only add links between devices the IP data
+            does not connect
+
+    Returns:
+        The topology graph
+    """
+    links = adjacency_links(adjacencies, devices, index)
+    if include_ip and index is not None:
+        ip_links = list(_index_links(index, devices))
+        connected = {frozenset(link[:2]) for link in ip_links}
+        links = ip_links + [
+            link for link in links if frozenset(link[:2]) not in connected
+        ]
+    topology_graph = _graph_from_links(devices, links, backend)
     logger.debug(
-        "Built graph with %d nodes and %d edges",
-        graph.number_of_nodes(),
-        graph.number_of_edges(),
+        "Built %s adjacency topology graph: %d nodes, %d edges",
+        backend,
+        topology_graph.number_of_nodes(),
+        topology_graph.number_of_edges(),
     )
+    return topology_graph
 
-    return TopologyBuildResult(
-        graph=graph,
-        has_errors=has_errors,
-        error_devices=error_devices,
-        total_devices=total_devices,
-        error_response=first_error_response,
-    )
+
+def _graph_from_links(
+    devices: List[str], links, backend: str
+) -> Union[nx.Graph, CSRGraph]:
+    if backend == BACKEND_CSR:
+        return CSRGraph.from_edges(devices, links)
+    topology_graph = nx.Graph()
+    topology_graph.add_nodes_from(devices)
+    topology_graph.add_edges_from(links)
+    return topology_graph
+
+
+def _index_links(index: TopologyIndex, devices: List[str]):
+    """(source, target, attributes) of every point-to-point network."""
+    device_order = {device: i for i, device in enumerate(devices)}
+    for key, endpoints in index.networks().items():
+        endpoints = [
+            endpoint
+            for endpoint in endpoints
+            if endpoint.interface not in MGMT_INTERFACES
+        ]
+        if len(endpoints) != 2:
+            continue
+        endpoint_a, endpoint_b = endpoints
+        if (
+            endpoint_a.device not in device_order
+            or endpoint_b.device not in device_order
+        ):
+            continue
+        if device_order[endpoint_a.device] > device_order[endpoint_b.device]:
+            endpoint_a, endpoint_b = endpoint_b, endpoint_a
+        yield (
+            endpoint_a.device,
+            endpoint_b.device,
+            {
+                "network": network_name(key),
+                "local_interface": endpoint_a.interface,
+                "remote_interface": endpoint_b.interface,
+                "local_ip": endpoint_a.ip,
+                "remote_ip": endpoint_b.ip,
+            },
+        )
+
+
+def _build_graph_ip_only(
+    max_workers: int = 10,
+    source: Optional[str] = None,
+    discovery: str = DISCOVERY_IP,
+    refresh: bool = False,
+) -> TopologyBuildResult:
+    """
+    Return the IP topology graph of the inventory.
+
+    The graph comes from the topology service, which polls only the devices
+    whose interface data is stale (see service.py). With a source device,
+    only the source and its candidate peers are refreshed. Path queries
+    refresh the devices between two ends through the service directly (see
+    path_queries.py).
+
+    discovery selects where links come from: "ip", "adjacency" (ISIS and
+    LLDP) or "merged" (both). refresh polls the devices the answer depends
+    on even if their data is younger than the TTL.
+    """
+    from .service import get_topology_service
+
+    service = get_topology_service()
+    if refresh:
+        service.invalidate()
+    if source is not None:
+        return service.get_neighborhood(source, max_workers, discovery)
+    return service.get_graph(max_workers=max_workers, discovery=discovery)
 
 
 def _get_interface(device: str) -> dict:
@@ -275,7 +384,9 @@ def _get_interface(device: str) -> dict:
         )
         return device_obj
 
-    interface_response = get_interfaces(device_obj)
+    interface_response = get_interfaces(
+        device_obj, view=InterfaceView.TOPOLOGY
+    )
     logger.debug(
         "Device %s: interface response type: %s",
         device,
@@ -355,3 +466,60 @@ def _get_isis(device) -> dict:
             return first_response
         return {"error": "Unexpected routing response format"}
     return {"error": "No ISIS routing information found"}
+
+
+def _get_isis_metrics(device: str) -> dict:
+    """ISIS metric per interface of a device, as used for IGP path costs."""
+    device_obj = _get_device_or_error_dict(device)
+    if not isinstance(device_obj, Device):
+        return device_obj
+
+    response = get_gnmi_data(device_obj, isis_request())
+    if isinstance(response, FeatureNotFoundResponse):
+        return {
+            "feature_not_found": response.feature_name,
+            "device_name": device,
+        }
+    if isinstance(response, ErrorResponse):
+        return {"error": response.message, "device_name": device}
+    return {
+        "device_name": device,
+        "metrics": extract_isis_interface_metrics(response.data or []),
+    }
+
+
+def _get_adjacencies(device: str) -> dict:
+    """ISIS adjacencies and LLDP neighbors of a device, for topology."""
+    device_obj = _get_device_or_error_dict(device)
+    if not isinstance(device_obj, Device):
+        return device_obj
+
+    isis_response = get_gnmi_data(device_obj, isis_adjacency_request())
+    if isinstance(isis_response, ErrorResponse):
+        return {"error": isis_response.message, "device_name": device}
+    lldp_response = get_gnmi_data(device_obj, lldp_neighbor_request())
+    if isinstance(lldp_response, ErrorResponse):
+        # LLDP is optional; ISIS alone still gives the links
+        logger.debug(
+            "Device %s: no LLDP neighbors: %s", device, lldp_response.message
+        )
+
+    isis_missing = isinstance(isis_response, FeatureNotFoundResponse)
+    lldp_missing = not hasattr(lldp_response, "data")
+    if isis_missing and lldp_missing:
+        return {"feature_not_found": "isis, lldp", "device_name": device}
+
+    result = {"device_name": device, "system_id": None, "isis": [], "lldp": []}
+    if not isis_missing:
+        isis = extract_isis_topology(isis_response.data or [])
+        result["system_id"] = isis["system_id"]
+        result["isis"] = isis["adjacencies"]
+    if not lldp_missing:
+        result["lldp"] = extract_lldp_neighbors(lldp_response.data or [])
+    logger.debug(
+        "Device %s: %d ISIS adjacencies, %d LLDP neighbors",
+        device,
+        len(result["isis"]),
+        len(result["lldp"]),
+    )
+    return result
@@ -4,7 +4,7 @@ VPN/VRF information module.
 Provides functions for retrieving VRF/VPN information from network devices using gNMI.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from src.schemas.responses import (
     ErrorResponse,
@@ -24,29 +24,58 @@ from src.gnmi.parameters import GnmiRequest
 from src.gnmi.capabilities.encoding import GnmiEncoding
 from src.utils.vrf_utils import (
     get_non_default_vrf_names,
+    is_internal_vrf,
+    network_instance_name,
     DEFAULT_INTERNAL_VRFS,
 )
 from src.logging import get_logger
 
 logger = get_logger(__name__)
 
+NETWORK_INSTANCE_PATH = (
+    "openconfig-network-instance:network-instances/network-instance[name={}]"
+)
+
+# Network-instance containers read by process_vrf_data
+VRF_PROJECTED_CONTAINERS = (
+    "state",
+    "interfaces",
+    "inter-instance-policies",
+    "protocols",
+    "route-distinguisher",
+    "vpn-targets",
+)
+
 
 def get_vpn_info(
     device: Device,
     vrf_name: Optional[str] = None,
     include_details: bool = False,
+    single_request: bool = False,
+    projected: bool = False,
 ) -> NetworkOperationResult:
     """
     Get VRF/VPN information from a network device.
 
+    By default VRF names are discovered first and their details fetched with
+    a second request. With ``single_request`` the network-instance subtrees
+    are fetched in one wildcard Get instead.
+
     Args:
         device: Device object from inventory
         vrf_name: Optional VRF name filter
         include_details: Whether to show detailed information (default: False, returns summary only)
+        single_request: Fetch all VRFs with one wildcard Get request
+        projected: With single_request, only request the containers the
+            VRF parser uses
 
     Returns:
         NetworkOperationResult: Response object containing structured VRF information
     """
+    if single_request:
+        return _get_vpn_info_single_request(
+            device, vrf_name, include_details, projected
+        )
 
     # Get all VRF names from the device
     vrf_names_result = get_non_default_vrf_names(device)
@@ -151,6 +180,193 @@ def get_vpn_info(
     )
 
 
+def _get_vpn_info_single_request(
+    device: Device,
+    vrf_name: Optional[str] = None,
+    include_details: bool = False,
+    projected: bool = False,
+) -> NetworkOperationResult:
+    """
+    Get VRF/VPN information with a single wildcard Get request.
+
+    The network-instance subtrees are requested with ``name=*`` (or with the
+    VRF filter as the key) and DEFAULT_INTERNAL_VRFS are dropped locally,
+    saving the VRF name discovery round trip. With a VRF filter the request
+    only returns that VRF, so ``total_vrfs_on_device`` counts the VRFs
+    returned rather than every VRF on the device.
+
+    Args:
+        device: Device object from inventory
+        vrf_name: Optional VRF name filter, pushed into the path key
+        include_details: Whether to show detailed information
+        projected: Only request the containers the VRF parser uses
+
+    Returns:
+        NetworkOperationResult: Response object containing structured VRF information
+    """
+    instance_path = NETWORK_INSTANCE_PATH.format(vrf_name or "*")
+    if projected:
+        paths = [
+            f"{instance_path}/{container}"
+            for container in VRF_PROJECTED_CONTAINERS
+        ]
+    else:
+        paths = [instance_path]
+
+    request = GnmiRequest(path=paths, encoding=GnmiEncoding.JSON_IETF)
+    response = get_gnmi_data(device, request)
+
+    if isinstance(response, ErrorResponse):
+        logger.error(
+            "Failed to retrieve VRFs due to gNMI error: %s", response.message
+        )
+        return NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="vpn_info",
+            status=OperationStatus.FAILED,
+            data={},
+            error_response=response,
+            metadata={"message": "Failed to retrieve VRFs due to gNMI error"},
+        )
+
+    if isinstance(response, FeatureNotFoundResponse):
+        logger.info(
+            "VRF feature not found on device %s: %s",
+            device.name,
+            response.message,
+        )
+        return NetworkOperationResult(
+            device_name=device.name,
+            ip_address=device.ip_address,
+            nos=device.nos,
+            operation_type="vpn_info",
+            status=OperationStatus.FEATURE_NOT_AVAILABLE,
+            data={},
+            feature_not_found_response=response,
+            metadata={
+                "message": "VRF feature not available on device",
+                "total_vrfs_on_device": 0,
+                "vrfs_returned": 0,
+                "vrf_filter_applied": vrf_name is not None,
+                "vrf_filter": vrf_name,
+                "include_details": include_details,
+                "excluded_internal_vrfs": DEFAULT_INTERNAL_VRFS,
+            },
+        )
+
+    updates = response.data if isinstance(response, SuccessResponse) else []
+    vrf_updates = [
+        update
+        for update in _merge_network_instance_updates(updates or [])
+        if not is_internal_vrf(update["val"]["name"])
+    ]
+    logger.info(
+        "Retrieved %d VRFs on device %s in a single request",
+        len(vrf_updates),
+        device.name,
+    )
+
+    if not vrf_updates:
+        return _empty_vrf_result(
+            device, include_details, len(vrf_updates), vrf_name
+        )
+
+    return _build_vrf_result(
+        device, vrf_updates, include_details, len(vrf_updates), vrf_name
+    )
+
+
+def _merge_network_instance_updates(
+    updates: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Rebuild one network-instance subtree per VRF from gNMI updates.
+
+    Wildcard and projected requests return one update per network instance
+    and requested path, e.g. ``network-instance[name=A]/protocols``. The
+    values are nested back under their container so each returned update
+    looks like a full ``network-instance[name=A]`` update, with ``name`` set.
+
+    Args:
+        updates: gNMI updates with ``path`` and ``val`` keys
+
+    Returns:
+        List of ``{"path": ..., "val": {...}}`` updates, one per VRF, in the
+        order the VRFs first appear
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for update in updates:
+        if not isinstance(update, dict) or "val" not in update:
+            continue
+        path = update.get("path") or ""
+        val = update["val"]
+        name = network_instance_name(path)
+        if name is None and isinstance(val, dict):
+            name = val.get("name")
+        if not name:
+            continue
+
+        entry = merged.setdefault(
+            name,
+            {
+                "path": NETWORK_INSTANCE_PATH.format(name),
+                "val": {"name": name},
+            },
+        )
+        containers = _containers_below_instance(path, name)
+        target = entry["val"]
+        for container in containers[:-1]:
+            target = target.setdefault(container, {})
+        if containers:
+            target[containers[-1]] = val
+        elif isinstance(val, dict):
+            target.update(val)
+    return list(merged.values())
+
+
+def _containers_below_instance(path: str, name: str) -> List[str]:
+    """Container names below ``network-instance[name=<name>]`` in a path."""
+    key = f"network-instance[name={name}]"
+    if key not in path:
+        return []
+    relative = path.split(key, 1)[1].strip("/")
+    return [
+        segment.split("[", 1)[0] for segment in relative.split("/") if segment
+    ]
+
+
+def _empty_vrf_result(
+    device: Device,
+    include_details: bool,
+    total_vrfs_found: int,
+    vrf_name_filter: Optional[str],
+) -> NetworkOperationResult:
+    """Successful vpn_info result for a device without matching VRFs."""
+    return NetworkOperationResult(
+        device_name=device.name,
+        ip_address=device.ip_address,
+        nos=device.nos,
+        operation_type="vpn_info",
+        status=OperationStatus.SUCCESS,
+        data={},
+        metadata={
+            "message": (
+                "No VRFs found matching filter"
+                if vrf_name_filter
+                else "No VRFs found"
+            ),
+            "total_vrfs_on_device": total_vrfs_found,
+            "vrfs_returned": 0,
+            "vrf_filter_applied": vrf_name_filter is not None,
+            "vrf_filter": vrf_name_filter,
+            "include_details": include_details,
+            "excluded_internal_vrfs": DEFAULT_INTERNAL_VRFS,
+        },
+    )
+
+
 def _get_vrf_details(
     device: Device,
     vrf_names: List[str],
@@ -173,32 +389,13 @@ def _get_vrf_details(
     """
     # If no VRF names, return empty result
     if not vrf_names:
-        return NetworkOperationResult(
-            device_name=device.name,
-            ip_address=device.ip_address,
-            nos=device.nos,
-            operation_type="vpn_info",
-            status=OperationStatus.SUCCESS,
-            data={},
-            metadata={
-                "message": (
-                    "No VRFs found matching filter"
-                    if vrf_name_filter
-                    else "No VRFs found"
-                ),
-                "total_vrfs_on_device": total_vrfs_found,
-                "vrfs_returned": 0,
-                "vrf_filter_applied": vrf_name_filter is not None,
-                "vrf_filter": vrf_name_filter,
-                "include_details": include_details,
-                "excluded_internal_vrfs": DEFAULT_INTERNAL_VRFS,
-            },
+        return _empty_vrf_result(
+            device, include_details, total_vrfs_found, vrf_name_filter
         )
 
     # Build path queries for each VRF
     vrf_path_queries = [
-        f"openconfig-network-instance:network-instances/network-instance[name={vrf_name}]"
-        for vrf_name in vrf_names
+        NETWORK_INSTANCE_PATH.format(vrf_name) for vrf_name in vrf_names
     ]
     logger.debug(
         "Building gNMI paths for VRFs %s: %s",
@@ -237,11 +434,37 @@ def _get_vrf_details(
             },
         )
 
+    gnmi_data = response.data if isinstance(response, SuccessResponse) else []
+    return _build_vrf_result(
+        device,
+        gnmi_data or [],
+        include_details,
+        total_vrfs_found,
+        vrf_name_filter,
+    )
+
+
+def _build_vrf_result(
+    device: Device,
+    gnmi_data: List[Dict[str, Any]],
+    include_details: bool,
+    total_vrfs_found: int,
+    vrf_name_filter: Optional[str],
+) -> NetworkOperationResult:
+    """
+    Process network-instance updates into a vpn_info result.
+
+    Args:
+        device: Device object from inventory
+        gnmi_data: gNMI updates whose values are network-instance subtrees
+        include_details: Whether to include detailed data in the response
+        total_vrfs_found: Total number of VRFs found on the device
+        vrf_name_filter: The VRF name filter applied, if any
+
+    Returns:
+        NetworkOperationResult: Response object containing structured VRF information with parsed data and summary
+    """
     try:
-        # Extract gNMI data from response
-        gnmi_data = (
-            response.data if isinstance(response, SuccessResponse) else []
-        )
         logger.debug(
             "Extracted gNMI data length: %d",
             len(gnmi_data) if gnmi_data else 0,
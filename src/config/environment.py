@@ -58,6 +58,21 @@ class GNMIBuddySettings(BaseSettings):
 
     # MCP configuration
     gnmibuddy_mcp_tool_debug: Optional[bool] = None
+    gnmibuddy_mcp_session_ttl: Optional[float] = None
+
+    # Local state configuration (persisted statistics, caches)
+    gnmibuddy_state_dir: Optional[str] = None
+    gnmibuddy_log_index: Optional[bool] = None
+    gnmibuddy_system_static_ttl: Optional[float] = None
+
+    # Topology configuration (cached interface data and graph)
+    gnmibuddy_topology_ttl: Optional[float] = None
+    gnmibuddy_topology_cache: Optional[bool] = None
+    gnmibuddy_topology_backend: Optional[str] = None
+
+    # Request scheduling configuration (priority lanes)
+    gnmibuddy_max_concurrent_requests: Optional[int] = None
+    gnmibuddy_interactive_reserved: Optional[int] = None
 
     @classmethod
     def from_env_file(
@@ -159,6 +174,104 @@ class GNMIBuddySettings(BaseSettings):
         logger.debug("MCP tool debug mode: %s", debug_enabled)
         return debug_enabled
 
+    def get_mcp_session_ttl(self) -> float:
+        """
+        Get how long MCP tool calls may reuse data fetched by earlier calls.
+
+        Returns:
+            Seconds fetched subtrees are shared across tool calls, or 0
+            (disabled) when not set
+        """
+        return max(self.gnmibuddy_mcp_session_ttl or 0.0, 0.0)
+
+    def get_state_dir(self) -> Path:
+        """
+        Get the directory used to persist local state between runs.
+
+        Returns:
+            Configured state directory, or ~/.gnmibuddy when not set
+        """
+        state_dir = (
+            Path(self.gnmibuddy_state_dir).expanduser()
+            if self.gnmibuddy_state_dir
+            else Path.home() / ".gnmibuddy"
+        )
+        logger.debug("State directory: %s", state_dir)
+        return state_dir
+
+    def get_log_index_enabled(self) -> bool:
+        """
+        Get whether fetched log lines are kept in the local log index.
+
+        Returns:
+            True if GNMIBUDDY_LOG_INDEX is enabled, False otherwise
+        """
+        return self.gnmibuddy_log_index or False
+
+    def get_system_static_ttl(self) -> float:
+        """
+        Get how long the static part of system info is reused per device.
+
+        Returns:
+            Seconds the cached static subtree stays valid, or 3600 when not
+            set (0 disables the cache)
+        """
+        if self.gnmibuddy_system_static_ttl is None:
+            return 3600.0
+        return max(self.gnmibuddy_system_static_ttl, 0.0)
+
+    def get_topology_ttl(self) -> float:
+        """
+        Get how long the interface data of a device is reused for topology.
+
+        Returns:
+            Seconds before a device is polled again, or 300 when not set
+            (0 polls every device on every topology query)
+        """
+        if self.gnmibuddy_topology_ttl is None:
+            return 300.0
+        return max(self.gnmibuddy_topology_ttl, 0.0)
+
+    def get_topology_cache_enabled(self) -> bool:
+        """
+        Get whether topology snapshots are kept in the state directory.
+
+        Returns:
+            True if GNMIBUDDY_TOPOLOGY_CACHE is enabled, False otherwise
+        """
+        return self.gnmibuddy_topology_cache or False
+
+    def get_topology_backend(self) -> str:
+        """
+        Get the graph implementation used for the topology.
+
+        Returns:
+            "csr" for the array-backed graph if GNMIBUDDY_TOPOLOGY_BACKEND
+            is set to it, otherwise "networkx"
+        """
+        backend = (self.gnmibuddy_topology_backend or "").strip().lower()
+        return "csr" if backend == "csr" else "networkx"
+
+    def get_max_concurrent_requests(self) -> int:
+        """
+        Get the maximum number of gNMI requests in flight per process.
+
+        Returns:
+            Configured limit, or 32 when not set
+        """
+        return self.gnmibuddy_max_concurrent_requests or 32
+
+    def get_interactive_reserved(self) -> int:
+        """
+        Get the number of request slots reserved for interactive calls.
+
+        Returns:
+            Configured reservation, or 4 when not set
+        """
+        if self.gnmibuddy_interactive_reserved is None:
+            return 4
+        return self.gnmibuddy_interactive_reserved
+
 
 # Global instance for application-wide use
 # This provides a singleton pattern for configuration access
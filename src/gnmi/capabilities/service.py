@@ -7,6 +7,7 @@ from typing import List, Dict, Any
 from pygnmi.client import gNMIclient
 
 from src.schemas.models import Device
+from src.utils.cancellation import on_cancel
 from .models import DeviceCapabilities, ModelIdentifier
 from .encoding import GnmiEncoding
 from .repository import DeviceCapabilitiesRepository
@@ -51,7 +52,8 @@ class CapabilityService:
             """
             return GnmiEncoding.from_any(e)
 
-        with gNMIclient(**params) as client:  # type: ignore[arg-type]
+        client = gNMIclient(**params)  # type: ignore[arg-type]
+        with on_cancel(lambda: _close_quietly(client)), client:
             resp: Dict[str, Any] = client.capabilities() or {}
             # Expected keys in pygnmi response
             for m in resp.get("supported_models", []) or []:
@@ -69,3 +71,11 @@ class CapabilityService:
             gnmi_version = resp.get("gNMI_version")
 
         return DeviceCapabilities(models, encodings, gnmi_version)
+
+
+def _close_quietly(client: gNMIclient) -> None:
+    """Close the client channel on cancellation, even if not yet connected."""
+    try:
+        client.close()
+    except AttributeError:
+        pass
@@ -25,12 +25,15 @@ from src.schemas.responses import (
     NetworkResponse,
 )
 from src.gnmi.error_handlers import (
+    handle_cancelled,
     handle_timeout_error,
     handle_rpc_error,
     handle_connection_refused,
     handle_generic_error,
 )
 from src.gnmi.retry_handler import with_retry
+from src.gnmi.priority import get_scheduler
+from src.gnmi.session import get_current_session
 from src.gnmi.response_parser import parse_gnmi_response, ParsedGnmiResponse
 from src.logging import get_logger
 from src.gnmi.preflight import (
@@ -39,6 +42,11 @@ from src.gnmi.preflight import (
     compute_effective_encoding,
 )
 from src.gnmi.capabilities.errors import CapabilityError
+from src.utils.cancellation import (
+    OperationCancelledError,
+    get_current_token,
+    on_cancel,
+)
 
 logger = get_logger(__name__)
 
@@ -110,8 +118,13 @@ class GnmiRequestExecutor:
             NetworkResponse from the request
 
         Raises:
+            OperationCancelledError: If the current operation was cancelled
             Exception: Any exception from the gNMI operation
         """
+        token = get_current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
         logger.debug("Executing gNMI request for device %s", device.name)
         logger.debug("Request paths: %s", str(request.path))
         logger.debug(
@@ -136,9 +149,18 @@ class GnmiRequestExecutor:
             device
         )
 
+        # Preflight may have contacted the device; re-check before connecting
+        if token is not None:
+            token.raise_if_cancelled()
+
         logger.debug("Establishing gNMI connection to %s", device.name)
+        gnmi_client = gNMIclient(**connection_params)  # type: ignore[arg-type]
         try:
-            with gNMIclient(**connection_params) as gnmi_client:  # type: ignore[arg-type]
+            # Closing the channel on cancellation aborts the connect wait and
+            # any in-flight RPC instead of waiting for gnmi_timeout.
+            with on_cancel(
+                lambda: self._close_client(gnmi_client, device)
+            ), gnmi_client:
                 logger.debug("gNMI client connected, executing get request")
 
                 # Execute the gNMI get request (override only the encoding for this call)
@@ -178,8 +200,20 @@ class GnmiRequestExecutor:
 
         except Exception as e:
             logger.debug("Exception during gNMI request execution: %s", str(e))
+            if token is not None and token.is_cancelled:
+                raise OperationCancelledError(token.reason) from e
             raise  # Re-raise for error handler to process
 
+    @staticmethod
+    def _close_client(gnmi_client: gNMIclient, device: Device) -> None:
+        """Close the gNMI channel to abort blocking calls on cancellation."""
+        logger.debug("Closing gNMI channel to %s on cancellation", device.name)
+        try:
+            gnmi_client.close()
+        except AttributeError:
+            # Channel not created yet; the pre-connect check will stop it
+            pass
+
     @staticmethod
     def _create_network_response(
         parsed_data: ParsedGnmiResponse,
@@ -197,28 +231,28 @@ class GnmiRequestExecutor:
         logger.debug("Parsed data exists: %s", parsed_data is not None)
 
         if parsed_data and parsed_data.has_data:
-            logger.debug(
-                "Parsed data has content, extracting first notification"
-            )
+            # Devices may answer a multi-path Get with one notification per
+            # path, so collect the updates of every notification
+            data = [
+                update
+                for notification in parsed_data.notifications
+                for update in notification.updates
+            ]
             first_notification = parsed_data.first_notification
+            timestamp = (
+                str(first_notification.timestamp)
+                if first_notification
+                and first_notification.timestamp is not None
+                else None
+            )
 
-            if first_notification and first_notification.has_data:
-                data = first_notification.updates
-                timestamp = (
-                    str(first_notification.timestamp)
-                    if first_notification.timestamp is not None
-                    else None
-                )
-
-                logger.debug(
-                    "SuccessResponse created - data items: %d, timestamp: %s",
-                    len(data) if data else 0,
-                    timestamp,
-                )
+            logger.debug(
+                "SuccessResponse created - data items: %d, timestamp: %s",
+                len(data),
+                timestamp,
+            )
 
-                return SuccessResponse(data=data, timestamp=timestamp)
-            else:
-                logger.debug("First notification has no data")
+            return SuccessResponse(data=data, timestamp=timestamp)
         else:
             logger.debug("Parsed data is empty or has no content")
 
@@ -250,7 +284,10 @@ class GnmiErrorHandler:
         )
         logger.debug("Exception details: %s", str(error))
 
-        if isinstance(error, grpc.FutureTimeoutError):
+        if isinstance(error, OperationCancelledError):
+            logger.debug("Handling cancelled operation")
+            return handle_cancelled(device, str(error) or None)
+        elif isinstance(error, grpc.FutureTimeoutError):
             logger.debug("Handling timeout error")
             return handle_timeout_error(device)
         elif isinstance(error, grpc.RpcError):
@@ -278,6 +315,8 @@ def get_gnmi_data(
 
     This is the main entry point for gNMI operations. It automatically handles
     rate limiting with exponential backoff and provides structured error handling.
+    Inside a device_session() block, requests covered by an earlier fetch
+    from the same device are answered from the session store.
 
     Args:
         device: Device object containing connection information
@@ -299,6 +338,28 @@ def get_gnmi_data(
         getattr(request, "encoding", "default"),
     )
 
+    session = get_current_session()
+    if session is not None and session.caches(request):
+        with session.single_flight(device, request):
+            cached = session.lookup(device, request)
+            if cached is not None:
+                return cached
+            response = _get_gnmi_data_uncached(
+                device, request, max_retries, base_delay
+            )
+            if isinstance(response, SuccessResponse):
+                session.store(device, request, response)
+            return response
+
+    return _get_gnmi_data_uncached(device, request, max_retries, base_delay)
+
+
+def _get_gnmi_data_uncached(
+    device: Device,
+    request: GnmiRequest,
+    max_retries: int,
+    base_delay: float,
+) -> NetworkResponse:
     executor = GnmiRequestExecutor()
     error_handler = GnmiErrorHandler()
 
@@ -308,7 +369,10 @@ def get_gnmi_data(
             "Executing gNMI operation attempt for device %s", device.name
         )
         try:
-            result = executor.execute_request(device, request)
+            # Take a slot in the current priority lane for the attempt only,
+            # so retry back-off does not hold capacity
+            with get_scheduler().slot():
+                result = executor.execute_request(device, request)
             logger.debug(
                 "gNMI operation completed successfully for device %s",
                 device.name,
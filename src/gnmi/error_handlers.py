@@ -95,6 +95,19 @@ def handle_connection_refused(device: Device) -> ErrorResponse:
     return ErrorResponse(type="CONNECTION_REFUSED", message=error_msg)
 
 
+def handle_cancelled(device: Device, reason: Optional[str]) -> ErrorResponse:
+    """
+    Handle requests aborted because the operation was cancelled.
+
+    Returns:
+        ErrorResponse object with error details
+    """
+    error_msg = f"Request to {device.name} cancelled: {reason or 'operation cancelled'}"
+    _log_error(device.name, error_msg, level="info")
+
+    return ErrorResponse(type="CANCELLED", message=error_msg)
+
+
 def handle_generic_error(
     device: Device, error: Exception
 ) -> Union[ErrorResponse, FeatureNotFoundResponse]:
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Priority lanes for gNMI requests.
+
+Interactive work (MCP tool calls from an LLM agent) should not queue behind
+background fan-out such as fleet sweeps or topology builds running in the
+same process. Every gNMI request takes a slot from a process-wide
+PriorityScheduler before contacting the device:
+
+- INTERACTIVE requests may use the full capacity.
+- NORMAL and BULK requests may only use the capacity not reserved for
+  interactive work.
+- When requests are waiting, higher lanes are admitted first.
+
+The lane of the current request is kept in a context variable. Thread pool
+workers do not inherit context variables, so fan-out helpers enter the lane
+explicitly with ``priority_scope``.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Dict, Iterator, Optional
+
+from src.logging import get_logger
+from src.utils.cancellation import get_current_token, on_cancel
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 32
+DEFAULT_INTERACTIVE_RESERVED = 4
+
+
+class Priority(Enum):
+    """Priority lanes, ordered from most to least urgent"""
+
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+    @property
+    def rank(self) -> int:
+        return _RANKS[self]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.value
+
+
+_RANKS = {Priority.INTERACTIVE: 0, Priority.NORMAL: 1, Priority.BULK: 2}
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "gnmibuddy_priority", default=Priority.NORMAL
+)
+
+
+def get_current_priority() -> Priority:
+    """Return the priority lane of the current context."""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[Priority]:
+    """Run the block in the given priority lane."""
+    reset_token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(reset_token)
+
+
+class PriorityScheduler:
+    """Admission control for concurrent gNMI requests by priority lane.
+
+    Args:
+        capacity: Maximum number of requests in flight at once
+        interactive_reserved: Slots only INTERACTIVE requests may use
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        interactive_reserved: int = DEFAULT_INTERACTIVE_RESERVED,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.interactive_reserved = max(
+            0, min(interactive_reserved, capacity - 1)
+        )
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting: Dict[Priority, int] = {p: 0 for p in Priority}
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def lane_capacity(self, priority: Priority) -> int:
+        """Maximum number of ``priority`` requests that may run at once."""
+        if priority == Priority.INTERACTIVE:
+            return self.capacity
+        return self.capacity - self.interactive_reserved
+
+    def _can_run(self, priority: Priority) -> bool:
+        if self._in_flight >= self.lane_capacity(priority):
+            return False
+        # Yield to waiting requests in higher lanes that could run now
+        return not any(
+            self._waiting[other]
+            and self._in_flight < self.lane_capacity(other)
+            for other in Priority
+            if other.rank < priority.rank
+        )
+
+    def acquire(self, priority: Priority) -> None:
+        """Block until a slot is free for ``priority``.
+
+        Raises:
+            OperationCancelledError: If the current cancellation token is
+                cancelled while waiting
+        """
+        token = get_current_token()
+        with self._cond:
+            if self._can_run(priority):
+                self._in_flight += 1
+                return
+
+        def wake_waiters() -> None:
+            with self._cond:
+                self._cond.notify_all()
+
+        with on_cancel(wake_waiters), self._cond:
+            self._waiting[priority] += 1
+            try:
+                while not self._can_run(priority):
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    self._cond.wait()
+                self._in_flight += 1
+            finally:
+                self._waiting[priority] -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Optional[Priority] = None) -> Iterator[None]:
+        """Hold a request slot, by default in the current context's lane."""
+        priority = priority or get_current_priority()
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_scheduler: Optional[PriorityScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PriorityScheduler:
+    """Return the process-wide scheduler, configured from settings."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            from src.config.environment import get_settings
+
+            settings = get_settings()
+            _scheduler = PriorityScheduler(
+                capacity=settings.get_max_concurrent_requests(),
+                interactive_reserved=settings.get_interactive_reserved(),
+            )
+            logger.debug(
+                "Priority scheduler capacity: %d (%d reserved for interactive)",
+                _scheduler.capacity,
+                _scheduler.interactive_reserved,
+            )
+        return _scheduler
+
+
+def warn_if_oversubscribed(
+    workers: int, priority: Priority = Priority.BULK
+) -> None:
+    """Warn when more workers are started than ``priority`` may run at once.
+
+    Workers beyond the lane capacity only wait for a slot, so raising
+    ``--max-workers`` past it has no effect unless
+    GNMIBUDDY_MAX_CONCURRENT_REQUESTS is raised as well.
+    """
+    capacity = get_scheduler().lane_capacity(priority)
+    if workers > capacity:
+        logger.warning(
+            "%d workers requested but only %d %s gNMI requests may run at "
+            "once; raise GNMIBUDDY_MAX_CONCURRENT_REQUESTS to use them all",
+            workers,
+            capacity,
+            priority,
+        )
+
+
+def reset_scheduler() -> None:
+    """Drop the process-wide scheduler (primarily for tests)."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = None
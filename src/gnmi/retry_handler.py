@@ -10,6 +10,10 @@ import random
 from typing import Callable, TypeVar, Optional
 from src.schemas.models import Device
 from src.logging import get_logger
+from src.utils.cancellation import (
+    OperationCancelledError,
+    get_current_token,
+)
 
 logger = get_logger(__name__)
 
@@ -181,11 +185,16 @@ class RetryHandler:
             Result of the operation
 
         Raises:
+            OperationCancelledError: If the current cancellation token is
+                cancelled before an attempt or during a back-off delay
             Exception: The last exception if all retries are exhausted
         """
         last_rate_limit_error = None
+        token = get_current_token()
 
         for attempt in range(self.config.max_retries + 1):
+            if token is not None:
+                token.raise_if_cancelled()
             try:
                 result = operation()
                 self.retry_logger.log_retry_success(device, attempt)
@@ -202,7 +211,7 @@ class RetryHandler:
                         self.retry_logger.log_retry_attempt(
                             device, attempt, self.config.max_retries, delay
                         )
-                        time.sleep(delay)
+                        self._sleep(delay, device)
                         continue
                     else:
                         self.retry_logger.log_retry_exhausted(
@@ -227,6 +236,20 @@ class RetryHandler:
             f"Unexpected state in retry logic for {operation_name}"
         )
 
+    @staticmethod
+    def _sleep(delay: float, device: Device) -> None:
+        """Back-off sleep that wakes up early when cancelled."""
+        token = get_current_token()
+        if token is None:
+            time.sleep(delay)
+            return
+        if token.wait(delay):
+            logger.debug(
+                "Retry back-off for device '%s' interrupted by cancellation",
+                device.name,
+            )
+            raise OperationCancelledError(token.reason)
+
 
 # Convenience function for common use case
 def with_retry(
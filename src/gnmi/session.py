@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Device sessions: share fetched gNMI subtrees across a group of collectors.
+
+Composite workflows (``ops validate``, device profile, an agent calling
+profile, vpn and routing in a row) often request overlapping subtrees from
+the same device. Inside a ``device_session()`` block, every successful Get
+is kept in a path-indexed store. A later request whose paths are all covered
+by an earlier fetch is answered from the store without contacting the
+device:
+
+- a request for the same path, or for a path with fixed keys where the
+  earlier fetch used a wildcard, reuses the stored updates;
+- a request for a path below an earlier fetch is answered by walking the
+  stored subtrees, e.g. ``network-instance[name=*]/state/name`` from a fetch
+  of ``network-instance[name=*]``.
+
+Anything the store cannot answer exactly (different encoding or data type,
+stored updates finer-grained than the request, no matching data) is fetched
+from the device as usual. Identical requests issued concurrently inside the
+same session are fetched once. CLI requests (ASCII encoding, e.g. logs) are
+never stored: their output changes between calls and is not path-indexed.
+
+The current session is kept in a context variable, like the cancellation
+token and priority lane; tasks submitted to a thread pool join it by running
+in a copy of the caller's context.
+"""
+import copy
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.gnmi.parameters import GnmiRequest
+from src.logging import get_logger
+from src.processors.gnmi_tree import PathElement, parse_path, strip_module
+from src.schemas.models import Device
+from src.schemas.responses import SuccessResponse
+
+logger = get_logger(__name__)
+
+_StoreKey = Tuple[str, str, str]
+
+
+@dataclass
+class _Fetch:
+    """One stored Get: the requested paths and the updates returned."""
+
+    paths: List[List[PathElement]]
+    updates: List[Tuple[List[PathElement], Dict[str, Any]]]
+    timestamp: Optional[str]
+    stored_at: float
+
+
+class DeviceSession:
+    """Scoped, path-indexed store of gNMI responses.
+
+    Args:
+        max_age: Seconds a stored response may be reused; None keeps them
+            for the lifetime of the session
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._fetches: Dict[_StoreKey, List[_Fetch]] = {}
+        self._in_flight: Dict[Tuple, threading.Event] = {}
+
+    @staticmethod
+    def caches(request: GnmiRequest) -> bool:
+        """True if responses to ``request`` may be stored and reused."""
+        encoding = getattr(request.encoding, "value", request.encoding)
+        return str(encoding).lower() != "ascii"
+
+    def lookup(
+        self, device: Device, request: GnmiRequest
+    ) -> Optional[SuccessResponse]:
+        """Answer ``request`` from the store, or return None."""
+        with self._lock:
+            fetches = list(self._fetches.get(_store_key(device, request), []))
+        if self.max_age is not None:
+            cutoff = time.monotonic() - self.max_age
+            fetches = [f for f in fetches if f.stored_at >= cutoff]
+
+        data: List[Dict[str, Any]] = []
+        timestamp = None
+        for path in request.path:
+            requested = parse_path(path)
+            answer = None
+            for fetch in reversed(fetches):
+                answer = _answer_from_fetch(requested, fetch)
+                if answer:
+                    timestamp = timestamp or fetch.timestamp
+                    break
+            if not answer:
+                with self._lock:
+                    self.misses += 1
+                return None
+            data.extend(answer)
+
+        with self._lock:
+            self.hits += 1
+        logger.debug(
+            "Session answered %s for %s locally (%d updates)",
+            request.path,
+            device.name,
+            len(data),
+        )
+        return SuccessResponse(data=data, timestamp=timestamp)
+
+    def store(
+        self,
+        device: Device,
+        request: GnmiRequest,
+        response: SuccessResponse,
+    ) -> None:
+        """Index the updates of a successful response."""
+        fetch = _Fetch(
+            paths=[parse_path(path) for path in request.path],
+            updates=[
+                (parse_path(update.get("path") or ""), update)
+                for update in response.data or []
+                if isinstance(update, dict) and "val" in update
+            ],
+            timestamp=response.timestamp,
+            stored_at=time.monotonic(),
+        )
+        with self._lock:
+            fetches = self._fetches.setdefault(
+                _store_key(device, request), []
+            )
+            if self.max_age is not None:
+                # Long-lived sessions drop what can no longer be reused
+                cutoff = fetch.stored_at - self.max_age
+                fetches[:] = [f for f in fetches if f.stored_at >= cutoff]
+            fetches.append(fetch)
+
+    @contextmanager
+    def single_flight(
+        self, device: Device, request: GnmiRequest
+    ) -> Iterator[None]:
+        """Let one caller fetch a given request while identical ones wait.
+
+        Callers that waited should look the request up again once inside.
+        """
+        key = _store_key(device, request) + (tuple(request.path),)
+        with self._lock:
+            event = self._in_flight.get(key)
+            owner = event is None
+            if owner:
+                event = self._in_flight[key] = threading.Event()
+        if not owner:
+            event.wait()
+            yield
+            return
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+
+def _store_key(device: Device, request: GnmiRequest) -> _StoreKey:
+    encoding = getattr(request.encoding, "value", request.encoding)
+    return (device.name, str(encoding), str(request.datatype))
+
+
+def _element_matches(pattern: PathElement, element: PathElement) -> bool:
+    """True if ``element`` is selected by ``pattern`` (keys may be '*')."""
+    if strip_module(pattern[0]) != strip_module(element[0]):
+        return False
+    for key, value in pattern[1].items():
+        if value == "*":
+            continue
+        if key not in element[1] or str(element[1][key]) != str(value):
+            return False
+    return True
+
+
+def _covers(fetched: List[PathElement], requested: List[PathElement]) -> bool:
+    """True if the fetched path selects everything the request selects."""
+    if len(fetched) > len(requested):
+        return False
+    for pattern, element in zip(fetched, requested):
+        if strip_module(pattern[0]) != strip_module(element[0]):
+            return False
+        for key, value in pattern[1].items():
+            if value != "*" and str(element[1].get(key)) != str(value):
+                return False
+    return True
+
+
+def _answer_from_fetch(
+    requested: List[PathElement], fetch: _Fetch
+) -> Optional[List[Dict[str, Any]]]:
+    """Updates answering ``requested`` from one fetch, or None."""
+    if not any(_covers(fetched, requested) for fetched in fetch.paths):
+        return None
+    same_request = any(
+        _normalized(fetched) == _normalized(requested)
+        for fetched in fetch.paths
+    )
+
+    answer: List[Dict[str, Any]] = []
+    for elements, update in fetch.updates:
+        depth = min(len(elements), len(requested))
+        if not all(
+            _element_matches(p, e)
+            for p, e in zip(requested[:depth], elements[:depth])
+        ):
+            continue
+        if len(elements) > len(requested):
+            if same_request:
+                answer.append(copy.deepcopy(update))
+                continue
+            # Finer-grained than the request: the device would have sent a
+            # different shape, so let it answer
+            return None
+        for suffix, val in _descend(update["val"], requested[depth:]):
+            path = update.get("path") or ""
+            if suffix:
+                path = f"{path.rstrip('/')}/{suffix}" if path else suffix
+            answer.append(
+                {**update, "path": path, "val": copy.deepcopy(val)}
+            )
+    return answer or None
+
+
+def _normalized(elements: List[PathElement]) -> List[Tuple]:
+    return [
+        (strip_module(name), sorted((k, str(v)) for k, v in keys.items()))
+        for name, keys in elements
+    ]
+
+
+def _descend(
+    val: Any, remaining: List[PathElement]
+) -> Iterator[Tuple[str, Any]]:
+    """Walk ``remaining`` path elements into a JSON value.
+
+    Yields (resolved relative path, value) for every match; keyed elements
+    fan out over the matching list entries.
+    """
+    if not remaining:
+        yield "", val
+        return
+    if not isinstance(val, dict):
+        return
+
+    (name, keys), rest = remaining[0], remaining[1:]
+    child_key = _find_key(val, name)
+    if child_key is None:
+        return
+    child = val[child_key]
+
+    if not keys:
+        for suffix, found in _descend(child, rest):
+            yield _join(name, suffix), found
+        return
+
+    if not isinstance(child, list):
+        return
+    for entry in child:
+        if not isinstance(entry, dict):
+            continue
+        if not _element_matches((name, keys), (name, entry)):
+            continue
+        resolved = name + "".join(
+            f"[{key}={entry.get(key)}]" for key in keys
+        )
+        for suffix, found in _descend(entry, rest):
+            yield _join(resolved, suffix), found
+
+
+def _find_key(val: Dict[str, Any], name: str) -> Optional[str]:
+    if name in val:
+        return name
+    bare = strip_module(name)
+    for key in val:
+        if strip_module(key) == bare:
+            return key
+    return None
+
+
+def _join(head: str, tail: str) -> str:
+    return f"{head}/{tail}" if tail else head
+
+
+_current_session: ContextVar[Optional[DeviceSession]] = ContextVar(
+    "gnmibuddy_device_session", default=None
+)
+
+
+def get_current_session() -> Optional[DeviceSession]:
+    """Return the device session of the current context, if any."""
+    return _current_session.get()
+
+
+@contextmanager
+def device_session(
+    session: Optional[DeviceSession] = None,
+) -> Iterator[DeviceSession]:
+    """Share fetched subtrees between the gNMI requests made in the block.
+
+    Nested blocks reuse the enclosing session unless one is passed in.
+    """
+    session = session or get_current_session() or DeviceSession()
+    reset_token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(reset_token)
+        logger.debug(
+            "Device session closed: %d requests answered locally, %d fetched",
+            session.hits,
+            session.misses,
+        )
@@ -69,6 +69,9 @@ def setup_mcp_logging(
             "get_system_info",
             "get_network_topology_api",
             "get_topology_neighbors",
+            "get_topology_path",
+            "lookup_ip",
+            "get_topology_changes",
         ]
         for tool in mcp_tools:
             default_module_levels[f"{LoggerNames.MCP}.tools.{tool}"] = "debug"
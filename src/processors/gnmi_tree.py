@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+gNMI path and update tree utilities.
+
+Projected requests (several narrow paths instead of one container) come back
+as many updates, each holding a leaf or a small subtree under a keyed path
+such as ``interfaces/interface[name=Gi0/0/0/0]/state/admin-status``. The
+helpers here rebuild those updates into the nested JSON shape a request for
+the whole container would have returned, so processors can consume both.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+PathElement = Tuple[str, Dict[str, Any]]
+
+_KEY_PATTERN = re.compile(r"\[([^=\]]+)=([^\]]*)\]")
+
+
+def split_path(path: str) -> List[str]:
+    """
+    Split a gNMI path string into elements, ignoring '/' inside keys.
+
+    Example: "interfaces/interface[name=Gi0/0/0/0]/state" ->
+    ["interfaces", "interface[name=Gi0/0/0/0]", "state"]
+    """
+    elements = []
+    current = []
+    depth = 0
+    for char in path or "":
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth = max(depth - 1, 0)
+        if char == "/" and depth == 0:
+            if current:
+                elements.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if current:
+        elements.append("".join(current))
+    return elements
+
+
+def parse_path(path: str) -> List[PathElement]:
+    """
+    Parse a gNMI path string into (name, keys) elements.
+
+    Numeric key values are converted to int, matching JSON_IETF list
+    entries such as ``{"index": 0}``.
+    """
+    parsed = []
+    for element in split_path(path):
+        name = element.split("[", 1)[0]
+        keys = {
+            key: _convert_key_value(value)
+            for key, value in _KEY_PATTERN.findall(element)
+        }
+        parsed.append((name, keys))
+    return parsed
+
+
+def strip_module(name: str) -> str:
+    """Drop the YANG module prefix: "openconfig-if-ip:ipv4" -> "ipv4"."""
+    return name.split(":", 1)[-1]
+
+
+def updates_to_tree(
+    updates: List[Dict[str, Any]], root: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Merge gNMI updates into one nested JSON tree.
+
+    Args:
+        updates: gNMI updates with ``path`` and ``val`` keys
+        root: Leading path element to drop (module prefix ignored), e.g.
+            "interfaces" so the tree holds the container's children
+
+    Returns:
+        Nested dict where keyed path elements become list entries that
+        carry their keys, in the order they first appear
+    """
+    tree: Dict[str, Any] = {}
+    # (id of list, sorted keys) -> list entry, for O(1) keyed lookups
+    entries: Dict[Tuple[int, Tuple], Dict[str, Any]] = {}
+
+    for update in updates:
+        if not isinstance(update, dict) or "val" not in update:
+            continue
+        elements = parse_path(update.get("path") or "")
+        if elements and root and strip_module(elements[0][0]) == root:
+            elements = elements[1:]
+
+        node = tree
+        for index, (name, keys) in enumerate(elements):
+            is_last = index == len(elements) - 1
+            if keys:
+                node = _list_entry(node, name, keys, entries)
+            elif is_last and not isinstance(update["val"], dict):
+                node[name] = update["val"]
+                node = None
+                break
+            else:
+                child = node.get(name)
+                if not isinstance(child, dict):
+                    child = node[name] = {}
+                node = child
+
+        if node is not None and isinstance(update["val"], dict):
+            _deep_merge(node, update["val"])
+    return tree
+
+
+def merge_trees(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    """
+    Merge one update tree into another in place.
+
+    Containers are merged recursively; leaves and lists from ``source``
+    replace those in ``target``.
+    """
+    _deep_merge(target, source)
+
+
+def _list_entry(
+    node: Dict[str, Any],
+    name: str,
+    keys: Dict[str, Any],
+    entries: Dict[Tuple[int, Tuple], Dict[str, Any]],
+) -> Dict[str, Any]:
+    items = node.get(name)
+    if not isinstance(items, list):
+        items = node[name] = []
+    lookup = (id(items), tuple(sorted(keys.items())))
+    entry = entries.get(lookup)
+    if entry is None:
+        entry = dict(keys)
+        items.append(entry)
+        entries[lookup] = entry
+    return entry
+
+
+def _deep_merge(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _convert_key_value(value: str) -> Any:
+    return int(value) if value.isdigit() else value
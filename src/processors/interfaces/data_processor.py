@@ -4,8 +4,11 @@ Interface data parser module.
 Provides functions for transforming raw gNMI interface data from OpenConfig models into LLM-friendly formats.
 """
 
+import ipaddress
 from typing import Dict, Any, List, Optional
 
+from src.processors.gnmi_tree import updates_to_tree
+
 
 def format_interface_data_for_llm(
     gnmi_data: List[Dict[str, Any]],
@@ -54,6 +57,10 @@ def extract_interfaces(
     """
     Extract interface information from the OpenConfig interfaces model.
 
+    Accepts both a response for the whole interfaces container and the
+    per-interface updates returned for projected paths, which are rebuilt
+    into the same nested structure first.
+
     Args:
         gnmi_data: Raw gNMI response data containing interface information
 
@@ -65,6 +72,7 @@ def extract_interfaces(
     if not gnmi_data:
         return interfaces
 
+    projected_updates = []
     for item in gnmi_data:
         if "val" not in item:
             continue
@@ -72,11 +80,20 @@ def extract_interfaces(
         val = item.get("val", {})
 
         # Extract interfaces from the interfaces container
-        if "interface" in val:
+        if isinstance(val, dict) and "interface" in val:
             for interface in val["interface"]:
                 interface_info = extract_interface_info(interface)
                 if interface_info:
                     interfaces.append(interface_info)
+        elif "interface[" in item.get("path", ""):
+            projected_updates.append(item)
+
+    if projected_updates:
+        tree = updates_to_tree(projected_updates, root="interfaces")
+        for interface in tree.get("interface", []):
+            interface_info = extract_interface_info(interface)
+            if interface_info:
+                interfaces.append(interface_info)
 
     return interfaces
 
@@ -137,10 +154,11 @@ def extract_ip_and_vrf_for_brief(
         subinterface: Subinterface object from OpenConfig model
         interface_info: Interface info dictionary to update
     """
-    # Extract IPv4 address
-    if "openconfig-if-ip:ipv4" in subinterface:
-        ipv4 = subinterface["openconfig-if-ip:ipv4"]
-
+    # Extract IPv4 address (projected paths may return it without prefix)
+    ipv4 = subinterface.get("openconfig-if-ip:ipv4") or subinterface.get(
+        "ipv4"
+    )
+    if ipv4:
         if "addresses" in ipv4 and "address" in ipv4["addresses"]:
             addresses = ipv4["addresses"]["address"]
             if addresses and len(addresses) > 0:
@@ -158,6 +176,17 @@ def extract_ip_and_vrf_for_brief(
                     subnet_mask = prefix_to_subnet_mask(prefix_length)
                     interface_info["ip_address"] = f"{ip}/{subnet_mask}"
 
+    # Extract IPv6 addresses, all of them: interfaces often have several
+    ipv6 = subinterface.get("openconfig-if-ip:ipv6") or subinterface.get(
+        "ipv6"
+    )
+    if ipv6:
+        ipv6_addresses = extract_ipv6_addresses(
+            ipv6.get("addresses", {}).get("address", [])
+        )
+        if ipv6_addresses:
+            interface_info["ipv6_addresses"] = ipv6_addresses
+
     # Extract VRF information if available
     # In OpenConfig, VRF might be in different paths depending on the implementation
     if "openconfig-network-instance:network-instance" in subinterface:
@@ -172,6 +201,34 @@ def extract_ip_and_vrf_for_brief(
         interface_info["vrf"] = subinterface["vrf-instance"]
 
 
+def extract_ipv6_addresses(addresses: List[Dict[str, Any]]) -> List[str]:
+    """
+    Format the IPv6 addresses of a subinterface as "ip/prefix-length".
+
+    Link-local addresses are skipped: every interface has one in
+    fe80::/64, so they do not tell which interfaces share a link.
+
+    Args:
+        addresses: OpenConfig IPv6 address list of a subinterface
+
+    Returns:
+        Addresses in the order the device reported them
+    """
+    formatted = []
+    for address in addresses:
+        ip = address.get("ip")
+        prefix_length = address.get("state", {}).get("prefix-length")
+        if not ip or prefix_length is None:
+            continue
+        try:
+            if ipaddress.IPv6Address(ip).is_link_local:
+                continue
+        except ValueError:
+            continue
+        formatted.append(f"{ip}/{prefix_length}")
+    return formatted
+
+
 def prefix_to_subnet_mask(prefix_length: int) -> str:
     """
     Convert a prefix length to a subnet mask in dotted decimal format.
@@ -5,12 +5,40 @@ Provides functions for filtering logs based on time and other criteria.
 """
 
 import re
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from src.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Pattern to match timestamps in the logs
+# Format: RP/0/RP0/CPU0:Apr 23 12:52:06.929 UTC:
+TIMESTAMP_PATTERN = (
+    r"RP/\d+/\w+/\w+:(\w+)\s+(\d+)\s+(\d+):(\d+):(\d+)\.(\d+)\s+UTC:"
+)
+_TIMESTAMP_RE = re.compile(TIMESTAMP_PATTERN)
+_LOG_LINE_PREFIX = "RP/"
+
+# Month name to number mapping
+MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
 
 def filter_logs(
     gnmi_data: List[Dict[str, Any]], show_all_logs: bool, filter_minutes: int
@@ -69,6 +97,11 @@ def filter_logs_by_time(
     """
     Filter logs based on timestamp, keeping only recent logs.
 
+    IOS-XR writes the log buffer in chronological order, so the lines are
+    scanned from the newest backwards and timestamps are only parsed until
+    the first line older than the threshold. Before that point, only lines
+    that are not log messages (headers, continuation lines) are kept.
+
     Args:
         logs: String containing log data
         minutes: Number of minutes to filter (keep logs newer than this)
@@ -87,92 +120,117 @@ def filter_logs_by_time(
         # Convert to naive datetime if it has timezone info
         current_time = current_time.replace(tzinfo=None)
 
-    # Time threshold
-    time_threshold = current_time - timedelta(minutes=minutes)
+    # Time threshold, in microseconds since the epoch
+    threshold = _epoch_us(current_time - timedelta(minutes=minutes))
+    year, month = current_time.year, current_time.month
 
     # Split logs into individual lines
     log_lines = logs.strip().split("\n")
-    filtered_lines = []
 
-    # Pattern to match timestamps in the logs
-    # Format: RP/0/RP0/CPU0:Apr 23 12:52:06.929 UTC:
-    timestamp_pattern = (
-        r"RP/\d+/\w+/\w+:(\w+)\s+(\d+)\s+(\d+):(\d+):(\d+)\.(\d+)\s+UTC:"
+    # Walk back from the newest line to the first one that is too old
+    cut = 0
+    for index in range(len(log_lines) - 1, -1, -1):
+        line = log_lines[index]
+        if _is_header(line):
+            continue
+        try:
+            log_time = _line_epoch_us(line, year, month)
+        except ValueError:
+            continue
+        if log_time is not None and log_time < threshold:
+            cut = index + 1
+            break
+
+    # Everything before the cut is older; keep only headers and lines that
+    # are not node-prefixed log messages, such as continuation lines
+    filtered_lines = [
+        line
+        for line in log_lines[: max(cut - 1, 0)]
+        if not line.startswith(_LOG_LINE_PREFIX)
+    ]
+    filtered_lines.extend(log_lines[cut:])
+    return "\n".join(filtered_lines)
+
+
+def parse_log_timestamp(
+    line: str, current_time: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Parse the timestamp of a log line.
+
+    Log lines carry no year, so it is taken from the reference time; months
+    after the reference month belong to the previous year.
+
+    Args:
+        line: Log line, e.g. "RP/0/RP0/CPU0:Apr 23 12:52:06.929 UTC: ..."
+        current_time: Naive UTC reference time (defaults to current time)
+
+    Returns:
+        Naive UTC datetime, or None if the line has no timestamp
+
+    Raises:
+        ValueError: If the timestamp is not a valid date
+    """
+    if current_time is None:
+        current_time = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    log_time = _line_epoch_us(line, current_time.year, current_time.month)
+    if log_time is None:
+        return None
+    return _EPOCH + timedelta(microseconds=log_time)
+
+
+def _is_header(line: str) -> bool:
+    """Header/footer lines and empty lines are always kept."""
+    return (
+        not line
+        or line.startswith("---")
+        or line.startswith("===")
+        or "show logging" in line
     )
 
-    # Current year for timestamp context
-    current_year = current_time.year
-
-    # Month name to number mapping
-    month_dict = {
-        "Jan": 1,
-        "Feb": 2,
-        "Mar": 3,
-        "Apr": 4,
-        "May": 5,
-        "Jun": 6,
-        "Jul": 7,
-        "Aug": 8,
-        "Sep": 9,
-        "Oct": 10,
-        "Nov": 11,
-        "Dec": 12,
-    }
-
-    # Process each line
-    for line in log_lines:
-        # Skip header/footer lines or empty lines
-        if (
-            not line
-            or line.startswith("---")
-            or line.startswith("===")
-            or "show logging" in line
-        ):
-            filtered_lines.append(line)
-            continue
 
-        match = re.search(timestamp_pattern, line)
-        if match:
-            try:
-                # Extract timestamp components
-                (
-                    month_str,
-                    day_str,
-                    hour_str,
-                    minute_str,
-                    second_str,
-                    msec_str,
-                ) = match.groups()
-
-                # Get month number
-                month = month_dict.get(month_str, 1)
-
-                # Handle year rollover (logs from last year)
-                year = current_year
-                if month > current_time.month:
-                    year -= 1
-
-                # Parse the log timestamp
-                log_time = datetime(
-                    year=year,
-                    month=month,
-                    day=int(day_str),
-                    hour=int(hour_str),
-                    minute=int(minute_str),
-                    second=int(second_str),
-                    microsecond=int(msec_str)
-                    * 1000,  # Convert milliseconds to microseconds
-                )
+def _line_epoch_us(line: str, year: int, month: int) -> Optional[int]:
+    """Timestamp of a log line in microseconds since the epoch, or None."""
+    if "UTC:" not in line:
+        return None
+    match = _TIMESTAMP_RE.search(line)
+    if not match:
+        return None
+    (
+        month_str,
+        day_str,
+        hour_str,
+        minute_str,
+        second_str,
+        msec_str,
+    ) = match.groups()
+    seconds = (
+        _day_epoch(month_str, day_str, year, month)
+        + int(hour_str) * 3600
+        + int(minute_str) * 60
+        + int(second_str)
+    )
+    return seconds * 1_000_000 + int(msec_str) * 1000
 
-                # Add the line if it's recent enough
-                if log_time >= time_threshold:
-                    filtered_lines.append(line)
-            except Exception as e:
-                # If there are issues parsing, include the line and log the error
-                logger.warning("Error parsing timestamp in log: %s", e)
-                filtered_lines.append(line)
-        else:
-            # If no timestamp found, include the line
-            filtered_lines.append(line)
 
-    return "\n".join(filtered_lines)
+@lru_cache(maxsize=1024)
+def _day_epoch(month_str: str, day_str: str, year: int, month: int) -> int:
+    """
+    Seconds since the epoch at the start of a log day.
+
+    Handles the year rollover: months after the reference month are logs
+    from last year. Raises ValueError for dates that do not exist.
+    """
+    log_month = MONTHS.get(month_str, 1)
+    if log_month > month:
+        year -= 1
+    days = date(year, log_month, int(day_str)).toordinal() - _EPOCH_ORDINAL
+    return days * 86400
+
+
+def _epoch_us(moment: datetime) -> int:
+    delta = moment - _EPOCH
+    return (
+        delta.days * 86400 + delta.seconds
+    ) * 1_000_000 + delta.microseconds
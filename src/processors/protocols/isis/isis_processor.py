@@ -8,6 +8,7 @@ and format it in a way that's easier for small LLMs to understand.
 
 from typing import Dict, Any, List, Optional
 from src.logging import get_logger
+from src.processors.gnmi_tree import updates_to_tree
 
 logger = get_logger(__name__)
 
@@ -79,6 +80,108 @@ def process_isis_data(response: List[Dict[str, Any]]) -> Dict[str, Any]:
     return isis_data
 
 
+def extract_isis_interface_metrics(
+    response: List[Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Extract the ISIS metric of each interface that can form adjacencies.
+
+    Passive interfaces are skipped. The IPv4 unicast metric of the lowest
+    enabled level is used.
+
+    Args:
+        response: The gNMI response data (list of update dictionaries)
+
+    Returns:
+        Dict mapping interface name to metric
+    """
+    metrics = {}
+    for item in response or []:
+        if "interfaces" not in item.get("path", ""):
+            continue
+        for interface in item.get("val", {}).get("interface", []):
+            state = interface.get("state", {})
+            name = interface.get("interface-id") or state.get("interface-id")
+            if not name or state.get("passive", False):
+                continue
+            levels = sorted(
+                interface.get("levels", {}).get("level", []),
+                key=lambda level: level.get("level-number", 0),
+            )
+            for level in levels:
+                if not level.get("state", {}).get("enabled", False):
+                    continue
+                metric = _ipv4_unicast_metric(level)
+                if metric is not None:
+                    metrics[name] = metric
+                    break
+    return metrics
+
+
+def extract_isis_topology(response: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Extract what topology discovery needs from ISIS data: the system ID of
+    the device and its adjacencies that are up.
+
+    Accepts whole ISIS containers as well as projected updates (one per
+    adjacency state or NET leaf).
+
+    Args:
+        response: The gNMI response data (list of update dictionaries)
+
+    Returns:
+        Dict with "system_id" (None if unknown) and "adjacencies", each
+        with interface, system_id and neighbor_ipv4, one per interface and
+        neighbor even when both levels are up
+    """
+    system_id = None
+    adjacencies = {}
+    tree = updates_to_tree(response or [], root="network-instances")
+    for instance in tree.get("network-instance", []):
+        for protocol in instance.get("protocols", {}).get("protocol", []):
+            isis = protocol.get("isis")
+            if not isinstance(isis, dict):
+                continue
+            nets = isis.get("global", {}).get("state", {}).get("net")
+            if isinstance(nets, str):
+                nets = [nets]
+            for net in nets or []:
+                system_id = system_id or _system_id_from_net(net)
+            for interface in isis.get("interfaces", {}).get("interface", []):
+                name = interface.get("interface-id")
+                for level in interface.get("levels", {}).get("level", []):
+                    for adjacency in _extract_adjacencies(name, level):
+                        key = (name, adjacency["system_id"])
+                        adjacencies.setdefault(
+                            key,
+                            {
+                                "interface": name,
+                                "system_id": adjacency["system_id"],
+                                "neighbor_ipv4": adjacency["neighbor_ipv4"],
+                            },
+                        )
+    return {"system_id": system_id, "adjacencies": list(adjacencies.values())}
+
+
+def _system_id_from_net(net: str) -> Optional[str]:
+    """System ID of a NET: "49.0100.0100.0100.0101.00" -> "0100.0100.0101"."""
+    parts = str(net).split(".")
+    if len(parts) < 5:
+        return None
+    return ".".join(parts[-4:-1])
+
+
+def _ipv4_unicast_metric(level: Dict[str, Any]) -> Optional[int]:
+    for af in level.get("afi-safi", {}).get("af", []):
+        state = af.get("state", {})
+        afi = str(state.get("afi-name", af.get("afi-name", "")))
+        safi = str(state.get("safi-name", af.get("safi-name", "")))
+        if afi.endswith("IPV4") and safi.endswith("UNICAST"):
+            if state.get("metric") is not None:
+                return int(state["metric"])
+    return None
+
+
 def _process_interface(interface: Dict[str, Any]) -> Dict[str, Any]:
     """Parse interface data from ISIS response."""
     state = interface.get("state", {})
@@ -125,9 +125,11 @@ class SystemInfoProcessor(BaseProcessor):
         ]
 
     def _extract_grpc_servers(self, extracted_data: Dict[str, Any]):
-        grpc_servers = extracted_data.get(
-            "openconfig-system-grpc:grpc-servers", {}
-        ).get("grpc-server", [])
+        # Projected requests may return the container without its module
+        grpc_container = extracted_data.get(
+            "openconfig-system-grpc:grpc-servers"
+        ) or extracted_data.get("grpc-servers", {})
+        grpc_servers = grpc_container.get("grpc-server", [])
         return [
             {
                 "name": s.get("state", {}).get("name"),
@@ -3,24 +3,175 @@
 """
 Topology parser module.
 Provides functions for extracting interface subnet data for topology discovery.
+
+Addresses are parsed into integers with socket.inet_pton and network IDs
+are computed with bitwise operations, instead of building an
+ipaddress.IPv4Network object per interface. Masks repeat across thousands
+of interfaces, so their parsing is cached. Both IPv4 ("ip/dotted-mask" or
+"ip/prefix-length") and IPv6 ("ip/prefix-length") are supported: an
+interface has one IPv4 "ip_address" and a list of "ipv6_addresses", as
+the interface brief reports them.
 """
-from typing import List, Dict, Any
 import ipaddress
+import operator
+import socket
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Any, Tuple
 
+from src.processors.gnmi_tree import updates_to_tree
 
-def extract_interface_subnets(
-    interface_results: List[Dict[str, Any]],
-) -> List[Dict[str, Any]]:
+NetworkKey = Tuple[int, int, int]
+
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+_BITS = {4: 32, 6: 128}
+
+
+def parse_address(address: str) -> Tuple[int, int]:
     """
-    Extract interface IP and network information from interface API results.
+    Parse an IP address into (version, integer value).
+
+    Raises:
+        ValueError: If the address is not a valid IPv4 or IPv6 address
+    """
+    version = 6 if ":" in address else 4
+    try:
+        packed = socket.inet_pton(_FAMILIES[version], address)
+    except (OSError, TypeError) as e:
+        raise ValueError(f"Invalid IP address: {address!r}") from e
+    return version, int.from_bytes(packed, "big")
+
+
+@lru_cache(maxsize=1024)
+def parse_mask(mask: str, version: int) -> Tuple[int, int]:
+    """
+    Parse a prefix length, netmask or hostmask into (prefix length, netmask).
+
+    Raises:
+        ValueError: If the mask is not valid for the IP version
+    """
+    bits = _BITS[version]
+    all_ones = (1 << bits) - 1
+    if mask.isascii() and mask.isdigit():
+        prefix_length = int(mask)
+        if prefix_length > bits:
+            raise ValueError(f"Invalid prefix length: {mask!r}")
+    elif version == 4:
+        value = parse_address(mask)[1]
+        inverted = value ^ all_ones
+        if not inverted & (inverted + 1):
+            prefix_length = bits - inverted.bit_length()
+        elif not value & (value + 1):
+            # Hostmask, e.g. 0.0.0.255
+            prefix_length = bits - value.bit_length()
+        else:
+            raise ValueError(f"Invalid netmask: {mask!r}")
+    else:
+        raise ValueError(f"Invalid IPv6 prefix length: {mask!r}")
+    return prefix_length, all_ones ^ (all_ones >> prefix_length)
+
+
+def parse_network(network: str) -> NetworkKey:
+    """
+    Parse "address/mask" into (version, network ID, prefix length).
+
+    Host bits are ignored; a bare address is a host network.
+
+    Raises:
+        ValueError: If the address or mask is invalid
+    """
+    address, _, mask = network.partition("/")
+    version, value = parse_address(address)
+    prefix_length, netmask = parse_mask(
+        mask or str(_BITS[version]), version
+    )
+    return version, value & netmask, prefix_length
+
+
+@lru_cache(maxsize=65536)
+def format_network(key: NetworkKey) -> str:
+    """CIDR string of a network key, as ipaddress would print it."""
+    version, value, prefix_length = key
+    if version == 4:
+        packed = value.to_bytes(4, "big")
+        return f"{socket.inet_ntop(socket.AF_INET, packed)}/{prefix_length}"
+    return str(ipaddress.IPv6Network((value, prefix_length)))
+
+
+@dataclass
+class InterfaceAddressTable:
+    """
+    Interface addresses of many devices, one column per attribute.
+
+    Row i is the address ``ips[i]`` of interface ``interfaces[i]`` on
+    ``devices[i]``, in network ``(versions[i], networks[i],
+    prefix_lengths[i])``.
+    """
+
+    devices: List[str] = field(default_factory=list)
+    interfaces: List[str] = field(default_factory=list)
+    ips: List[str] = field(default_factory=list)
+    versions: array = field(default_factory=lambda: array("B"))
+    networks: List[int] = field(default_factory=list)
+    prefix_lengths: array = field(default_factory=lambda: array("B"))
+
+    def __len__(self) -> int:
+        return len(self.ips)
+
+    def network_key(self, row: int) -> NetworkKey:
+        return (
+            self.versions[row],
+            self.networks[row],
+            self.prefix_lengths[row],
+        )
+
+    def group_by_network(self) -> Dict[NetworkKey, List[int]]:
+        """Rows per network, in row order."""
+        groups: Dict[NetworkKey, List[int]] = {}
+        for row, key in enumerate(
+            zip(self.versions, self.networks, self.prefix_lengths)
+        ):
+            groups.setdefault(key, []).append(row)
+        return groups
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Rows as dicts with device, interface, ip and network (CIDR)."""
+        return [
+            {
+                "device": device,
+                "interface": interface,
+                "ip": ip,
+                "network": format_network(key),
+            }
+            for device, interface, ip, key in zip(
+                self.devices,
+                self.interfaces,
+                self.ips,
+                zip(self.versions, self.networks, self.prefix_lengths),
+            )
+        ]
+
+
+def parse_interface_addresses(
+    interface_results: Iterable[Dict[str, Any]],
+) -> InterfaceAddressTable:
+    """
+    Parse the addresses of interface API results into an address table.
+
+    Each interface contributes its IPv4 "ip_address" and every entry of
+    its "ipv6_addresses". Interfaces without a device or name, and
+    addresses that are not a valid "ip/mask", are skipped.
 
     Args:
         interface_results: List of dicts as returned by get_interface_info API (one per device)
 
     Returns:
-        List of entries with device, interface, ip, and network (CIDR string)
+        InterfaceAddressTable with one row per interface address
     """
-    entries: List[Dict[str, Any]] = []
+    table = InterfaceAddressTable()
+    addresses: List[int] = []
+    netmasks: List[int] = []
     for res in interface_results:
         device = res.get("device")
         # Support both top-level 'interfaces' and nested 'response'->'interfaces'
@@ -29,29 +180,81 @@ def extract_interface_subnets(
         else:
             resp = res.get("response", {})
             interfaces = resp.get("interfaces", [])
+        if not device:
+            continue
         for iface in interfaces:
-            ip_addr = iface.get("ip_address")
-            name = (
-                iface.get("name")
-                or iface.get("interface")
-                or iface.get("name")
-            )
-            if not ip_addr or not device or not name:
+            name = iface.get("name") or iface.get("interface")
+            if not name:
                 continue
-            # Convert "100.103.104.104/255.255.255.0" to "100.103.104.104/24"
-            try:
-                ip, mask = ip_addr.split("/")
-                network = str(
-                    ipaddress.IPv4Network(f"{ip}/{mask}", strict=False)
-                )
-            except Exception:
+            for ip_addr in [iface.get("ip_address")] + (
+                iface.get("ipv6_addresses") or []
+            ):
+                if not ip_addr:
+                    continue
+                ip, separator, mask = ip_addr.partition("/")
+                if not separator or "/" in mask:
+                    continue
+                try:
+                    version, value = parse_address(ip)
+                    prefix_length, netmask = parse_mask(mask, version)
+                except ValueError:
+                    continue
+                table.devices.append(device)
+                table.interfaces.append(name)
+                table.ips.append(ip)
+                table.versions.append(version)
+                table.prefix_lengths.append(prefix_length)
+                addresses.append(value)
+                netmasks.append(netmask)
+    # Network IDs of all rows in one pass
+    table.networks = list(map(operator.and_, addresses, netmasks))
+    return table
+
+
+def extract_interface_subnets(
+    interface_results: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Extract interface IP and network information from interface API results.
+
+    Args:
+        interface_results: List of dicts as returned by get_interface_info API (one per device)
+
+    Returns:
+        List of entries with device, interface, ip, and network (CIDR string)
+    """
+    return parse_interface_addresses(interface_results).entries()
+
+
+def extract_lldp_neighbors(
+    response: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Extract LLDP neighbors from openconfig-lldp data.
+
+    Accepts the whole lldp container as well as projected updates (one per
+    neighbor state).
+
+    Args:
+        response: The gNMI response data (list of update dictionaries)
+
+    Returns:
+        List of entries with interface, system_name, port_id and chassis_id
+    """
+    neighbors = []
+    tree = updates_to_tree(response or [], root="lldp")
+    for interface in tree.get("interfaces", {}).get("interface", []):
+        name = interface.get("name") or interface.get("state", {}).get("name")
+        for neighbor in interface.get("neighbors", {}).get("neighbor", []):
+            state = neighbor.get("state", {})
+            if not name or not state.get("system-name"):
                 continue
-            entries.append(
+            neighbors.append(
                 {
-                    "device": device,
                     "interface": name,
-                    "ip": ip,
-                    "network": network,
+                    "system_name": state["system-name"],
+                    "port_id": state.get("port-id"),
+                    "chassis_id": state.get("chassis-id"),
                 }
             )
-    return entries
+    return neighbors
@@ -8,7 +8,7 @@ the gNMIBuddy application for representing operation results.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Sequence, Union
 from .models import NetworkOS, IPAddress
 
 
@@ -185,12 +185,14 @@ class BatchOperationResult:
     as the base structure for individual device results.
 
     Attributes:
-        results: List of NetworkOperationResult objects, one per device
+        results: NetworkOperationResult objects, one per device. Usually a
+            list; large batches may pass a lazy view over an on-disk store
+            (see src.storage.result_store) instead.
         summary: BatchOperationSummary containing aggregate metadata
         metadata: Additional batch operation metadata
     """
 
-    results: List[NetworkOperationResult]
+    results: Sequence[NetworkOperationResult]
     summary: BatchOperationSummary
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -200,27 +202,49 @@ class BatchOperationResult:
             raise ValueError("Summary total_devices must match results count")
 
         successful_count = sum(
-            1 for r in self.results if r.status == OperationStatus.SUCCESS
+            1
+            for status in self._statuses()
+            if status == OperationStatus.SUCCESS
         )
         if successful_count != self.summary.successful:
             raise ValueError(
                 "Summary successful count must match actual successful results"
             )
 
+    def _statuses(self) -> List[OperationStatus]:
+        """Result statuses, read from the store index when available"""
+        statuses = getattr(self.results, "statuses", None)
+        if callable(statuses):
+            return statuses()
+        return [r.status for r in self.results]
+
+    def _filter_status(self, predicate) -> Sequence[NetworkOperationResult]:
+        filter_status = getattr(self.results, "filter_status", None)
+        if callable(filter_status):
+            return filter_status(predicate)
+        return [r for r in self.results if predicate(r.status)]
+
     @property
-    def successful_results(self) -> List[NetworkOperationResult]:
+    def successful_results(self) -> Sequence[NetworkOperationResult]:
         """Get only the successful results"""
-        return [r for r in self.results if r.status == OperationStatus.SUCCESS]
+        return self._filter_status(
+            lambda status: status == OperationStatus.SUCCESS
+        )
 
     @property
-    def failed_results(self) -> List[NetworkOperationResult]:
+    def failed_results(self) -> Sequence[NetworkOperationResult]:
         """Get only the failed results"""
-        return [r for r in self.results if r.status != OperationStatus.SUCCESS]
+        return self._filter_status(
+            lambda status: status != OperationStatus.SUCCESS
+        )
 
     def get_results_by_device(
         self, device_name: str
     ) -> Optional[NetworkOperationResult]:
         """Get result for a specific device"""
+        find_device = getattr(self.results, "find_device", None)
+        if callable(find_device):
+            return find_device(device_name)
         return next(
             (r for r in self.results if r.device_name == device_name), None
         )
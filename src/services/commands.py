@@ -3,7 +3,15 @@
 Simplified network command service for executing commands with standardized error handling and formatting.
 """
 
-from typing import Any, Protocol, runtime_checkable, Union, Optional
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Protocol,
+    runtime_checkable,
+    Union,
+    Optional,
+)
 
 import src.inventory
 from src.logging import get_logger
@@ -53,11 +61,7 @@ def run(
     """
     logger.debug(
         "Running command %s for device: %s, args: %s",
-        (
-            command_func.__name__
-            if hasattr(command_func, "__name__")
-            else "unknown"
-        ),
+        _command_name(command_func),
         device_name,
         str(args),
     )
@@ -85,23 +89,7 @@ def run(
     device = src.inventory.get_device(device_name)
 
     if isinstance(device, DeviceErrorResult):
-        logger.warning("Failed to retrieve device: %s", device_name)
-        logger.debug("Device error details: %s", device.msg)
-
-        # Return NetworkOperationResult for device errors
-        error_response = ErrorResponse(
-            type="DEVICE_ERROR",
-            message=device.msg,
-        )
-        return NetworkOperationResult(
-            device_name=device_name,
-            ip_address=None,
-            nos=NetworkOS.UNKNOWN,
-            operation_type="device_retrieval",
-            status=OperationStatus.FAILED,
-            error_response=error_response,
-            metadata={"error_type": "device_not_found"},
-        )
+        return _device_error_result(device_name, device)
 
     logger.debug(
         "Successfully retrieved device %s (%s, %s)",
@@ -145,11 +133,7 @@ def run_network_wide(
     """
     logger.debug(
         "Running network-wide command %s with args: %s",
-        (
-            command_func.__name__
-            if hasattr(command_func, "__name__")
-            else "unknown"
-        ),
+        _command_name(command_func),
         str(args),
     )
 
@@ -160,3 +144,60 @@ def run_network_wide(
     )
 
     return result
+
+
+def run_stream(
+    device_name: str,
+    command_func: Callable[..., Iterator[NetworkOperationResult]],
+    *args: Any,
+) -> Iterator[NetworkOperationResult]:
+    """
+    Execute a streaming network command, such as following logs.
+
+    Like run(), but the command yields results as they become available.
+    A device that cannot be found yields a single failed result.
+
+    Args:
+        device_name: Name of the device in inventory
+        command_func: Generator function taking the device and ``args``
+        *args: Arguments to pass to the command function
+
+    Yields:
+        NetworkOperationResult: Results produced by the command
+    """
+    logger.debug("Getting device %s from inventory", device_name)
+    device = src.inventory.get_device(device_name)
+    if isinstance(device, DeviceErrorResult):
+        yield _device_error_result(device_name, device)
+        return
+
+    yield from command_func(device, *args)
+
+
+def _device_error_result(
+    device_name: str, device: DeviceErrorResult
+) -> NetworkOperationResult:
+    """Failed result for a device that could not be retrieved."""
+    logger.warning("Failed to retrieve device: %s", device_name)
+    logger.debug("Device error details: %s", device.msg)
+
+    # Return NetworkOperationResult for device errors
+    error_response = ErrorResponse(
+        type="DEVICE_ERROR",
+        message=device.msg,
+    )
+    return NetworkOperationResult(
+        device_name=device_name,
+        ip_address=None,
+        nos=NetworkOS.UNKNOWN,
+        operation_type="device_retrieval",
+        status=OperationStatus.FAILED,
+        error_response=error_response,
+        metadata={"error_type": "device_not_found"},
+    )
+
+
+def _command_name(command_func: Callable) -> str:
+    """Name of a command function for logs, looking through partials."""
+    func = getattr(command_func, "func", command_func)
+    return getattr(func, "__name__", "unknown")
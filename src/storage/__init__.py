@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Local persistence for state kept between gNMIBuddy runs"""
+
+from .latency_stats import LatencyStats, LatencyStatsStore
+from .log_index import IndexedLog, LogIndex, get_log_index, reset_log_index
+from .log_buffer import (
+    DeviceLogBuffer,
+    LogBufferStore,
+    LogEntry,
+    get_log_buffer_store,
+    reset_log_buffer_store,
+)
+from .result_store import (
+    SpilledResultView,
+    SpillingResultStore,
+    result_from_dict,
+    result_to_dict,
+)
+from .system_info_cache import (
+    StaticSystemInfo,
+    SystemInfoCache,
+    get_system_info_cache,
+    reset_system_info_cache,
+)
+
+__all__ = [
+    "DeviceLogBuffer",
+    "IndexedLog",
+    "LatencyStats",
+    "LatencyStatsStore",
+    "LogBufferStore",
+    "LogEntry",
+    "LogIndex",
+    "SpilledResultView",
+    "SpillingResultStore",
+    "StaticSystemInfo",
+    "SystemInfoCache",
+    "get_log_buffer_store",
+    "get_log_index",
+    "get_system_info_cache",
+    "reset_log_buffer_store",
+    "reset_log_index",
+    "reset_system_info_cache",
+    "result_from_dict",
+    "result_to_dict",
+]
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Per-device, per-operation latency statistics persisted between runs.
+
+Batch operations use these statistics to submit the devices expected to take
+the longest first (LPT scheduling) and to give a better ETA while a batch is
+running: the EWMA is the expected time, the p95 bounds it. Statistics are
+stored as a small JSON document in the state directory (see
+GNMIBUDDY_STATE_DIR).
+"""
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.logging import get_logger
+
+logger = get_logger(__name__)
+
+STATS_FILE_NAME = "latency_stats.json"
+STATS_FORMAT_VERSION = 1
+
+
+def nearest_rank_p95(samples: List[float]) -> float:
+    """95th percentile of the samples (nearest-rank), 0.0 when empty."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(0.95 * len(ordered)) - 1
+    return ordered[max(rank, 0)]
+
+
+@dataclass
+class LatencyStats:
+    """Running latency statistics for one device and operation.
+
+    Attributes:
+        ewma: Exponentially weighted moving average of durations in seconds
+        count: Total number of durations recorded
+        samples: Most recent durations, bounded by the store window, used
+            to compute the p95
+    """
+
+    ewma: float = 0.0
+    count: int = 0
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def p95(self) -> float:
+        """95th percentile of the recent samples (nearest-rank)."""
+        return nearest_rank_p95(self.samples)
+
+    def update(self, duration: float, alpha: float, window: int) -> None:
+        """Fold a new duration into the statistics."""
+        if self.count == 0:
+            self.ewma = duration
+        else:
+            self.ewma = alpha * duration + (1 - alpha) * self.ewma
+        self.count += 1
+        self.samples.append(duration)
+        if len(self.samples) > window:
+            del self.samples[: len(self.samples) - window]
+
+    def to_dict(self) -> Dict:
+        return {
+            "ewma": self.ewma,
+            "count": self.count,
+            "samples": list(self.samples),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyStats":
+        return cls(
+            ewma=float(data.get("ewma", 0.0)),
+            count=int(data.get("count", 0)),
+            samples=[float(s) for s in data.get("samples", [])],
+        )
+
+
+class LatencyStatsStore:
+    """Thread-safe store of LatencyStats keyed by operation and device.
+
+    When created without a path the store lives only in memory, which is
+    what tests and one-off callers want. Use ``default()`` to get a store
+    backed by the state directory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        alpha: float = 0.3,
+        window: int = 50,
+    ):
+        self.path = Path(path) if path else None
+        self.alpha = alpha
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, LatencyStats]] = {}
+        self._load()
+
+    @classmethod
+    def default(cls) -> "LatencyStatsStore":
+        """Create a store persisted in the configured state directory."""
+        from src.config.environment import get_settings
+
+        state_dir = get_settings().get_state_dir()
+        return cls(path=state_dir / STATS_FILE_NAME)
+
+    def record(self, device: str, operation: str, duration: float) -> None:
+        """Record how long an operation took on a device."""
+        if duration < 0:
+            return
+        with self._lock:
+            per_device = self._stats.setdefault(operation, {})
+            stats = per_device.setdefault(device, LatencyStats())
+            stats.update(duration, self.alpha, self.window)
+
+    def get(self, device: str, operation: str) -> Optional[LatencyStats]:
+        """Return the statistics for a device and operation, if any."""
+        with self._lock:
+            return self._stats.get(operation, {}).get(device)
+
+    def expected_durations(
+        self, devices: List[str], operation: str
+    ) -> Dict[str, float]:
+        """Expected duration (EWMA) for each device with recorded history."""
+        with self._lock:
+            per_device = self._stats.get(operation, {})
+            return {
+                device: per_device[device].ewma
+                for device in devices
+                if device in per_device
+            }
+
+    def p95_durations(
+        self, devices: List[str], operation: str
+    ) -> Dict[str, float]:
+        """Slow-case duration (p95) for each device with recorded history."""
+        with self._lock:
+            per_device = self._stats.get(operation, {})
+            return {
+                device: per_device[device].p95
+                for device in devices
+                if device in per_device
+            }
+
+    def order_longest_first(
+        self, devices: List[str], operation: str
+    ) -> List[str]:
+        """Order devices by expected duration, longest first.
+
+        Devices without history are assumed to take the mean of the known
+        devices. Ties keep their original order, so with no history at all
+        the input order is returned unchanged.
+        """
+        expected = self.expected_durations(devices, operation)
+        if not expected:
+            return list(devices)
+        fallback = sum(expected.values()) / len(expected)
+        return sorted(
+            devices, key=lambda device: -expected.get(device, fallback)
+        )
+
+    def save(self) -> None:
+        """Persist the statistics to disk; no-op for in-memory stores."""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {
+                "version": STATS_FORMAT_VERSION,
+                "operations": {
+                    operation: {
+                        device: stats.to_dict()
+                        for device, stats in per_device.items()
+                    }
+                    for operation, per_device in self._stats.items()
+                },
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(
+                "Could not save latency statistics to %s: %s", self.path, e
+            )
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("version") != STATS_FORMAT_VERSION:
+                logger.info(
+                    "Ignoring latency statistics with unknown version in %s",
+                    self.path,
+                )
+                return
+            self._stats = {
+                operation: {
+                    device: LatencyStats.from_dict(stats)
+                    for device, stats in per_device.items()
+                }
+                for operation, per_device in payload.get(
+                    "operations", {}
+                ).items()
+            }
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(
+                "Could not load latency statistics from %s: %s", self.path, e
+            )
+            self._stats = {}
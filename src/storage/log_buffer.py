@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Per-device log buffers with watermarks for incremental log retrieval.
+
+Repeated log queries for the same device (an agent polling every few
+minutes) used to download and filter the whole matching log every time.
+A DeviceLogBuffer remembers the timestamp of the last line seen and how many
+lines carried that timestamp (the watermark), so the next query only asks
+the device for lines from the watermark onwards. New lines are appended to a
+bounded ring buffer that answers the requested time window locally.
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LOG_BUFFER_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """One log line and its parsed (naive UTC) timestamp."""
+
+    timestamp: datetime
+    message: str
+
+
+class DeviceLogBuffer:
+    """Bounded, time-ordered buffer of the log lines seen for one device.
+
+    Attributes:
+        watermark: Timestamp of the newest line seen
+        watermark_count: Number of lines seen with exactly that timestamp,
+            skipped when a fetch starting at the watermark returns them again
+        covered_since: Every matching line since this time is buffered;
+            windows starting earlier need a full fetch
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_LOG_BUFFER_SIZE):
+        self.entries: Deque[LogEntry] = deque(maxlen=max_entries)
+        self.watermark: Optional[datetime] = None
+        self.watermark_count = 0
+        self.covered_since: Optional[datetime] = None
+        self.lock = threading.Lock()
+
+    def covers(self, since: datetime) -> bool:
+        """True if the buffer holds every line from ``since`` onwards."""
+        return self.covered_since is not None and self.covered_since <= since
+
+    def merge(
+        self, entries: Iterable[LogEntry], fetched_since: datetime
+    ) -> List[LogEntry]:
+        """
+        Add the lines of a fetch that started at ``fetched_since``.
+
+        Lines already buffered (between the start of coverage and the
+        watermark, plus the lines counted at the watermark itself) are
+        dropped as duplicates. Lines older than the start of coverage come
+        from a wider fetch and are put in front of the buffered ones.
+
+        Returns:
+            The new lines, oldest first
+        """
+        covered_since = self.covered_since
+        watermark = self.watermark
+        watermark_count = self.watermark_count
+        older: List[LogEntry] = []
+        added: List[LogEntry] = []
+        seen_at_watermark = 0
+        for entry in entries:
+            if entry.timestamp < fetched_since:
+                # The device filters by whole seconds
+                continue
+            if covered_since is not None and entry.timestamp < covered_since:
+                older.append(entry)
+                continue
+            if watermark is not None:
+                if entry.timestamp < watermark:
+                    continue
+                if entry.timestamp == watermark:
+                    seen_at_watermark += 1
+                    if seen_at_watermark <= watermark_count:
+                        continue
+            self._append(entry)
+            added.append(entry)
+
+        if older:
+            self.entries = deque(
+                older + list(self.entries), maxlen=self.entries.maxlen
+            )
+            if self.watermark is None:
+                self.watermark = older[-1].timestamp
+                self.watermark_count = sum(
+                    1 for e in older if e.timestamp == self.watermark
+                )
+            added = older + added
+
+        if covered_since is None or fetched_since < covered_since:
+            self.covered_since = fetched_since
+        if self.entries and len(self.entries) == self.entries.maxlen:
+            # Evicted lines are gone: only the oldest kept one is covered
+            self.covered_since = max(
+                self.covered_since, self.entries[0].timestamp
+            )
+        return added
+
+    def window(self, since: datetime) -> List[LogEntry]:
+        """Buffered lines with a timestamp at or after ``since``."""
+        return [entry for entry in self.entries if entry.timestamp >= since]
+
+    def _append(self, entry: LogEntry) -> None:
+        if self.watermark is None or entry.timestamp > self.watermark:
+            self.watermark = entry.timestamp
+            self.watermark_count = 1
+        elif entry.timestamp == self.watermark:
+            self.watermark_count += 1
+        self.entries.append(entry)
+
+
+class LogBufferStore:
+    """Process-wide log buffers, one per device and log filter."""
+
+    def __init__(self, max_entries: int = DEFAULT_LOG_BUFFER_SIZE):
+        self.max_entries = max_entries
+        self._buffers: Dict[Tuple[str, str], DeviceLogBuffer] = {}
+        self._lock = threading.Lock()
+
+    def get(self, device_name: str, log_filter: str) -> DeviceLogBuffer:
+        """Return the buffer for a device and filter, creating it if needed."""
+        key = (device_name, log_filter)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = DeviceLogBuffer(
+                    self.max_entries
+                )
+            return buffer
+
+
+_store: Optional[LogBufferStore] = None
+_store_lock = threading.Lock()
+
+
+def get_log_buffer_store() -> LogBufferStore:
+    """Return the process-wide log buffer store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LogBufferStore()
+        return _store
+
+
+def reset_log_buffer_store() -> None:
+    """Drop every log buffer (primarily for tests)."""
+    global _store
+    with _store_lock:
+        _store = None
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Local, fleet-wide index of device log lines.
+
+Questions such as "which routers logged ISIS ADJCHANGE in the last hour"
+used to need a get_logs call per device and a client-side grep. When enabled
+(GNMIBUDDY_LOG_INDEX), every line fetched by get_logs or a log follower is
+also appended to this index, which answers keyword and time-window queries
+across devices without contacting them.
+
+Lines are stored append-only per device, partitioned by UTC hour, as JSON
+lines under ``<state dir>/log_index/<device>/<YYYYMMDDHH>.jsonl``. Each
+partition loaded in memory keeps an inverted index from tokens to lines.
+Tokens are the upper-cased words of the line plus the parts of its message
+code, so ``%ROUTING-ISIS-5-ADJCHANGE`` is found by ``ISIS``, ``ADJCHANGE``
+or ``ROUTING-ISIS``, and its severity (5) can be filtered on.
+"""
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+from src.logging import get_logger
+from src.storage.log_buffer import LogEntry
+
+logger = get_logger(__name__)
+
+LOG_INDEX_DIR_NAME = "log_index"
+PARTITION_FORMAT = "%Y%m%d%H"
+DEFAULT_RETENTION_HOURS = 7 * 24
+
+# IOS-XR message code: %<FACILITY>[-<SUBFACILITY>...]-<SEVERITY>-<MNEMONIC>
+_MESSAGE_CODE = re.compile(
+    r"%([A-Z0-9_]+(?:-[A-Z0-9_]+)*?)-([0-7])-([A-Z0-9_]+)"
+)
+_WORD = re.compile(r"[A-Z0-9_]+")
+
+
+@dataclass(frozen=True)
+class IndexedLog:
+    """A log line found in the index."""
+
+    device: str
+    timestamp: datetime
+    message: str
+    severity: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "device": self.device,
+            "timestamp": self.timestamp.isoformat(),
+            "severity": self.severity,
+            "message": self.message,
+        }
+
+
+@dataclass
+class _Partition:
+    """The lines of one device and hour, with their inverted index."""
+
+    entries: List[IndexedLog] = field(default_factory=list)
+    postings: Dict[str, List[int]] = field(default_factory=dict)
+    seen: Set[Tuple[datetime, str]] = field(default_factory=set)
+
+    def add(self, entry: IndexedLog) -> bool:
+        key = (entry.timestamp, entry.message)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        position = len(self.entries)
+        self.entries.append(entry)
+        for token in tokenize(entry.message):
+            self.postings.setdefault(token, []).append(position)
+        return True
+
+    def candidates(self, keyword_groups: List[List[str]]) -> Iterable[int]:
+        """
+        Positions of lines that may match every group (any keyword per
+        group); see matches_keywords for the exact check.
+        """
+        if not keyword_groups:
+            return range(len(self.entries))
+        matches: Optional[Set[int]] = None
+        for group in keyword_groups:
+            group_matches: Set[int] = set()
+            for keyword in group:
+                group_matches.update(self._keyword_candidates(keyword))
+            matches = (
+                group_matches if matches is None else matches & group_matches
+            )
+            if not matches:
+                return ()
+        return sorted(matches or ())
+
+    def _keyword_candidates(self, keyword: str) -> Set[int]:
+        """Lines holding every index token of a keyword."""
+        if keyword in self.postings:
+            return set(self.postings[keyword])
+        # Keywords such as LINK-3 or GigabitEthernet0/0/0/0 are not index
+        # tokens themselves: split them the way lines are split
+        words = _WORD.findall(keyword)
+        if not words:
+            return set(range(len(self.entries)))
+        positions = set(self.postings.get(words[0], ()))
+        for word in words[1:]:
+            positions &= set(self.postings.get(word, ()))
+        return positions
+
+
+def tokenize(message: str) -> Set[str]:
+    """Index tokens of a log line: its words and message code parts."""
+    upper = message.upper()
+    tokens = set(_WORD.findall(upper))
+    for facility, severity, mnemonic in _MESSAGE_CODE.findall(upper):
+        parts = facility.split("-")
+        # Every run of facility parts, e.g. ROUTING, ISIS and ROUTING-ISIS
+        for start in range(len(parts)):
+            for end in range(start + 1, len(parts) + 1):
+                tokens.add("-".join(parts[start:end]))
+        tokens.add(f"{facility}-{severity}-{mnemonic}")
+        tokens.add(f"-{severity}-")
+    return tokens
+
+
+def parse_severity(message: str) -> Optional[int]:
+    """Severity (0-7) from the message code of a log line, if any."""
+    match = _MESSAGE_CODE.search(message.upper())
+    return int(match.group(2)) if match else None
+
+
+def parse_keywords(keywords: Optional[str]) -> List[List[str]]:
+    """
+    Turn a keyword query into token groups.
+
+    Words separated by spaces must all match; alternatives separated by
+    '|' (as in the egrep filter of get_logs) match any of them:
+    "ISIS|BGP ADJCHANGE" -> [["ISIS", "BGP"], ["ADJCHANGE"]].
+    """
+    groups = []
+    for word in (keywords or "").upper().split():
+        group = [token for token in word.strip("()").split("|") if token]
+        if group:
+            groups.append(group)
+    return groups
+
+
+def matches_keywords(message: str, keyword_groups: List[List[str]]) -> bool:
+    """Whether a line contains a keyword of every group (case-insensitive)."""
+    upper = message.upper()
+    return all(
+        any(keyword in upper for keyword in group)
+        for group in keyword_groups
+    )
+
+
+class LogIndex:
+    """Append-only, time-partitioned log store with an inverted index.
+
+    When created without a root the index lives only in memory, which is
+    what tests want. Use ``default()`` for the index in the state directory.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        retention_hours: int = DEFAULT_RETENTION_HOURS,
+    ):
+        self.root = Path(root) if root else None
+        self.retention_hours = retention_hours
+        self._lock = threading.Lock()
+        self._partitions: Dict[Tuple[str, str], _Partition] = {}
+
+    @classmethod
+    def default(cls) -> "LogIndex":
+        """Create an index persisted in the configured state directory."""
+        from src.config.environment import get_settings
+
+        state_dir = get_settings().get_state_dir()
+        return cls(root=state_dir / LOG_INDEX_DIR_NAME)
+
+    def add(self, device: str, entries: Iterable[LogEntry]) -> int:
+        """
+        Append log lines of a device; lines already indexed are skipped.
+
+        Returns:
+            Number of lines added
+        """
+        by_hour: Dict[str, List[IndexedLog]] = {}
+        for entry in entries:
+            indexed = IndexedLog(
+                device=device,
+                timestamp=entry.timestamp,
+                message=entry.message,
+                severity=parse_severity(entry.message),
+            )
+            hour = entry.timestamp.strftime(PARTITION_FORMAT)
+            by_hour.setdefault(hour, []).append(indexed)
+
+        added = 0
+        with self._lock:
+            for hour, hour_entries in by_hour.items():
+                partition = self._partition(device, hour)
+                new = [entry for entry in hour_entries if partition.add(entry)]
+                self._append_to_file(device, hour, new)
+                added += len(new)
+            if added:
+                self._prune(device)
+        return added
+
+    def query(
+        self,
+        keywords: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        devices: Optional[List[str]] = None,
+        max_severity: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[IndexedLog]:
+        """
+        Find indexed lines across devices.
+
+        Args:
+            keywords: Words that must all appear; "A|B" matches either.
+                A word matches where the line contains it, e.g. LINK-3 or
+                GigabitEthernet0/0/0/0
+            since: Oldest timestamp to include (naive UTC)
+            until: Newest timestamp to include (naive UTC)
+            devices: Devices to search (default: all indexed devices)
+            max_severity: Only lines with a severity at or below this
+            limit: Return only the newest ``limit`` matches
+
+        Returns:
+            Matching lines, oldest first
+        """
+        groups = parse_keywords(keywords)
+        results: List[IndexedLog] = []
+        with self._lock:
+            for device in devices or self._devices():
+                for hour in self._hours(device, since, until):
+                    partition = self._partition(device, hour)
+                    for position in partition.candidates(groups):
+                        entry = partition.entries[position]
+                        if not matches_keywords(entry.message, groups):
+                            continue
+                        if since is not None and entry.timestamp < since:
+                            continue
+                        if until is not None and entry.timestamp > until:
+                            continue
+                        if max_severity is not None and (
+                            entry.severity is None
+                            or entry.severity > max_severity
+                        ):
+                            continue
+                        results.append(entry)
+
+        results.sort(key=lambda entry: (entry.timestamp, entry.device))
+        if limit is not None and limit >= 0:
+            results = results[len(results) - limit :] if limit else []
+        return results
+
+    def devices(self) -> List[str]:
+        """Names of the devices with indexed lines."""
+        with self._lock:
+            return self._devices()
+
+    def _devices(self) -> List[str]:
+        names = {device for device, _ in self._partitions}
+        if self.root is not None and self.root.is_dir():
+            names.update(
+                unquote(path.name)
+                for path in self.root.iterdir()
+                if path.is_dir()
+            )
+        return sorted(names)
+
+    def _hours(
+        self,
+        device: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+    ) -> List[str]:
+        """Partitions of a device that may hold lines in the window."""
+        hours = {hour for name, hour in self._partitions if name == device}
+        device_dir = self._device_dir(device)
+        if device_dir is not None and device_dir.is_dir():
+            hours.update(path.stem for path in device_dir.glob("*.jsonl"))
+        low = since.strftime(PARTITION_FORMAT) if since else None
+        high = until.strftime(PARTITION_FORMAT) if until else None
+        return sorted(
+            hour
+            for hour in hours
+            if (low is None or hour >= low) and (high is None or hour <= high)
+        )
+
+    def _partition(self, device: str, hour: str) -> _Partition:
+        """Return a partition, loading it from disk the first time."""
+        key = (device, hour)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _Partition()
+            for entry in self._read_file(device, hour):
+                partition.add(entry)
+        return partition
+
+    def _device_dir(self, device: str) -> Optional[Path]:
+        if self.root is None:
+            return None
+        return self.root / quote(device, safe="")
+
+    def _read_file(self, device: str, hour: str) -> Iterable[IndexedLog]:
+        device_dir = self._device_dir(device)
+        if device_dir is None:
+            return
+        path = device_dir / f"{hour}.jsonl"
+        if not path.exists():
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        timestamp = datetime.fromisoformat(record["t"])
+                    except (ValueError, KeyError):
+                        # A partially written last line is skipped
+                        continue
+                    yield IndexedLog(
+                        device=device,
+                        timestamp=timestamp,
+                        message=record.get("m", ""),
+                        severity=parse_severity(record.get("m", "")),
+                    )
+        except OSError as e:
+            logger.warning("Could not read log index %s: %s", path, e)
+
+    def _append_to_file(
+        self, device: str, hour: str, entries: List[IndexedLog]
+    ) -> None:
+        device_dir = self._device_dir(device)
+        if device_dir is None or not entries:
+            return
+        try:
+            device_dir.mkdir(parents=True, exist_ok=True)
+            with open(
+                device_dir / f"{hour}.jsonl", "a", encoding="utf-8"
+            ) as f:
+                for entry in entries:
+                    record = {
+                        "t": entry.timestamp.isoformat(),
+                        "m": entry.message,
+                    }
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning(
+                "Could not append to log index for %s: %s", device, e
+            )
+
+    def _prune(self, device: str) -> None:
+        """Drop partitions of a device older than the retention period."""
+        hours = self._hours(device, None, None)
+        if not hours:
+            return
+        newest = datetime.strptime(hours[-1], PARTITION_FORMAT)
+        cutoff = (newest - timedelta(hours=self.retention_hours)).strftime(
+            PARTITION_FORMAT
+        )
+        for hour in hours:
+            if hour >= cutoff:
+                break
+            self._partitions.pop((device, hour), None)
+            device_dir = self._device_dir(device)
+            if device_dir is not None:
+                try:
+                    (device_dir / f"{hour}.jsonl").unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(
+                        "Could not prune log index for %s: %s", device, e
+                    )
+
+
+_index: Optional[LogIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_log_index() -> LogIndex:
+    """Return the process-wide log index in the state directory."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LogIndex.default()
+        return _index
+
+
+def reset_log_index() -> None:
+    """Drop the process-wide log index (primarily for tests)."""
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Disk-spilling store for batch operation results.
+
+Large batch operations (e.g. detailed routing or VPN data across thousands
+of devices) can hold more per-device payload than fits in memory. The
+SpillingResultStore appends every NetworkOperationResult to a file as an
+individually compressed JSON record and keeps only a small index entry
+(device name, status, file offset) in memory. Results are loaded back one
+at a time when the store, or a view over it, is read.
+"""
+import ipaddress
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from src.logging import get_logger
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    FeatureNotFoundResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+
+logger = get_logger(__name__)
+
+# Each record is a 4-byte big-endian length followed by zlib-compressed JSON
+_FRAME_HEADER = struct.Struct(">I")
+
+
+def result_to_dict(result: NetworkOperationResult) -> Dict[str, Any]:
+    """Convert a NetworkOperationResult to a JSON-compatible dict."""
+    from src.cmd.formatters import make_serializable
+
+    data = make_serializable(result)
+    if result.ip_address is not None:
+        data["ip_address"] = str(result.ip_address)
+    return data
+
+
+def result_from_dict(data: Dict[str, Any]) -> NetworkOperationResult:
+    """Rebuild a NetworkOperationResult from ``result_to_dict`` output."""
+    ip_address = data.get("ip_address")
+    try:
+        ip_address = (
+            ipaddress.ip_address(ip_address) if ip_address else None
+        )
+    except ValueError:
+        # Error results may carry placeholders such as "unknown"
+        pass
+
+    error = data.get("error_response")
+    feature_not_found = data.get("feature_not_found_response")
+    return NetworkOperationResult(
+        device_name=data["device_name"],
+        ip_address=ip_address,
+        nos=NetworkOS(data.get("nos", NetworkOS.UNKNOWN.value)),
+        operation_type=data.get("operation_type", ""),
+        status=OperationStatus(data["status"]),
+        data=data.get("data") or {},
+        metadata=data.get("metadata") or {},
+        error_response=ErrorResponse(**error) if error else None,
+        feature_not_found_response=(
+            FeatureNotFoundResponse(**feature_not_found)
+            if feature_not_found
+            else None
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class _IndexEntry:
+    """In-memory index entry for one spilled result."""
+
+    device_name: str
+    status: OperationStatus
+    offset: int
+    length: int
+
+
+class SpilledResultView(Sequence[NetworkOperationResult]):
+    """Lazy, read-only sequence over results held in a SpillingResultStore.
+
+    Indexing or iterating loads results from disk one at a time; status and
+    device lookups use only the in-memory index.
+    """
+
+    def __init__(
+        self, store: "SpillingResultStore", entries: List[_IndexEntry]
+    ):
+        self._store = store
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @overload
+    def __getitem__(self, index: int) -> NetworkOperationResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SpilledResultView": ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[NetworkOperationResult, "SpilledResultView"]:
+        if isinstance(index, slice):
+            return SpilledResultView(self._store, self._entries[index])
+        return self._store._load(self._entries[index])
+
+    def __iter__(self) -> Iterator[NetworkOperationResult]:
+        for entry in list(self._entries):
+            yield self._store._load(entry)
+
+    def statuses(self) -> List[OperationStatus]:
+        """Statuses of the results, without loading them."""
+        return [entry.status for entry in self._entries]
+
+    def filter_status(
+        self, predicate: Callable[[OperationStatus], bool]
+    ) -> "SpilledResultView":
+        """View over the results whose status matches ``predicate``."""
+        return SpilledResultView(
+            self._store,
+            [entry for entry in self._entries if predicate(entry.status)],
+        )
+
+    def find_device(
+        self, device_name: str
+    ) -> Optional[NetworkOperationResult]:
+        """First result for ``device_name``, or None."""
+        entry = next(
+            (e for e in self._entries if e.device_name == device_name), None
+        )
+        return self._store._load(entry) if entry else None
+
+
+class SpillingResultStore(SpilledResultView):
+    """Append-only on-disk store of NetworkOperationResult objects.
+
+    The store is itself a lazy view over everything appended so far, so it
+    can be passed directly as ``BatchOperationResult.results``.
+
+    Args:
+        path: File to write to. When omitted a temporary file is created and
+            removed again on ``close()``.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        super().__init__(self, [])
+        self._lock = threading.Lock()
+        if path is None:
+            fd, tmp_name = tempfile.mkstemp(
+                prefix="gnmibuddy-results-", suffix=".jsonz"
+            )
+            os.close(fd)
+            self.path = Path(tmp_name)
+            self._delete_on_close = True
+        else:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._delete_on_close = False
+        self._file = open(self.path, "w+b")
+        self._offset = 0
+
+    def append(self, result: NetworkOperationResult) -> None:
+        """Spill a result to disk and index it."""
+        payload = zlib.compress(
+            json.dumps(result_to_dict(result), default=str).encode("utf-8")
+        )
+        with self._lock:
+            self._file.seek(self._offset)
+            self._file.write(_FRAME_HEADER.pack(len(payload)))
+            self._file.write(payload)
+            entry = _IndexEntry(
+                device_name=result.device_name,
+                status=result.status,
+                offset=self._offset + _FRAME_HEADER.size,
+                length=len(payload),
+            )
+            self._offset += _FRAME_HEADER.size + len(payload)
+            self._entries.append(entry)
+
+    def close(self) -> None:
+        """Close the backing file, removing it if it was temporary."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+            if self._delete_on_close:
+                try:
+                    os.unlink(self.path)
+                except OSError as e:
+                    logger.debug(
+                        "Could not remove result store %s: %s", self.path, e
+                    )
+
+    def __enter__(self) -> "SpillingResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load(self, entry: _IndexEntry) -> NetworkOperationResult:
+        with self._lock:
+            self._file.seek(entry.offset)
+            payload = self._file.read(entry.length)
+        return result_from_dict(json.loads(zlib.decompress(payload)))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Per-device cache of the static part of system information.
+
+Hostname, software version, gRPC server configuration, users and logging
+selectors change rarely, while memory figures and the current time change
+on every call. get_system_info keeps the static subtree here and fetches
+only the small dynamic one each time. An entry is reused until its TTL
+expires or the device reports a different boot time, which means it was
+reloaded and may run new software.
+"""
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class StaticSystemInfo:
+    """The static system subtree of a device and when it was fetched."""
+
+    tree: Dict[str, Any]
+    boot_time: Optional[str]
+    fetched_at: float
+
+
+class SystemInfoCache:
+    """Static system subtrees keyed by device name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, StaticSystemInfo] = {}
+
+    def get(
+        self, device_name: str, boot_time: Optional[str], ttl: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of the cached static subtree of a device.
+
+        Args:
+            device_name: Device the subtree belongs to
+            boot_time: Boot time the device reports now
+            ttl: Seconds a cached subtree stays valid
+
+        Returns:
+            The subtree, or None when missing, expired or fetched before the
+            device last booted (the stale entry is dropped)
+        """
+        with self._lock:
+            entry = self._entries.get(device_name)
+            if entry is None:
+                return None
+            if entry.boot_time != boot_time:
+                logger.debug(
+                    "Boot time of %s changed, dropping static system info",
+                    device_name,
+                )
+                del self._entries[device_name]
+                return None
+            if time.monotonic() - entry.fetched_at >= ttl:
+                del self._entries[device_name]
+                return None
+            return copy.deepcopy(entry.tree)
+
+    def put(
+        self,
+        device_name: str,
+        tree: Dict[str, Any],
+        boot_time: Optional[str],
+    ) -> None:
+        """Store the static subtree of a device."""
+        with self._lock:
+            self._entries[device_name] = StaticSystemInfo(
+                tree=copy.deepcopy(tree),
+                boot_time=boot_time,
+                fetched_at=time.monotonic(),
+            )
+
+    def invalidate(self, device_name: Optional[str] = None) -> None:
+        """Drop the entry of one device, or all entries."""
+        with self._lock:
+            if device_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(device_name, None)
+
+
+_cache: Optional[SystemInfoCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_system_info_cache() -> SystemInfoCache:
+    """Return the process-wide static system info cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SystemInfoCache()
+        return _cache
+
+
+def reset_system_info_cache() -> None:
+    """Drop the process-wide static system info cache (primarily for tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = None
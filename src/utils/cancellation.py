@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cooperative cancellation for in-flight device work.
+
+A CancellationToken is shared by every task of a batch run. Code that may
+block (retry back-off sleeps, gNMI calls) looks up the token of the current
+scope and either waits on it or registers a callback that aborts the blocking
+call, e.g. by closing the gRPC channel. Cancelling the token therefore frees
+worker threads right away instead of waiting for timeouts to expire.
+
+The current token is kept in a context variable. Worker threads do not
+inherit context variables, so work submitted to a thread pool must enter
+the scope explicitly with ``cancellation_scope(token)``.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from src.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class OperationCancelledError(Exception):
+    """Raised when work is abandoned because its token was cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal with abort callbacks."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Operation cancelled") -> None:
+        """Cancel the token and run every registered callback once."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        logger.debug("Cancellation requested: %s", reason)
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to ``timeout`` seconds; return True if cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelledError(self.reason)
+
+    def register(self, callback: Callable[[], None]) -> None:
+        """Register a callback to run on cancellation.
+
+        If the token is already cancelled the callback runs immediately.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @staticmethod
+    def _run_callback(callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            logger.debug("Cancellation callback failed: %s", e)
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar(
+    "gnmibuddy_cancellation_token", default=None
+)
+
+
+def get_current_token() -> Optional[CancellationToken]:
+    """Return the cancellation token of the current scope, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(
+    token: Optional[CancellationToken],
+) -> Iterator[Optional[CancellationToken]]:
+    """Make ``token`` the current cancellation token within the block."""
+    reset_token = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset_token)
+
+
+@contextmanager
+def on_cancel(callback: Callable[[], None]) -> Iterator[None]:
+    """Run ``callback`` if the current token is cancelled within the block."""
+    token = get_current_token()
+    if token is None:
+        yield
+        return
+    token.register(callback)
+    try:
+        yield
+    finally:
+        token.unregister(callback)
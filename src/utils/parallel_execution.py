@@ -4,9 +4,16 @@ import concurrent.futures
 from typing import Dict, Any, List, Callable
 
 from src.logging import get_logger
+from src.gnmi.priority import Priority, priority_scope
 import src.inventory
 
 
+def _run_as_bulk(command_func: Callable, *args) -> Any:
+    """Run a fan-out task in the bulk priority lane"""
+    with priority_scope(Priority.BULK):
+        return command_func(*args)
+
+
 def run_command_on_all_devices(
     command_func: Callable,
     *args,
@@ -15,6 +22,9 @@ def run_command_on_all_devices(
     """
     Run a command on all devices in the inventory concurrently.
 
+    Device tasks run in the bulk priority lane so that interactive requests
+    in the same process are served first.
+
     Args:
         command_func: Function to execute on each device
         *args: Arguments to pass to the command function
@@ -23,13 +33,39 @@ def run_command_on_all_devices(
     Returns:
         List of results from each device
     """
-    logger = get_logger(__name__)
     # Initialize inventory if not already done
     src.inventory.InventoryManager.initialize()
     # Get the list of all devices
     devices_info = src.inventory.InventoryManager.list_devices()
     device_names = [device.name for device in devices_info.devices]
 
+    return run_command_on_devices(
+        command_func, device_names, *args, max_workers=max_workers
+    )
+
+
+def run_command_on_devices(
+    command_func: Callable,
+    device_names: List[str],
+    *args,
+    max_workers: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Run a command on the given devices concurrently.
+
+    Device tasks run in the bulk priority lane, like
+    run_command_on_all_devices.
+
+    Args:
+        command_func: Function to execute on each device
+        device_names: Names of the devices to run the command on
+        *args: Arguments to pass to the command function
+        max_workers: Maximum number of concurrent workers
+
+    Returns:
+        List of results from each device, in completion order
+    """
+    logger = get_logger(__name__)
     results = []
 
     with concurrent.futures.ThreadPoolExecutor(
@@ -37,7 +73,9 @@ def run_command_on_all_devices(
     ) as executor:
         # Create a dictionary of future: device_name
         future_to_device = {
-            executor.submit(command_func, device_name, *args): device_name
+            executor.submit(
+                _run_as_bulk, command_func, device_name, *args
+            ): device_name
             for device_name in device_names
         }
 
@@ -2,7 +2,8 @@
 VRF utility functions for extracting non-default VRF names from gNMI responses.
 """
 
-from typing import List, Union
+import re
+from typing import List, Optional, Union
 from src.schemas.models import Device
 from src.gnmi.client import get_gnmi_data
 from src.gnmi.parameters import GnmiRequest
@@ -14,6 +15,26 @@ from src.schemas.responses import (
 
 DEFAULT_INTERNAL_VRFS = ["default", "**iid"]
 
+_INTERNAL_VRFS_LOWER = frozenset(vrf.lower() for vrf in DEFAULT_INTERNAL_VRFS)
+_NETWORK_INSTANCE_NAME = re.compile(r"network-instance\[name=([^\]]+)\]")
+
+
+def is_internal_vrf(vrf_name: str) -> bool:
+    """Return True for default/internal VRFs listed in DEFAULT_INTERNAL_VRFS."""
+    return vrf_name.lower() in _INTERNAL_VRFS_LOWER
+
+
+def network_instance_name(path: str) -> Optional[str]:
+    """
+    Extract the network-instance name from a gNMI update path.
+
+    Wildcard requests come back with resolved keys, e.g.
+    "network-instances/network-instance[name=CUST_A]/protocols/..." -> "CUST_A".
+    Returns None when the path has no network-instance key.
+    """
+    match = _NETWORK_INSTANCE_NAME.search(path or "")
+    return match.group(1) if match else None
+
 
 def get_non_default_vrf_names(
     device: Device,
@@ -51,11 +72,6 @@ def get_non_default_vrf_names(
             for item in response_data:
                 if isinstance(item, dict) and "val" in item:
                     val = item.get("val")
-                    if (
-                        val
-                        and isinstance(val, str)
-                        and val.lower()
-                        not in [vrf.lower() for vrf in DEFAULT_INTERNAL_VRFS]
-                    ):
+                    if val and isinstance(val, str) and not is_internal_vrf(val):
                         vrf_names.append(val)
     return vrf_names
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for cancellation of in-flight batch work"""
+import ipaddress
+import time
+
+import pytest
+
+from src.cmd.batch import BatchOperationExecutor
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.utils.cancellation import CancellationToken, get_current_token
+
+
+def _result(device_name: str, status: OperationStatus) -> NetworkOperationResult:
+    return NetworkOperationResult(
+        device_name=device_name,
+        ip_address=ipaddress.IPv4Address("192.168.1.1"),
+        nos=NetworkOS.IOSXR,
+        operation_type="test",
+        status=status,
+        data={},
+        metadata={},
+        error_response=(
+            ErrorResponse(type="connection_error", message="down")
+            if status == OperationStatus.FAILED
+            else None
+        ),
+    )
+
+
+def _slow_operation(device_name: str) -> NetworkOperationResult:
+    """Fail R1 right away, block the others until cancelled."""
+    if device_name == "R1":
+        return _result(device_name, OperationStatus.FAILED)
+    token = get_current_token()
+    assert token is not None
+    token.wait(30)
+    return _result(device_name, OperationStatus.FAILED)
+
+
+class TestBatchCancellation:
+    def test_fail_fast_cancels_in_flight_work(self):
+        executor = BatchOperationExecutor(max_workers=2)
+        devices = ["R1", "R2", "R3", "R4"]
+
+        start = time.time()
+        batch_result = executor.execute_batch_operation(
+            devices=devices,
+            operation_func=_slow_operation,
+            operation_type="test",
+            show_progress=False,
+            fail_fast=True,
+        )
+
+        assert time.time() - start < 5
+        assert batch_result.summary.total_devices == 4
+        assert batch_result.summary.failed == 4
+        assert batch_result.metadata["cancelled"] is True
+        cancelled = [
+            r.device_name
+            for r in batch_result.results
+            if r.error_response and r.error_response.type == "CANCELLED"
+        ]
+        assert sorted(cancelled) == ["R2", "R3", "R4"]
+        assert {r.operation_type for r in batch_result.results} == {"test"}
+
+    def test_results_keep_operation_type_without_running(self):
+        token = CancellationToken()
+        token.cancel("coordinator went away")
+
+        def operation(device_name):
+            raise RuntimeError("boom")
+
+        executor = BatchOperationExecutor(max_workers=2)
+        cancelled = executor.execute_batch_operation(
+            devices=["R1", "R2"],
+            operation_func=operation,
+            operation_type="routing",
+            show_progress=False,
+            cancellation_token=token,
+        )
+        failed = executor.execute_batch_operation(
+            devices=["R1"],
+            operation_func=operation,
+            operation_type="routing",
+            show_progress=False,
+        )
+
+        for result in [*cancelled.results, *failed.results]:
+            assert result.operation_type == "routing"
+        assert failed.results[0].error_response.message == "boom"
+
+    def test_keyboard_interrupt_cancels_token(self):
+        tokens = []
+
+        def operation(device_name):
+            tokens.append(get_current_token())
+            raise KeyboardInterrupt
+
+        executor = BatchOperationExecutor(max_workers=1)
+        with pytest.raises(KeyboardInterrupt):
+            executor.execute_batch_operation(
+                devices=["R1", "R2"],
+                operation_func=operation,
+                operation_type="test",
+                show_progress=False,
+            )
+        assert tokens and tokens[0].is_cancelled
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests for multi-process sharded batch execution"""
+import ipaddress
+import os
+
+import pytest
+
+from src.cmd.sharded_batch import ShardedBatchExecutor, shard_devices
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.utils.cancellation import get_current_token
+
+pytestmark = pytest.mark.skipif(
+    not ShardedBatchExecutor.is_supported(),
+    reason="sharded execution requires the fork start method",
+)
+
+
+def _operation(
+    device_name: str, failing_device: str = "R2"
+) -> NetworkOperationResult:
+    failed = device_name == failing_device
+    return NetworkOperationResult(
+        device_name=device_name,
+        ip_address=ipaddress.IPv4Address("192.168.1.1"),
+        nos=NetworkOS.IOSXR,
+        operation_type="test",
+        status=OperationStatus.FAILED if failed else OperationStatus.SUCCESS,
+        data={"pid": os.getpid()},
+        metadata={},
+        error_response=(
+            ErrorResponse(type="connection_error", message="down")
+            if failed
+            else None
+        ),
+    )
+
+
+def _fail_fast_operation(device_name: str) -> NetworkOperationResult:
+    if device_name != "R1":
+        get_current_token().wait(30)
+    return _operation(device_name, failing_device="R1")
+
+
+class TestShardDevices:
+    def test_round_robin(self):
+        assert shard_devices(["R1", "R2", "R3"], 2) == [["R1", "R3"], ["R2"]]
+
+    def test_more_shards_than_devices(self):
+        assert shard_devices(["R1", "R2"], 8) == [["R1"], ["R2"]]
+
+    def test_balances_expected_durations(self):
+        shards = shard_devices(
+            ["R1", "R2", "R3", "R4"],
+            2,
+            {"R1": 10.0, "R2": 6.0, "R3": 4.0, "R4": 1.0},
+        )
+        assert shards == [["R1", "R4"], ["R2", "R3"]]
+
+
+class TestShardedBatchExecutor:
+    def test_results_merged_from_workers(self):
+        executor = ShardedBatchExecutor(processes=2, max_workers=2)
+        batch_result = executor.execute_batch_operation(
+            devices=["R1", "R2", "R3", "R4"],
+            operation_func=_operation,
+            operation_type="test",
+            show_progress=False,
+        )
+
+        assert batch_result.summary.total_devices == 4
+        assert batch_result.summary.successful == 3
+        assert batch_result.metadata["processes"] == 2
+        assert batch_result.get_results_by_device("R2").error_response.type == (
+            "connection_error"
+        )
+        pids = {r.data["pid"] for r in batch_result.successful_results}
+        assert os.getpid() not in pids
+
+    def test_fail_fast_cancels_workers(self):
+        executor = ShardedBatchExecutor(processes=2, max_workers=2)
+        batch_result = executor.execute_batch_operation(
+            devices=["R1", "R3", "R4", "R5"],
+            operation_func=_fail_fast_operation,
+            operation_type="test",
+            show_progress=False,
+            fail_fast=True,
+        )
+
+        assert batch_result.summary.total_devices == 4
+        assert batch_result.metadata["cancelled"] is True
+        assert batch_result.summary.execution_time < 10
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from src.collectors.profile import (
+    VPN_BGP_AFI_SAFI_STATE_PATH,
+    _get_vpn_bgp_info,
+)
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import ErrorResponse, SuccessResponse
+
+DEVICE = Device(name="PE1", ip_address="192.0.2.1", nos=NetworkOS.IOSXR)
+
+AFI_SAFI_PATH = "network-instances/network-instance[name={vrf}]/protocols/protocol[identifier=BGP][name=default]/bgp/global/afi-safis/afi-safi[afi-safi-name={afi}]/state"
+
+
+def _update(vrf, afi, enabled=True):
+    return {
+        "path": AFI_SAFI_PATH.format(vrf=vrf, afi=afi),
+        "val": {
+            "afi-safi-name": f"openconfig-bgp-types:{afi}",
+            "enabled": enabled,
+        },
+    }
+
+
+@patch("src.collectors.profile.get_gnmi_data")
+def test_vpn_bgp_info_uses_single_wildcard_get(mock_get_gnmi_data):
+    mock_get_gnmi_data.return_value = SuccessResponse(
+        data=[
+            _update("DEFAULT", "L3VPN_IPV4_UNICAST"),
+            _update("CUST_A", "IPV4_UNICAST"),
+            _update("CUST_B", "IPV4_UNICAST"),
+            _update("CUST_B", "IPV6_UNICAST"),
+            _update("**iid", "IPV4_UNICAST"),
+        ]
+    )
+
+    vpn_info, states = _get_vpn_bgp_info(DEVICE)
+
+    mock_get_gnmi_data.assert_called_once()
+    request = mock_get_gnmi_data.call_args[0][1]
+    assert request.path == [VPN_BGP_AFI_SAFI_STATE_PATH]
+    assert vpn_info == {"vpn_names": ["CUST_A", "CUST_B"]}
+    assert len(states) == 3
+
+
+@patch("src.collectors.profile.get_gnmi_data")
+def test_vpn_bgp_info_error_returns_empty(mock_get_gnmi_data):
+    mock_get_gnmi_data.return_value = ErrorResponse(
+        type="GRPC_ERROR", message="unreachable"
+    )
+
+    vpn_info, states = _get_vpn_bgp_info(DEVICE)
+
+    assert vpn_info == {"vpn_names": []}
+    assert states == []
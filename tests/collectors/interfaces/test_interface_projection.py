@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for projected interface queries and the rebuild of per-path updates.
+"""
+from unittest.mock import patch
+
+from src.collectors.interfaces import (
+    INTERFACE_VIEW_PATHS,
+    InterfaceView,
+    get_interfaces,
+)
+from src.processors.gnmi_tree import parse_path, split_path, updates_to_tree
+from src.collectors.topology.utils import _get_interface
+from src.processors.interfaces.data_processor import (
+    format_interface_data_for_llm,
+)
+from src.processors.topology_processor import extract_interface_subnets
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import OperationStatus, SuccessResponse
+
+GI1 = "interfaces/interface[name=GigabitEthernet0/0/0/1]"
+GI2 = "interfaces/interface[name=GigabitEthernet0/0/0/2]"
+
+BRIEF_UPDATES = [
+    {"path": f"{GI1}/state/admin-status", "val": "UP"},
+    {"path": f"{GI1}/state/oper-status", "val": "UP"},
+    {"path": f"{GI2}/state/admin-status", "val": "DOWN"},
+    {"path": f"{GI2}/state/oper-status", "val": "DOWN"},
+    {
+        "path": f"{GI1}/subinterfaces/subinterface[index=0]",
+        "val": {
+            "index": 0,
+            "openconfig-if-ip:ipv4": {
+                "addresses": {
+                    "address": [
+                        {
+                            "ip": "10.1.1.1",
+                            "state": {"ip": "10.1.1.1", "prefix-length": 30},
+                        }
+                    ]
+                }
+            },
+            "openconfig-network-instance:network-instance": [
+                {"name": "CUST_A"}
+            ],
+        },
+    },
+]
+
+
+def _device():
+    return Device(
+        name="R1",
+        ip_address="192.168.1.1",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+
+def test_split_path_ignores_slashes_in_keys():
+    assert split_path(f"/{GI1}/state") == [
+        "interfaces",
+        "interface[name=GigabitEthernet0/0/0/1]",
+        "state",
+    ]
+    assert parse_path("a/b[index=0][ip=10.0.0.1]") == [
+        ("a", {}),
+        ("b", {"index": 0, "ip": "10.0.0.1"}),
+    ]
+
+
+def test_updates_to_tree_rebuilds_keyed_lists():
+    tree = updates_to_tree(BRIEF_UPDATES, root="interfaces")
+
+    names = [interface["name"] for interface in tree["interface"]]
+    assert names == ["GigabitEthernet0/0/0/1", "GigabitEthernet0/0/0/2"]
+    gi1 = tree["interface"][0]
+    assert gi1["state"] == {"admin-status": "UP", "oper-status": "UP"}
+    assert gi1["subinterfaces"]["subinterface"][0]["index"] == 0
+
+
+def test_projected_brief_matches_full_tree_output():
+    full = [
+        {
+            "path": "interfaces",
+            "val": updates_to_tree(BRIEF_UPDATES, root="interfaces"),
+        }
+    ]
+
+    projected = format_interface_data_for_llm(BRIEF_UPDATES)
+
+    assert projected == format_interface_data_for_llm(full)
+    gi1 = projected["interfaces"][0]
+    assert gi1["ip_address"] == "10.1.1.1/255.255.255.252"
+    assert gi1["vrf"] == "CUST_A"
+    assert projected["summary"]["admin_up"] == 1
+
+
+@patch("src.collectors.interfaces.get_gnmi_data")
+def test_brief_requests_projected_paths(mock_get_gnmi_data):
+    mock_get_gnmi_data.return_value = SuccessResponse(data=BRIEF_UPDATES)
+
+    result = get_interfaces(_device())
+
+    request = mock_get_gnmi_data.call_args[0][1]
+    assert request.path == INTERFACE_VIEW_PATHS[InterfaceView.BRIEF]
+    assert "openconfig-interfaces:interfaces" not in request.path
+    assert result.status == OperationStatus.SUCCESS
+    assert result.data["interface_count"] == 2
+    assert result.metadata["view"] == "brief"
+
+
+@patch("src.collectors.interfaces.get_gnmi_data")
+def test_topology_view_returns_addresses(mock_get_gnmi_data):
+    mock_get_gnmi_data.return_value = SuccessResponse(
+        data=[
+            {
+                "path": (
+                    f"{GI1}/subinterfaces/subinterface[index=0]"
+                    "/ipv4/addresses"
+                ),
+                "val": {
+                    "address": [
+                        {
+                            "ip": "10.1.1.1",
+                            "state": {"prefix-length": 30},
+                        }
+                    ]
+                },
+            }
+        ]
+    )
+
+    result = get_interfaces(_device(), view=InterfaceView.TOPOLOGY)
+
+    request = mock_get_gnmi_data.call_args[0][1]
+    assert request.path == INTERFACE_VIEW_PATHS[InterfaceView.TOPOLOGY]
+    assert result.data["interfaces"] == [
+        {
+            "name": "GigabitEthernet0/0/0/1",
+            "ip_address": "10.1.1.1/255.255.255.252",
+        }
+    ]
+
+
+@patch("src.collectors.topology.utils._get_device_or_error_dict")
+@patch("src.collectors.interfaces.get_gnmi_data")
+def test_topology_addresses_include_ipv6(mock_get_gnmi_data, mock_device):
+    subinterface = f"{GI1}/subinterfaces/subinterface[index=0]"
+    mock_device.return_value = _device()
+    mock_get_gnmi_data.return_value = SuccessResponse(
+        data=[
+            {
+                "path": f"{subinterface}/ipv4/addresses",
+                "val": {
+                    "address": [
+                        {"ip": "10.1.1.1", "state": {"prefix-length": 30}}
+                    ]
+                },
+            },
+            {
+                "path": f"{subinterface}/ipv6/addresses",
+                "val": {
+                    "address": [
+                        {
+                            "ip": "2001:db8:1::1",
+                            "state": {"prefix-length": 64},
+                        },
+                        {
+                            "ip": "fe80::1",
+                            "state": {"prefix-length": 64},
+                        },
+                        {
+                            "ip": "2001:db8:ff::1",
+                            "state": {"prefix-length": 127},
+                        },
+                    ]
+                },
+            },
+        ]
+    )
+
+    result = _get_interface("R1")
+
+    request = mock_get_gnmi_data.call_args[0][1]
+    assert any("ipv6/addresses" in path for path in request.path)
+    assert result["interfaces"][0]["ipv6_addresses"] == [
+        "2001:db8:1::1/64",
+        "2001:db8:ff::1/127",
+    ]
+    entries = extract_interface_subnets([dict(result, device="R1")])
+    assert [entry["network"] for entry in entries] == [
+        "10.1.1.0/30",
+        "2001:db8:1::/64",
+        "2001:db8:ff::/127",
+    ]
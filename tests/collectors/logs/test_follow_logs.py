@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for following device logs as new lines arrive.
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+from src.collectors.logs import follow_logs
+from src.gnmi.client import get_gnmi_data
+from src.gnmi.parameters import GnmiRequest
+from src.gnmi.session import device_session
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    OperationStatus,
+    SuccessResponse,
+)
+from src.utils.cancellation import CancellationToken, cancellation_scope
+
+NOW = datetime(2025, 4, 23, 12, 55, 0)
+
+
+def _line(time: str, text: str) -> str:
+    return f"RP/0/RP0/CPU0:Apr 23 {time} UTC: {text}"
+
+
+def _response(*lines: str) -> SuccessResponse:
+    return SuccessResponse(data=[{"val": "\n".join(lines)}])
+
+
+def _device():
+    return Device(
+        name="R1",
+        ip_address="192.168.1.1",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+
+@patch("src.collectors.logs._utc_now", return_value=NOW)
+@patch("src.collectors.logs.get_gnmi_data")
+def test_each_poll_yields_only_new_lines(mock_get, _now):
+    first = _line("12:52:06.100", "%ROUTING-BGP-5-ADJCHANGE A")
+    second = _line("12:54:00.000", "%PKT_INFRA-LINK-3-UPDOWN B")
+    mock_get.side_effect = [
+        _response(first),
+        ErrorResponse(type="TIMEOUT", message="timed out"),
+        _response(first, second),
+        _response(second),
+    ]
+
+    results = list(
+        follow_logs(_device(), minutes=5, interval=0, max_polls=4)
+    )
+
+    assert [r.status for r in results] == [
+        OperationStatus.SUCCESS,
+        OperationStatus.FAILED,
+        OperationStatus.SUCCESS,
+        OperationStatus.SUCCESS,
+    ]
+    assert [
+        [log["message"] for log in r.data.get("logs", [])] for r in results
+    ] == [[first], [], [second], []]
+    queries = [c[1]["request"].path[0] for c in mock_get.call_args_list]
+    assert queries[0].startswith("show logging start Apr 23 12:50:00 |")
+    assert queries[2].startswith("show logging start Apr 23 12:52:06 |")
+    assert queries[3].startswith("show logging start Apr 23 12:54:00 |")
+
+
+@patch("src.collectors.logs.get_gnmi_data")
+def test_cancellation_stops_following(mock_get):
+    mock_get.return_value = _response()
+    token = CancellationToken()
+    token.cancel("stop")
+
+    with cancellation_scope(token):
+        results = list(follow_logs(_device(), interval=60))
+
+    assert len(results) == 1
+
+
+def test_invalid_minutes_yield_one_failed_result():
+    results = list(follow_logs(_device(), minutes="soon"))
+
+    assert len(results) == 1
+    assert results[0].error_response.type == "INVALID_PARAMETER"
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_cli_requests_bypass_the_device_session(mock_fetch):
+    mock_fetch.return_value = _response()
+    request = GnmiRequest(path=["show logging"], encoding="ascii")
+
+    with device_session() as session:
+        get_gnmi_data(_device(), request)
+        get_gnmi_data(_device(), request)
+
+    assert mock_fetch.call_count == 2
+    assert (session.hits, session.misses) == (0, 0)
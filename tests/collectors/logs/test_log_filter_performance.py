@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for filter_logs_by_time on large log buffers.
+
+The reference implementation is the per-line filter the module used before:
+it parses every line with an uncompiled pattern and compares datetimes. The
+current filter must return the same lines and be much faster on a 100k-line
+buffer where only the last minutes are requested.
+"""
+import re
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.processors.logs.filter import filter_logs_by_time
+
+LINE_COUNT = 100_000
+CURRENT_TIME = datetime(2025, 1, 2, 0, 5, 0)
+
+
+def _reference_filter(logs: str, minutes: int, current_time: datetime) -> str:
+    month_dict = {"Dec": 12, "Jan": 1}
+    threshold = current_time - timedelta(minutes=minutes)
+    kept = []
+    for line in logs.strip().split("\n"):
+        if not line or line.startswith("---") or "show logging" in line:
+            kept.append(line)
+            continue
+        match = re.search(
+            r"RP/\d+/\w+/\w+:(\w+)\s+(\d+)\s+(\d+):(\d+):(\d+)\.(\d+)\s+UTC:",
+            line,
+        )
+        if not match:
+            kept.append(line)
+            continue
+        mon, day, hour, minute, second, msec = match.groups()
+        month = month_dict[mon]
+        year = current_time.year - (1 if month > current_time.month else 0)
+        log_time = datetime(
+            year,
+            month,
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            int(msec) * 1000,
+        )
+        if log_time >= threshold:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+@pytest.fixture(scope="module")
+def busy_router_logs():
+    """100k chronological lines spanning a year rollover, one per second."""
+    start = CURRENT_TIME - timedelta(seconds=LINE_COUNT)
+    lines = ["---- show logging | utility egrep ----"]
+    for second in range(LINE_COUNT):
+        moment = start + timedelta(seconds=second, milliseconds=second % 997)
+        lines.append(
+            f"RP/0/RP0/CPU0:{moment:%b} {moment.day:2d} "
+            f"{moment:%H:%M:%S}.{moment.microsecond // 1000:03d} UTC: "
+            f"ifmgr[277]: %PKT_INFRA-LINK-3-UPDOWN : event {second}"
+        )
+        if second % 5000 == 0:
+            lines.append("    continuation line without a timestamp")
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("minutes", [0, 5, 60 * 24 * 2])
+def test_matches_reference_on_a_large_buffer(busy_router_logs, minutes):
+    expected = _reference_filter(busy_router_logs, minutes, CURRENT_TIME)
+
+    assert (
+        filter_logs_by_time(busy_router_logs, minutes, CURRENT_TIME)
+        == expected
+    )
+
+
+@pytest.mark.benchmark
+def test_recent_window_is_faster_than_reference(busy_router_logs):
+    def best_of(func, runs=3):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            func(busy_router_logs, 5, CURRENT_TIME)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    reference = best_of(_reference_filter)
+    current = best_of(filter_logs_by_time)
+
+    print(
+        f"\nfilter_logs_by_time on {LINE_COUNT} lines: "
+        f"{current * 1000:.1f} ms (reference {reference * 1000:.1f} ms)"
+    )
+    assert current * 3 < reference
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental log retrieval with per-device watermarks.
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.logs import get_logs
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import OperationStatus, SuccessResponse
+from src.storage.log_buffer import (
+    DeviceLogBuffer,
+    LogEntry,
+    reset_log_buffer_store,
+)
+
+NOW = datetime(2025, 4, 23, 12, 55, 0)
+
+
+def _line(time: str, text: str) -> str:
+    return f"RP/0/RP0/CPU0:Apr 23 {time} UTC: {text}"
+
+
+def _response(*lines: str) -> SuccessResponse:
+    return SuccessResponse(data=[{"val": "\n".join(lines)}])
+
+
+def _device():
+    return Device(
+        name="R1",
+        ip_address="192.168.1.1",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_buffers():
+    reset_log_buffer_store()
+    yield
+    reset_log_buffer_store()
+
+
+@patch("src.collectors.logs._utc_now", return_value=NOW)
+@patch("src.collectors.logs.get_gnmi_data")
+def test_second_call_fetches_from_the_watermark(mock_get, _now):
+    first_a = _line("12:52:06.100", "%ROUTING-BGP-5-ADJCHANGE A")
+    first_b = _line("12:52:06.100", "%ROUTING-BGP-5-ADJCHANGE B")
+    mock_get.return_value = _response(first_a, first_b)
+    first = get_logs(_device(), minutes=5, incremental=True)
+
+    mock_get.return_value = _response(
+        first_a, first_b, _line("12:54:00.000", "%PKT_INFRA-LINK-3-UPDOWN")
+    )
+    second = get_logs(_device(), minutes=5, incremental=True)
+
+    first_query = mock_get.call_args_list[0][1]["request"].path[0]
+    second_query = mock_get.call_args_list[1][1]["request"].path[0]
+    assert first_query.startswith("show logging start Apr 23 12:50:00 |")
+    assert second_query.startswith("show logging start Apr 23 12:52:06 |")
+    assert first.data["summary"]["count"] == 2
+    assert second.status == OperationStatus.SUCCESS
+    assert second.data["summary"]["count"] == 3
+    assert second.metadata["incremental"]["new_entries"] == 1
+
+
+@patch("src.collectors.logs._utc_now", return_value=NOW)
+@patch("src.collectors.logs.get_gnmi_data")
+def test_wider_window_than_buffered_refetches(mock_get, _now):
+    mock_get.return_value = _response(_line("12:54:00.000", "%X-3-Y a"))
+    get_logs(_device(), minutes=2, incremental=True)
+    mock_get.return_value = _response(
+        _line("12:40:00.000", "%X-3-Y old"), _line("12:54:00.000", "%X-3-Y a")
+    )
+
+    result = get_logs(_device(), minutes=30, incremental=True)
+
+    query = mock_get.call_args[1]["request"].path[0]
+    assert query.startswith("show logging start Apr 23 12:25:00 |")
+    assert [log["message"][-5:] for log in result.data["logs"]] == [
+        "Y old",
+        "3-Y a",
+    ]
+
+
+@patch("src.collectors.logs.get_gnmi_data")
+def test_show_all_logs_keeps_the_full_fetch(mock_get):
+    mock_get.return_value = _response(_line("12:54:00.000", "%X-3-Y a"))
+
+    get_logs(_device(), show_all_logs=True, incremental=True)
+
+    query = mock_get.call_args[1]["request"].path[0]
+    assert query.startswith("show logging |")
+
+
+def test_buffer_is_bounded_and_tracks_coverage():
+    buffer = DeviceLogBuffer(max_entries=2)
+    entries = [
+        LogEntry(datetime(2025, 4, 23, 12, minute), f"line {minute}")
+        for minute in (1, 2, 3)
+    ]
+
+    assert buffer.merge(entries, datetime(2025, 4, 23, 12, 0)) == entries
+
+    assert [e.message for e in buffer.entries] == ["line 2", "line 3"]
+    assert buffer.covered_since == datetime(2025, 4, 23, 12, 2)
+    assert not buffer.covers(datetime(2025, 4, 23, 12, 1))
+    assert buffer.merge(entries[-1:], buffer.watermark) == []
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent protocol collection in collectors/routing.py.
+"""
+
+import threading
+from unittest.mock import patch
+
+from src.collectors.routing import get_routing_info
+from src.gnmi.priority import Priority, get_current_priority, priority_scope
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+
+DEVICE = Device(
+    name="test-device",
+    ip_address="192.168.1.1",
+    nos=NetworkOS.IOSXR,
+    username="admin",
+    password="password",
+)
+
+
+def _success(protocol: str) -> NetworkOperationResult:
+    return NetworkOperationResult(
+        device_name=DEVICE.name,
+        ip_address=DEVICE.ip_address,
+        nos=DEVICE.nos,
+        operation_type="routing_info",
+        status=OperationStatus.SUCCESS,
+        data={"detailed_data": {}, "summary": {"protocol": protocol}},
+    )
+
+
+def test_protocols_are_queried_concurrently():
+    """BGP and ISIS must be in flight at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def bgp(device, include_details=False):
+        barrier.wait()
+        return _success("bgp")
+
+    def isis(device, include_details=False):
+        barrier.wait()
+        return _success("isis")
+
+    with patch("src.collectors.routing._get_bgp_info", side_effect=bgp), patch(
+        "src.collectors.routing._get_isis_info", side_effect=isis
+    ):
+        result = get_routing_info(DEVICE)
+
+    assert result.status == OperationStatus.SUCCESS
+    assert [p["protocol"] for p in result.data["routing_protocols"]] == [
+        "bgp",
+        "isis",
+    ]
+
+
+def test_result_order_and_statuses_are_kept():
+    """Results follow the requested protocol order, not completion order."""
+    bgp_started = threading.Event()
+
+    def bgp(device, include_details=False):
+        bgp_started.set()
+        return NetworkOperationResult(
+            device_name=DEVICE.name,
+            ip_address=DEVICE.ip_address,
+            nos=DEVICE.nos,
+            operation_type="routing_info",
+            status=OperationStatus.FAILED,
+            error_response=ErrorResponse(type="TIMEOUT", message="timed out"),
+        )
+
+    def isis(device, include_details=False):
+        bgp_started.wait(timeout=5)
+        return _success("isis")
+
+    with patch("src.collectors.routing._get_bgp_info", side_effect=bgp), patch(
+        "src.collectors.routing._get_isis_info", side_effect=isis
+    ):
+        result = get_routing_info(DEVICE, protocol="isis,bgp")
+
+    assert result.status == OperationStatus.PARTIAL_SUCCESS
+    assert list(result.metadata["protocol_statuses"]) == ["isis", "bgp"]
+    assert result.metadata["protocol_errors"]["bgp"] == {
+        "type": "error",
+        "message": "timed out",
+    }
+
+
+def test_protocol_tasks_inherit_the_priority_lane():
+    seen = []
+
+    def record(device, include_details=False):
+        seen.append(get_current_priority())
+        return _success("any")
+
+    with patch(
+        "src.collectors.routing._get_bgp_info", side_effect=record
+    ), patch("src.collectors.routing._get_isis_info", side_effect=record):
+        with priority_scope(Priority.INTERACTIVE):
+            get_routing_info(DEVICE)
+
+    assert seen == [Priority.INTERACTIVE, Priority.INTERACTIVE]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for system info with the static subtree cached per device.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.system import (
+    SYSTEM_DYNAMIC_PATHS,
+    get_system_info,
+)
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    OperationStatus,
+    SuccessResponse,
+)
+from src.storage.system_info_cache import reset_system_info_cache
+
+BOOT_TIME = "1747381914000000000"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    reset_system_info_cache()
+    yield
+    reset_system_info_cache()
+
+
+@pytest.fixture
+def system_tree():
+    with open("tests/collectors/system_info/system_info_input.json") as f:
+        return json.load(f)["response"][0]["val"]
+
+
+def _device():
+    return Device(
+        name="xrd-9",
+        ip_address="192.168.1.9",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+
+def _dynamic(boot_time=BOOT_TIME, physical="1000"):
+    return SuccessResponse(
+        data=[
+            {
+                "path": "system/state/current-datetime",
+                "val": "2025-05-25T16:00:00.000+00:00",
+            },
+            {"path": "system/state/boot-time", "val": boot_time},
+            {
+                "path": "system/memory",
+                "val": {"state": {"physical": physical}},
+            },
+        ]
+    )
+
+
+STATIC_NAMES = [
+    "state",
+    "clock",
+    "openconfig-system-grpc:grpc-servers",
+    "aaa",
+    "logging",
+]
+
+
+def _static(tree):
+    return SuccessResponse(
+        data=[
+            {"path": f"system/{name}", "val": tree[name]}
+            for name in STATIC_NAMES
+        ]
+    )
+
+
+def _is_dynamic(request):
+    return request.path == SYSTEM_DYNAMIC_PATHS
+
+
+@patch("src.collectors.system.get_gnmi_data")
+def test_static_part_is_fetched_once_and_merged(mock_get, system_tree):
+    mock_get.side_effect = lambda device, request: (
+        _dynamic(physical="2000")
+        if _is_dynamic(request)
+        else _static(system_tree)
+    )
+
+    first = get_system_info(_device(), split_static=True)
+    second = get_system_info(_device(), split_static=True)
+
+    requests = [c[0][1] for c in mock_get.call_args_list]
+    assert [_is_dynamic(r) for r in requests] == [True, False, True]
+    assert first.metadata["static_cache"] == "miss"
+    assert second.metadata["static_cache"] == "hit"
+    data = second.data["system_data"]
+    assert data["hostname"] == "xrd-9"
+    assert data["software_version"] == "24.2.1"
+    assert data["grpc_servers"][0]["port"] == 57400
+    assert data["memory_physical"] == "2000"
+    assert data["current_datetime"] == "2025-05-25T16:00:00.000+00:00"
+    assert any(u["username"] == "admin" for u in data["users"])
+
+
+@patch("src.collectors.system.get_gnmi_data")
+def test_boot_time_change_refetches_static_part(mock_get, system_tree):
+    mock_get.side_effect = [
+        _dynamic(),
+        _static(system_tree),
+        _dynamic(boot_time="1747400000000000000"),
+        _static(system_tree),
+    ]
+
+    get_system_info(_device(), split_static=True)
+    result = get_system_info(_device(), split_static=True)
+
+    assert mock_get.call_count == 4
+    assert result.metadata["static_cache"] == "miss"
+    assert result.data["system_data"]["boot_time"] == "1747400000000000000"
+
+
+@patch("src.collectors.system.get_settings")
+@patch("src.collectors.system.get_gnmi_data")
+def test_zero_ttl_disables_the_cache(mock_get, mock_settings, system_tree):
+    mock_settings.return_value.get_system_static_ttl.return_value = 0
+    mock_get.side_effect = [
+        _dynamic(),
+        _static(system_tree),
+        _dynamic(),
+        _static(system_tree),
+    ]
+
+    get_system_info(_device(), split_static=True)
+    get_system_info(_device(), split_static=True)
+
+    assert mock_get.call_count == 4
+
+
+@patch("src.collectors.system.get_gnmi_data")
+def test_dynamic_fetch_error_fails_without_static_fetch(mock_get):
+    mock_get.return_value = ErrorResponse(type="TIMEOUT", message="timeout")
+
+    result = get_system_info(_device(), split_static=True)
+
+    assert result.status == OperationStatus.FAILED
+    assert result.error_response.type == "TIMEOUT"
+    assert mock_get.call_count == 1
@@ -32,6 +32,9 @@ class MockTopologyBuildResult:
         self.has_errors = has_errors
         self.error_response = error_response
         self.graph = graph if graph is not None else MockGraph()
+        self.segments = None
+        self.built_at = None
+        self.fetched_at = None
 
 
 class MockGraph:
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-request mode of the VPN/VRF collector.
+
+In single-request mode the collector fetches every network-instance with one
+wildcard Get, drops the internal VRFs locally and pushes a VRF filter into
+the path key instead of discovering VRF names first.
+"""
+
+from unittest.mock import patch
+
+from src.collectors.vpn import (
+    _merge_network_instance_updates,
+    get_vpn_info,
+)
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    FeatureNotFoundResponse,
+    OperationStatus,
+    SuccessResponse,
+)
+
+PREFIX = "openconfig-network-instance:network-instances/"
+
+
+def _instance(name, **extra):
+    return {
+        "path": f"{PREFIX}network-instance[name={name}]",
+        "val": {
+            "name": name,
+            "state": {"name": name, "route-distinguisher": "65000:1"},
+            **extra,
+        },
+    }
+
+
+class TestVpnSingleRequest:
+    """Test suite for get_vpn_info(single_request=True)."""
+
+    def setup_method(self):
+        self.device = Device(
+            name="pe1",
+            ip_address="192.168.1.1",
+            port=57400,
+            username="admin",
+            password="admin",
+            nos=NetworkOS.IOSXR,
+        )
+
+    @patch("src.collectors.vpn.get_non_default_vrf_names")
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_one_wildcard_get_filters_internal_vrfs(
+        self, mock_get_gnmi_data, mock_get_vrf_names
+    ):
+        mock_get_gnmi_data.return_value = SuccessResponse(
+            data=[
+                _instance("default"),
+                _instance("**iid"),
+                _instance("CUST_A"),
+                _instance("CUST_B"),
+            ]
+        )
+
+        result = get_vpn_info(self.device, single_request=True)
+
+        mock_get_vrf_names.assert_not_called()
+        mock_get_gnmi_data.assert_called_once()
+        request = mock_get_gnmi_data.call_args[0][1]
+        assert request.path == [f"{PREFIX}network-instance[name=*]"]
+
+        assert result.status == OperationStatus.SUCCESS
+        names = [vrf["summary"] for vrf in result.data["vrfs"]]
+        assert len(names) == 2
+        assert "CUST_A" in names[0] and "CUST_B" in names[1]
+        assert result.metadata["total_vrfs_on_device"] == 2
+        assert result.metadata["vrfs_returned"] == 2
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_vrf_filter_is_pushed_into_path_key(self, mock_get_gnmi_data):
+        mock_get_gnmi_data.return_value = SuccessResponse(
+            data=[_instance("CUST_A")]
+        )
+
+        result = get_vpn_info(
+            self.device, vrf_name="CUST_A", single_request=True
+        )
+
+        request = mock_get_gnmi_data.call_args[0][1]
+        assert request.path == [f"{PREFIX}network-instance[name=CUST_A]"]
+        assert result.metadata["vrf_filter"] == "CUST_A"
+        assert result.metadata["vrfs_returned"] == 1
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_unknown_vrf_filter_returns_empty_success(
+        self, mock_get_gnmi_data
+    ):
+        mock_get_gnmi_data.return_value = SuccessResponse(data=[])
+
+        result = get_vpn_info(
+            self.device, vrf_name="MISSING", single_request=True
+        )
+
+        assert result.status == OperationStatus.SUCCESS
+        assert result.data == {}
+        assert result.metadata["message"] == "No VRFs found matching filter"
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_projected_request_is_merged_per_vrf(self, mock_get_gnmi_data):
+        base = f"{PREFIX}network-instance[name=CUST_A]"
+        mock_get_gnmi_data.return_value = SuccessResponse(
+            data=[
+                {
+                    "path": f"{base}/state",
+                    "val": {"route-distinguisher": "65000:1"},
+                },
+                {
+                    "path": f"{base}/interfaces",
+                    "val": {"interface": [{"id": "Gi0/0/0/1"}]},
+                },
+                {
+                    "path": f"{PREFIX}network-instance[name=default]/state",
+                    "val": {"type": "DEFAULT_INSTANCE"},
+                },
+            ]
+        )
+
+        result = get_vpn_info(
+            self.device,
+            include_details=True,
+            single_request=True,
+            projected=True,
+        )
+
+        request = mock_get_gnmi_data.call_args[0][1]
+        assert f"{base.replace('CUST_A', '*')}/protocols" in request.path
+        assert len(request.path) == 6
+
+        vrfs = result.data["vrfs"]
+        assert len(vrfs) == 1
+        detail = vrfs[0]["detailed_data"]
+        assert detail["name"] == "CUST_A"
+        assert detail["rd"] == "65000:1"
+        assert detail["interfaces"] == ["Gi0/0/0/1"]
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_projected_request_reads_rd_and_vpn_targets(
+        self, mock_get_gnmi_data
+    ):
+        base = f"{PREFIX}network-instance[name=CUST_A]"
+        mock_get_gnmi_data.return_value = SuccessResponse(
+            data=[
+                {"path": f"{base}/state", "val": {"name": "CUST_A"}},
+                {
+                    "path": f"{base}/route-distinguisher",
+                    "val": {"state": {"rd": "65000:7"}},
+                },
+                {
+                    "path": f"{base}/vpn-targets",
+                    "val": {
+                        "vpn-target": [
+                            {
+                                "state": {
+                                    "rt-type": "import",
+                                    "rt-value": "65000:100",
+                                }
+                            },
+                            {
+                                "state": {
+                                    "rt-type": "export",
+                                    "rt-value": "65000:200",
+                                }
+                            },
+                        ]
+                    },
+                },
+            ]
+        )
+
+        result = get_vpn_info(
+            self.device,
+            include_details=True,
+            single_request=True,
+            projected=True,
+        )
+
+        request = mock_get_gnmi_data.call_args[0][1]
+        wildcard = base.replace("CUST_A", "*")
+        assert f"{wildcard}/route-distinguisher" in request.path
+        assert f"{wildcard}/vpn-targets" in request.path
+
+        detail = result.data["vrfs"][0]["detailed_data"]
+        assert detail["rd"] == "65000:7"
+        assert detail["route_targets"] == {
+            "import": ["65000:100"],
+            "export": ["65000:200"],
+        }
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_error_response_fails(self, mock_get_gnmi_data):
+        error = ErrorResponse(type="GRPC_ERROR", message="unavailable")
+        mock_get_gnmi_data.return_value = error
+
+        result = get_vpn_info(self.device, single_request=True)
+
+        assert result.status == OperationStatus.FAILED
+        assert result.data == {}
+        assert result.error_response == error
+
+    @patch("src.collectors.vpn.get_gnmi_data")
+    def test_feature_not_found(self, mock_get_gnmi_data):
+        not_found = FeatureNotFoundResponse(
+            feature_name="network-instances", message="not supported"
+        )
+        mock_get_gnmi_data.return_value = not_found
+
+        result = get_vpn_info(self.device, single_request=True)
+
+        assert result.status == OperationStatus.FEATURE_NOT_AVAILABLE
+        assert result.feature_not_found_response == not_found
+
+
+def test_merge_uses_val_name_without_path_key():
+    merged = _merge_network_instance_updates(
+        [{"path": "", "val": {"name": "CUST_A", "state": {"enabled": True}}}]
+    )
+
+    assert len(merged) == 1
+    assert merged[0]["val"]["name"] == "CUST_A"
+    assert merged[0]["val"]["state"] == {"enabled": True}
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Shared fixtures for topology tests."""
+import copy
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.topology.service import reset_topology_service
+
+
+@pytest.fixture
+def interface_results():
+    with open(
+        "tests/collectors/topology/topology_input.json", encoding="utf-8"
+    ) as f:
+        return {result["device_name"]: result for result in json.load(f)}
+
+
+@pytest.fixture
+def fleet(interface_results):
+    """Patch the inventory and interface polling with the sample fleet."""
+    polled = []
+
+    def get_interface(device_name):
+        polled.append(device_name)
+        return copy.deepcopy(interface_results[device_name])
+
+    inventory = SimpleNamespace(
+        devices=[SimpleNamespace(name=name) for name in interface_results]
+    )
+    with patch(
+        "src.collectors.topology.service._get_interface",
+        side_effect=get_interface,
+    ), patch(
+        "src.collectors.topology.service.InventoryManager"
+    ) as manager:
+        manager.list_devices.return_value = inventory
+        yield SimpleNamespace(polled=polled, results=interface_results)
+
+
+@pytest.fixture
+def fresh_service():
+    """Reset the process-wide topology service around a test."""
+    reset_topology_service()
+    yield
+    reset_topology_service()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests and benchmarks for the array-backed (CSR) topology graph.
+
+Results must match NetworkX on the same graph; the benchmark builds a
+synthetic 10k-node / 50k-link topology with both and compares memory and
+query times.
+"""
+import random
+import time
+import tracemalloc
+
+import networkx as nx
+import pytest
+
+from src.collectors.topology.csr import CSRGraph, shortest_path
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.snapshot import TopologySnapshot
+
+NODE_COUNT = 10_000
+LINK_COUNT = 50_000
+
+
+def _links(node_count, link_count, seed=7):
+    rng = random.Random(seed)
+    links, seen = [], set()
+    while len(links) < link_count:
+        a, b = rng.randrange(node_count), rng.randrange(node_count)
+        if a == b or (min(a, b), max(a, b)) in seen:
+            continue
+        seen.add((min(a, b), max(a, b)))
+        i = len(links)
+        prefix = f"10.{i // 65536}.{i // 256 % 256}"
+        links.append(
+            (
+                f"R{a}",
+                f"R{b}",
+                {
+                    "network": f"{prefix}.{i % 256}/31",
+                    "local_interface": f"Gi0/0/0/{i % 48}",
+                    "remote_interface": f"Gi0/0/0/{(i + 1) % 48}",
+                    "local_ip": f"{prefix}.{i % 256}",
+                    "remote_ip": f"{prefix}.{i % 256}",
+                },
+            )
+        )
+    return [f"R{i}" for i in range(node_count)], links
+
+
+def _networkx(nodes, links):
+    graph = nx.Graph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(links)
+    return graph
+
+
+@pytest.fixture(scope="module")
+def small():
+    nodes, links = _links(300, 450)
+    # Isolated nodes and a duplicate link whose attributes replace the first
+    nodes += ["isolated-1", "isolated-2"]
+    links.append((links[0][1], links[0][0], dict(links[0][2], network="x")))
+    return _networkx(nodes, links), CSRGraph.from_edges(nodes, links)
+
+
+def test_graph_api_matches_networkx(small):
+    expected, graph = small
+
+    assert graph.number_of_nodes() == expected.number_of_nodes()
+    assert graph.number_of_edges() == expected.number_of_edges()
+    assert list(graph.edges(data=True)) == list(expected.edges(data=True))
+    for node in expected:
+        assert sorted(graph.neighbors(node)) == sorted(
+            expected.neighbors(node)
+        )
+    assert "R0" in graph and "R9999" not in graph
+    assert graph.get_edge_data("R0", "nope") is None
+    assert sorted(map(sorted, graph.connected_components())) == sorted(
+        map(sorted, nx.connected_components(expected))
+    )
+    sub = list(expected)[:120]
+    assert sorted(map(sorted, graph.subgraph(sub).edges())) == sorted(
+        map(sorted, expected.subgraph(sub).edges())
+    )
+    assert nx.utils.graphs_equal(graph.to_networkx(), expected)
+
+
+def test_paths_match_networkx(small):
+    expected, graph = small
+    rng = random.Random(3)
+    # Weights are per link row
+    weights = [rng.randint(1, 20) for _ in range(graph.number_of_edges())]
+    for source, target, weight in zip(
+        graph.edge_source, graph.edge_target, weights
+    ):
+        expected[graph.nodes[source]][graph.nodes[target]]["weight"] = weight
+    nodes = list(expected)[:300]
+
+    assert graph.bfs("R0") == nx.single_source_shortest_path_length(
+        expected, "R0"
+    )
+    for _ in range(100):
+        source, target = rng.choice(nodes), rng.choice(nodes)
+        try:
+            expected_path = nx.shortest_path(expected, source, target)
+        except nx.NetworkXNoPath:
+            with pytest.raises(nx.NetworkXNoPath):
+                shortest_path(graph, source, target)
+            continue
+        found = shortest_path(graph, source, target)
+        assert (found[0], found[-1]) == (source, target)
+        assert len(found) == len(expected_path)
+        assert all(graph.get_edge_data(a, b) for a, b in zip(found, found[1:]))
+        weighted = graph.shortest_path(source, target, weights)
+        assert nx.path_weight(
+            expected, weighted, "weight"
+        ) == nx.shortest_path_length(expected, source, target, "weight")
+
+    with pytest.raises(nx.NodeNotFound):
+        graph.shortest_path("R0", "nope")
+
+
+def test_service_csr_backend_matches_networkx(fleet, tmp_path):
+    expected = TopologyService(ttl=300, backend="networkx").get_graph().graph
+    graph = TopologyService(ttl=300, backend="csr").get_graph().graph
+
+    assert isinstance(graph, CSRGraph)
+    assert list(graph.edges(data=True)) == list(expected.edges(data=True))
+
+    TopologyService(ttl=300, snapshot_dir=tmp_path).get_graph()
+    reloaded = TopologyService(ttl=300, snapshot_dir=tmp_path, backend="csr")
+    path_graph = reloaded.get_path_scope("xrd-1", "xrd-8").graph
+    assert isinstance(path_graph, CSRGraph)
+    assert len(shortest_path(path_graph, "xrd-1", "xrd-8")) == len(
+        nx.shortest_path(expected, "xrd-1", "xrd-8")
+    )
+
+
+def test_snapshot_tables_load_as_csr():
+    nodes, links = _links(50, 80)
+    graph = _networkx(nodes, links)
+    snapshot = TopologySnapshot.build(1, 0.0, graph, [])
+
+    loaded = TopologySnapshot.from_bytes(snapshot.to_bytes()).to_csr()
+
+    assert list(loaded.edges(data=True)) == list(graph.edges(data=True))
+
+
+@pytest.mark.benchmark
+def test_large_topology_benchmark():
+    nodes, links = _links(NODE_COUNT, LINK_COUNT)
+
+    def measure(build):
+        started = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - started
+        tracemalloc.start()
+        graph = build()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return graph, elapsed, memory
+
+    expected, nx_build, nx_memory = measure(lambda: _networkx(nodes, links))
+    graph, csr_build, csr_memory = measure(
+        lambda: CSRGraph.from_edges(nodes, links)
+    )
+
+    def best_of(func, runs=3):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    pairs = [(f"R{i}", f"R{i + NODE_COUNT // 2}") for i in range(100)]
+    nx_paths = best_of(
+        lambda: [nx.shortest_path(expected, s, t) for s, t in pairs]
+    )
+    csr_paths = best_of(lambda: [graph.shortest_path(s, t) for s, t in pairs])
+    nx_bfs = best_of(
+        lambda: nx.single_source_shortest_path_length(expected, "R0")
+    )
+    csr_bfs = best_of(lambda: graph.bfs("R0"))
+    nx_components = best_of(lambda: list(nx.connected_components(expected)))
+    csr_components = best_of(graph.connected_components)
+
+    print(
+        f"\n{NODE_COUNT} nodes / {LINK_COUNT} links, networkx vs csr:"
+        f"\n  memory     {nx_memory / 1e6:.1f} vs {csr_memory / 1e6:.1f} MB"
+        f"\n  build      {nx_build * 1000:.0f} vs {csr_build * 1000:.0f} ms"
+        f"\n  100 paths  {nx_paths * 1000:.1f} vs {csr_paths * 1000:.1f} ms"
+        f"\n  BFS        {nx_bfs * 1000:.1f} vs {csr_bfs * 1000:.1f} ms"
+        f"\n  components {nx_components * 1000:.1f}"
+        f" vs {csr_components * 1000:.1f} ms"
+    )
+    assert csr_memory * 2 < nx_memory
+    assert csr_bfs < nx_bfs * 2
+    assert csr_paths < nx_paths * 2
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for path queries answered from cached shortest-path trees.
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+from src.collectors.topology.csr import CSRGraph
+from src.collectors.topology.path import path, topology_path
+from src.collectors.topology.path_queries import (
+    PathQueryService,
+    reset_path_query_service,
+)
+from src.collectors.topology.service import TopologyService
+from src.processors.protocols.isis.isis_processor import (
+    extract_isis_interface_metrics,
+)
+from src.schemas.responses import OperationStatus
+
+# The sample topology also links some devices over Loopback1 addresses
+INTERFACES = ["Loopback1"] + [f"GigabitEthernet0/0/0/{i}" for i in range(4)]
+
+
+def _isis_metrics(expensive=()):
+    def get_isis_metrics(device_name):
+        metric = 100 if device_name in expensive else 10
+        return {
+            "device_name": device_name,
+            "metrics": {interface: metric for interface in INTERFACES},
+        }
+
+    return get_isis_metrics
+
+
+@pytest.fixture(params=["networkx", "csr"])
+def paths(request, fleet):
+    topology = TopologyService(ttl=300, backend=request.param)
+    return PathQueryService(topology)
+
+
+def test_all_equal_cost_paths_are_returned(paths):
+    answer = paths.query("xrd-5", "xrd-4")
+
+    assert answer["cost"] == 2
+    assert answer["equal_cost_paths"] == 2
+    assert sorted(p["nodes"] for p in answer["paths"]) == [
+        ["xrd-5", "xrd-3", "xrd-4"],
+        ["xrd-5", "xrd-6", "xrd-4"],
+    ]
+    first_hop = answer["paths"][0]["edges"][0]
+    assert first_hop["attributes"]["network"] in (
+        "100.103.105.0/24",
+        "100.105.106.0/24",
+    )
+
+
+def test_trees_are_reused_until_the_topology_changes(paths, fleet):
+    with patch.object(
+        CSRGraph,
+        "shortest_path_tree",
+        autospec=True,
+        side_effect=CSRGraph.shortest_path_tree,
+    ) as csr_tree, patch(
+        "src.collectors.topology.path_queries.nx.predecessor",
+        wraps=nx.predecessor,
+    ) as nx_tree:
+        for target in ("xrd-4", "xrd-6", "xrd-7", "xrd-8"):
+            paths.query("xrd-5", target)
+        assert csr_tree.call_count + nx_tree.call_count == 1
+        fleet.polled.clear()
+
+        # xrd-6 loses its links: new graph, new trees
+        fleet.results["xrd-6"]["interfaces"] = []
+        paths._topology.invalidate("xrd-6")
+        paths._topology.get_graph()
+        answer = paths.query("xrd-5", "xrd-4")
+
+    assert csr_tree.call_count + nx_tree.call_count == 2
+    assert fleet.polled == ["xrd-6"]
+    assert [p["nodes"] for p in answer["paths"]] == [
+        ["xrd-5", "xrd-3", "xrd-4"]
+    ]
+
+
+def test_stale_hop_queries_refresh_only_the_path_scope(paths, fleet):
+    paths._topology.get_graph()
+    paths._topology.invalidate()
+    fleet.polled.clear()
+
+    paths.query("xrd-1", "xrd-3")
+    scoped = sorted(fleet.polled)
+    paths.query("xrd-1", "xrd-3")
+    again = len(fleet.polled)
+    paths.query("xrd-1", "xrd-3", k=2)
+
+    assert scoped == ["xrd-1", "xrd-3", "xrd-5"]
+    assert again == len(scoped)
+    # Other answers may use any link: the whole topology is refreshed
+    assert sorted(fleet.polled[again:]) == sorted(
+        set(fleet.results) - set(scoped)
+    )
+
+
+def test_igp_metrics_weight_paths(paths):
+    with patch(
+        "src.collectors.topology.path_queries._get_isis_metrics",
+        side_effect=_isis_metrics(expensive={"xrd-3"}),
+    ):
+        answer = paths.query("xrd-5", "xrd-4", weight="igp")
+        k_shortest = paths.query("xrd-5", "xrd-4", weight="igp", k=3)
+
+    assert answer["cost"] == 20
+    assert answer["equal_cost_paths"] == 1
+    assert answer["paths"][0]["nodes"] == ["xrd-5", "xrd-6", "xrd-4"]
+    assert [p["cost"] for p in k_shortest["paths"]] == [20, 30, 30]
+
+
+def test_links_without_isis_are_not_used_for_igp_paths(paths):
+    def without_xrd_6(device_name):
+        if device_name == "xrd-6":
+            return {"feature_not_found": "isis", "device_name": device_name}
+        return _isis_metrics()(device_name)
+
+    with patch(
+        "src.collectors.topology.path_queries._get_isis_metrics",
+        side_effect=without_xrd_6,
+    ):
+        answer = paths.query("xrd-5", "xrd-4", weight="igp")
+
+    assert [p["nodes"] for p in answer["paths"]] == [
+        ["xrd-5", "xrd-3", "xrd-4"]
+    ]
+
+
+def test_k_shortest_paths_by_hops(paths):
+    answer = paths.query("xrd-1", "xrd-8", k=3)
+
+    assert answer["equal_cost_paths"] == 1
+    assert answer["paths"][0]["nodes"] == ["xrd-1", "xrd-5", "xrd-8"]
+    assert [p["cost"] for p in answer["paths"]] == [2, 3, 3]
+
+
+def test_collector_results(fleet):
+    reset_path_query_service()
+    device = SimpleNamespace(
+        name="xrd-1", ip_address="198.18.158.1", nos="iosxr"
+    )
+    try:
+        with patch(
+            "src.collectors.topology.path_queries.get_topology_service",
+            return_value=TopologyService(ttl=300),
+        ):
+            found = topology_path(device, "xrd-8")
+            unreachable = topology_path(device, "xrd-10")
+            unknown = topology_path(device, "nope")
+            invalid = topology_path(device, "xrd-8", weight="latency")
+            legacy = path(device, "xrd-8")
+    finally:
+        reset_path_query_service()
+
+    assert found.status == OperationStatus.SUCCESS
+    assert found.data["paths"][0]["nodes"] == ["xrd-1", "xrd-5", "xrd-8"]
+    assert unreachable.status == OperationStatus.SUCCESS
+    assert unreachable.metadata["reachable"] is False
+    assert unknown.error_response.type == "TOPOLOGY_ERROR"
+    assert invalid.error_response.type == "INVALID_PARAMETER"
+    assert legacy["nodes"] == ["xrd-1", "xrd-5", "xrd-8"]
+    assert legacy["equal_cost_paths"] == [["xrd-1", "xrd-5", "xrd-8"]]
+
+
+def test_isis_interface_metrics_are_extracted():
+    with open(
+        "tests/collectors/protocols/isis/test_isis_parser_open_config.json",
+        encoding="utf-8",
+    ) as f:
+        response = json.load(f)["response"]
+
+    assert extract_isis_interface_metrics(response) == {
+        "GigabitEthernet0/0/0/0": 1,
+        "GigabitEthernet0/0/0/1": 1,
+    }
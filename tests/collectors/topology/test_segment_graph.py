@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-access segments in the topology.
+"""
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+from src.collectors.topology.index import TopologyIndex
+from src.collectors.topology.neighbors import neighbors
+from src.collectors.topology.network_topology import get_network_topology
+from src.collectors.topology.path_queries import PathQueryService
+from src.collectors.topology.segment import segment
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.utils import build_segment_graph
+from src.schemas.models import Device, NetworkOS
+
+LAN = "10.9.0.0/24"
+LAN_DEVICES = ["xrd-1", "xrd-2", "xrd-4", "xrd-9", "xrd-10"]
+
+
+def _interface(name, address):
+    return {
+        "admin_status": "UP",
+        "ip_address": address,
+        "name": name,
+        "oper_status": "UP",
+    }
+
+
+@pytest.fixture
+def lan_fleet(fleet):
+    """The sample fleet with a shared LAN, xrd-9 and xrd-10 only on it."""
+    for number, device in enumerate(LAN_DEVICES, start=1):
+        fleet.results[device]["interfaces"].append(
+            _interface(
+                "GigabitEthernet0/0/0/9", f"10.9.0.{number}/255.255.255.0"
+            )
+        )
+    # Two interfaces of one device on the LAN are one membership
+    fleet.results["xrd-1"]["interfaces"].append(
+        _interface("GigabitEthernet0/0/0/10", "10.9.0.11/255.255.255.0")
+    )
+    return fleet
+
+
+def test_segments_are_not_pairwise_links(lan_fleet):
+    service = TopologyService(ttl=300)
+
+    result = service.get_graph()
+
+    segments = result.segments
+    networks = {
+        attributes["network"]
+        for _, _, attributes in result.graph.edges(data=True)
+    }
+    assert LAN not in networks
+    assert segments.segments() == [LAN]
+    # Members are listed in inventory order
+    assert segments.devices_on(LAN) == [
+        name for name in lan_fleet.results if name in LAN_DEVICES
+    ]
+    assert len(segments.members(LAN)) == 6
+    assert segments.number_of_memberships() == 5
+    assert segments.segments_of("xrd-9") == [LAN]
+    assert segments.segments_of("xrd-3") == []
+    assert segments.peers_of("xrd-9") == set(LAN_DEVICES) - {"xrd-9"}
+    assert segments.peers_of("xrd-3") == set()
+    # Point-to-point links and prefixes written differently still match
+    assert "100.103.105.0/24" not in segments
+    assert "10.9.0.7/24" in segments
+
+
+def test_bipartite_graph_joins_links_and_segments(lan_fleet):
+    result = TopologyService(ttl=300).get_graph()
+
+    bipartite = result.segments.to_graph()
+    combined = result.segments.to_graph(result.graph)
+
+    assert nx.is_bipartite(bipartite)
+    assert bipartite.number_of_nodes() == 6
+    assert bipartite.nodes[LAN] == {"kind": "segment", "bipartite": 1}
+    assert bipartite.edges["xrd-1", LAN] == {
+        "interfaces": ["GigabitEthernet0/0/0/10", "GigabitEthernet0/0/0/9"],
+        "ips": ["10.9.0.11", "10.9.0.1"],
+    }
+    # xrd-9 reaches xrd-7 only across the LAN
+    assert nx.shortest_path(combined, "xrd-9", "xrd-7") == [
+        "xrd-9",
+        LAN,
+        "xrd-4",
+        "xrd-7",
+    ]
+    assert combined.number_of_edges() == (
+        result.graph.number_of_edges() + 5
+    )
+
+
+def test_large_segment_costs_one_entry_per_member():
+    index = TopologyIndex()
+    devices = [f"R{i}" for i in range(1000)]
+    for i, device in enumerate(devices):
+        index.set_device(
+            device,
+            [
+                {
+                    "interface": "GigabitEthernet0/0/0/0",
+                    "ip": f"10.{i // 256}.{i % 256}.1",
+                    "network": "10.0.0.0/16",
+                },
+                {
+                    "interface": "MgmtEth0/RP0/CPU0/0",
+                    "ip": f"192.168.{i // 256}.{i % 256}",
+                    "network": "192.168.0.0/16",
+                },
+            ],
+        )
+
+    segments = build_segment_graph(index, devices)
+
+    # Management networks are never segments
+    assert segments.segments() == ["10.0.0.0/16"]
+    assert segments.number_of_memberships() == 1000
+    assert segments.to_graph().number_of_edges() == 1000
+    assert segments.segments_of("R999") == ["10.0.0.0/16"]
+    assert len(segments.peers_of("R0")) == 999
+
+
+def test_collectors_report_segments(lan_fleet, fresh_service):
+    device = Device(
+        name="xrd-9",
+        ip_address="10.10.20.109",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+    with patch(
+        "src.collectors.topology.service.get_settings"
+    ) as settings:
+        settings.return_value.get_topology_cache_enabled.return_value = False
+        settings.return_value.get_topology_backend.return_value = "networkx"
+        settings.return_value.get_topology_ttl.return_value = 300
+        topology = get_network_topology()
+        neighbor_result = neighbors(device)
+        lan = segment(LAN)
+        link = segment("100.103.105.0/24")
+
+    (lan_segment,) = topology.data["segments"]
+    assert lan_segment["segment"] == LAN
+    assert sorted(lan_segment["devices"]) == sorted(LAN_DEVICES)
+    assert len(lan_segment["endpoints"]) == 6
+    assert topology.metadata["total_segments"] == 1
+    assert neighbor_result.data["neighbors"] == []
+    assert neighbor_result.data["segments"] == [
+        {
+            "segment": LAN,
+            "interfaces": ["GigabitEthernet0/0/0/9"],
+            "members": [
+                endpoint
+                for endpoint in lan_segment["endpoints"]
+                if endpoint["device"] != "xrd-9"
+            ],
+        }
+    ]
+    assert lan["multi_access"] is True
+    assert link["multi_access"] is False
+
+
+def test_segments_are_rebuilt_from_a_snapshot(lan_fleet, tmp_path):
+    TopologyService(ttl=300, snapshot_dir=tmp_path).get_graph()
+
+    restored = TopologyService(ttl=300, snapshot_dir=tmp_path)
+
+    assert restored.segments.segments() == [LAN]
+    assert restored.segments.number_of_memberships() == 5
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_paths_cross_segments(lan_fleet, backend):
+    paths = PathQueryService(TopologyService(ttl=300, backend=backend))
+
+    answer = paths.query("xrd-9", "xrd-7")
+    across = paths.query("xrd-9", "xrd-10")
+
+    # xrd-9 is only on the LAN; crossing it is one hop
+    assert answer["cost"] == 2
+    assert [p["nodes"] for p in answer["paths"]] == [
+        ["xrd-9", "xrd-4", "xrd-7"]
+    ]
+    first_hop = answer["paths"][0]["edges"][0]
+    assert (first_hop["source"], first_hop["target"]) == ("xrd-9", "xrd-4")
+    assert first_hop["attributes"] == {
+        "network": LAN,
+        "local_interface": "GigabitEthernet0/0/0/9",
+        "remote_interface": "GigabitEthernet0/0/0/9",
+        "local_ip": "10.9.0.4",
+        "remote_ip": "10.9.0.3",
+        "multi_access": True,
+    }
+    assert across["cost"] == 1
+    assert across["paths"][0]["nodes"] == ["xrd-9", "xrd-10"]
+    # Segments are not devices
+    with pytest.raises(nx.NodeNotFound):
+        paths.query("xrd-9", LAN)
+
+
+def test_igp_paths_cross_segments(lan_fleet):
+    def get_isis_metrics(device_name):
+        metrics = {"GigabitEthernet0/0/0/9": 20}
+        if device_name == "xrd-10":
+            metrics = {}
+        return {"device_name": device_name, "metrics": metrics}
+
+    paths = PathQueryService(TopologyService(ttl=300))
+    with patch(
+        "src.collectors.topology.path_queries._get_isis_metrics",
+        side_effect=get_isis_metrics,
+    ):
+        answer = paths.query("xrd-9", "xrd-2", weight="igp")
+        with pytest.raises(nx.NetworkXNoPath):
+            # No ISIS on the LAN interface of xrd-10
+            paths.query("xrd-9", "xrd-10", weight="igp")
+
+    # Mean of the metrics of the two member interfaces
+    assert answer["cost"] == 20
+    assert answer["paths"][0]["cost"] == 20
+    assert answer["paths"][0]["nodes"] == ["xrd-9", "xrd-2"]
+
+
+def test_path_scope_crosses_segments(lan_fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    service.invalidate()
+    lan_fleet.polled.clear()
+
+    result = service.get_path_scope("xrd-9", "xrd-7")
+
+    # xrd-9 has no links: the search goes on across the LAN
+    assert "xrd-4" in result.graph
+    combined = result.segments.to_graph(result.graph)
+    assert nx.has_path(combined, "xrd-9", "xrd-7")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for interface subnet extraction on large fleets.
+
+The reference implementation is the extractor the module used before: it
+builds an ipaddress.IPv4Network per interface. The current extractor must
+return the same entries for IPv4 and be much faster on 2000 devices with
+20 addresses each.
+"""
+import ipaddress
+import time
+
+import pytest
+
+from src.processors.topology_processor import (
+    extract_interface_subnets,
+    parse_interface_addresses,
+)
+
+DEVICE_COUNT = 2000
+INTERFACES_PER_DEVICE = 20
+MASKS = ["255.255.255.0", "255.255.255.252", "255.255.255.255", "255.255.0.0"]
+
+
+def _reference_extract(interface_results):
+    entries = []
+    for res in interface_results:
+        device = res.get("device")
+        for iface in res.get("interfaces", []):
+            ip_addr = iface.get("ip_address")
+            name = iface.get("name") or iface.get("interface")
+            if not ip_addr or not device or not name:
+                continue
+            try:
+                ip, mask = ip_addr.split("/")
+                network = str(
+                    ipaddress.IPv4Network(f"{ip}/{mask}", strict=False)
+                )
+            except Exception:
+                continue
+            entries.append(
+                {
+                    "device": device,
+                    "interface": name,
+                    "ip": ip,
+                    "network": network,
+                }
+            )
+    return entries
+
+
+@pytest.fixture(scope="module")
+def large_fleet():
+    """Point-to-point links between consecutive devices plus loopbacks."""
+    results = []
+    for d in range(DEVICE_COUNT):
+        interfaces = [
+            {
+                "name": "Loopback0",
+                "ip_address": f"10.255.{d // 256}.{d % 256}/255.255.255.255",
+            },
+            {"name": "Gi0/0/0/0", "ip_address": "not-an-address/24"},
+        ]
+        for i in range(2, INTERFACES_PER_DEVICE):
+            link = d * INTERFACES_PER_DEVICE + i
+            interfaces.append(
+                {
+                    "name": f"Gi0/0/0/{i}",
+                    "ip_address": (
+                        f"10.{link // 65536}.{link // 256 % 256}."
+                        f"{link % 256}/{MASKS[link % len(MASKS)]}"
+                    ),
+                }
+            )
+        results.append({"device": f"R{d}", "interfaces": interfaces})
+    return results
+
+
+def test_matches_reference_for_ipv4(large_fleet):
+    assert extract_interface_subnets(large_fleet) == _reference_extract(
+        large_fleet
+    )
+
+
+def test_ipv6_and_prefix_lengths_are_supported():
+    table = parse_interface_addresses(
+        [
+            {
+                "device": "R1",
+                "interfaces": [
+                    {"name": "Gi0", "ip_address": "2001:db8:0:12::1/64"},
+                    {"name": "Gi1", "ip_address": "10.0.12.1/30"},
+                    {"name": "Gi2", "ip_address": "10.0.13.1/0.0.0.255"},
+                    {"name": "Gi3", "ip_address": "2001:db8::1/129"},
+                ],
+            }
+        ]
+    )
+
+    assert [entry["network"] for entry in table.entries()] == [
+        "2001:db8:0:12::/64",
+        "10.0.12.0/30",
+        "10.0.13.0/24",
+    ]
+    assert list(table.group_by_network().values()) == [[0], [1], [2]]
+
+
+@pytest.mark.benchmark
+def test_extraction_is_faster_than_reference(large_fleet):
+    def best_of(func, runs=3):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            func(large_fleet)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    reference = best_of(_reference_extract)
+    current = best_of(extract_interface_subnets)
+
+    interfaces = DEVICE_COUNT * INTERFACES_PER_DEVICE
+    print(
+        f"\nextract_interface_subnets on {interfaces} interfaces: "
+        f"{current * 1000:.1f} ms (reference {reference * 1000:.1f} ms)"
+    )
+    assert current * 2 < reference
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Tests for topology discovery from ISIS adjacencies and LLDP neighbors.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.topology.adjacency import DeviceAdjacencies
+from src.collectors.topology.network_topology import get_network_topology
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.utils import build_adjacency_graph
+from src.processors.protocols.isis.isis_processor import (
+    extract_isis_topology,
+)
+from src.processors.topology_processor import extract_lldp_neighbors
+from src.schemas.responses import OperationStatus
+
+ISIS = (
+    "network-instances/network-instance[name=DEFAULT]"
+    "/protocols/protocol[identifier=ISIS][name=1]/isis"
+)
+
+
+def _system_id(device):
+    return f"0000.0000.{int(device.split('-')[1]):04d}"
+
+
+def _is_adjacency_link(source, target, attributes):
+    # ISIS runs on the GigabitEthernet links of the sample fleet
+    return source != target and attributes["local_interface"].startswith(
+        "GigabitEthernet"
+    )
+
+
+@pytest.fixture
+def ip_graph(fleet):
+    return TopologyService(ttl=300).get_graph().graph
+
+
+@pytest.fixture
+def adjacency_results(ip_graph, interface_results):
+    """ISIS adjacencies of every sample device, consistent with its IPs."""
+    results = {
+        name: {
+            "device_name": name,
+            "system_id": _system_id(name),
+            "isis": [],
+            "lldp": [],
+        }
+        for name in interface_results
+    }
+    for source, target, attributes in ip_graph.edges(data=True):
+        if not _is_adjacency_link(source, target, attributes):
+            continue
+        results[source]["isis"].append(
+            {
+                "interface": attributes["local_interface"],
+                "system_id": _system_id(target),
+                "neighbor_ipv4": attributes["remote_ip"],
+            }
+        )
+        results[target]["isis"].append(
+            {
+                "interface": attributes["remote_interface"],
+                "system_id": _system_id(source),
+                "neighbor_ipv4": attributes["local_ip"],
+            }
+        )
+    return results
+
+
+@pytest.fixture
+def adjacency_fleet(fleet, adjacency_results):
+    polled = []
+
+    def get_adjacencies(device_name):
+        polled.append(device_name)
+        return adjacency_results[device_name]
+
+    with patch(
+        "src.collectors.topology.service._get_adjacencies",
+        side_effect=get_adjacencies,
+    ):
+        # Building the sample adjacencies polled interfaces
+        fleet.polled.clear()
+        fleet.adjacency_polled = polled
+        yield fleet
+
+
+def _adjacencies(results):
+    return {
+        name: DeviceAdjacencies.from_result(result, 0.0)
+        for name, result in results.items()
+    }
+
+
+def test_isis_adjacencies_from_whole_and_projected_data():
+    with open(
+        "tests/collectors/protocols/isis/test_isis_parser_open_config.json",
+        encoding="utf-8",
+    ) as f:
+        response = json.load(f)["response"]
+    projected = [
+        {
+            "path": f"{ISIS}/global/state/net",
+            "val": ["49.0100.0100.0100.0101.00"],
+        },
+        {
+            "path": f"{ISIS}/interfaces"
+            "/interface[interface-id=GigabitEthernet0/0/0/0]"
+            "/levels/level[level-number=2]/adjacencies"
+            "/adjacency[system-id=0100.0100.0103]/state",
+            "val": {
+                "system-id": "0100.0100.0103",
+                "neighbor-ipv4-address": "100.101.103.103",
+                "adjacency-state": "UP",
+            },
+        },
+    ]
+
+    whole = extract_isis_topology(response)
+
+    assert whole["system_id"] == "0100.0100.0101"
+    assert whole["adjacencies"] == [
+        {
+            "interface": "GigabitEthernet0/0/0/0",
+            "system_id": "0100.0100.0103",
+            "neighbor_ipv4": "100.101.103.103",
+        },
+        {
+            "interface": "GigabitEthernet0/0/0/1",
+            "system_id": "0100.0100.0105",
+            "neighbor_ipv4": "100.101.105.105",
+        },
+    ]
+    assert extract_isis_topology(projected) == {
+        "system_id": "0100.0100.0101",
+        "adjacencies": whole["adjacencies"][:1],
+    }
+
+
+def test_lldp_neighbors_from_projected_data():
+    response = [
+        {
+            "path": "lldp/interfaces/interface[name=GigabitEthernet0/0/0/0]"
+            "/neighbors/neighbor[id=1]/state",
+            "val": {
+                "system-name": "xrd-2.lab",
+                "port-id": "GigabitEthernet0/0/0/1",
+                "chassis-id": "02:42:ac:12:00:02",
+            },
+        }
+    ]
+
+    assert extract_lldp_neighbors(response) == [
+        {
+            "interface": "GigabitEthernet0/0/0/0",
+            "system_name": "xrd-2.lab",
+            "port_id": "GigabitEthernet0/0/0/1",
+            "chassis_id": "02:42:ac:12:00:02",
+        }
+    ]
+
+
+def test_adjacency_links_match_ip_links(ip_graph, adjacency_results):
+    devices = list(ip_graph)
+    expected = {
+        frozenset((source, target)): attributes
+        for source, target, attributes in ip_graph.edges(data=True)
+        if _is_adjacency_link(source, target, attributes)
+    }
+    index = TopologyService(ttl=300).get_graph().index
+
+    bare = build_adjacency_graph(_adjacencies(adjacency_results), devices)
+    enriched = build_adjacency_graph(
+        _adjacencies(adjacency_results), devices, index
+    )
+
+    assert {frozenset(edge) for edge in bare.edges()} == set(expected)
+    for source, target, attributes in bare.edges(data=True):
+        ip_attributes = expected[frozenset((source, target))]
+        assert attributes == dict(ip_attributes, network=None)
+    for source, target, attributes in enriched.edges(data=True):
+        assert attributes == expected[frozenset((source, target))]
+
+
+def test_lldp_and_address_resolution_add_links(ip_graph, adjacency_results):
+    devices = list(ip_graph) + ["xrd-9", "xrd-10"]
+    # xrd-9 only speaks LLDP and names xrd-10 by its FQDN
+    adjacency_results["xrd-9"]["lldp"] = [
+        {
+            "interface": "GigabitEthernet0/0/0/5",
+            "system_name": "xrd-10.lab.example",
+            "port_id": "GigabitEthernet0/0/0/6",
+        }
+    ]
+    # An unknown system ID is resolved by the owner of its address
+    adjacency_results["xrd-1"]["system_id"] = None
+    index = TopologyService(ttl=300).get_graph().index
+
+    adjacencies = _adjacencies(adjacency_results)
+
+    graph = build_adjacency_graph(adjacencies, devices, index)
+    merged = build_adjacency_graph(
+        adjacencies, devices, index, include_ip=True
+    )
+
+    assert graph.get_edge_data("xrd-9", "xrd-10") == {
+        "network": None,
+        "local_interface": "GigabitEthernet0/0/0/5",
+        "remote_interface": "GigabitEthernet0/0/0/6",
+        "local_ip": None,
+        "remote_ip": None,
+    }
+    assert graph.get_edge_data("xrd-1", "xrd-3") == ip_graph.get_edge_data(
+        "xrd-1", "xrd-3"
+    )
+    # IP links the adjacencies do not see are kept when merged
+    assert not graph.has_edge("xrd-5", "xrd-3")
+    assert merged.has_edge("xrd-5", "xrd-3")
+    assert merged.has_edge("xrd-9", "xrd-10")
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_service_adjacency_discovery(adjacency_fleet, backend):
+    service = TopologyService(ttl=300, backend=backend)
+
+    result = service.get_graph(discovery="adjacency")
+    again = service.get_graph(discovery="adjacency")
+
+    assert adjacency_fleet.polled == []
+    assert sorted(adjacency_fleet.adjacency_polled) == sorted(
+        adjacency_fleet.results
+    )
+    assert again.refreshed_devices == []
+    assert again.graph is result.graph
+    assert result.graph.number_of_edges() == 10
+    assert result.total_devices == len(adjacency_fleet.results)
+
+    merged = service.get_graph(discovery="merged").graph
+    assert merged.number_of_edges() == service.graph.number_of_edges()
+    with pytest.raises(ValueError):
+        service.get_graph(discovery="lldp")
+
+
+def test_neighborhood_polls_adjacent_devices(adjacency_fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph(discovery="adjacency")
+    adjacency_fleet.adjacency_polled.clear()
+    service.invalidate()
+
+    result = service.get_neighborhood("xrd-1", discovery="adjacency")
+
+    assert sorted(adjacency_fleet.adjacency_polled) == [
+        "xrd-1",
+        "xrd-3",
+        "xrd-5",
+    ]
+    assert sorted(result.graph.neighbors("xrd-1")) == ["xrd-3", "xrd-5"]
+
+
+def test_invalid_discovery_is_rejected():
+    result = get_network_topology(discovery="lldp")
+
+    assert result.status == OperationStatus.FAILED
+    assert result.error_response.type == "INVALID_PARAMETER"
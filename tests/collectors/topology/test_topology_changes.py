@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for topology changes between snapshots.
+"""
+import json
+import random
+from datetime import datetime
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+from src.collectors.topology.changes import get_topology_changes, parse_since
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.snapshot import SnapshotStore, TopologySnapshot
+from src.schemas.responses import OperationStatus
+
+
+def _random_graph(rng, nodes, links):
+    graph = nx.Graph()
+    graph.add_nodes_from(f"R{i}" for i in range(nodes))
+    while graph.number_of_edges() < links:
+        a, b = rng.sample(range(nodes), 2)
+        i = graph.number_of_edges()
+        graph.add_edge(
+            f"R{a}",
+            f"R{b}",
+            network=f"10.{i // 256}.{i % 256}.0/31",
+            local_interface=f"Gi0/0/0/{i % 8}",
+            remote_interface=f"Gi0/0/0/{(i + 1) % 8}",
+            local_ip=f"10.{i // 256}.{i % 256}.0",
+            remote_ip=f"10.{i // 256}.{i % 256}.1",
+        )
+    return graph
+
+
+def _brute_force(before, after):
+    def links(snapshot):
+        return {
+            (frozenset((s, t)), a["network"]): (s, t, a)
+            for s, t, a in snapshot.edge_rows()
+        }
+
+    def ends(link):
+        s, t, a = link
+        return {
+            (s, a["local_interface"], a["local_ip"]),
+            (t, a["remote_interface"], a["remote_ip"]),
+        }
+
+    old, new = links(before), links(after)
+    return (
+        sorted(new.keys() - old.keys(), key=str),
+        sorted(old.keys() - new.keys(), key=str),
+        sorted(
+            (
+                key
+                for key in new.keys() & old.keys()
+                if ends(new[key]) != ends(old[key])
+            ),
+            key=str,
+        ),
+    )
+
+
+def _keys(links):
+    return sorted(
+        (
+            (
+                frozenset((link["source"], link["target"])),
+                link["attributes"]["network"],
+            )
+            for link in links
+        ),
+        key=str,
+    )
+
+
+def test_diff_matches_brute_force_comparison():
+    rng = random.Random(11)
+    graph = _random_graph(rng, 200, 600)
+    before = TopologySnapshot.build(1, 0.0, graph, [])
+    edges = list(graph.edges())
+    graph.remove_edges_from(rng.sample(edges, 40))
+    for a, b in rng.sample(list(graph.edges()), 30):
+        graph[a][b]["remote_ip"] = f"192.0.2.{rng.randrange(256)}"
+    graph.add_edge(
+        "R0",
+        "R500",
+        network="198.51.100.0/31",
+        local_interface="Hu0/0/0/0",
+        remote_interface="Hu0/0/0/1",
+        local_ip="198.51.100.0",
+        remote_ip="198.51.100.1",
+    )
+    # Both orientations of an unchanged link are the same link
+    a, b = next(iter(graph.edges()))
+    attributes = graph[a][b]
+    graph.remove_edge(a, b)
+    graph.add_edge(
+        b,
+        a,
+        network=attributes["network"],
+        local_interface=attributes["remote_interface"],
+        remote_interface=attributes["local_interface"],
+        local_ip=attributes["remote_ip"],
+        remote_ip=attributes["local_ip"],
+    )
+    after = TopologySnapshot.build(2, 0.0, graph, [])
+    # The node and string tables of both snapshots differ
+    assert before.nodes != after.nodes and before.strings != after.strings
+
+    diff = after.diff(before)
+    added, removed, changed = _brute_force(before, after)
+
+    assert diff["added_nodes"] == ["R500"]
+    assert _keys(diff["added_links"]) == added
+    assert _keys(diff["removed_links"]) == removed
+    assert _keys(link["after"] for link in diff["changed_links"]) == changed
+    assert len(added) == 1 and len(removed) == 40 and len(changed) > 0
+    assert after.diff(after)["changed_links"] == []
+
+
+def test_store_finds_snapshot_current_at_a_time(tmp_path):
+    graph = _random_graph(random.Random(1), 30, 40)
+    store = SnapshotStore(tmp_path)
+    for version, built_at in ((1, 100.0), (2, 200.0), (3, 300.0)):
+        store.save(TopologySnapshot.build(version, built_at, graph, []))
+
+    assert store.header(2)["built_at"] == 200.0
+    assert store.header(2)["edge_rows"] == 40
+    assert store.version_at(250.0) == 2
+    assert store.version_at(300.0) == 3
+    assert store.version_at(50.0) is None
+    assert store.header(9) is None
+
+
+def test_parse_since():
+    now = 1_000_000.0
+
+    assert parse_since("2h", now) == now - 7200
+    assert parse_since("30m", now) == now - 1800
+    assert parse_since("1d", now) == now - 86400
+    assert parse_since("12345", now) == 12345.0
+    assert parse_since("2025-06-01T08:00", now) == datetime(
+        2025, 6, 1, 8
+    ).timestamp()
+    with pytest.raises(ValueError):
+        parse_since("this morning", now)
+
+
+@pytest.fixture
+def snapshot_service(fleet, tmp_path):
+    service = TopologyService(ttl=0, snapshot_dir=tmp_path)
+    with patch(
+        "src.collectors.topology.changes.get_topology_service",
+        return_value=service,
+    ):
+        yield service
+
+
+def test_changes_since_previous_snapshot(snapshot_service, fleet):
+    snapshot_service.get_graph()
+    fleet.results["xrd-6"]["interfaces"] = []
+
+    result = get_topology_changes()
+    explicit = get_topology_changes(from_version=1, to_version=2)
+
+    assert result.status == OperationStatus.SUCCESS
+    assert (result.data["from_version"], result.data["to_version"]) == (1, 2)
+    assert result.data["changed_devices"] == ["xrd-6"]
+    assert len(result.data["removed_links"]) == 4
+    for link in result.data["removed_links"]:
+        assert "xrd-6" in (link["source"], link["target"])
+    assert result.data["added_links"] == []
+    assert explicit.data == result.data
+    assert result.metadata["available_versions"] == [1, 2]
+    # Only the delta is returned, not the topology
+    topology = nx.node_link_data(snapshot_service.graph, edges="links")
+    assert len(json.dumps(result.data)) < len(json.dumps(topology))
+
+
+def test_changes_since_a_time(snapshot_service, fleet):
+    snapshot_service.get_graph()
+    fleet.results["xrd-1"]["interfaces"] = []
+    snapshot_service.get_graph()
+    fleet.results["xrd-6"]["interfaces"] = []
+
+    result = get_topology_changes(since="1h")
+
+    assert result.metadata["note"]
+    assert (result.data["from_version"], result.data["to_version"]) == (1, 3)
+    assert result.data["changed_devices"] == ["xrd-1", "xrd-6"]
+
+
+def test_invalid_requests(snapshot_service):
+    snapshot_service.get_graph()
+
+    bad_time = get_topology_changes(since="yesterday-ish")
+    both = get_topology_changes(from_version=1, since="1h")
+    missing = get_topology_changes(from_version=7)
+
+    for result in (bad_time, both, missing):
+        assert result.status == OperationStatus.FAILED
+        assert result.error_response.type == "INVALID_PARAMETER"
+
+
+def test_changes_need_snapshots(fleet):
+    with patch(
+        "src.collectors.topology.changes.get_topology_service",
+        return_value=TopologyService(ttl=0),
+    ):
+        result = get_topology_changes()
+
+    assert result.status == OperationStatus.FEATURE_NOT_AVAILABLE
+    assert "GNMIBUDDY_TOPOLOGY_CACHE" in (
+        result.feature_not_found_response.message
+    )
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the topology index and the lookups answered from it.
+"""
+import json
+
+from src.collectors.topology.index import TopologyIndex
+from src.collectors.topology.ip_lookup import lookup_ip
+from src.collectors.topology.segment import segment
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.utils import (
+    build_ip_only_graph_from_index,
+    build_ip_only_graph_from_interface_results,
+)
+from src.processors.topology_processor import extract_interface_subnets
+from src.schemas.responses import OperationStatus
+
+
+def _entry(interface, ip, network):
+    return {"interface": interface, "ip": ip, "network": network}
+
+
+def _index():
+    index = TopologyIndex()
+    index.set_device(
+        "R1",
+        [
+            _entry("Gi0/0/0/0", "10.0.12.1", "10.0.12.0/24"),
+            _entry("Gi0/0/0/1", "2001:db8:13::1", "2001:db8:13::/64"),
+        ],
+    )
+    index.set_device("R2", [_entry("Gi0/0/0/0", "10.0.12.2", "10.0.12.0/24")])
+    index.set_device(
+        "R3", [_entry("Gi0/0/0/1", "2001:db8:13::3", "2001:db8:13::/64")]
+    )
+    return index
+
+
+def test_lookups_normalize_prefixes_and_addresses():
+    index = _index()
+
+    assert index.devices_on("10.0.12.77/255.255.255.0") == ["R1", "R2"]
+    assert index.owner("2001:db8:13:0::3").device == "R3"
+    assert index.owner("10.0.12.2/24").interface == "Gi0/0/0/0"
+    assert index.containing_network("10.0.12.200") == "10.0.12.0/24"
+    assert index.containing_network("2001:db8:13::99") == "2001:db8:13::/64"
+    assert index.containing_network("192.0.2.1") is None
+    assert index.peers_of("R1") == {"R2", "R3"}
+    assert index.interfaces_of("R1")["Gi0/0/0/1"] == ["2001:db8:13::/64"]
+
+
+def test_device_updates_are_incremental():
+    index = _index()
+
+    touched = index.set_device(
+        "R2", [_entry("Gi0/0/0/2", "10.0.23.2", "10.0.23.0/24")]
+    )
+
+    assert {key[2] for key in touched} == {24}
+    assert len(touched) == 2
+    assert index.devices_on("10.0.12.0/24") == ["R1"]
+    assert index.owner("10.0.12.2") is None
+    assert index.owner("10.0.23.2").device == "R2"
+
+    index.remove_device("R2")
+    assert index.containing_network("10.0.23.9") is None
+
+
+def test_index_graph_matches_interface_result_graph():
+    with open(
+        "tests/collectors/topology/topology_input.json", encoding="utf-8"
+    ) as f:
+        interface_results = json.load(f)
+    index = TopologyIndex()
+    for result in interface_results:
+        device = result["device_name"]
+        index.set_device(
+            device,
+            extract_interface_subnets([dict(result, device=device)]),
+        )
+    devices = [result["device_name"] for result in interface_results]
+
+    expected = build_ip_only_graph_from_interface_results(interface_results)
+    actual = build_ip_only_graph_from_index(index, devices)
+
+    assert list(actual.nodes) == list(expected.nodes)
+    assert sorted(actual.edges(data=True)) == sorted(
+        expected.edges(data=True)
+    )
+
+
+def test_segment_and_ip_lookup_use_the_index(fleet, fresh_service):
+    result = segment("100.103.105.0/24")
+    owner = lookup_ip("100.103.105.105")
+    unknown = lookup_ip("100.103.105.9")
+    invalid = lookup_ip("not-an-ip")
+
+    assert sorted(result["devices"]) == ["xrd-3", "xrd-5"]
+    assert owner.data["owner"]["device"] == "xrd-5"
+    assert unknown.data["owner"] is None
+    assert unknown.data["network"] == "100.103.105.0/24"
+    assert len(unknown.data["segment"]) == 2
+    assert invalid.status == OperationStatus.FAILED
+    assert invalid.error_response.type == "INVALID_PARAMETER"
+
+
+def test_warm_segment_lookup_polls_only_segment_devices(fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    service.invalidate()
+    fleet.polled.clear()
+
+    service.get_segment("100.103.105.0/24")
+
+    assert sorted(fleet.polled) == ["xrd-3", "xrd-5"]
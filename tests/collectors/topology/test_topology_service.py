@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for the topology service that refreshes the graph per device.
+"""
+import threading
+from unittest.mock import patch
+
+import networkx as nx
+
+from src.collectors.topology import service as service_module
+from src.collectors.topology.network_topology import get_network_topology
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.utils import data_age_metadata
+
+
+def test_fresh_data_is_reused_without_polling(fleet):
+    service = TopologyService(ttl=300)
+
+    first = service.get_graph()
+    fleet.polled.clear()
+    second = service.get_graph()
+
+    assert len(first.refreshed_devices) == len(fleet.results)
+    assert fleet.polled == []
+    assert second.graph is first.graph
+    assert second.graph.number_of_edges() > 0
+
+
+def test_only_invalidated_devices_are_polled(fleet):
+    service = TopologyService(ttl=300)
+    graph = service.get_graph().graph
+    fleet.polled.clear()
+
+    service.invalidate("xrd-1")
+    result = service.get_graph()
+
+    assert fleet.polled == ["xrd-1"]
+    # Same subnets: the graph is not rebuilt
+    assert result.graph is graph
+
+
+def test_changed_subnets_rebuild_the_graph(fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    links_before = set(service.get_graph().graph.edges("xrd-1"))
+    for interface in fleet.results["xrd-1"]["interfaces"]:
+        if interface["name"] != "Loopback0":
+            interface["ip_address"] = None
+
+    service.invalidate("xrd-1")
+    result = service.get_graph()
+
+    assert links_before
+    assert list(result.graph.edges("xrd-1")) == []
+
+
+def test_failed_refresh_is_reported_and_retried(fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    fleet.results["xrd-2"] = {"error": "timeout", "device_name": "xrd-2"}
+
+    service.invalidate("xrd-2")
+    failed = service.get_graph()
+    fleet.polled.clear()
+    service.get_graph()
+
+    assert failed.has_errors
+    assert failed.error_devices == ["xrd-2"]
+    assert failed.error_response.message == "timeout"
+    assert fleet.polled == ["xrd-2"]
+
+
+def test_zero_ttl_polls_every_device(fleet):
+    service = TopologyService(ttl=0)
+    service.get_graph()
+    fleet.polled.clear()
+
+    service.get_graph()
+
+    assert sorted(fleet.polled) == sorted(fleet.results)
+
+
+def test_device_data_is_persisted(fleet, tmp_path):
+    edges = TopologyService(ttl=300, snapshot_dir=tmp_path).get_graph()
+    fleet.polled.clear()
+
+    reloaded = TopologyService(ttl=300, snapshot_dir=tmp_path).get_graph()
+
+    assert fleet.polled == []
+    assert set(reloaded.graph.edges()) == set(edges.graph.edges())
+
+
+def test_neighborhood_polls_only_candidate_peers(fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    service.invalidate()
+    fleet.polled.clear()
+
+    result = service.get_neighborhood("xrd-1")
+
+    assert sorted(fleet.polled) == ["xrd-1", "xrd-3", "xrd-5"]
+    assert sorted(result.graph.neighbors("xrd-1")) == [
+        "xrd-1",
+        "xrd-3",
+        "xrd-5",
+    ]
+
+
+def test_path_scope_meets_in_the_middle(fleet):
+    service = TopologyService(ttl=300)
+    full = service.get_graph().graph
+    service.invalidate()
+    fleet.polled.clear()
+
+    result = service.get_path_scope("xrd-1", "xrd-7")
+
+    assert "xrd-9" not in fleet.polled
+    assert len(fleet.polled) < len(fleet.results)
+    assert nx.shortest_path_length(
+        result.graph, "xrd-1", "xrd-7"
+    ) == nx.shortest_path_length(full, "xrd-1", "xrd-7")
+
+
+def test_cold_neighborhood_polls_devices_without_data(fleet):
+    service = TopologyService(ttl=300)
+
+    service.get_neighborhood("xrd-9")
+
+    assert sorted(fleet.polled) == sorted(fleet.results)
+
+
+def test_data_age_is_reported(fleet):
+    service = TopologyService(ttl=300)
+
+    result = service.get_graph()
+    metadata = data_age_metadata(result)
+
+    assert result.fetched_at is not None
+    assert result.fetched_at <= result.built_at
+    assert metadata["data_fetched_at"] == result.fetched_at
+    assert metadata["data_age_seconds"] >= 0
+    assert data_age_metadata(None) == {}
+
+
+def test_polling_does_not_block_warm_queries(fleet):
+    service = TopologyService(ttl=300)
+    service.get_graph()
+    polling = threading.Event()
+    release = threading.Event()
+    get_interface = service_module._get_interface.side_effect
+
+    def slow_get_interface(device_name):
+        polling.set()
+        release.wait(5)
+        return get_interface(device_name)
+
+    service_module._get_interface.side_effect = slow_get_interface
+    service.invalidate("xrd-1")
+    slow = threading.Thread(target=service.get_neighborhood, args=("xrd-1",))
+    slow.start()
+    try:
+        assert polling.wait(5)
+        # xrd-6 is fresh: answered while xrd-1 is still being polled
+        result = service.get_neighborhood("xrd-6")
+        assert result.refreshed_devices == []
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join(5)
+    assert not slow.is_alive()
+
+
+def test_refresh_polls_fresh_devices(fleet, fresh_service):
+    with patch(
+        "src.collectors.topology.service.get_settings"
+    ) as settings:
+        settings.return_value.get_topology_cache_enabled.return_value = False
+        settings.return_value.get_topology_backend.return_value = "networkx"
+        settings.return_value.get_topology_ttl.return_value = 300
+        get_network_topology()
+        fleet.polled.clear()
+        cached = get_network_topology()
+        polled_cached = list(fleet.polled)
+        refreshed = get_network_topology(refresh=True)
+
+    assert polled_cached == []
+    assert sorted(fleet.polled) == sorted(fleet.results)
+    assert cached.metadata["data_age_seconds"] >= 0
+    assert refreshed.metadata["data_fetched_at"] >= (
+        cached.metadata["data_fetched_at"]
+    )
+
+
+def test_ipv6_only_links_are_discovered(fleet):
+    for device, address in (("xrd-1", "2001:db8::"), ("xrd-8", "2001:db8::1")):
+        fleet.results[device]["interfaces"].append(
+            {
+                "name": "GigabitEthernet0/0/0/7",
+                "ipv6_addresses": [f"{address}/127"],
+            }
+        )
+
+    graph = TopologyService(ttl=300).get_graph().graph
+
+    assert graph.get_edge_data("xrd-1", "xrd-8")["network"] == (
+        "2001:db8::/127"
+    )
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Tests for topology snapshots and cold starts of the topology service.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+import pytest
+
+from src.collectors.topology.service import TopologyService
+from src.collectors.topology.snapshot import SnapshotStore, TopologySnapshot
+
+
+def _signature(device):
+    return tuple(
+        sorted(
+            (interface, ip, network)
+            for interface, ip, network in (
+                ("Loopback0", f"10.255.0.{device}", f"10.255.0.{device}/32"),
+                ("Gi0/0/0/0", f"10.0.{device}.1", f"10.0.{device}.0/24"),
+            )
+        )
+    )
+
+
+def _ring(size):
+    graph = nx.Graph()
+    for device in range(size):
+        peer = (device + 1) % size
+        graph.add_edge(
+            f"R{device}",
+            f"R{peer}",
+            network=f"10.0.{device}.0/24",
+            local_interface="Gi0/0/0/0",
+            remote_interface="Gi0/0/0/1",
+            local_ip=f"10.0.{device}.1",
+            remote_ip=f"10.0.{device}.2",
+        )
+    return graph
+
+
+def test_snapshot_round_trip():
+    graph = _ring(4)
+    devices = [(f"R{d}", 100.0 + d, _signature(d)) for d in range(4)]
+    devices.append(("R9", 50.0, ("feature_not_found",)))
+
+    snapshot = TopologySnapshot.build(3, 123.5, graph, devices)
+    loaded = TopologySnapshot.from_bytes(snapshot.to_bytes())
+
+    assert (loaded.version, loaded.built_at) == (3, 123.5)
+    assert sorted(loaded.to_graph().edges(data=True)) == sorted(
+        graph.edges(data=True)
+    )
+    assert loaded.device_signatures() == {
+        name: signature for name, _, signature in devices
+    }
+    assert sorted(peer for peer, _ in loaded.adjacency()["R0"]) == [
+        "R1",
+        "R3",
+    ]
+
+
+def test_diff_reports_link_and_device_changes():
+    before = TopologySnapshot.build(
+        1, 0.0, _ring(4), [(f"R{d}", 0.0, _signature(d)) for d in range(4)]
+    )
+    graph = _ring(4)
+    graph.remove_edge("R3", "R0")
+    graph["R0"]["R1"]["remote_interface"] = "Gi0/0/0/7"
+    graph.add_edge(
+        "R1",
+        "R4",
+        network="10.9.9.0/24",
+        local_interface="Gi0/0/0/9",
+        remote_interface="Gi0/0/0/9",
+        local_ip="10.9.9.1",
+        remote_ip="10.9.9.2",
+    )
+    devices = [(f"R{d}", 0.0, _signature(d)) for d in range(5)]
+    devices[2] = ("R2", 0.0, ())
+    after = TopologySnapshot.build(2, 0.0, graph, devices)
+
+    diff = after.diff(before)
+
+    assert diff["added_nodes"] == ["R4"]
+    assert diff["removed_nodes"] == []
+    assert [
+        link["attributes"]["network"] for link in diff["added_links"]
+    ] == ["10.9.9.0/24"]
+    assert [
+        link["attributes"]["network"] for link in diff["removed_links"]
+    ] == ["10.0.3.0/24"]
+    assert len(diff["changed_links"]) == 1
+    assert diff["changed_devices"] == ["R2"]
+
+
+def test_store_keeps_numbered_versions(tmp_path):
+    store = SnapshotStore(tmp_path, keep=2)
+    for version in (1, 2, 3):
+        store.save(TopologySnapshot.build(version, 0.0, _ring(3), []))
+    (tmp_path / "00000009.gbts").write_bytes(b"garbage")
+
+    assert store.versions() == [2, 3, 9]
+    assert store.load(9) is None
+    assert store.load(3).version == 3
+    assert store.load(1) is None
+
+
+def test_concurrent_writers_get_distinct_numbers(tmp_path):
+    stores = [SnapshotStore(tmp_path) for _ in range(8)]
+    snapshot = TopologySnapshot.build(1, 0.0, _ring(3), [])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        versions = list(
+            pool.map(
+                lambda store: store.save(snapshot, new_version=True), stores
+            )
+        )
+
+    assert sorted(versions) == list(range(1, 9))
+    assert SnapshotStore(tmp_path).versions() == list(range(1, 9))
+    for version in versions:
+        assert stores[0].load(version).version == version
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_services_sharing_a_directory_do_not_overwrite(fleet, tmp_path):
+    first = TopologyService(ttl=0, snapshot_dir=tmp_path)
+    second = TopologyService(ttl=0, snapshot_dir=tmp_path)
+    first.get_graph()
+    fleet.results["xrd-1"]["interfaces"] = []
+
+    second.get_graph()
+
+    store = SnapshotStore(tmp_path)
+    assert (first.snapshot_version, second.snapshot_version) == (1, 2)
+    assert store.versions() == [1, 2]
+    assert store.load(2).diff(store.load(1))["changed_devices"] == ["xrd-1"]
+
+
+def test_cold_start_answers_from_snapshot(fleet, tmp_path):
+    first = TopologyService(ttl=300, snapshot_dir=tmp_path)
+    expected = first.get_graph().graph
+    fleet.polled.clear()
+
+    service = TopologyService(ttl=300, snapshot_dir=tmp_path)
+    result = service.get_neighborhood("xrd-1")
+
+    assert fleet.polled == []
+    assert sorted(result.graph.edges(data=True)) == sorted(
+        expected.edges(data=True)
+    )
+    assert sorted(result.index.devices_on("100.103.105.0/24")) == [
+        "xrd-3",
+        "xrd-5",
+    ]
+    assert service.snapshot_version == first.snapshot_version == 1
+
+
+def test_snapshot_number_changes_only_with_topology(fleet, tmp_path):
+    service = TopologyService(ttl=0, snapshot_dir=tmp_path)
+    service.get_graph()
+    service.get_graph()
+    assert SnapshotStore(tmp_path).versions() == [1]
+
+    fleet.results["xrd-1"]["interfaces"] = []
+    service.get_graph()
+
+    store = SnapshotStore(tmp_path)
+    assert store.versions() == [1, 2]
+    diff = store.load(2).diff(store.load(1))
+    assert diff["changed_devices"] == ["xrd-1"]
+    assert diff["removed_links"]
+
+
+def test_large_snapshot_round_trips(tmp_path):
+    size = 5000
+    graph = _ring(size)
+    store = SnapshotStore(tmp_path)
+    store.save(
+        TopologySnapshot.build(
+            1,
+            0.0,
+            graph,
+            [(f"R{d}", 0.0, _signature(d)) for d in range(size)],
+        )
+    )
+
+    loaded = store.load()
+
+    assert len(loaded.adjacency()) == size
+    assert loaded.edge_count == size
+    assert set(map(frozenset, loaded.to_graph().edges())) == set(
+        map(frozenset, graph.edges())
+    )
+
+
+@pytest.mark.benchmark
+def test_large_snapshot_loads_quickly(tmp_path):
+    size = 5000
+    graph = _ring(size)
+    snapshot = TopologySnapshot.build(
+        1, 0.0, graph, [(f"R{d}", 0.0, _signature(d)) for d in range(size)]
+    )
+    store = SnapshotStore(tmp_path)
+    store.save(snapshot)
+
+    started = time.perf_counter()
+    loaded = store.load()
+    adjacency = loaded.adjacency()
+    elapsed = time.perf_counter() - started
+
+    print(f"\nLoaded {size}-node snapshot in {elapsed * 1000:.1f} ms")
+    assert len(adjacency) == size
+    assert loaded.edge_count == size
+    assert elapsed < 1.0
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Tests for turning parsed gNMI Get responses into network responses."""
+from src.gnmi.client import GnmiRequestExecutor
+from src.gnmi.response_parser import parse_gnmi_response
+
+
+def test_updates_from_every_notification_are_returned():
+    parsed = parse_gnmi_response(
+        {
+            "notification": [
+                {"timestamp": 1, "update": [{"path": "a", "val": 1}]},
+                {"timestamp": 2, "update": [{"path": "b", "val": 2}]},
+            ]
+        }
+    )
+
+    response = GnmiRequestExecutor._create_network_response(parsed)
+
+    assert [u["path"] for u in response.data] == ["a", "b"]
+    assert response.timestamp == "1"
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Tests for device sessions sharing fetched subtrees between requests."""
+import threading
+import time
+from unittest.mock import patch
+
+from src.gnmi.client import get_gnmi_data
+from src.gnmi.parameters import GnmiRequest
+from src.gnmi.session import DeviceSession, device_session
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import ErrorResponse, SuccessResponse
+
+NI = "openconfig-network-instance:network-instances/network-instance"
+
+INSTANCES = SuccessResponse(
+    data=[
+        {
+            "path": "network-instances/network-instance[name=default]",
+            "val": {"name": "default", "state": {"name": "default"}},
+        },
+        {
+            "path": "network-instances/network-instance[name=CUST_A]",
+            "val": {
+                "name": "CUST_A",
+                "state": {"name": "CUST_A", "enabled": True},
+                "protocols": {
+                    "protocol": [
+                        {"identifier": "BGP", "name": "100", "bgp": {}},
+                        {"identifier": "STATIC", "name": "static"},
+                    ]
+                },
+            },
+        },
+    ],
+    timestamp="1",
+)
+
+
+def _device(name="R1"):
+    return Device(
+        name=name,
+        ip_address="192.168.1.1",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_same_request_is_fetched_once(mock_fetch):
+    mock_fetch.return_value = INSTANCES
+    request = GnmiRequest(path=[f"{NI}[name=*]"])
+
+    with device_session() as session:
+        first = get_gnmi_data(_device(), request)
+        second = get_gnmi_data(_device(), request)
+
+    assert mock_fetch.call_count == 1
+    assert first.data == second.data
+    assert (session.hits, session.misses) == (1, 1)
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_narrower_paths_are_answered_from_stored_subtrees(mock_fetch):
+    mock_fetch.return_value = INSTANCES
+
+    with device_session():
+        get_gnmi_data(_device(), GnmiRequest(path=[f"{NI}[name=*]"]))
+        names = get_gnmi_data(
+            _device(), GnmiRequest(path=[f"{NI}[name=*]/state/name"])
+        )
+        bgp = get_gnmi_data(
+            _device(),
+            GnmiRequest(
+                path=[f"{NI}[name=CUST_A]/protocols/protocol[identifier=BGP]"]
+            ),
+        )
+
+    assert mock_fetch.call_count == 1
+    assert names.data == [
+        {
+            "path": "network-instances/network-instance[name=default]"
+            "/state/name",
+            "val": "default",
+        },
+        {
+            "path": "network-instances/network-instance[name=CUST_A]"
+            "/state/name",
+            "val": "CUST_A",
+        },
+    ]
+    assert [u["path"] for u in bgp.data] == [
+        "network-instances/network-instance[name=CUST_A]"
+        "/protocols/protocol[identifier=BGP]"
+    ]
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_uncovered_requests_go_to_the_device(mock_fetch):
+    mock_fetch.return_value = INSTANCES
+
+    with device_session():
+        get_gnmi_data(_device(), GnmiRequest(path=[f"{NI}[name=CUST_A]"]))
+        # A wildcard is broader than the fixed key fetched before
+        get_gnmi_data(_device(), GnmiRequest(path=[f"{NI}[name=*]"]))
+        # Another device, and another encoding, have their own store
+        get_gnmi_data(_device("R2"), GnmiRequest(path=[f"{NI}[name=*]"]))
+        get_gnmi_data(
+            _device(),
+            GnmiRequest(path=[f"{NI}[name=*]"], encoding="json"),
+        )
+
+    assert mock_fetch.call_count == 4
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_finer_grained_updates_are_not_reshaped(mock_fetch):
+    mock_fetch.return_value = SuccessResponse(
+        data=[
+            {
+                "path": "network-instances/network-instance[name=A]"
+                "/state/name",
+                "val": "A",
+            }
+        ]
+    )
+
+    with device_session():
+        get_gnmi_data(
+            _device(),
+            GnmiRequest(path=[f"{NI}[name=*]/state/name", f"{NI}[name=*]"]),
+        )
+        get_gnmi_data(_device(), GnmiRequest(path=[f"{NI}[name=*]/state"]))
+
+    assert mock_fetch.call_count == 2
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_errors_are_not_stored_and_no_session_means_no_reuse(mock_fetch):
+    request = GnmiRequest(path=[f"{NI}[name=*]"])
+    mock_fetch.return_value = ErrorResponse(type="TIMEOUT", message="x")
+
+    with device_session():
+        get_gnmi_data(_device(), request)
+        get_gnmi_data(_device(), request)
+    mock_fetch.return_value = INSTANCES
+    get_gnmi_data(_device(), request)
+    get_gnmi_data(_device(), request)
+
+    assert mock_fetch.call_count == 4
+
+
+@patch("src.gnmi.client._get_gnmi_data_uncached")
+def test_stored_responses_expire_after_max_age(mock_fetch):
+    mock_fetch.return_value = INSTANCES
+    request = GnmiRequest(path=[f"{NI}[name=*]"])
+
+    with device_session(DeviceSession(max_age=0.01)):
+        get_gnmi_data(_device(), request)
+        time.sleep(0.02)
+        get_gnmi_data(_device(), request)
+
+    assert mock_fetch.call_count == 2
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    request = GnmiRequest(path=[f"{NI}[name=*]"])
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(*args):
+        calls.append(args)
+        release.wait(timeout=5)
+        return INSTANCES
+
+    results = []
+    session = DeviceSession()
+
+    def worker():
+        with device_session(session):
+            results.append(get_gnmi_data(_device(), request))
+
+    with patch(
+        "src.gnmi.client._get_gnmi_data_uncached", side_effect=slow_fetch
+    ):
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 3
+    assert all(r.data == INSTANCES.data for r in results)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for priority lanes in gnmi/priority.py.
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from src.gnmi.priority import (
+    Priority,
+    PriorityScheduler,
+    get_current_priority,
+    priority_scope,
+    warn_if_oversubscribed,
+)
+from src.utils.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    cancellation_scope,
+)
+
+
+def _start(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestPriorityScope:
+    def test_default_is_normal(self):
+        assert get_current_priority() == Priority.NORMAL
+
+    def test_scope_sets_and_resets(self):
+        with priority_scope(Priority.BULK):
+            assert get_current_priority() == Priority.BULK
+        assert get_current_priority() == Priority.NORMAL
+
+
+class TestPriorityScheduler:
+    def test_reserved_capacity_is_interactive_only(self):
+        scheduler = PriorityScheduler(capacity=2, interactive_reserved=1)
+        scheduler.acquire(Priority.BULK)
+
+        admitted = []
+        bulk = _start(
+            lambda: (
+                scheduler.acquire(Priority.BULK),
+                admitted.append("bulk"),
+            )
+        )
+        time.sleep(0.05)
+        assert admitted == []
+
+        scheduler.acquire(Priority.INTERACTIVE)
+        assert scheduler.in_flight == 2
+
+        scheduler.release()
+        scheduler.release()
+        bulk.join(timeout=2)
+        assert admitted == ["bulk"]
+
+    def test_interactive_admitted_before_waiting_bulk(self):
+        scheduler = PriorityScheduler(capacity=1, interactive_reserved=0)
+        scheduler.acquire(Priority.BULK)
+        order = []
+
+        def waiter(priority):
+            scheduler.acquire(priority)
+            order.append(priority)
+            scheduler.release()
+
+        bulk = _start(lambda: waiter(Priority.BULK))
+        time.sleep(0.05)
+        interactive = _start(lambda: waiter(Priority.INTERACTIVE))
+        time.sleep(0.05)
+
+        scheduler.release()
+        bulk.join(timeout=2)
+        interactive.join(timeout=2)
+        assert order == [Priority.INTERACTIVE, Priority.BULK]
+
+    def test_waiting_is_cancellable(self):
+        scheduler = PriorityScheduler(capacity=1, interactive_reserved=0)
+        scheduler.acquire(Priority.NORMAL)
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+
+        with cancellation_scope(token):
+            with pytest.raises(OperationCancelledError):
+                scheduler.acquire(Priority.BULK)
+        assert scheduler.in_flight == 1
+
+
+class TestOversubscriptionWarning:
+    @pytest.fixture(autouse=True)
+    def scheduler(self, monkeypatch):
+        scheduler = PriorityScheduler(capacity=8, interactive_reserved=2)
+        monkeypatch.setattr(
+            "src.gnmi.priority.get_scheduler", lambda: scheduler
+        )
+        return scheduler
+
+    def test_warns_when_workers_exceed_bulk_lane(self, caplog):
+        with caplog.at_level(logging.WARNING, logger="src.gnmi.priority"):
+            warn_if_oversubscribed(7, Priority.BULK)
+
+        assert "GNMIBUDDY_MAX_CONCURRENT_REQUESTS" in caplog.text
+        assert "only 6 bulk" in caplog.text
+
+    def test_silent_within_bulk_lane(self, caplog):
+        with caplog.at_level(logging.WARNING, logger="src.gnmi.priority"):
+            warn_if_oversubscribed(6, Priority.BULK)
+
+        assert caplog.text == ""
+
+    def test_interactive_lane_uses_full_capacity(self, scheduler):
+        assert scheduler.lane_capacity(Priority.INTERACTIVE) == 8
+        assert scheduler.lane_capacity(Priority.BULK) == 6
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for cooperative cancellation in gnmi/retry_handler.py.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.schemas.models import Device, NetworkOS
+from src.gnmi.retry_handler import RetryConfig, RetryHandler
+from src.gnmi.client import GnmiErrorHandler
+from src.utils.cancellation import (
+    CancellationToken,
+    OperationCancelledError,
+    cancellation_scope,
+    on_cancel,
+)
+
+
+def _device() -> Device:
+    return Device(name="R1", ip_address="192.0.2.1", nos=NetworkOS.IOSXR)
+
+
+def _rate_limited():
+    raise Exception("exceeded requests limit")
+
+
+class TestCancellationToken:
+    def test_callbacks_run_once(self):
+        token = CancellationToken()
+        calls = []
+        token.register(lambda: calls.append("closed"))
+        token.cancel("stop")
+        token.cancel("again")
+        assert calls == ["closed"]
+        assert token.reason == "stop"
+
+    def test_register_after_cancel_runs_immediately(self):
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+        token.register(lambda: calls.append("closed"))
+        assert calls == ["closed"]
+
+    def test_on_cancel_unregisters_on_exit(self):
+        token = CancellationToken()
+        calls = []
+        with cancellation_scope(token):
+            with on_cancel(lambda: calls.append("closed")):
+                pass
+        token.cancel()
+        assert calls == []
+
+
+class TestRetryCancellation:
+    def test_backoff_sleep_is_interrupted(self):
+        token = CancellationToken()
+        handler = RetryHandler(
+            RetryConfig(max_retries=3, base_delay=30.0, max_delay=30.0)
+        )
+        threading.Timer(0.05, token.cancel).start()
+
+        start = time.time()
+        with cancellation_scope(token):
+            with pytest.raises(OperationCancelledError):
+                handler.execute_with_retry(_rate_limited, _device())
+        assert time.time() - start < 5
+
+    def test_cancelled_token_skips_attempt(self):
+        token = CancellationToken()
+        token.cancel("fail-fast")
+        calls = []
+
+        with cancellation_scope(token):
+            with pytest.raises(OperationCancelledError):
+                RetryHandler().execute_with_retry(
+                    lambda: calls.append("called"), _device()
+                )
+        assert calls == []
+
+    def test_cancelled_error_maps_to_cancelled_response(self):
+        response = GnmiErrorHandler.handle_exception(
+            _device(), OperationCancelledError("fail-fast")
+        )
+        assert response.type == "CANCELLED"
+        assert "fail-fast" in response.message
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Tests for persisted latency statistics and LPT batch scheduling"""
+import ipaddress
+
+from src.cmd.batch import BatchOperationExecutor, ProgressIndicator
+from src.schemas.models import NetworkOS
+from src.schemas.responses import NetworkOperationResult, OperationStatus
+from src.storage.latency_stats import LatencyStats, LatencyStatsStore
+
+
+def _result(device_name: str, execution_time: float) -> NetworkOperationResult:
+    return NetworkOperationResult(
+        device_name=device_name,
+        ip_address=ipaddress.IPv4Address("192.168.1.1"),
+        nos=NetworkOS.IOSXR,
+        operation_type="test",
+        status=OperationStatus.SUCCESS,
+        data={},
+        metadata={"execution_time": execution_time},
+    )
+
+
+class TestLatencyStats:
+    def test_first_sample_sets_ewma(self):
+        stats = LatencyStats()
+        stats.update(2.0, alpha=0.5, window=10)
+        assert stats.ewma == 2.0
+        assert stats.count == 1
+
+    def test_ewma_and_window(self):
+        stats = LatencyStats()
+        for duration in (1.0, 3.0, 5.0):
+            stats.update(duration, alpha=0.5, window=2)
+        assert stats.ewma == 3.5
+        assert stats.count == 3
+        assert stats.samples == [3.0, 5.0]
+
+    def test_p95(self):
+        stats = LatencyStats()
+        for duration in range(1, 21):
+            stats.update(float(duration), alpha=0.3, window=50)
+        assert stats.p95 == 19.0
+        assert LatencyStats().p95 == 0.0
+
+
+class TestLatencyStatsStore:
+    def test_order_longest_first(self):
+        store = LatencyStatsStore()
+        store.record("R1", "interface", 1.0)
+        store.record("R2", "interface", 5.0)
+        store.record("R3", "interface", 3.0)
+
+        ordered = store.order_longest_first(["R1", "R2", "R3"], "interface")
+        assert ordered == ["R2", "R3", "R1"]
+
+    def test_order_without_history_keeps_input_order(self):
+        store = LatencyStatsStore()
+        store.record("R1", "routing", 9.0)
+        devices = ["R3", "R1", "R2"]
+        assert store.order_longest_first(devices, "interface") == devices
+
+    def test_unknown_devices_use_mean(self):
+        store = LatencyStatsStore()
+        store.record("R1", "interface", 1.0)
+        store.record("R2", "interface", 5.0)
+        ordered = store.order_longest_first(["R1", "NEW", "R2"], "interface")
+        assert ordered == ["R2", "NEW", "R1"]
+
+    def test_p95_durations(self):
+        store = LatencyStatsStore()
+        for duration in (1.0, 1.0, 8.0):
+            store.record("R1", "interface", duration)
+
+        assert store.p95_durations(["R1", "R2"], "interface") == {"R1": 8.0}
+
+    def test_persistence_round_trip(self, tmp_path):
+        path = tmp_path / "state" / "latency_stats.json"
+        store = LatencyStatsStore(path=path)
+        store.record("R1", "interface", 2.0)
+        store.save()
+
+        reloaded = LatencyStatsStore(path=path)
+        stats = reloaded.get("R1", "interface")
+        assert stats is not None
+        assert stats.ewma == 2.0
+        assert stats.samples == [2.0]
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "latency_stats.json"
+        path.write_text("not json", encoding="utf-8")
+        store = LatencyStatsStore(path=path)
+        assert store.get("R1", "interface") is None
+
+
+class TestLatencyAwareBatch:
+    def test_executor_submits_longest_first_and_records(self):
+        store = LatencyStatsStore()
+        store.record("R1", "test", 0.1)
+        store.record("R2", "test", 9.0)
+        submitted = []
+
+        def operation(device_name):
+            submitted.append(device_name)
+            return _result(device_name, 0.5)
+
+        executor = BatchOperationExecutor(max_workers=1, latency_store=store)
+        batch_result = executor.execute_batch_operation(
+            devices=["R1", "R2"],
+            operation_func=operation,
+            operation_type="test",
+            show_progress=False,
+        )
+
+        assert submitted == ["R2", "R1"]
+        assert batch_result.summary.successful == 2
+        assert store.get("R1", "test").count == 2
+        assert store.get("R2", "test").count == 2
+
+    def test_progress_estimate_uses_expected_durations(self):
+        progress = ProgressIndicator(
+            total=3,
+            show_progress=False,
+            expected_durations={"R1": 4.0, "R2": 2.0, "R3": 2.0},
+            workers=2,
+        )
+        progress.update(device="R1")
+        assert progress.estimate_remaining(elapsed=1.0) == 2.0
+        progress.update(device="R2")
+        progress.update(device="R3")
+        assert progress.estimate_remaining(elapsed=1.0) == 0.0
+
+    def test_progress_upper_bound_uses_p95(self):
+        progress = ProgressIndicator(
+            total=2,
+            show_progress=False,
+            expected_durations={"R1": 2.0, "R2": 2.0},
+            workers=2,
+            p95_durations={"R1": 6.0, "R2": 3.0},
+        )
+        assert progress.estimate_upper_bound() == 6.0
+        progress.update(device="R1")
+        assert progress.estimate_upper_bound() == 3.0
+        assert progress.estimate_remaining(elapsed=1.0) == 2.0
+        progress.update(device="R2")
+        assert progress.estimate_upper_bound() == 0.0
+        assert ProgressIndicator(total=2).estimate_upper_bound() is None
+
+    def test_progress_counts_devices_without_history(self):
+        progress = ProgressIndicator(
+            total=4,
+            show_progress=False,
+            expected_durations={"R1": 4.0, "R2": 2.0},
+            workers=1,
+            p95_durations={"R1": 6.0, "R2": 4.0},
+        )
+        # R3 and R4 take the mean of the known devices
+        assert progress.estimate_remaining(elapsed=0.0) == 12.0
+        assert progress.estimate_upper_bound() == 20.0
+
+        # Once devices finish, their observed durations are used instead
+        progress.update(device="R1", duration=8.0)
+        assert progress.estimate_remaining(elapsed=8.0) == 18.0
+        assert progress.estimate_upper_bound() == 20.0
+
+    def test_progress_cold_batch_uses_observed_durations(self):
+        progress = ProgressIndicator(total=5, show_progress=False, workers=2)
+        assert progress.estimate_upper_bound() is None
+
+        progress.update(device="R1", duration=2.0)
+        progress.update(device="R2", duration=4.0)
+        progress.update(device="R3", duration=0.0)
+        assert progress.estimate_remaining(elapsed=4.0) == 3.0
+        assert progress.estimate_upper_bound() == 4.0
+
+    def test_untimed_errors_are_not_recorded(self):
+        store = LatencyStatsStore()
+        store.record("R1", "test", 2.0)
+
+        def operation(device_name):
+            raise RuntimeError("boom")
+
+        executor = BatchOperationExecutor(max_workers=1, latency_store=store)
+        executor._execute_single_device = (
+            lambda device, func, operation_type: func(device)
+        )
+        batch_result = executor.execute_batch_operation(
+            devices=["R1"],
+            operation_func=operation,
+            operation_type="test",
+            show_progress=False,
+        )
+
+        assert batch_result.summary.failed == 1
+        assert store.get("R1", "test").count == 1
+        assert store.get("R1", "test").ewma == 2.0
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Tests for the local, fleet-wide log index."""
+from datetime import datetime
+from unittest.mock import patch
+
+from src.collectors.logs import get_logs, search_logs
+from src.schemas.models import Device, NetworkOS
+from src.schemas.responses import OperationStatus, SuccessResponse
+from src.storage.log_buffer import LogEntry
+from src.storage.log_index import LogIndex, parse_keywords, tokenize
+
+ISIS = "RP/0/RP0/CPU0:Apr 23 {} UTC: isis[1010]: %ROUTING-ISIS-5-ADJCHANGE : Adjacency to xrd-2 (Gi0/0/0/1) (L2) Down"
+BGP = "RP/0/RP0/CPU0:Apr 23 {} UTC: bgp[1084]: %ROUTING-BGP-5-ADJCHANGE : neighbor 10.0.0.2 Down"
+LINK = "RP/0/RP0/CPU0:Apr 23 {} UTC: ifmgr[277]: %PKT_INFRA-LINK-3-UPDOWN : Interface Gi0/0/0/1, changed state to Down"
+
+
+def _entry(template, hour, minute):
+    return LogEntry(
+        datetime(2025, 4, 23, hour, minute),
+        template.format(f"{hour:02d}:{minute:02d}:00.000"),
+    )
+
+
+def _index(root=None):
+    index = LogIndex(root=root)
+    index.add("R1", [_entry(ISIS, 11, 10), _entry(LINK, 12, 40)])
+    index.add("R2", [_entry(BGP, 12, 30), _entry(ISIS, 12, 50)])
+    return index
+
+
+def test_tokens_cover_message_code_parts():
+    tokens = tokenize(ISIS.format("12:00:00.000"))
+
+    assert {"ISIS", "ROUTING-ISIS", "ADJCHANGE", "-5-"} <= tokens
+    assert parse_keywords("(ISIS|BGP) adjchange") == [
+        ["ISIS", "BGP"],
+        ["ADJCHANGE"],
+    ]
+
+
+def test_fleet_wide_keyword_and_time_window_queries():
+    index = _index()
+
+    last_hour = index.query("ISIS ADJCHANGE", since=datetime(2025, 4, 23, 12))
+    either = index.query("ISIS|BGP")
+    errors = index.query(max_severity=3)
+
+    assert [(e.device, e.timestamp.minute) for e in last_hour] == [
+        ("R2", 50)
+    ]
+    assert [e.device for e in either] == ["R1", "R2", "R2"]
+    assert [e.device for e in errors] == ["R1"]
+    assert len(index.query(devices=["R1"], limit=1)) == 1
+
+
+def test_keywords_that_are_not_single_tokens():
+    index = _index()
+    index.add(
+        "R3",
+        [
+            LogEntry(
+                datetime(2025, 4, 23, 12, 5),
+                "RP/0/RP0/CPU0:Apr 23 12:05:00.000 UTC: ifmgr[277]: "
+                "%PKT_INFRA-LINK-3-UPDOWN : Interface "
+                "GigabitEthernet0/0/0/0, changed state to Down",
+            )
+        ],
+    )
+
+    link_down = index.query("LINK-3")
+    interface = index.query("GigabitEthernet0/0/0/0")
+
+    assert [e.device for e in link_down] == ["R3", "R1"]
+    assert [e.device for e in interface] == ["R3"]
+    # Every word of the keyword is present, but not as written
+    assert index.query("GigabitEthernet0/0/0/1") == []
+    assert [e.device for e in index.query("link-3|BGP")] == [
+        "R3",
+        "R2",
+        "R1",
+    ]
+
+
+def test_lines_are_appended_once_and_persisted(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.add("R1", [_entry(LINK, 12, 40)]) == 0
+    assert sorted(p.name for p in (tmp_path / "R1").iterdir()) == [
+        "2025042311.jsonl",
+        "2025042312.jsonl",
+    ]
+
+    reloaded = LogIndex(root=tmp_path)
+    assert reloaded.devices() == ["R1", "R2"]
+    assert len(reloaded.query("ADJCHANGE")) == 3
+
+
+def test_old_partitions_are_pruned(tmp_path):
+    index = LogIndex(root=tmp_path, retention_hours=1)
+    index.add("R1", [_entry(ISIS, 9, 0)])
+    index.add("R1", [_entry(ISIS, 12, 0)])
+
+    assert [e.timestamp.hour for e in index.query()] == [12]
+    assert not (tmp_path / "R1" / "2025042309.jsonl").exists()
+
+
+@patch("src.collectors.logs._utc_now")
+@patch("src.collectors.logs.get_gnmi_data")
+def test_get_logs_feeds_the_index_when_enabled(mock_get, mock_now, tmp_path):
+    mock_now.return_value = datetime(2025, 4, 23, 12, 55)
+    mock_get.return_value = SuccessResponse(
+        data=[{"val": ISIS.format("12:50:00.000")}]
+    )
+    device = Device(
+        name="R1",
+        ip_address="192.168.1.1",
+        nos=NetworkOS.IOSXR,
+        username="admin",
+        password="admin",
+    )
+    index = LogIndex()
+
+    with patch("src.collectors.logs.get_log_index", return_value=index), patch(
+        "src.collectors.logs.get_settings"
+    ) as settings:
+        settings.return_value.get_log_index_enabled.return_value = True
+        get_logs(device, show_all_logs=True)
+        result = search_logs("ISIS", minutes=30)
+
+    assert result.status == OperationStatus.SUCCESS
+    assert result.data["summary"]["devices"] == {"R1": 1}
+    assert result.data["logs"][0]["severity"] == 5
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Tests for the disk-spilling batch result store"""
+import ipaddress
+import json
+import weakref
+
+from src.cmd.batch import BatchOperationExecutor
+from src.cmd.formatters import (
+    format_output,
+    make_serializable,
+    stream_batch_output,
+)
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    BatchOperationResult,
+    BatchOperationSummary,
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+from src.storage.result_store import (
+    SpillingResultStore,
+    result_from_dict,
+    result_to_dict,
+)
+
+
+def _result(device_name: str, status: OperationStatus) -> NetworkOperationResult:
+    return NetworkOperationResult(
+        device_name=device_name,
+        ip_address=ipaddress.IPv4Address("192.168.1.1"),
+        nos=NetworkOS.IOSXR,
+        operation_type="routing",
+        status=status,
+        data={"routes": [{"prefix": "10.0.0.0/8"}]},
+        metadata={"execution_time": 0.5},
+        error_response=(
+            ErrorResponse(type="GRPC_ERROR", message="unreachable")
+            if status == OperationStatus.FAILED
+            else None
+        ),
+    )
+
+
+class TestResultSerialization:
+    def test_round_trip(self):
+        original = _result("R1", OperationStatus.FAILED)
+        restored = result_from_dict(result_to_dict(original))
+        assert restored == original
+
+    def test_placeholder_ip_is_kept(self):
+        data = result_to_dict(_result("R1", OperationStatus.SUCCESS))
+        data["ip_address"] = "unknown"
+        assert result_from_dict(data).ip_address == "unknown"
+
+
+class TestSpillingResultStore:
+    def test_append_and_lazy_views(self):
+        with SpillingResultStore() as store:
+            store.append(_result("R1", OperationStatus.SUCCESS))
+            store.append(_result("R2", OperationStatus.FAILED))
+            store.append(_result("R3", OperationStatus.SUCCESS))
+
+            assert len(store) == 3
+            assert store[1].device_name == "R2"
+            assert [r.device_name for r in store] == ["R1", "R2", "R3"]
+
+            successful = store.filter_status(
+                lambda status: status == OperationStatus.SUCCESS
+            )
+            assert [r.device_name for r in successful] == ["R1", "R3"]
+            assert store.find_device("R2").error_response.type == "GRPC_ERROR"
+            assert store.find_device("R9") is None
+
+    def test_temporary_file_removed_on_close(self):
+        store = SpillingResultStore()
+        store.append(_result("R1", OperationStatus.SUCCESS))
+        path = store.path
+        assert path.exists()
+        store.close()
+        assert not path.exists()
+
+    def test_batch_result_over_store(self):
+        with SpillingResultStore() as store:
+            store.append(_result("R1", OperationStatus.SUCCESS))
+            store.append(_result("R2", OperationStatus.FAILED))
+            batch_result = BatchOperationResult(
+                results=store,
+                summary=BatchOperationSummary(
+                    total_devices=2,
+                    successful=1,
+                    failed=1,
+                    execution_time=1.0,
+                    operation_type="routing",
+                ),
+            )
+
+            assert len(batch_result.successful_results) == 1
+            assert len(batch_result.failed_results) == 1
+            assert batch_result.get_results_by_device("R2").status == (
+                OperationStatus.FAILED
+            )
+            serialized = make_serializable(batch_result)
+            assert [r["device_name"] for r in serialized["results"]] == [
+                "R1",
+                "R2",
+            ]
+
+    def test_executor_spills_results(self):
+        def operation(device_name):
+            return _result(device_name, OperationStatus.SUCCESS)
+
+        with SpillingResultStore() as store:
+            batch_result = BatchOperationExecutor(
+                max_workers=2
+            ).execute_batch_operation(
+                devices=["R1", "R2", "R3"],
+                operation_func=operation,
+                operation_type="routing",
+                show_progress=False,
+                result_sink=store,
+            )
+            assert batch_result.results is store
+            assert batch_result.summary.successful == 3
+            assert batch_result.metadata["spilled_results"] is True
+            assert batch_result.get_results_by_device("R3").data["routes"]
+
+    def test_stream_output_matches_formatted_output(self):
+        with SpillingResultStore() as store:
+            store.append(_result("R1", OperationStatus.SUCCESS))
+            store.append(_result("R2", OperationStatus.FAILED))
+            batch_result = BatchOperationResult(
+                results=store,
+                summary=BatchOperationSummary(
+                    total_devices=2,
+                    successful=1,
+                    failed=1,
+                    execution_time=1.0,
+                    operation_type="routing",
+                ),
+                metadata={"spilled_results": True},
+            )
+
+            for output_format in ("json", "yaml"):
+                streamed = "".join(
+                    stream_batch_output(batch_result, output_format)
+                )
+                expected = format_output(batch_result, output_format)
+                assert streamed == expected.rstrip("\n")
+
+    def test_stream_output_decodes_one_result_at_a_time(self, monkeypatch):
+        with SpillingResultStore() as store:
+            for index in range(10):
+                store.append(_result(f"R{index}", OperationStatus.SUCCESS))
+            batch_result = BatchOperationResult(
+                results=store,
+                summary=BatchOperationSummary(
+                    total_devices=10,
+                    successful=10,
+                    failed=0,
+                    execution_time=1.0,
+                    operation_type="routing",
+                ),
+            )
+
+            decoded = []
+            load = store._load
+
+            def tracking_load(entry):
+                result = load(entry)
+                decoded.append(weakref.ref(result))
+                return result
+
+            monkeypatch.setattr(store, "_load", tracking_load)
+            chunks, loaded, alive = [], [], []
+            for chunk in stream_batch_output(batch_result, "json"):
+                chunks.append(chunk)
+                loaded.append(len(decoded))
+                alive.append(sum(ref() is not None for ref in decoded))
+
+            # Each result is decoded just before its own chunk is written
+            # and released before the next one is decoded
+            assert loaded[:11] == list(range(11))
+            assert max(alive) <= 1
+            assert len(json.loads("".join(chunks))["results"]) == 10
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the follow_logs MCP tool.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import mcp_server
+from src.schemas.models import NetworkOS
+from src.schemas.responses import (
+    ErrorResponse,
+    NetworkOperationResult,
+    OperationStatus,
+)
+
+
+def _poll(*messages, status=OperationStatus.SUCCESS):
+    return NetworkOperationResult(
+        device_name="R1",
+        ip_address=None,
+        nos=NetworkOS.IOSXR,
+        operation_type="logs",
+        status=status,
+        data={"logs": [{"message": m} for m in messages]},
+        error_response=(
+            ErrorResponse(type="TIMEOUT", message="timed out")
+            if status == OperationStatus.FAILED
+            else None
+        ),
+    )
+
+
+def _stream(polls, closed=None):
+    try:
+        yield from polls
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+def test_new_lines_are_sent_as_progress_and_collected():
+    polls = [
+        _poll("first"),
+        _poll(status=OperationStatus.FAILED),
+        _poll("second", "third"),
+    ]
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+
+    with patch("api.follow_logs", return_value=_stream(polls)) as follow:
+        result = asyncio.run(
+            mcp_server.follow_logs(
+                "R1", duration_seconds=10, interval_seconds=5, ctx=ctx
+            )
+        )
+
+    assert follow.call_args[0] == ("R1", None, 5, 5, 3)
+    assert [log["message"] for log in result["logs"]] == [
+        "first",
+        "second",
+        "third",
+    ]
+    assert result["summary"] == {"count": 3, "polls": 3}
+    assert result["errors"][0]["message"] == "timed out"
+    assert ctx.report_progress.await_count == 2
+    ctx.info.assert_any_await("second\nthird")
+
+
+def test_duration_is_capped():
+    with patch("api.follow_logs", return_value=_stream([])) as follow:
+        asyncio.run(
+            mcp_server.follow_logs(
+                "R1", duration_seconds=86400, interval_seconds=0
+            )
+        )
+
+    interval, max_polls = follow.call_args[0][3:]
+    assert interval == 1.0
+    assert max_polls == mcp_server.MAX_FOLLOW_SECONDS + 1
+
+
+def test_stream_is_closed_when_the_client_goes_away():
+    closed = []
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock(side_effect=ConnectionError("gone"))
+
+    with patch(
+        "api.follow_logs",
+        return_value=_stream([_poll("first"), _poll("second")], closed),
+    ):
+        with pytest.raises(ConnectionError):
+            asyncio.run(mcp_server.follow_logs("R1", ctx=ctx))
+
+    assert closed == [True]